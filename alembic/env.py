@@ -33,6 +33,16 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 target_metadata = Base.metadata
 
+# SQLite FTS5 virtual table and its shadow tables (shared_deck_fts_data, _idx, ...)
+# are managed by raw DDL in migrations, not by the models; keep autogenerate from dropping them.
+FTS_TABLE_PREFIX = "shared_deck_fts"
+
+
+def include_object(object, name, type_, reflected, compare_to):  # noqa: A002
+    """Skip the shared deck FTS5 tables during autogenerate."""
+    return not (type_ == "table" and name is not None and name.startswith(FTS_TABLE_PREFIX))
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -55,6 +65,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -77,7 +88,7 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(connection=connection, target_metadata=target_metadata, include_object=include_object)
 
         with context.begin_transaction():
             context.run_migrations()
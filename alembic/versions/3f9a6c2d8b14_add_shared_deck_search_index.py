@@ -0,0 +1,110 @@
+"""Add shared_deck_search full-text index
+
+Revision ID: 3f9a6c2d8b14
+Revises: 8c3d1a6e5f27
+Create Date: 2026-10-17 16:05:42.318204
+
+"""
+
+import re
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9a6c2d8b14"
+down_revision: str | Sequence[str] | None = "8c3d1a6e5f27"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# 与 app.utils.search_text.segment 一致：每个中日韩字符单独成词
+_CJK_RE = re.compile(r"([\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff])")
+_TOKEN_RE = re.compile(r"\w+")
+
+_TSVECTOR = (
+    "setweight(to_tsvector('simple', title), 'A') || "
+    "setweight(to_tsvector('simple', tags), 'B') || "
+    "setweight(to_tsvector('simple', description), 'C')"
+)
+
+_SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE shared_deck_fts USING fts5("
+    "title, description, tags, content='shared_deck_search', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER shared_deck_search_ai AFTER INSERT ON shared_deck_search BEGIN "
+    "INSERT INTO shared_deck_fts(rowid, title, description, tags) "
+    "VALUES (new.id, new.title, new.description, new.tags); END",
+    "CREATE TRIGGER shared_deck_search_ad AFTER DELETE ON shared_deck_search BEGIN "
+    "INSERT INTO shared_deck_fts(shared_deck_fts, rowid, title, description, tags) "
+    "VALUES ('delete', old.id, old.title, old.description, old.tags); END",
+    "CREATE TRIGGER shared_deck_search_au AFTER UPDATE ON shared_deck_search BEGIN "
+    "INSERT INTO shared_deck_fts(shared_deck_fts, rowid, title, description, tags) "
+    "VALUES ('delete', old.id, old.title, old.description, old.tags); "
+    "INSERT INTO shared_deck_fts(rowid, title, description, tags) "
+    "VALUES (new.id, new.title, new.description, new.tags); END",
+]
+
+
+def _segment(text: str | None) -> str:
+    if not text:
+        return ""
+    return " ".join(_TOKEN_RE.findall(_CJK_RE.sub(r" \1 ", text.lower())))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    search_table = op.create_table(
+        "shared_deck_search",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False, comment="主键ID"),
+        sa.Column("shared_deck_id", sa.String(length=36), nullable=False, comment="共享牌组ID"),
+        sa.Column("title", sa.Text(), nullable=False, comment="切分后的标题"),
+        sa.Column("description", sa.Text(), nullable=False, comment="切分后的描述"),
+        sa.Column("tags", sa.Text(), nullable=False, comment="切分后的标签"),
+        sa.ForeignKeyConstraint(["shared_deck_id"], ["shared_decks.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("shared_deck_id"),
+    )
+
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        for statement in _SQLITE_DDL:
+            op.execute(statement)
+    elif bind.dialect.name == "postgresql":
+        op.execute(f"CREATE INDEX ix_shared_deck_search_document ON shared_deck_search USING gin (({_TSVECTOR}))")
+
+    # 为已有的共享牌组建立索引
+    shared_decks = sa.table(
+        "shared_decks",
+        sa.column("id", sa.String),
+        sa.column("title", sa.String),
+        sa.column("description", sa.Text),
+        sa.column("tags", sa.JSON),
+        sa.column("deleted_at", sa.DateTime),
+    )
+    rows = bind.execute(
+        sa.select(shared_decks.c.id, shared_decks.c.title, shared_decks.c.description, shared_decks.c.tags).where(
+            shared_decks.c.deleted_at.is_(None)
+        )
+    ).all()
+    if rows:
+        op.bulk_insert(
+            search_table,
+            [
+                {
+                    "shared_deck_id": row.id,
+                    "title": _segment(row.title),
+                    "description": _segment(row.description),
+                    "tags": _segment(" ".join(row.tags or [])),
+                }
+                for row in rows
+            ],
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("DROP TABLE IF EXISTS shared_deck_fts")
+    op.drop_table("shared_deck_search")
@@ -0,0 +1,53 @@
+"""Add jobs table
+
+Revision ID: 5b8e2f4c7a91
+Revises: 13347e4e0e57
+Create Date: 2026-10-17 10:12:31.204512
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e2f4c7a91'
+down_revision: str | Sequence[str] | None = '13347e4e0e57'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('jobs',
+    sa.Column('user_id', sa.String(length=36), nullable=False, comment='提交用户ID'),
+    sa.Column('type', sa.String(length=50), nullable=False, comment='任务类型'),
+    sa.Column('status', sa.String(length=20), nullable=False, comment='状态: pending, running, succeeded, failed, cancelled'),
+    sa.Column('payload', sa.JSON(), nullable=False, comment='任务参数'),
+    sa.Column('result', sa.JSON(), nullable=True, comment='执行结果'),
+    sa.Column('error', sa.Text(), nullable=True, comment='失败原因'),
+    sa.Column('progress_done', sa.Integer(), nullable=False, comment='已完成数量'),
+    sa.Column('progress_total', sa.Integer(), nullable=True, comment='总数量（未知时为空）'),
+    sa.Column('cancel_requested', sa.Boolean(), nullable=False, comment='是否已请求取消'),
+    sa.Column('attempts', sa.Integer(), nullable=False, comment='已执行次数'),
+    sa.Column('started_at', sa.DateTime(), nullable=True, comment='开始执行时间'),
+    sa.Column('finished_at', sa.DateTime(), nullable=True, comment='结束时间'),
+    sa.Column('id', sa.String(length=36), nullable=False, comment='主键ID(UUID)'),
+    sa.Column('created_by', sa.String(length=50), nullable=True, comment='创建人'),
+    sa.Column('updated_by', sa.String(length=50), nullable=True, comment='更新人'),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False, comment='创建时间'),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False, comment='更新时间'),
+    sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='逻辑删除时间'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_jobs_status'), 'jobs', ['status'], unique=False)
+    op.create_index(op.f('ix_jobs_user_id'), 'jobs', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_jobs_user_id'), table_name='jobs')
+    op.drop_index(op.f('ix_jobs_status'), table_name='jobs')
+    op.drop_table('jobs')
@@ -0,0 +1,39 @@
+"""Add content_digest to decks table
+
+Revision ID: 8c3d1a6e5f27
+Revises: 5b8e2f4c7a91
+Create Date: 2026-10-17 14:38:05.611730
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c3d1a6e5f27"
+down_revision: str | Sequence[str] | None = "5b8e2f4c7a91"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 已有牌组的摘要保持为空，首次发布时全量计算一次
+    with op.batch_alter_table("decks", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "content_digest",
+                sa.String(length=64),
+                nullable=True,
+                comment="内容摘要（笔记和卡片元素哈希之和，为空时发布前全量计算）",
+            )
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("decks", schema=None) as batch_op:
+        batch_op.drop_column("content_digest")
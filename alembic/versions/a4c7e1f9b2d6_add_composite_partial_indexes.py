@@ -0,0 +1,61 @@
+"""Add composite partial indexes for hot queries
+
+Revision ID: a4c7e1f9b2d6
+Revises: e7b4d2a9c613
+Create Date: 2026-10-17 20:05:42.118734
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4c7e1f9b2d6"
+down_revision: str | Sequence[str] | None = "e7b4d2a9c613"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (索引名, 表名, 索引列)，均只收录 deleted_at IS NULL 的记录
+PARTIAL_INDEXES = [
+    ("ix_notes_user_created", "notes", ["user_id", "created_at", "id"]),
+    ("ix_notes_user_deck_created", "notes", ["user_id", "deck_id", "created_at", "id"]),
+    ("ix_notes_deck_guid", "notes", ["deck_id", "guid"]),
+    ("ix_cards_user_queue_due", "cards", ["user_id", "queue", "due"]),
+    ("ix_cards_user_deck_queue_due", "cards", ["user_id", "deck_id", "queue", "due"]),
+    ("ix_cards_user_due", "cards", ["user_id", "due", "id"]),
+    ("ix_review_logs_user_time", "review_logs", ["user_id", "review_time", "id"]),
+    (
+        "ix_shared_decks_market",
+        "shared_decks",
+        ["is_active", "is_featured", "is_official", "download_count", "created_at", "id"],
+    ),
+]
+
+# 被上面的复合索引覆盖的单列索引
+SUPERSEDED_INDEXES = [
+    ("ix_notes_user_id", "notes", ["user_id"]),
+    ("ix_notes_deck_id", "notes", ["deck_id"]),
+    ("ix_cards_user_id", "cards", ["user_id"]),
+    ("ix_review_logs_user_id", "review_logs", ["user_id"]),
+    ("ix_review_logs_review_time", "review_logs", ["review_time"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    where = sa.text("deleted_at IS NULL")
+    for name, table, columns in PARTIAL_INDEXES:
+        op.create_index(name, table, columns, unique=False, sqlite_where=where, postgresql_where=where)
+    for name, table, _ in SUPERSEDED_INDEXES:
+        op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, columns in SUPERSEDED_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+    for name, table, _ in reversed(PARTIAL_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,82 @@
+"""Add review_daily_stats rollup table
+
+Revision ID: b8d3f6a2c915
+Revises: a4c7e1f9b2d6
+Create Date: 2026-10-17 21:12:30.504219
+
+"""
+
+from collections.abc import Sequence
+from datetime import UTC, date, datetime
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b8d3f6a2c915"
+down_revision: str | Sequence[str] | None = "a4c7e1f9b2d6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# 回填时每批读取和写入的行数
+BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    daily_stats = op.create_table(
+        "review_daily_stats",
+        sa.Column("user_id", sa.String(length=36), nullable=False, comment="用户ID"),
+        sa.Column("day", sa.Date(), nullable=False, comment="日期"),
+        sa.Column("review_count", sa.Integer(), nullable=False, comment="复习次数"),
+        sa.Column("rating_sum", sa.Integer(), nullable=False, comment="评分之和"),
+        sa.Column("good_count", sa.Integer(), nullable=False, comment="Good/Easy 次数"),
+        sa.Column("duration_ms", sa.BigInteger(), nullable=False, comment="回答总耗时（毫秒）"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("user_id", "day"),
+    )
+
+    # 回填：按用户和复习时间的 UTC 日期（与 app.repositories.review_log.review_day 一致）汇总已有复习日志
+    bind = op.get_bind()
+    review_logs = sa.table(
+        "review_logs",
+        sa.column("user_id", sa.String),
+        sa.column("review_time", sa.BigInteger),
+        sa.column("rating", sa.Integer),
+        sa.column("duration_ms", sa.Integer),
+        sa.column("deleted_at", sa.DateTime),
+    )
+    totals: dict[tuple[str, date], list[int]] = {}
+    rows = bind.execute(
+        sa.select(
+            review_logs.c.user_id, review_logs.c.review_time, review_logs.c.rating, review_logs.c.duration_ms
+        ).where(review_logs.c.deleted_at.is_(None))
+    )
+    while batch := rows.fetchmany(BATCH_SIZE):
+        for row in batch:
+            day = datetime.fromtimestamp(row.review_time / 1000, UTC).date()
+            counts = totals.setdefault((row.user_id, day), [0, 0, 0, 0])
+            counts[0] += 1
+            counts[1] += row.rating
+            counts[2] += row.rating >= 3
+            counts[3] += row.duration_ms or 0
+
+    values = [
+        {
+            "user_id": user_id,
+            "day": day,
+            "review_count": review_count,
+            "rating_sum": rating_sum,
+            "good_count": good_count,
+            "duration_ms": duration_ms,
+        }
+        for (user_id, day), (review_count, rating_sum, good_count, duration_ms) in totals.items()
+    ]
+    for start in range(0, len(values), BATCH_SIZE):
+        bind.execute(daily_stats.insert(), values[start : start + BATCH_SIZE])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("review_daily_stats")
@@ -0,0 +1,42 @@
+"""Add fsrs_params table
+
+Revision ID: d2f8a4c61e37
+Revises: b8d3f6a2c915
+Create Date: 2026-10-17 22:40:18.270413
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d2f8a4c61e37"
+down_revision: str | Sequence[str] | None = "b8d3f6a2c915"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "fsrs_params",
+        sa.Column("user_id", sa.String(length=36), nullable=False, comment="用户ID"),
+        sa.Column("scheduler", sa.String(length=20), nullable=False, comment="调度器类型: fsrs_v4, fsrs_v5"),
+        sa.Column("weights", sa.JSON(), nullable=False, comment="FSRS 参数"),
+        sa.Column("sample_count", sa.Integer(), nullable=False, comment="参与优化的复习数"),
+        sa.Column("loss_before", sa.Float(), nullable=False, comment="默认参数的对数损失"),
+        sa.Column("loss_after", sa.Float(), nullable=False, comment="优化后参数的对数损失"),
+        sa.Column(
+            "updated_at", sa.DateTime(), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=False, comment="更新时间"
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("user_id", "scheduler"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("fsrs_params")
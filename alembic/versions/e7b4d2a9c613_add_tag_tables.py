@@ -0,0 +1,117 @@
+"""Add normalized tag tables
+
+Revision ID: e7b4d2a9c613
+Revises: 3f9a6c2d8b14
+Create Date: 2026-10-17 18:21:09.447310
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e7b4d2a9c613"
+down_revision: str | Sequence[str] | None = "3f9a6c2d8b14"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# 回填时每批读取和写入的行数
+BATCH_SIZE = 5000
+
+# 与 app.repositories.tag.MAX_TAG_LENGTH 一致
+MAX_TAG_LENGTH = 100
+
+
+def _normalize(tags: list | None) -> list[str]:
+    names = (str(tag).strip() for tag in tags or ())
+    return list(dict.fromkeys(name for name in names if name and len(name) <= MAX_TAG_LENGTH))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tags_table = op.create_table(
+        "tags",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False, comment="主键ID"),
+        sa.Column("name", sa.String(length=100), nullable=False, comment="标签名"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    note_tags_table = op.create_table(
+        "note_tags",
+        sa.Column("note_id", sa.String(length=36), nullable=False, comment="笔记ID"),
+        sa.Column("tag_id", sa.Integer(), nullable=False, comment="标签ID"),
+        sa.Column("user_id", sa.String(length=36), nullable=False, comment="所属用户ID（冗余字段）"),
+        sa.ForeignKeyConstraint(["note_id"], ["notes.id"]),
+        sa.ForeignKeyConstraint(["tag_id"], ["tags.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("note_id", "tag_id"),
+    )
+    op.create_index("ix_note_tags_user_tag_note", "note_tags", ["user_id", "tag_id", "note_id"], unique=False)
+    shared_deck_tags_table = op.create_table(
+        "shared_deck_tags",
+        sa.Column("shared_deck_id", sa.String(length=36), nullable=False, comment="共享牌组ID"),
+        sa.Column("tag_id", sa.Integer(), nullable=False, comment="标签ID"),
+        sa.ForeignKeyConstraint(["shared_deck_id"], ["shared_decks.id"]),
+        sa.ForeignKeyConstraint(["tag_id"], ["tags.id"]),
+        sa.PrimaryKeyConstraint("shared_deck_id", "tag_id"),
+    )
+    op.create_index("ix_shared_deck_tags_tag_deck", "shared_deck_tags", ["tag_id", "shared_deck_id"], unique=False)
+
+    # 回填：从 JSON 标签字段生成标签字典和关联
+    bind = op.get_bind()
+    tag_ids: dict[str, int] = {}
+
+    def resolve(names: list[str]) -> None:
+        missing = [name for name in dict.fromkeys(names) if name not in tag_ids]
+        for start in range(0, len(missing), BATCH_SIZE):
+            chunk = missing[start : start + BATCH_SIZE]
+            bind.execute(tags_table.insert(), [{"name": name} for name in chunk])
+            result = bind.execute(sa.select(tags_table.c.name, tags_table.c.id).where(tags_table.c.name.in_(chunk)))
+            tag_ids.update(result.tuples().all())
+
+    notes = sa.table(
+        "notes",
+        sa.column("id", sa.String),
+        sa.column("user_id", sa.String),
+        sa.column("tags", sa.JSON),
+        sa.column("deleted_at", sa.DateTime),
+    )
+    rows = bind.execute(sa.select(notes.c.id, notes.c.user_id, notes.c.tags).where(notes.c.deleted_at.is_(None)))
+    while batch := rows.fetchmany(BATCH_SIZE):
+        normalized = [(row.id, row.user_id, _normalize(row.tags)) for row in batch]
+        resolve([name for _, _, names in normalized for name in names])
+        links = [
+            {"note_id": note_id, "user_id": user_id, "tag_id": tag_ids[name]}
+            for note_id, user_id, names in normalized
+            for name in names
+        ]
+        if links:
+            bind.execute(note_tags_table.insert(), links)
+
+    shared_decks = sa.table(
+        "shared_decks",
+        sa.column("id", sa.String),
+        sa.column("tags", sa.JSON),
+        sa.column("deleted_at", sa.DateTime),
+    )
+    rows = bind.execute(sa.select(shared_decks.c.id, shared_decks.c.tags).where(shared_decks.c.deleted_at.is_(None)))
+    while batch := rows.fetchmany(BATCH_SIZE):
+        normalized_decks = [(row.id, _normalize(row.tags)) for row in batch]
+        resolve([name for _, names in normalized_decks for name in names])
+        deck_links = [
+            {"shared_deck_id": deck_id, "tag_id": tag_ids[name]} for deck_id, names in normalized_decks for name in names
+        ]
+        if deck_links:
+            bind.execute(shared_deck_tags_table.insert(), deck_links)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_shared_deck_tags_tag_deck", table_name="shared_deck_tags")
+    op.drop_table("shared_deck_tags")
+    op.drop_index("ix_note_tags_user_tag_note", table_name="note_tags")
+    op.drop_table("note_tags")
+    op.drop_table("tags")
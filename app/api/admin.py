@@ -6,8 +6,13 @@
 
 from fastapi import APIRouter
 
+from app.core import database
+from app.core.cache import get_cache_stats
 from app.core.deps import CurrentSuperUser, DBSession
+from app.core.password import password_hasher
 from app.models.base import BaseResponse
+from app.schemas.cache import CacheStatsResponse
+from app.schemas.metrics import DatabasePoolStatsResponse, PasswordHasherStatsResponse, SQLiteWriterStatsResponse
 from app.schemas.shared_deck import SharedDeckResponse
 from app.services.shared_deck import SharedDeckService
 
@@ -154,3 +159,56 @@ async def get_system_stats(
             "total_downloads": total_downloads,
         },
     )
+
+
+@router.get("/caches", response_model=BaseResponse[list[CacheStatsResponse]])
+async def get_caches(_current_user: CurrentSuperUser):
+    """
+    获取进程内缓存的指标（命中、未命中、淘汰等，仅反映当前进程）
+    """
+    return BaseResponse(
+        success=True,
+        code=200,
+        msg="获取缓存指标成功",
+        data=[CacheStatsResponse.model_validate(stats) for stats in get_cache_stats()],
+    )
+
+
+@router.get("/password-hasher", response_model=BaseResponse[PasswordHasherStatsResponse])
+async def get_password_hasher_stats(_current_user: CurrentSuperUser):
+    """
+    获取密码哈希执行器的指标（执行中、排队、拒绝数等，仅反映当前进程）
+    """
+    return BaseResponse(
+        success=True,
+        code=200,
+        msg="获取密码哈希指标成功",
+        data=PasswordHasherStatsResponse.model_validate(password_hasher.stats()),
+    )
+
+
+@router.get("/db-pools", response_model=BaseResponse[list[DatabasePoolStatsResponse]])
+async def get_db_pools(_current_user: CurrentSuperUser):
+    """
+    获取数据库连接池的指标（占用、饱和度、签出等待耗时等，仅反映当前进程）
+    """
+    return BaseResponse(
+        success=True,
+        code=200,
+        msg="获取连接池指标成功",
+        data=[DatabasePoolStatsResponse.model_validate(stats) for stats in database.get_pool_stats()],
+    )
+
+
+@router.get("/sqlite-writer", response_model=BaseResponse[SQLiteWriterStatsResponse | None])
+async def get_sqlite_writer_stats(_current_user: CurrentSuperUser):
+    """
+    获取 SQLite 写连接的指标（排队、批量提交等，仅反映当前进程），未启用 SQLite 生产模式时为空
+    """
+    writer = database.sqlite_writer
+    return BaseResponse(
+        success=True,
+        code=200,
+        msg="获取 SQLite 写连接指标成功",
+        data=SQLiteWriterStatsResponse.model_validate(writer.stats()) if writer is not None else None,
+    )
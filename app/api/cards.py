@@ -9,6 +9,10 @@ from fastapi import APIRouter, Depends, Query
 from app.core.deps import CurrentUser, DBSession
 from app.models.base import BasePageQuery, BaseResponse, PageResponse
 from app.schemas.note import (
+    CardBatchUpdate,
+    CardBatchUpdateResult,
+    CardForecastQuery,
+    CardForecastResponse,
     CardListQuery,
     CardResponse,
     CardUpdate,
@@ -27,11 +31,10 @@ async def get_cards(
 ):
     """获取卡片列表（分页）"""
     service = CardService(db)
-    items, total = await service.get_cards(
+    items, total, next_cursor = await service.get_cards(
         user_id=current_user.id,
         query_params=query_params,
-        page_num=page_query.page_num,
-        page_size=page_query.page_size,
+        page_query=page_query,
     )
     return BaseResponse(
         success=True,
@@ -41,6 +44,7 @@ async def get_cards(
             page_num=page_query.page_num,
             page_size=page_query.page_size,
             total=total,
+            next_cursor=next_cursor,
             items=[CardResponse.model_validate(item) for item in items],
         ),
     )
@@ -70,6 +74,18 @@ async def get_due_cards(
     )
 
 
+@router.get("/forecast", response_model=BaseResponse[CardForecastResponse])
+async def get_card_forecast(
+    db: DBSession,
+    current_user: CurrentUser,
+    query: CardForecastQuery = Depends(),
+):
+    """获取复习预测（未来每天到期的卡片数和预计引入的新卡片数）"""
+    service = CardService(db)
+    forecast = await service.get_forecast(current_user.id, query)
+    return BaseResponse(success=True, code=200, msg="获取复习预测成功", data=forecast)
+
+
 @router.get("/stats", response_model=BaseResponse[dict[str, int]])
 async def get_card_stats(
     db: DBSession,
@@ -87,6 +103,29 @@ async def get_card_stats(
     )
 
 
+@router.put("/batch", response_model=BaseResponse[CardBatchUpdateResult])
+async def update_cards_batch(
+    data: CardBatchUpdate,
+    db: DBSession,
+    current_user: CurrentUser,
+):
+    """
+    批量更新卡片
+
+    用于一次性同步复习会话的调度结果，最多支持 10000 张卡片。
+    每项可携带 expected_updated_at（上次获取到的卡片更新时间）做乐观并发控制：
+    卡片已被其他设备修改时该项返回 conflict 且不更新，不影响其他卡片。
+    """
+    service = CardService(db)
+    result = await service.update_cards_batch(current_user.id, data)
+    return BaseResponse(
+        success=True,
+        code=200,
+        msg=f"批量更新完成：成功 {result.updated_count}，冲突 {result.conflict_count}，失败 {result.not_found_count}",
+        data=result,
+    )
+
+
 @router.get("/{card_id}", response_model=BaseResponse[CardResponse])
 async def get_card(
     card_id: str,
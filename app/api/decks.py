@@ -4,7 +4,7 @@
 提供 Deck 的 CRUD 操作
 """
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Response, status
 
 from app.core.deps import CurrentUser, DBSession
 from app.models.base import BasePageQuery, BaseResponse, PageResponse
@@ -14,8 +14,11 @@ from app.schemas.deck import (
     DeckResponse,
     DeckUpdate,
 )
+from app.schemas.job import JobResponse
 from app.schemas.shared_deck import PublishDeckRequest, SharedDeckResponse
 from app.services.deck import DeckService
+from app.services.job import JobService
+from app.services.job_handlers import JOB_TYPE_PUBLISH_DECK
 from app.services.shared_deck import SharedDeckService
 
 router = APIRouter(prefix="/decks", tags=["decks"])
@@ -30,11 +33,10 @@ async def get_decks(
 ):
     """获取牌组列表（分页）"""
     service = DeckService(db)
-    items, total = await service.get_decks(
+    items, total, next_cursor = await service.get_decks(
         user_id=current_user.id,
         query_params=query_params,
-        page_num=page_query.page_num,
-        page_size=page_query.page_size,
+        page_query=page_query,
     )
     return BaseResponse(
         success=True,
@@ -44,6 +46,7 @@ async def get_decks(
             page_num=page_query.page_num,
             page_size=page_query.page_size,
             total=total,
+            next_cursor=next_cursor,
             items=[DeckResponse.model_validate(item) for item in items],
         ),
     )
@@ -113,19 +116,35 @@ async def delete_deck(
     return BaseResponse(success=True, code=200, msg="删除牌组成功", data=None)
 
 
-@router.post("/{deck_id}/publish", response_model=BaseResponse[SharedDeckResponse], status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/{deck_id}/publish",
+    response_model=BaseResponse[SharedDeckResponse] | BaseResponse[JobResponse],
+    status_code=status.HTTP_201_CREATED,
+)
 async def publish_deck(
     deck_id: str,
     data: PublishDeckRequest,
     db: DBSession,
     current_user: CurrentUser,
+    response: Response,
+    background: bool = Query(default=False, description="是否作为后台任务执行（返回 202 和任务信息）"),
 ):
     """
     将牌组发布为共享牌组
 
     将私有牌组发布到牌组市场，供其他用户下载使用。
     发布后牌组内容会被打包，并创建初始版本快照。
+    大牌组可以使用 background=true 在后台执行，通过 /jobs/{job_id} 查询进度和结果。
     """
+    if background:
+        job = await JobService(db).submit_job(
+            current_user.id,
+            JOB_TYPE_PUBLISH_DECK,
+            {"deck_id": deck_id, "data": data.model_dump(mode="json")},
+        )
+        response.status_code = status.HTTP_202_ACCEPTED
+        return BaseResponse(success=True, code=202, msg="发布任务已提交", data=JobService.to_response(job))
+
     service = SharedDeckService(db)
     item = await service.publish_deck(deck_id, current_user.id, data)
     return BaseResponse(
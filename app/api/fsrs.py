@@ -0,0 +1,51 @@
+"""
+个人 FSRS 参数 API 路由
+
+提供个人 FSRS 参数的查询和优化接口
+"""
+
+from fastapi import APIRouter, Depends, Response, status
+
+from app.core.deps import CurrentUser, DBSession
+from app.models.base import BaseResponse
+from app.schemas.fsrs_params import FSRSOptimizeRequest, FSRSParamsQuery, FSRSParamsResponse
+from app.schemas.job import JobResponse
+from app.services.fsrs_params import FSRSParamsService
+from app.services.job import JobService
+from app.services.job_handlers import JOB_TYPE_OPTIMIZE_FSRS_PARAMS
+
+router = APIRouter(prefix="/fsrs", tags=["fsrs"])
+
+
+@router.get("/params", response_model=BaseResponse[FSRSParamsResponse])
+async def get_fsrs_params(
+    db: DBSession,
+    current_user: CurrentUser,
+    query_params: FSRSParamsQuery = Depends(),
+):
+    """获取当前用户的 FSRS 参数（尚未优化时返回默认参数）"""
+    service = FSRSParamsService(db)
+    params = await service.get_params(current_user.id, query_params.scheduler)
+    return BaseResponse(success=True, code=200, msg="获取FSRS参数成功", data=params)
+
+
+@router.post(
+    "/params/optimize",
+    response_model=BaseResponse[JobResponse],
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def optimize_fsrs_params(
+    data: FSRSOptimizeRequest,
+    db: DBSession,
+    current_user: CurrentUser,
+    response: Response,
+):
+    """
+    由复习日志优化当前用户的 FSRS 参数
+
+    优化在后台执行，通过 /jobs/{job_id} 查询进度（已完成的训练批次数）和结果。
+    完成后的参数可通过 GET /fsrs/params 获取。
+    """
+    job = await JobService(db).submit_job(current_user.id, JOB_TYPE_OPTIMIZE_FSRS_PARAMS, data.model_dump(mode="json"))
+    response.status_code = status.HTTP_202_ACCEPTED
+    return BaseResponse(success=True, code=202, msg="参数优化任务已提交", data=JobService.to_response(job))
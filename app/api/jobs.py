@@ -0,0 +1,70 @@
+"""
+后台任务 API 路由
+
+提供后台任务的状态查询和取消接口
+"""
+
+from fastapi import APIRouter, Depends
+
+from app.core.deps import CurrentUser, DBSession
+from app.models.base import BasePageQuery, BaseResponse, PageResponse
+from app.schemas.job import JobListQuery, JobResponse
+from app.services.job import JobService
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get("", response_model=BaseResponse[PageResponse[JobResponse]])
+async def get_jobs(
+    db: DBSession,
+    current_user: CurrentUser,
+    page_query: BasePageQuery = Depends(),
+    query_params: JobListQuery = Depends(),
+):
+    """获取当前用户的后台任务列表（分页）"""
+    service = JobService(db)
+    items, total, next_cursor = await service.get_jobs(
+        user_id=current_user.id,
+        query_params=query_params,
+        page_query=page_query,
+    )
+    return BaseResponse(
+        success=True,
+        code=200,
+        msg="获取任务列表成功",
+        data=PageResponse(
+            page_num=page_query.page_num,
+            page_size=page_query.page_size,
+            total=total,
+            next_cursor=next_cursor,
+            items=[JobService.to_response(item) for item in items],
+        ),
+    )
+
+
+@router.get("/{job_id}", response_model=BaseResponse[JobResponse])
+async def get_job(
+    job_id: str,
+    db: DBSession,
+    current_user: CurrentUser,
+):
+    """获取后台任务状态和进度"""
+    service = JobService(db)
+    item = await service.get_job(job_id, current_user.id)
+    return BaseResponse(success=True, code=200, msg="获取任务成功", data=JobService.to_response(item))
+
+
+@router.post("/{job_id}/cancel", response_model=BaseResponse[JobResponse])
+async def cancel_job(
+    job_id: str,
+    db: DBSession,
+    current_user: CurrentUser,
+):
+    """
+    取消后台任务
+
+    未开始的任务立即取消；执行中的任务会在下一个检查点停止并回滚已做的修改。
+    """
+    service = JobService(db)
+    item = await service.cancel_job(job_id, current_user.id)
+    return BaseResponse(success=True, code=200, msg="已请求取消任务", data=JobService.to_response(item))
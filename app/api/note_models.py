@@ -59,11 +59,10 @@ async def get_note_models(
 ):
     """获取笔记类型列表（分页）"""
     service = NoteModelService(db)
-    items, total = await service.get_note_models(
+    items, total, next_cursor = await service.get_note_models(
         user_id=current_user.id,
         query_params=query_params,
-        page_num=page_query.page_num,
-        page_size=page_query.page_size,
+        page_query=page_query,
     )
     return BaseResponse(
         success=True,
@@ -73,6 +72,7 @@ async def get_note_models(
             page_num=page_query.page_num,
             page_size=page_query.page_size,
             total=total,
+            next_cursor=next_cursor,
             items=[NoteModelResponse.model_validate(item) for item in items],
         ),
     )
@@ -4,19 +4,26 @@
 提供 Note 的 CRUD 操作
 """
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 
 from app.core.deps import CurrentUser, DBSession
 from app.models.base import BasePageQuery, BaseResponse, PageResponse
+from app.schemas.job import JobResponse
 from app.schemas.note import (
     NoteBatchCreate,
     NoteBatchResult,
     NoteCreate,
+    NoteImportQuery,
+    NoteImportResult,
     NoteListQuery,
     NoteResponse,
     NoteUpdate,
 )
+from app.schemas.tag import TagCountResponse
+from app.services.job import JobService
+from app.services.job_handlers import JOB_TYPE_CREATE_NOTES_BATCH
 from app.services.note import NoteService
+from app.utils.note_import import iter_csv_rows, iter_ndjson_rows
 
 router = APIRouter(prefix="/notes", tags=["notes"])
 
@@ -30,11 +37,10 @@ async def get_notes(
 ):
     """获取笔记列表（分页）"""
     service = NoteService(db)
-    items, total = await service.get_notes(
+    items, total, next_cursor = await service.get_notes(
         user_id=current_user.id,
         query_params=query_params,
-        page_num=page_query.page_num,
-        page_size=page_query.page_size,
+        page_query=page_query,
     )
     return BaseResponse(
         success=True,
@@ -44,11 +50,29 @@ async def get_notes(
             page_num=page_query.page_num,
             page_size=page_query.page_size,
             total=total,
+            next_cursor=next_cursor,
             items=[NoteResponse.model_validate(item) for item in items],
         ),
     )
 
 
+@router.get("/tags", response_model=BaseResponse[list[TagCountResponse]])
+async def get_note_tags(
+    db: DBSession,
+    current_user: CurrentUser,
+    deck_id: str | None = Query(default=None, description="只统计指定牌组"),
+):
+    """获取当前用户的全部标签及每个标签的笔记数"""
+    service = NoteService(db)
+    counts = await service.get_tag_counts(current_user.id, deck_id)
+    return BaseResponse(
+        success=True,
+        code=200,
+        msg="获取标签列表成功",
+        data=[TagCountResponse(name=name, count=count) for name, count in counts],
+    )
+
+
 @router.get("/{note_id}", response_model=BaseResponse[NoteResponse])
 async def get_note(
     note_id: str,
@@ -113,19 +137,33 @@ async def delete_note(
     return BaseResponse(success=True, code=200, msg="删除笔记成功", data=None)
 
 
-@router.post("/batch", response_model=BaseResponse[NoteBatchResult], status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/batch",
+    response_model=BaseResponse[NoteBatchResult] | BaseResponse[JobResponse],
+    status_code=status.HTTP_201_CREATED,
+)
 async def create_notes_batch(
     data: NoteBatchCreate,
     db: DBSession,
     current_user: CurrentUser,
+    response: Response,
+    background: bool = Query(default=False, description="是否作为后台任务执行（返回 202 和任务信息）"),
 ):
     """
     批量创建笔记
 
     一次性创建多条笔记及其关联的卡片。
     支持去重：如果笔记内容（GUID）已存在，会自动跳过。
-    最多支持 1000 条笔记。
+    最多支持 50000 条笔记。
+    使用 background=true 时在后台执行，可通过 /jobs/{job_id} 查询进度或取消。
     """
+    if background:
+        job = await JobService(db).submit_job(
+            current_user.id, JOB_TYPE_CREATE_NOTES_BATCH, data.model_dump(mode="json")
+        )
+        response.status_code = status.HTTP_202_ACCEPTED
+        return BaseResponse(success=True, code=202, msg="批量创建任务已提交", data=JobService.to_response(job))
+
     service = NoteService(db)
     result = await service.create_notes_batch(current_user.id, data)
     return BaseResponse(
@@ -134,3 +172,33 @@ async def create_notes_batch(
         msg=f"批量创建完成：成功 {result.created_count}，跳过 {result.skipped_count}，失败 {result.error_count}",
         data=result,
     )
+
+
+@router.post("/import", response_model=BaseResponse[NoteImportResult], status_code=status.HTTP_201_CREATED)
+async def import_notes(
+    request: Request,
+    db: DBSession,
+    current_user: CurrentUser,
+    query: NoteImportQuery = Depends(),
+):
+    """
+    流式导入笔记
+
+    请求体为 NDJSON（每行 {"fields": {...}, "tags": [...]}）或 CSV（首行为字段名表头，
+    可选 tags 列，标签以空格分隔）。服务端边读边解析，逐条校验并分批提交，
+    不限制条数。去重规则与批量创建一致，单条记录出错不影响其他记录。
+    """
+    import_format = query.format
+    if import_format is None:
+        content_type = request.headers.get("content-type", "")
+        import_format = "csv" if content_type.startswith("text/csv") else "ndjson"
+
+    parse_rows = iter_csv_rows if import_format == "csv" else iter_ndjson_rows
+    service = NoteService(db)
+    result = await service.import_notes_stream(current_user.id, query, parse_rows(request.stream()))
+    return BaseResponse(
+        success=True,
+        code=201,
+        msg=f"导入完成：成功 {result.created_count}，跳过 {result.skipped_count}，失败 {result.error_count}",
+        data=result,
+    )
@@ -4,11 +4,14 @@
 提供 ReviewLog 的创建和查询操作
 """
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
 
 from app.core.deps import CurrentUser, DBSession
 from app.models.base import BasePageQuery, BaseResponse, PageResponse
 from app.schemas.review_log import (
+    ReviewDailyStatResponse,
+    ReviewLogBatchCreate,
+    ReviewLogBatchResult,
     ReviewLogCreate,
     ReviewLogListQuery,
     ReviewLogResponse,
@@ -28,11 +31,10 @@ async def get_review_logs(
 ):
     """获取复习日志列表（分页）"""
     service = ReviewLogService(db)
-    items, total = await service.get_review_logs(
+    items, total, next_cursor = await service.get_review_logs(
         user_id=current_user.id,
         query_params=query_params,
-        page_num=page_query.page_num,
-        page_size=page_query.page_size,
+        page_query=page_query,
     )
     return BaseResponse(
         success=True,
@@ -42,6 +44,7 @@ async def get_review_logs(
             page_num=page_query.page_num,
             page_size=page_query.page_size,
             total=total,
+            next_cursor=next_cursor,
             items=[ReviewLogResponse.model_validate(item) for item in items],
         ),
     )
@@ -63,6 +66,23 @@ async def get_review_stats(
     )
 
 
+@router.get("/daily", response_model=BaseResponse[list[ReviewDailyStatResponse]])
+async def get_daily_review_stats(
+    db: DBSession,
+    current_user: CurrentUser,
+    days: int = Query(default=365, ge=1, le=3660, description="最近天数（包含今天）"),
+):
+    """获取每日复习汇总（热力图）"""
+    service = ReviewLogService(db)
+    items = await service.get_daily_stats(current_user.id, days)
+    return BaseResponse(
+        success=True,
+        code=200,
+        msg="获取每日复习汇总成功",
+        data=[ReviewDailyStatResponse.model_validate(item) for item in items],
+    )
+
+
 @router.get("/{log_id}", response_model=BaseResponse[ReviewLogResponse])
 async def get_review_log(
     log_id: str,
@@ -95,3 +115,26 @@ async def create_review_log(
         msg="创建复习日志成功",
         data=ReviewLogResponse.model_validate(item),
     )
+
+
+@router.post("/batch", response_model=BaseResponse[ReviewLogBatchResult], status_code=status.HTTP_201_CREATED)
+async def create_review_logs_batch(
+    data: ReviewLogBatchCreate,
+    db: DBSession,
+    current_user: CurrentUser,
+):
+    """
+    批量上传复习日志
+
+    用于离线复习后一次性同步，最多支持 10000 条。
+    每条日志需携带客户端生成的 ID：重试时已写入的日志会被跳过，不会重复计数；
+    卡片不存在或不属于当前用户的日志计为失败，不影响其他日志。
+    """
+    service = ReviewLogService(db)
+    result = await service.create_review_logs_batch(current_user.id, data)
+    return BaseResponse(
+        success=True,
+        code=201,
+        msg=f"批量上传完成：成功 {result.created_count}，跳过 {result.skipped_count}，失败 {result.error_count}",
+        data=result,
+    )
@@ -4,80 +4,158 @@
 提供 SharedDeck 的公开浏览和下载接口
 """
 
-from fastapi import APIRouter, Depends, status
+from pathlib import Path
 
-from app.core.deps import CurrentUser, DBSession
+from fastapi import APIRouter, Depends, Header, Query, Request, Response, status
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
+
+from app.core.config import settings
+from app.core.deps import CurrentUser, DBSession, ReadDBSession
+from app.core.response_cache import CacheableContent, accepts_encoding, etag_matches, market_response_cache
 from app.models.base import BasePageQuery, BaseResponse, PageResponse
+from app.schemas.job import JobResponse
 from app.schemas.shared_deck import (
     SharedDeckCreate,
+    SharedDeckDeltaResponse,
     SharedDeckDetailResponse,
     SharedDeckListQuery,
     SharedDeckResponse,
     SharedDeckSnapshotResponse,
     SharedDeckUpdate,
 )
+from app.schemas.tag import TagCountResponse
+from app.services.job import JobService
+from app.services.job_handlers import JOB_TYPE_PUBLISH_NEW_VERSION
 from app.services.shared_deck import SharedDeckService
+from app.utils import export_store
 
 router = APIRouter(prefix="/shared-decks", tags=["shared-decks"])
 
 
+def _artifact_response(path: Path, etag: str, accept_encoding: str | None) -> Response:
+    """构造预生成导出文件的响应"""
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+
+    # 客户端不支持 gzip 时边读边解压
+    if not accepts_encoding(accept_encoding, "gzip"):
+        return StreamingResponse(export_store.iter_decompressed(path), media_type="application/json", headers=headers)
+
+    headers["Content-Encoding"] = "gzip"
+    if settings.EXPORT_ACCEL_REDIRECT_PREFIX:
+        # 由前置 nginx 直接通过 sendfile 发送文件
+        headers["X-Accel-Redirect"] = f"{settings.EXPORT_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{path.name}"
+        return Response(media_type="application/json", headers=headers)
+    return FileResponse(path, media_type="application/json", headers=headers)
+
+
 # ==================== 共享牌组公开接口 ====================
 
 
 @router.get("", response_model=BaseResponse[PageResponse[SharedDeckResponse]])
 async def get_shared_decks(
-    db: DBSession,
+    request: Request,
+    db: ReadDBSession,
     page_query: BasePageQuery = Depends(),
     query_params: SharedDeckListQuery = Depends(),
 ):
-    """浏览共享牌组列表（公开接口，无需登录）"""
+    """
+    浏览共享牌组列表（公开接口，无需登录）
+
+    响应按规范化的查询参数缓存，带 ETag 和 Cache-Control 头，If-None-Match 命中时返回 304。
+    列表不带 Last-Modified（牌组删除、下架或下载次数变化不会更新列表项的 updated_at）。
+    """
+
+    async def build() -> CacheableContent:
+        service = SharedDeckService(db)
+        items, total, next_cursor = await service.search_shared_decks(
+            query_params=query_params,
+            page_query=page_query,
+        )
+        response = BaseResponse(
+            success=True,
+            code=200,
+            msg="获取共享牌组列表成功",
+            data=PageResponse(
+                page_num=page_query.page_num,
+                page_size=page_query.page_size,
+                total=total,
+                next_cursor=next_cursor,
+                items=[SharedDeckResponse.model_validate(item) for item in items],
+            ),
+        )
+        return CacheableContent(response)
+
+    return await market_response_cache.respond(request, build, page_query, query_params)
+
+
+@router.get("/tags", response_model=BaseResponse[list[TagCountResponse]])
+async def get_shared_deck_tags(
+    db: ReadDBSession,
+    limit: int = Query(default=100, ge=1, le=1000, description="返回的最大标签数"),
+):
+    """获取牌组市场的热门标签及每个标签的共享牌组数（公开接口，无需登录）"""
     service = SharedDeckService(db)
-    items, total = await service.search_shared_decks(
-        query_params=query_params,
-        page_num=page_query.page_num,
-        page_size=page_query.page_size,
-    )
+    counts = await service.get_tag_counts(limit)
     return BaseResponse(
         success=True,
         code=200,
-        msg="获取共享牌组列表成功",
-        data=PageResponse(
-            page_num=page_query.page_num,
-            page_size=page_query.page_size,
-            total=total,
-            items=[SharedDeckResponse.model_validate(item) for item in items],
-        ),
+        msg="获取标签列表成功",
+        data=[TagCountResponse(name=name, count=count) for name, count in counts],
     )
 
 
 @router.get("/{slug}", response_model=BaseResponse[SharedDeckDetailResponse])
-async def get_shared_deck(slug: str, db: DBSession):
-    """获取共享牌组详情（公开接口，无需登录）"""
-    service = SharedDeckService(db)
-    item = await service.get_shared_deck_by_slug(slug)
-    return BaseResponse(
-        success=True,
-        code=200,
-        msg="获取共享牌组成功",
-        data=SharedDeckDetailResponse.model_validate(item),
-    )
+async def get_shared_deck(slug: str, request: Request, db: ReadDBSession):
+    """获取共享牌组详情（公开接口，无需登录，响应缓存同列表接口）"""
+
+    async def build() -> CacheableContent:
+        service = SharedDeckService(db)
+        item = await service.get_shared_deck_by_slug(slug)
+        response = BaseResponse(
+            success=True,
+            code=200,
+            msg="获取共享牌组成功",
+            data=SharedDeckDetailResponse.model_validate(item),
+        )
+        return CacheableContent(response, last_modified=item.updated_at)
+
+    return await market_response_cache.respond(request, build)
 
 
 @router.get("/{slug}/download", response_model=BaseResponse[SharedDeckSnapshotResponse])
-async def get_shared_deck_download(slug: str, db: DBSession):
-    """获取共享牌组下载信息（公开接口，无需登录）"""
+async def get_shared_deck_download(slug: str, request: Request, db: ReadDBSession):
+    """
+    获取共享牌组下载信息（公开接口，无需登录，响应缓存同列表接口）
+
+    每次返回下载信息（包括命中缓存时）计入一次下载，条件请求命中返回 304 时不计入。
+    响应为 `Cache-Control: private, no-store`，避免 nginx 等共享缓存直接返回而漏计下载。
+    """
     service = SharedDeckService(db)
-    snapshot = await service.get_download_info(slug)
-    return BaseResponse(
-        success=True,
-        code=200,
-        msg="获取下载信息成功",
-        data=SharedDeckSnapshotResponse.model_validate(snapshot),
+
+    async def build() -> CacheableContent:
+        snapshot = await service.get_download_info(slug)
+        response = BaseResponse(
+            success=True,
+            code=200,
+            msg="获取下载信息成功",
+            data=SharedDeckSnapshotResponse.model_validate(snapshot),
+        )
+        return CacheableContent(response, last_modified=snapshot.created_at, subject_id=snapshot.shared_deck_id)
+
+    return await market_response_cache.respond(
+        request, build, on_served=service.record_download, cache_control="private, no-store"
     )
 
 
 @router.get("/{slug}/export")
-async def export_shared_deck(slug: str, db: DBSession):
+async def export_shared_deck(
+    slug: str,
+    db: ReadDBSession,
+    stream: bool = Query(default=False, description="是否以 NDJSON 流式导出（适合大牌组）"),
+    version: int | None = Query(default=None, ge=1, description="导出指定版本（默认最新版本）"),
+    if_none_match: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
+):
     """
     导出共享牌组数据（公开接口，无需登录）
 
@@ -86,9 +164,34 @@ async def export_shared_deck(slug: str, db: DBSession):
     - 牌组配置（deck）
     - 笔记（notes）
     - 卡片（cards）
+
+    默认直接返回发布时预生成的快照文件（gzip 压缩），带以内容哈希为值的强
+    ETag，`If-None-Match` 命中时返回 304。尚未生成快照文件的旧牌组回退为实时导出。
+
+    `stream=true` 时以 `application/x-ndjson` 逐行返回源牌组的实时内容，每行形如
+    `{"type": "note", "data": {...}}`，服务端内存占用不随牌组大小增长。流式导出不能与
+    `version` 同时使用（返回 400）。
+
+    导出内容从只读会话（配置了只读副本时为副本）读取，下载计数先累加在内存中，定期写入主库。
     """
     service = SharedDeckService(db)
-    export_data = await service.export_shared_deck(slug)
+    shared_deck = await service.get_shared_deck_by_slug(slug)
+    if stream:
+        body = await service.stream_export_shared_deck(shared_deck, version)
+        service.record_download(shared_deck.id)
+        return StreamingResponse(body, media_type="application/x-ndjson")
+
+    artifact = service.get_export_artifact(shared_deck, version)
+    if artifact is not None:
+        snapshot, path = artifact
+        etag = f'"{snapshot.content_hash}"'
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        service.record_download(shared_deck.id)
+        return _artifact_response(path, etag, accept_encoding)
+
+    export_data = await service.export_shared_deck(shared_deck)
+    service.record_download(shared_deck.id)
     return BaseResponse(
         success=True,
         code=200,
@@ -97,6 +200,40 @@ async def export_shared_deck(slug: str, db: DBSession):
     )
 
 
+@router.get("/{slug}/delta", response_model=BaseResponse[SharedDeckDeltaResponse])
+async def get_shared_deck_delta(
+    slug: str,
+    db: ReadDBSession,
+    response: Response,
+    from_version: int = Query(..., alias="from", ge=1, description="客户端当前版本号"),
+    if_none_match: str | None = Header(default=None),
+):
+    """
+    获取从指定版本更新到最新版本的增量（公开接口，无需登录）
+
+    返回笔记（以 guid 为键）和卡片（以 ID 为键）的新增、变化和删除，
+    以及最新版本完整的笔记类型和牌组信息。客户端已是最新版本时各增量为空。
+
+    需要合并的版本过多或旧版本缺少增量时，以 303 重定向到最新版本的完整导出。
+    响应带以两端内容哈希组成的强 ETag，`If-None-Match` 命中时返回 304。
+    """
+    service = SharedDeckService(db)
+    latest, delta = await service.get_delta(slug, from_version)
+    if delta is None:
+        return RedirectResponse(latest.file_url, status_code=status.HTTP_303_SEE_OTHER)
+
+    etag = f'"{delta["from_content_hash"]}-{delta["to_content_hash"]}"'
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return BaseResponse(
+        success=True,
+        code=200,
+        msg="获取增量成功",
+        data=SharedDeckDeltaResponse.model_validate(delta),
+    )
+
+
 # ==================== 共享牌组管理接口 ====================
 
 
@@ -147,11 +284,16 @@ async def delete_shared_deck(
     return BaseResponse(success=True, code=200, msg="删除共享牌组成功", data=None)
 
 
-@router.post("/{shared_deck_id}/publish-version", response_model=BaseResponse[SharedDeckResponse])
+@router.post(
+    "/{shared_deck_id}/publish-version",
+    response_model=BaseResponse[SharedDeckResponse] | BaseResponse[JobResponse],
+)
 async def publish_new_version(
     shared_deck_id: str,
     db: DBSession,
     current_user: CurrentUser,
+    response: Response,
+    background: bool = Query(default=False, description="是否作为后台任务执行（返回 202 和任务信息）"),
 ):
     """
     发布共享牌组的新版本
@@ -159,7 +301,15 @@ async def publish_new_version(
     从关联的源牌组重新导出内容，创建新的版本快照。
     版本号自动递增，内容哈希会重新计算。
     如果内容没有变化，会返回错误。
+    使用 background=true 时在后台执行，通过 /jobs/{job_id} 查询结果。
     """
+    if background:
+        job = await JobService(db).submit_job(
+            current_user.id, JOB_TYPE_PUBLISH_NEW_VERSION, {"shared_deck_id": shared_deck_id}
+        )
+        response.status_code = status.HTTP_202_ACCEPTED
+        return BaseResponse(success=True, code=202, msg="发布任务已提交", data=JobService.to_response(job))
+
     service = SharedDeckService(db)
     item = await service.publish_new_version(shared_deck_id, current_user.id)
     return BaseResponse(
@@ -8,7 +8,7 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, status
 
-from app.core.deps import CurrentSuperUser, CurrentUser, DBSession
+from app.core.deps import CurrentSuperUser, CurrentUserModel, DBSession
 from app.models.base import BasePageQuery, BaseResponse, PageResponse, Token
 from app.schemas.user import (
     LoginRequest,
@@ -54,13 +54,13 @@ async def register(user_data: UserCreate, db: DBSession):
 
 
 @auth_router.get("/me", response_model=BaseResponse[UserResponse])
-async def get_current_user_info(current_user: CurrentUser):
+async def get_current_user_info(current_user: CurrentUserModel):
     """获取当前登录用户信息"""
     return BaseResponse(success=True, code=200, msg="获取用户信息成功", data=UserResponse.model_validate(current_user))
 
 
 @auth_router.put("/me", response_model=BaseResponse[UserResponse])
-async def update_current_user(user_data: UserUpdate, current_user: CurrentUser, db: DBSession):
+async def update_current_user(user_data: UserUpdate, current_user: CurrentUserModel, db: DBSession):
     """更新当前登录用户信息"""
     user_service = UserService(db)
     user = await user_service.update_current_user(current_user, user_data)
@@ -68,7 +68,7 @@ async def update_current_user(user_data: UserUpdate, current_user: CurrentUser,
 
 
 @auth_router.post("/change-password", response_model=BaseResponse[None])
-async def change_password(password_data: PasswordChange, current_user: CurrentUser, db: DBSession):
+async def change_password(password_data: PasswordChange, current_user: CurrentUserModel, db: DBSession):
     """修改密码"""
     auth_service = AuthService(db)
     await auth_service.change_password(current_user, password_data.old_password, password_data.new_password)
@@ -87,17 +87,22 @@ async def get_users(
 ):
     """获取用户列表（分页）- 需要超级管理员权限"""
     user_service = UserService(db)
-    users, total = await user_service.get_users(
+    users, total, next_cursor = await user_service.get_users(
         query_params=query_params,
-        page_num=page_query.page_num,
-        page_size=page_query.page_size,
+        page_query=page_query,
     )
     user_list = [UserResponse.model_validate(user) for user in users]
     return BaseResponse(
         success=True,
         code=200,
         msg="获取用户列表成功",
-        data=PageResponse(page_num=page_query.page_num, page_size=page_query.page_size, total=total, items=user_list),
+        data=PageResponse(
+            page_num=page_query.page_num,
+            page_size=page_query.page_size,
+            total=total,
+            next_cursor=next_cursor,
+            items=user_list,
+        ),
     )
 
 
@@ -5,21 +5,34 @@
 """
 
 from app.core.config import settings
-from app.core.database import AsyncSessionLocal, close_db, engine, get_db, init_db
+from app.core.database import (
+    AsyncSessionLocal,
+    ReadSessionLocal,
+    close_db,
+    engine,
+    get_db,
+    get_read_db,
+    init_db,
+    read_engine,
+)
 from app.core.exceptions import (
     AppException,
     BadRequestException,
     ConflictException,
     ForbiddenException,
     NotFoundException,
+    TooManyRequestsException,
     UnauthorizedException,
 )
 
 __all__ = [
     "settings",
     "engine",
+    "read_engine",
     "AsyncSessionLocal",
+    "ReadSessionLocal",
     "get_db",
+    "get_read_db",
     "init_db",
     "close_db",
     "AppException",
@@ -27,5 +40,6 @@ __all__ = [
     "ConflictException",
     "ForbiddenException",
     "NotFoundException",
+    "TooManyRequestsException",
     "UnauthorizedException",
 ]
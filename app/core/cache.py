@@ -0,0 +1,245 @@
+"""
+进程内缓存
+
+带过期时间（TTL）和容量上限（LRU 淘汰）的键值缓存，并记录命中、未命中、淘汰等指标。
+
+- 仅在当前进程内有效：多进程部署时各进程各自缓存，数据一致性依赖写入时的失效和 TTL
+- 不加锁：只在事件循环线程中访问
+- 创建后用 register_cache 登记，管理员接口通过 get_cache_stats 汇总所有缓存的指标
+- 与数据库写入配合的失效由 SessionInvalidator 在会话提交/回滚时统一处理
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """缓存指标快照"""
+
+    name: str
+    size: int
+    max_size: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+
+    @property
+    def hit_rate(self) -> float:
+        """命中率（没有访问时为 0）"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class TTLCache[K: Hashable, V]:
+    """带 TTL 和 LRU 淘汰的进程内缓存"""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_size: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            name: 缓存名称（用于指标）
+            max_size: 最多保存的条目数，超过时淘汰最久未访问的条目
+            ttl_seconds: 条目写入后的有效期（秒）
+            clock: 单调时钟（测试时可替换）
+        """
+        self.name = name
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        # 键 -> (过期时间, 值)，按最近访问顺序排列（末尾最新）
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        """
+        读取缓存并计入命中/未命中，命中时标记为最近访问
+
+        Args:
+            key: 键
+
+        Returns:
+            缓存的值，不存在或已过期时返回 None
+        """
+        value = self._lookup(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def peek(self, key: K) -> V | None:
+        """
+        读取缓存但不计入指标、不改变访问顺序（用于写入时就地更新已缓存的值）
+
+        Args:
+            key: 键
+
+        Returns:
+            缓存的值，不存在或已过期时返回 None
+        """
+        return self._lookup(key)
+
+    def set(self, key: K, value: V) -> None:
+        """
+        写入缓存并重新计算过期时间，超出容量时淘汰最久未访问的条目
+
+        Args:
+            key: 键
+            value: 值
+        """
+        if self.max_size <= 0:
+            return
+        self._entries[key] = (self._clock() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        """
+        删除缓存条目（数据已变化时调用）
+
+        Args:
+            key: 键
+        """
+        if self._entries.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """清空缓存（不重置指标）"""
+        self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        """获取指标快照"""
+        return CacheStats(
+            name=self.name,
+            size=len(self._entries),
+            max_size=self.max_size,
+            ttl_seconds=self.ttl_seconds,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            expirations=self.expirations,
+            invalidations=self.invalidations,
+        )
+
+    def _lookup(self, key: K) -> V | None:
+        """查找未过期的条目，顺带删除已过期的条目"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        return value
+
+
+# 已登记的缓存（名称 -> 缓存）
+_caches: dict[str, TTLCache] = {}
+
+
+def register_cache[C: TTLCache](cache: C) -> C:
+    """
+    登记缓存，使其指标出现在 get_cache_stats 中
+
+    Args:
+        cache: 缓存
+
+    Returns:
+        传入的缓存（便于在模块级赋值时直接调用）
+    """
+    _caches[cache.name] = cache
+    return cache
+
+
+def get_cache_stats() -> list[CacheStats]:
+    """获取所有已登记缓存的指标快照（按名称排序）"""
+    return [_caches[name].stats() for name in sorted(_caches)]
+
+
+class SessionInvalidator[T]:
+    """
+    跟随数据库事务的缓存失效
+
+    写入时调用 defer：立即失效，会话提交后再失效一次（覆盖提交前开始、提交后才写入缓存的并发读取），
+    会话回滚时丢弃待失效记录（或交给 on_rollback 处理）。每次失效都会增加 generation，
+    读取前后 generation 不一致说明读取期间有变更，调用方不应缓存读取结果。
+    """
+
+    def __init__(
+        self,
+        name: str,
+        on_invalidate: Callable[[T], None],
+        *,
+        on_rollback: Callable[[T], None] | None = None,
+    ) -> None:
+        """
+        Args:
+            name: 名称（会话 info 中待失效记录的键）
+            on_invalidate: 执行失效的回调（立即失效和提交后再次失效时调用）
+            on_rollback: 回滚时对待失效记录调用的回调，默认直接丢弃
+        """
+        self.name = name
+        self.generation = 0
+        self._on_invalidate = on_invalidate
+        self._on_rollback = on_rollback
+        event.listen(Session, "after_commit", self._after_commit)
+        event.listen(Session, "after_rollback", self._after_rollback)
+
+    def invalidate(self, item: T) -> None:
+        """
+        立即失效（不跟随事务）
+
+        Args:
+            item: 失效的对象（如用户 ID）
+        """
+        self.generation += 1
+        self._on_invalidate(item)
+
+    def defer(self, db: AsyncSession | Session, item: T) -> None:
+        """
+        立即失效，并在会话提交后再失效一次
+
+        Args:
+            db: 执行写入的数据库会话
+            item: 失效的对象
+        """
+        self.invalidate(item)
+        db.info.setdefault(self.name, []).append(item)
+
+    def _after_commit(self, session: Session) -> None:
+        """会话提交后再次失效本事务内记录的对象"""
+        for item in session.info.pop(self.name, ()):
+            self.invalidate(item)
+
+    def _after_rollback(self, session: Session) -> None:
+        """会话回滚后数据未变，丢弃待失效记录"""
+        for item in session.info.pop(self.name, ()):
+            if self._on_rollback is not None:
+                self._on_rollback(item)
@@ -1,21 +1,181 @@
+"""
+数据库连接管理
+
+支持 SQLite（sqlite+aiosqlite://）和 PostgreSQL（postgresql+asyncpg://，需安装 postgres 可选依赖）。
+
+- 连接池：池大小、溢出、回收和等待超时由 DATABASE_POOL_* 配置；asyncpg 连接按
+  DATABASE_STATEMENT_CACHE_SIZE 缓存预编译语句
+- SQLite 生产模式：SQLite 文件数据库开启 SQLITE_TUNED 时，写入经单个写连接串行执行并批量提交，
+  读取使用只读连接池（见 app.core.sqlite）
+- 只读副本：配置 DATABASE_READ_REPLICA_URL 后，市场浏览、导出等只读接口通过 get_read_db 读取副本，
+  未配置时读取主库
+- 指标：各连接池的占用、溢出、签出等待耗时和超时次数，通过 GET /admin/db-pools 查看
+"""
+
+import time
 from collections.abc import AsyncGenerator
+from dataclasses import dataclass
 from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import URL, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection, QueuePool
 
 from app.core.config import settings
+from app.core.sqlite import SQLiteSession, SQLiteWriter, configure_reader_engine, configure_writer_engine
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """记录签出次数、等待耗时和超时次数的连接池"""
+
+    def __init__(self, creator: Any, pool_size: int = 5, max_overflow: int = 10, **kwargs: Any) -> None:
+        super().__init__(creator, pool_size=pool_size, max_overflow=max_overflow, **kwargs)
+        self.overflow_limit = max_overflow
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        wait = time.perf_counter() - started
+        self.checkouts += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        return connection
+
+
+@dataclass(frozen=True, slots=True)
+class PoolStats:
+    """连接池指标快照"""
+
+    name: str
+    backend: str
+    pool_size: int
+    max_overflow: int
+    checked_out: int
+    overflow: int
+    saturation: float
+    checkouts: int
+    timeouts: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+def is_sqlite_file(url: URL) -> bool:
+    """是否为 SQLite 文件数据库"""
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def engine_options(url: URL) -> dict[str, Any]:
+    """
+    按数据库类型生成 create_async_engine 的参数
+
+    Args:
+        url: 数据库 URL
+
+    Returns:
+        引擎参数
+    """
+    options: dict[str, Any] = {"echo": settings.DATABASE_ECHO, "pool_pre_ping": True}
+    if url.get_backend_name() == "sqlite" and not is_sqlite_file(url):
+        # 内存数据库只能使用单个连接，保留 SQLAlchemy 默认的连接池
+        return options
+
+    options.update(
+        poolclass=MeteredQueuePool,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    )
+    if url.get_driver_name() == "asyncpg":
+        options["connect_args"] = {"prepared_statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE}
+    return options
+
 
-# 创建异步引擎
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,  # 开发环境打印SQL，生产环境应设为False
-    future=True,
-    pool_pre_ping=True,
+def create_database_engine(url: str) -> AsyncEngine:
+    """
+    创建异步数据库引擎
+
+    Args:
+        url: 数据库 URL
+
+    Returns:
+        异步引擎
+    """
+    parsed = make_url(url)
+    return create_async_engine(parsed, **engine_options(parsed))
+
+
+def create_sqlite_engines(url: str) -> tuple[AsyncEngine, AsyncEngine]:
+    """
+    创建 SQLite 生产模式的写连接引擎（单个连接）和只读连接池引擎
+
+    Args:
+        url: SQLite 文件数据库 URL
+
+    Returns:
+        (写连接引擎, 只读连接池引擎) 元组
+    """
+    parsed = make_url(url)
+    options = {
+        "echo": settings.DATABASE_ECHO,
+        "poolclass": MeteredQueuePool,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+    }
+    writer = create_async_engine(parsed, pool_size=1, max_overflow=0, **options)
+    reader = create_async_engine(
+        parsed, pool_size=settings.SQLITE_READ_POOL_SIZE, max_overflow=settings.DATABASE_MAX_OVERFLOW, **options
+    )
+    configure_writer_engine(writer)
+    configure_reader_engine(reader)
+    return writer, reader
+
+
+# 主库引擎，读写接口和后台任务使用；SQLite 生产模式下为写连接引擎
+# primary_read_engine 为主库上的只读引擎，SQLite 生产模式下为只读连接池，否则即主库引擎
+sqlite_writer: SQLiteWriter | None = None
+AsyncSessionLocal: async_sessionmaker[AsyncSession]
+if settings.SQLITE_TUNED and is_sqlite_file(make_url(settings.DATABASE_URL)):
+    engine, primary_read_engine = create_sqlite_engines(settings.DATABASE_URL)
+    sqlite_writer = SQLiteWriter(
+        engine, batch_size=settings.SQLITE_WRITE_BATCH_SIZE, timeout=settings.DATABASE_POOL_TIMEOUT
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        primary_read_engine,
+        class_=SQLiteSession,
+        expire_on_commit=False,
+        autoflush=False,
+        writer=sqlite_writer,
+        reader=primary_read_engine,
+    )
+else:
+    engine = primary_read_engine = create_database_engine(settings.DATABASE_URL)
+    AsyncSessionLocal = async_sessionmaker(
+        engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+# 只读接口使用的引擎：配置了只读副本时为副本
+read_engine = (
+    create_database_engine(settings.DATABASE_READ_REPLICA_URL)
+    if settings.DATABASE_READ_REPLICA_URL
+    else primary_read_engine
 )
 
-# 创建异步会话工厂
-AsyncSessionLocal = async_sessionmaker(
-    engine,
+# 只读会话工厂
+ReadSessionLocal = async_sessionmaker(
+    read_engine,
     class_=AsyncSession,
     expire_on_commit=False,
     autocommit=False,
@@ -46,6 +206,17 @@ async def get_db() -> AsyncGenerator[AsyncSession, Any]:
             await session.close()
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, Any]:
+    """
+    依赖注入函数，用于获取只读数据库会话
+
+    配置了只读副本时连接副本（可能略落后于主库），否则连接主库。会话不提交，
+    需要写入的操作（如下载计数）应使用 get_db 的会话。
+    """
+    async with ReadSessionLocal() as session:
+        yield session
+
+
 async def init_db() -> None:
     """初始化数据库，创建所有表"""
     from app.models.base import Base
@@ -55,6 +226,49 @@ async def init_db() -> None:
         await conn.run_sync(Base.metadata.create_all)
 
 
+def _named_engines() -> dict[str, AsyncEngine]:
+    """按名称列出所有引擎（primary 主库，reader SQLite 只读连接池，replica 只读副本）"""
+    engines = {"primary": engine}
+    if primary_read_engine is not engine:
+        engines["reader"] = primary_read_engine
+    if read_engine is not primary_read_engine:
+        engines["replica"] = read_engine
+    return engines
+
+
 async def close_db() -> None:
     """关闭数据库连接"""
-    await engine.dispose()
+    if sqlite_writer is not None:
+        await sqlite_writer.close()
+    for item in _named_engines().values():
+        await item.dispose()
+
+
+def get_pool_stats() -> list[PoolStats]:
+    """返回各引擎连接池的当前指标"""
+    stats = []
+    for name, item in _named_engines().items():
+        pool = item.pool
+        pool_size = checked_out = overflow = max_overflow = 0
+        if isinstance(pool, QueuePool):
+            pool_size, checked_out = pool.size(), pool.checkedout()
+            overflow = max(0, pool.overflow())
+            max_overflow = max(0, getattr(pool, "overflow_limit", 0))
+        checkouts = getattr(pool, "checkouts", 0)
+        capacity = pool_size + max_overflow
+        stats.append(
+            PoolStats(
+                name=name,
+                backend=item.url.get_backend_name(),
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                checked_out=checked_out,
+                overflow=overflow,
+                saturation=checked_out / capacity if capacity else 0.0,
+                checkouts=checkouts,
+                timeouts=getattr(pool, "timeouts", 0),
+                avg_wait_ms=getattr(pool, "total_wait", 0.0) * 1000 / (checkouts or 1),
+                max_wait_ms=getattr(pool, "max_wait", 0.0) * 1000,
+            )
+        )
+    return stats
@@ -11,7 +11,8 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
+from app.core.principal import Principal, principal_cache
 from app.core.security import verify_access_token
 from app.models.user import User
 
@@ -19,23 +20,25 @@ from app.models.user import User
 security = HTTPBearer()
 
 # 类型别名
-DBSession = Annotated[AsyncSession, Depends(get_db)]
+# 读写会话在路由函数返回后、发送响应前提交并关闭，SQLite 生产模式下写连接不会被持有到响应发送完毕
+DBSession = Annotated[AsyncSession, Depends(get_db, scope="function")]
+ReadDBSession = Annotated[AsyncSession, Depends(get_read_db)]
 TokenCredentials = Annotated[HTTPAuthorizationCredentials, Depends(security)]
 
 
 async def get_current_user(
     db: DBSession,
     credentials: TokenCredentials,
-) -> User:
+) -> Principal:
     """
-    获取当前登录用户
+    获取当前登录用户的身份（按用户 ID 缓存，命中时不查询数据库）
 
     Args:
         db: 数据库会话
         credentials: Token 凭证
 
     Returns:
-        User: 当前用户对象
+        Principal: 当前用户身份
 
     Raises:
         HTTPException: 认证失败时抛出 401 错误
@@ -50,25 +53,51 @@ async def get_current_user(
     token = credentials.credentials
     user_id = verify_access_token(token, credentials_exception)
 
-    # 从数据库获取用户
-    result = await db.execute(select(User).where(User.id == user_id, User.deleted_at.is_(None)))
-    user = result.scalar_one_or_none()
+    principal = await principal_cache.get(db, user_id)
 
-    if user is None:
+    if principal is None:
         raise credentials_exception
 
-    if not user.is_active:
+    if not principal.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="用户已被禁用",
         )
 
+    return principal
+
+
+async def get_current_user_model(
+    db: DBSession,
+    current_user: Annotated[Principal, Depends(get_current_user)],
+) -> User:
+    """
+    获取当前登录用户的完整记录（需要读写用户其他字段的接口使用）
+
+    Args:
+        db: 数据库会话
+        current_user: 当前用户身份
+
+    Returns:
+        User: 当前用户对象
+
+    Raises:
+        HTTPException: 用户已不存在时抛出 401 错误
+    """
+    result = await db.execute(select(User).where(User.id == current_user.id, User.deleted_at.is_(None)))
+    user = result.scalar_one_or_none()
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="认证失败，请重新登录",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
 async def get_current_active_user(
-    current_user: Annotated[User, Depends(get_current_user)],
-) -> User:
+    current_user: Annotated[Principal, Depends(get_current_user)],
+) -> Principal:
     """
     获取当前激活的用户
 
@@ -76,7 +105,7 @@ async def get_current_active_user(
         current_user: 当前用户
 
     Returns:
-        User: 当前用户对象
+        Principal: 当前用户身份
 
     Raises:
         HTTPException: 用户未激活时抛出 403 错误
@@ -90,8 +119,8 @@ async def get_current_active_user(
 
 
 async def get_current_superuser(
-    current_user: Annotated[User, Depends(get_current_active_user)],
-) -> User:
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
+) -> Principal:
     """
     获取当前超级管理员用户
 
@@ -99,7 +128,7 @@ async def get_current_superuser(
         current_user: 当前用户
 
     Returns:
-        User: 当前用户对象
+        Principal: 当前用户身份
 
     Raises:
         HTTPException: 用户不是超级管理员时抛出 403 错误
@@ -113,6 +142,7 @@ async def get_current_superuser(
 
 
 # 类型别名（用于路由中）
-CurrentUser = Annotated[User, Depends(get_current_user)]
-CurrentActiveUser = Annotated[User, Depends(get_current_active_user)]
-CurrentSuperUser = Annotated[User, Depends(get_current_superuser)]
+CurrentUser = Annotated[Principal, Depends(get_current_user)]
+CurrentUserModel = Annotated[User, Depends(get_current_user_model)]
+CurrentActiveUser = Annotated[Principal, Depends(get_current_active_user)]
+CurrentSuperUser = Annotated[Principal, Depends(get_current_superuser)]
@@ -63,6 +63,13 @@ class ConflictException(AppException):
         super().__init__(code=409, msg=msg, detail=detail)
 
 
+class TooManyRequestsException(AppException):
+    """请求过多异常"""
+
+    def __init__(self, msg: str = "请求过多，请稍后重试", detail: Any = None):
+        super().__init__(code=429, msg=msg, detail=detail)
+
+
 def create_error_response(
     code: int,
     msg: str,
@@ -0,0 +1,262 @@
+"""
+进程内后台任务队列
+
+耗时操作以 Job 记录持久化后交给固定数量的 worker 协程执行，
+HTTP 请求只负责提交任务并立即返回任务 ID。
+
+- 并发：worker 数量由 JOB_WORKER_CONCURRENCY 决定
+- 进度：保存在内存中，任务结束时写回数据库（避免执行中额外的写事务）
+- 取消：未开始的任务直接取消；执行中的任务在处理函数检查点协作式退出
+- 恢复：启动时把上次中断的 running 任务重新排队，超过最大次数则标记失败
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any, cast
+
+from loguru import logger
+from sqlalchemy import CursorResult, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.exceptions import AppException
+from app.models.job import Job
+
+# 任务状态
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+# 已结束的任务状态
+JOB_FINISHED_STATUSES = frozenset({JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED})
+
+
+class JobCancelledError(Exception):
+    """任务被取消（由处理函数在检查点抛出）"""
+
+
+class JobContext:
+    """任务执行上下文，传递给任务处理函数"""
+
+    def __init__(self, queue: "JobQueue", job: Job, db: AsyncSession):
+        self._queue = queue
+        self.job_id = job.id
+        self.user_id = job.user_id
+        self.payload: dict[str, Any] = job.payload
+        self.db = db
+
+    def set_progress(self, done: int, total: int | None = None) -> None:
+        """
+        更新任务进度
+
+        Args:
+            done: 已完成数量
+            total: 总数量
+        """
+        self._queue.progress[self.job_id] = (done, total)
+
+    def check_cancelled(self) -> None:
+        """
+        检查任务是否已被请求取消
+
+        Raises:
+            JobCancelledError: 任务已被请求取消
+        """
+        if self.job_id in self._queue.cancel_requested:
+            raise JobCancelledError
+
+
+JobHandler = Callable[[JobContext], Awaitable[dict[str, Any] | None]]
+
+
+class JobQueue:
+    """进程内后台任务队列"""
+
+    def __init__(self) -> None:
+        self.session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal
+        self.progress: dict[str, tuple[int, int | None]] = {}
+        self.cancel_requested: set[str] = set()
+        self._handlers: dict[str, JobHandler] = {}
+        self._queue: asyncio.Queue[str] | None = None
+        self._workers: list[asyncio.Task[None]] = []
+
+    def register(self, job_type: str, handler: JobHandler) -> None:
+        """
+        注册任务处理函数
+
+        Args:
+            job_type: 任务类型
+            handler: 处理函数，返回值作为任务结果保存
+        """
+        self._handlers[job_type] = handler
+
+    def has_handler(self, job_type: str) -> bool:
+        """是否已注册该类型的处理函数"""
+        return job_type in self._handlers
+
+    @property
+    def is_running(self) -> bool:
+        """worker 是否已启动"""
+        return bool(self._workers)
+
+    async def start(self) -> int:
+        """
+        恢复未完成的任务并启动 worker
+
+        Returns:
+            重新排队的任务数
+        """
+        self._queue = asyncio.Queue()
+        job_ids = await self._recover()
+        for job_id in job_ids:
+            self._queue.put_nowait(job_id)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}")
+            for i in range(max(settings.JOB_WORKER_CONCURRENCY, 1))
+        ]
+        return len(job_ids)
+
+    async def stop(self) -> None:
+        """停止所有 worker，执行中的任务保持 running 状态，下次启动时恢复"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        self.progress.clear()
+        self.cancel_requested.clear()
+
+    def submit(self, job_id: str) -> None:
+        """
+        提交已持久化的任务
+
+        队列未启动时任务保持 pending，启动时会被恢复执行。
+
+        Args:
+            job_id: 任务 ID
+        """
+        if self._queue is not None:
+            self._queue.put_nowait(job_id)
+
+    def request_cancel(self, job_id: str) -> None:
+        """
+        请求取消任务（执行中的任务在下一个检查点退出）
+
+        Args:
+            job_id: 任务 ID
+        """
+        self.cancel_requested.add(job_id)
+
+    async def _recover(self) -> list[str]:
+        """
+        处理上次运行遗留的未完成任务
+
+        Returns:
+            需要重新执行的任务 ID（按创建时间排序）
+        """
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(Job)
+                .where(Job.status.in_([JOB_PENDING, JOB_RUNNING]), Job.deleted_at.is_(None))
+                .order_by(Job.created_at, Job.id)
+            )
+            job_ids = []
+            for job in result.scalars():
+                if job.cancel_requested:
+                    job.status = JOB_CANCELLED
+                    job.finished_at = func.now()
+                elif job.status == JOB_RUNNING and job.attempts >= settings.JOB_MAX_ATTEMPTS:
+                    job.status = JOB_FAILED
+                    job.error = "任务执行中断，已达到最大执行次数"
+                    job.finished_at = func.now()
+                else:
+                    if job.status == JOB_RUNNING:
+                        logger.warning(f"恢复中断的后台任务: {job.id} ({job.type})")
+                    job.status = JOB_PENDING
+                    job_ids.append(job.id)
+            await db.commit()
+        return job_ids
+
+    async def _worker(self) -> None:
+        """worker 主循环"""
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            job_id = await queue.get()
+            try:
+                await self._run(job_id)
+            except Exception:
+                logger.exception(f"后台任务执行异常: {job_id}")
+            finally:
+                self.progress.pop(job_id, None)
+                self.cancel_requested.discard(job_id)
+                queue.task_done()
+
+    async def _run(self, job_id: str) -> None:
+        """
+        执行单个任务并记录结果
+
+        Args:
+            job_id: 任务 ID
+        """
+        async with self.session_factory() as db:
+            job = await db.get(Job, job_id)
+            if job is None or job.status != JOB_PENDING:
+                return
+
+            handler = self._handlers.get(job.type)
+            if job.cancel_requested or job_id in self.cancel_requested:
+                job.status = JOB_CANCELLED
+            elif handler is None:
+                job.status = JOB_FAILED
+                job.error = f"未知的任务类型: {job.type}"
+            if job.status != JOB_PENDING:
+                job.finished_at = func.now()
+                await db.commit()
+                return
+
+            # 条件更新认领任务：读取之后被取消（已提交 cancelled 或 cancel_requested）时不再执行，
+            # 避免覆盖取消接口写入的状态
+            claimed = await db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == JOB_PENDING, Job.cancel_requested.is_(False))
+                .values(status=JOB_RUNNING, attempts=Job.attempts + 1, started_at=func.now())
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+            if cast(CursorResult[Any], claimed).rowcount == 0:
+                return
+            await db.refresh(job)
+
+            assert handler is not None
+            status, result, error = JOB_SUCCEEDED, None, None
+            try:
+                result = await handler(JobContext(self, job, db))
+                await db.commit()
+            except JobCancelledError:
+                status = JOB_CANCELLED
+            except AppException as e:
+                status, error = JOB_FAILED, e.msg
+            except Exception as e:
+                logger.exception(f"后台任务失败: {job_id} ({job.type})")
+                status, error = JOB_FAILED, str(e) or type(e).__name__
+
+            if status != JOB_SUCCEEDED:
+                await db.rollback()
+                await db.refresh(job)
+
+            progress = self.progress.get(job_id)
+            if progress is not None:
+                job.progress_done, job.progress_total = progress
+            job.status = status
+            job.result = result
+            job.error = error
+            job.finished_at = func.now()
+            await db.commit()
+
+
+# 全局任务队列
+job_queue = JobQueue()
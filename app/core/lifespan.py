@@ -4,13 +4,18 @@
 管理应用启动和关闭时的资源初始化和清理
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from loguru import logger
 
 from app.core.database import AsyncSessionLocal, close_db, init_db
+from app.core.jobs import job_queue
+from app.core.password import password_hasher
 from app.core.seed_data import init_builtin_note_models
+from app.services.download_counter import download_counter
+from app.services.job_handlers import register_job_handlers
 
 
 @asynccontextmanager
@@ -22,8 +27,13 @@ async def lifespan(app: FastAPI):
     - 初始化数据库连接
     - 创建数据库表（开发环境）
     - 初始化内置模板
+    - 启动后台任务 worker（恢复上次中断的任务）
+    - 启动下载计数的定期写入
 
     关闭时:
+    - 停止后台任务 worker
+    - 写入剩余的下载计数
+    - 关闭密码哈希线程池
     - 关闭数据库连接
     - 清理资源
     """
@@ -42,6 +52,14 @@ async def lifespan(app: FastAPI):
                 logger.info(f"✅ 创建了 {created_count} 个内置模板")
             else:
                 logger.info("✅ 内置模板已存在")
+
+        # 启动后台任务队列
+        register_job_handlers(job_queue)
+        recovered_count = await job_queue.start()
+        logger.info(f"✅ 后台任务队列已启动（恢复 {recovered_count} 个未完成任务）")
+
+        # 启动下载计数的定期写入
+        download_counter.start()
     except Exception as e:
         logger.error(f"❌ 初始化失败: {e}")
         raise
@@ -53,6 +71,18 @@ async def lifespan(app: FastAPI):
     # 关闭时
     logger.info("🛑 应用关闭中...")
 
+    await job_queue.stop()
+    logger.info("✅ 后台任务队列已停止")
+
+    try:
+        await download_counter.stop()
+        logger.info("✅ 下载计数已写入")
+    except Exception as e:
+        logger.error(f"❌ 下载计数写入失败: {e}")
+
+    # 等待执行中的哈希完成，放到线程中以免阻塞事件循环
+    await asyncio.to_thread(password_hasher.shutdown)
+
     try:
         await close_db()
         logger.info("✅ 数据库连接已关闭")
@@ -0,0 +1,155 @@
+"""
+密码哈希执行器
+
+bcrypt 每次哈希/校验耗时约 250ms（12 rounds），在事件循环中直接执行会阻塞同一进程内的所有请求。
+这里把哈希和校验提交到有界线程池中执行（bcrypt 计算期间释放 GIL）：
+
+- 并发上限：同时执行的哈希数等于 PASSWORD_HASH_WORKERS，其余请求排队等待
+- 吞吐控制：已提交（含执行中）的请求数达到 PASSWORD_HASH_MAX_PENDING 时直接拒绝（429），
+  避免登录洪峰时排队无限增长
+- 指标：执行中、排队数、峰值排队数、完成数、拒绝数、平均排队和执行耗时，
+  通过 GET /admin/password-hasher 查看（仅反映当前进程）
+"""
+
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from app.core.config import settings
+from app.core.exceptions import TooManyRequestsException
+from app.core.security import BCRYPT_ROUNDS, get_password_hash, needs_rehash, verify_password
+
+
+@dataclass(frozen=True, slots=True)
+class PasswordHasherStats:
+    """密码哈希执行器指标快照"""
+
+    workers: int
+    rounds: int
+    max_pending: int
+    running: int
+    waiting: int
+    peak_waiting: int
+    completed: int
+    rejected: int
+    avg_wait_ms: float
+    avg_run_ms: float
+
+
+class PasswordHasher:
+    """在有界线程池中执行 bcrypt 哈希和校验"""
+
+    def __init__(self, *, workers: int, max_pending: int, rounds: int) -> None:
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = rounds
+        self._executor: ThreadPoolExecutor | None = None
+        # 以下计数只在事件循环线程中读写
+        self._pending = 0
+        self._peak_waiting = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._total_run = 0.0
+
+    async def hash(self, password: str) -> str:
+        """
+        按当前成本因子生成密码哈希
+
+        Args:
+            password: 明文密码
+
+        Returns:
+            密码哈希
+
+        Raises:
+            TooManyRequestsException: 排队的请求数已达上限
+        """
+        return await self._run(get_password_hash, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """
+        校验密码
+
+        Args:
+            password: 明文密码
+            hashed_password: 密码哈希
+
+        Returns:
+            密码是否正确
+
+        Raises:
+            TooManyRequestsException: 排队的请求数已达上限
+        """
+        return await self._run(verify_password, password, hashed_password)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """密码哈希的成本因子与当前配置不一致时需要重新哈希"""
+        return needs_rehash(hashed_password, self.rounds)
+
+    def stats(self) -> PasswordHasherStats:
+        """返回当前指标"""
+        finished = self._completed or 1
+        return PasswordHasherStats(
+            workers=self.workers,
+            rounds=self.rounds,
+            max_pending=self.max_pending,
+            running=min(self._pending, self.workers) if self.workers else 0,
+            waiting=self._waiting(),
+            peak_waiting=self._peak_waiting,
+            completed=self._completed,
+            rejected=self._rejected,
+            avg_wait_ms=self._total_wait * 1000 / finished,
+            avg_run_ms=self._total_run * 1000 / finished,
+        )
+
+    def shutdown(self) -> None:
+        """关闭线程池（再次使用时重新创建）"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def _run[T](self, func: Callable[..., T], *args: object) -> T:
+        """提交到线程池执行并记录指标"""
+        if self.max_pending and self._pending >= self.max_pending:
+            self._rejected += 1
+            raise TooManyRequestsException(msg="服务繁忙，请稍后重试")
+
+        submitted = time.perf_counter()
+        self._pending += 1
+        self._peak_waiting = max(self._peak_waiting, self._waiting())
+        try:
+            if self.workers:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+                loop = asyncio.get_running_loop()
+                result, started, finished = await loop.run_in_executor(self._executor, _timed, func, args)
+            else:
+                result, started, finished = _timed(func, args)
+        finally:
+            self._pending -= 1
+
+        self._completed += 1
+        self._total_wait += started - submitted
+        self._total_run += finished - started
+        return result
+
+    def _waiting(self) -> int:
+        """已提交但尚未开始执行的请求数"""
+        return max(0, self._pending - self.workers) if self.workers else 0
+
+
+def _timed[T](func: Callable[..., T], args: tuple[object, ...]) -> tuple[T, float, float]:
+    """执行函数，返回结果和开始、结束执行的时间"""
+    started = time.perf_counter()
+    result = func(*args)
+    return result, started, time.perf_counter()
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    rounds=BCRYPT_ROUNDS,
+)
@@ -0,0 +1,94 @@
+"""
+已认证用户身份缓存
+
+每个认证请求都要确认 token 中的用户仍然存在且未被禁用。这里按用户 ID 缓存鉴权所需的字段，
+命中时不再查询 users 表。
+
+- 失效：用户更新、禁用、删除和修改密码时由服务层调用 invalidate_principal，由 SessionInvalidator 跟随事务失效
+- 多进程部署时其他进程的变更在 PRINCIPAL_CACHE_TTL 内可能不可见（如禁用用户的最长生效延迟）
+"""
+
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import SessionInvalidator, TTLCache, register_cache
+from app.core.config import settings
+from app.models.user import User
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """已认证的用户身份（鉴权所需的字段）"""
+
+    id: str
+    nickname: str
+    is_active: bool
+    is_superuser: bool
+
+
+class PrincipalCache:
+    """按用户 ID 缓存已认证的用户身份"""
+
+    def __init__(self) -> None:
+        self.cache: TTLCache[str, Principal] = register_cache(
+            TTLCache(
+                "principal",
+                max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+                ttl_seconds=settings.PRINCIPAL_CACHE_TTL,
+            )
+        )
+        self.invalidator: SessionInvalidator[str] = SessionInvalidator("principal_invalidations", self.cache.invalidate)
+
+    async def get(self, db: AsyncSession, user_id: str) -> Principal | None:
+        """
+        获取用户身份，未缓存时查询数据库
+
+        Args:
+            db: 数据库会话
+            user_id: 用户 ID
+
+        Returns:
+            用户身份，用户不存在或已删除时返回 None
+        """
+        principal = self.cache.get(user_id)
+        if principal is not None:
+            return principal
+
+        generation = self.invalidator.generation
+        result = await db.execute(
+            select(User.id, User.nickname, User.is_active, User.is_superuser).where(
+                User.id == user_id, User.deleted_at.is_(None)
+            )
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        principal = Principal(*row)
+        if generation == self.invalidator.generation:
+            self.cache.set(user_id, principal)
+        return principal
+
+    def invalidate(self, user_id: str) -> None:
+        """
+        丢弃用户身份缓存
+
+        Args:
+            user_id: 用户 ID
+        """
+        self.invalidator.invalidate(user_id)
+
+
+principal_cache = PrincipalCache()
+
+
+def invalidate_principal(db: AsyncSession, user_id: str) -> None:
+    """
+    用户信息变更时丢弃其身份缓存，并在会话提交后再次丢弃
+
+    Args:
+        db: 执行变更的数据库会话
+        user_id: 用户 ID
+    """
+    principal_cache.invalidator.defer(db, user_id)
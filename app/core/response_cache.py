@@ -0,0 +1,217 @@
+"""
+公开接口响应缓存
+
+牌组市场的浏览接口（列表、详情、下载信息）对所有用户返回相同的内容且读多写少。这里缓存序列化后的
+响应字节，命中时不再查询数据库和经 pydantic 序列化，并输出 HTTP 缓存头供 nginx 和浏览器缓存：
+
+- 键：请求路径 + 规范化的查询参数（由解析后的查询模型生成，参数顺序、默认值写法和未知参数不影响键）
+- 淘汰：LRU + TTL（MARKET_CACHE_MAX_SIZE / MARKET_CACHE_TTL）
+- 失效：SharedDeckService 的写操作调用 invalidate_market_cache，由 SessionInvalidator 跟随事务清空
+- HTTP 缓存头：ETag 为响应字节的哈希，Cache-Control 默认为 public, max-age=MARKET_CACHE_MAX_AGE；
+  单个资源另带 Last-Modified。If-None-Match 命中时返回 304，未带 If-None-Match 时按 If-Modified-Since 判断
+  （只对带 Last-Modified 的响应）。列表不带 Last-Modified：删除、下架、排序和下载次数的变化都不会体现在
+  列表项的最近更新时间上，只能依赖 ETag
+- 下载次数写入数据库后不会使缓存失效，最多在 MARKET_CACHE_TTL 后更新；多进程部署时各进程各自缓存
+"""
+
+import hashlib
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import SessionInvalidator, TTLCache, register_cache
+from app.core.config import settings
+
+
+@dataclass(frozen=True, slots=True)
+class CacheableContent:
+    """待缓存的响应内容"""
+
+    model: BaseModel
+    last_modified: datetime | None = None
+    # 响应对应的资源 ID，每次返回响应体时传给 on_served（如记录下载）
+    subject_id: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    """缓存的响应"""
+
+    body: bytes
+    etag: str
+    last_modified: datetime | None
+    subject_id: str | None
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    判断 If-None-Match 请求头是否命中给定 ETag（弱比较）
+
+    Args:
+        if_none_match: If-None-Match 请求头
+        etag: 当前 ETag
+
+    Returns:
+        是否命中
+    """
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def accepts_encoding(accept_encoding: str | None, coding: str) -> bool:
+    """
+    判断 Accept-Encoding 请求头是否接受给定内容编码
+
+    按 q 值判断：显式列出的编码以其 q 值为准，未列出时取 ``*`` 的 q 值，q=0 表示不接受。
+    未带请求头时视为不接受（只返回未编码的内容）。
+
+    Args:
+        accept_encoding: Accept-Encoding 请求头
+        coding: 内容编码，如 gzip
+
+    Returns:
+        是否接受
+    """
+    qvalues: dict[str, float] = {}
+    for item in (accept_encoding or "").split(","):
+        name, *params = (part.strip() for part in item.split(";"))
+        if not name:
+            continue
+        q = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qvalues[name.lower()] = q
+    q = qvalues.get(coding, qvalues.get("*", 0.0))
+    return q > 0
+
+
+def _not_modified_since(if_modified_since: str | None, last_modified: datetime | None) -> bool:
+    """判断 If-Modified-Since 请求头是否不早于内容的最近更新时间"""
+    if not if_modified_since or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    return _as_utc(last_modified).replace(microsecond=0) <= since
+
+
+def _as_utc(value: datetime) -> datetime:
+    """数据库中的时间为不带时区的 UTC 时间"""
+    return value if value.tzinfo is not None else value.replace(tzinfo=UTC)
+
+
+class ResponseCache:
+    """按请求路径和规范化查询参数缓存公开接口的响应"""
+
+    def __init__(self, name: str, *, max_size: int, ttl_seconds: float, max_age: int) -> None:
+        """
+        Args:
+            name: 缓存名称（用于指标）
+            max_size: 最多缓存的响应数
+            ttl_seconds: 服务端缓存有效期（秒）
+            max_age: 允许 nginx 和浏览器缓存的时间（秒）
+        """
+        self.cache: TTLCache[str, CachedResponse] = register_cache(
+            TTLCache(name, max_size=max_size, ttl_seconds=ttl_seconds)
+        )
+        self.max_age = max_age
+        self.invalidator: SessionInvalidator[None] = SessionInvalidator(f"{name}_invalidations", self._clear)
+
+    async def respond(
+        self,
+        request: Request,
+        build: Callable[[], Awaitable[CacheableContent]],
+        *params: BaseModel,
+        on_served: Callable[[str], None] | None = None,
+        cache_control: str | None = None,
+    ) -> Response:
+        """
+        返回缓存的响应，未缓存时调用 build 生成
+
+        Args:
+            request: 当前请求
+            build: 生成响应内容的协程函数
+            params: 解析后的查询参数模型（参与缓存键）
+            on_served: 返回响应体（非 304）时以内容的 subject_id 调用
+            cache_control: Cache-Control 响应头，默认允许共享缓存缓存 max_age 秒
+
+        Returns:
+            200 响应，或条件请求命中时的 304 响应
+        """
+        key = self._key(request.url.path, params)
+        cached = self.cache.get(key)
+        if cached is None:
+            generation = self.invalidator.generation
+            content = await build()
+            body = content.model.model_dump_json().encode()
+            cached = CachedResponse(
+                body=body,
+                etag=f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+                last_modified=content.last_modified,
+                subject_id=content.subject_id,
+            )
+            if generation == self.invalidator.generation:
+                self.cache.set(key, cached)
+
+        headers = {"ETag": cached.etag, "Cache-Control": cache_control or f"public, max-age={self.max_age}"}
+        if cached.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(_as_utc(cached.last_modified), usegmt=True)
+
+        if_none_match = request.headers.get("if-none-match")
+        if etag_matches(if_none_match, cached.etag) or (
+            if_none_match is None
+            and _not_modified_since(request.headers.get("if-modified-since"), cached.last_modified)
+        ):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        if on_served is not None and cached.subject_id is not None:
+            on_served(cached.subject_id)
+        return Response(cached.body, media_type="application/json", headers=headers)
+
+    def invalidate(self) -> None:
+        """清空所有缓存的响应"""
+        self.invalidator.invalidate(None)
+
+    def _clear(self, _: None) -> None:
+        """SessionInvalidator 的失效回调"""
+        self.cache.clear()
+
+    @staticmethod
+    def _key(path: str, params: tuple[BaseModel, ...]) -> str:
+        """由路径和查询参数模型生成缓存键"""
+        parts = [path]
+        for model in params:
+            parts.extend(f"{name}={value}" for name, value in sorted(model.model_dump(mode="json").items()))
+        return "&".join(parts)
+
+
+market_response_cache = ResponseCache(
+    "market_response",
+    max_size=settings.MARKET_CACHE_MAX_SIZE,
+    ttl_seconds=settings.MARKET_CACHE_TTL,
+    max_age=settings.MARKET_CACHE_MAX_AGE,
+)
+
+
+def invalidate_market_cache(db: AsyncSession) -> None:
+    """
+    共享牌组变更时清空市场响应缓存，并在会话提交后再次清空
+
+    Args:
+        db: 执行变更的数据库会话
+    """
+    market_response_cache.invalidator.defer(db, None)
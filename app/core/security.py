@@ -20,12 +20,12 @@ ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
 
 # bcrypt rounds - 测试环境使用更少的rounds以提高速度
-_BCRYPT_ROUNDS = 4 if os.getenv("TESTING") == "1" else 12
+BCRYPT_ROUNDS = 4 if os.getenv("TESTING") == "1" else settings.BCRYPT_ROUNDS
 
 
-def get_password_hash(password: str) -> str:
+def get_password_hash(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
     """使用 bcrypt 生成密码哈希"""
-    salt = bcrypt.gensalt(rounds=_BCRYPT_ROUNDS)
+    salt = bcrypt.gensalt(rounds=rounds)
     hashed: bytes = bcrypt.hashpw(password.encode("utf-8"), salt)
     return hashed.decode("utf-8")
 
@@ -36,6 +36,12 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return result
 
 
+def needs_rehash(hashed_password: str, rounds: int = BCRYPT_ROUNDS) -> bool:
+    """密码哈希的成本因子与配置不一致时需要重新哈希（哈希格式为 $2b$<rounds>$...）"""
+    parts = hashed_password.split("$")
+    return len(parts) < 4 or not parts[2].isdigit() or int(parts[2]) != rounds
+
+
 def get_token_hash(token: str) -> str:
     """返回给定Token的哈希值"""
     return hashlib.sha256(token.encode("utf-8")).hexdigest()
@@ -0,0 +1,298 @@
+"""
+SQLite 生产模式
+
+SQLite 同一时刻只允许一个写事务，多个连接并发写入时在文件锁上竞争，等待超过 busy_timeout 后报
+"database is locked"。DATABASE_URL 为 SQLite 文件数据库且开启 SQLITE_TUNED 时：
+
+- 连接建立时设置 WAL、synchronous、mmap_size、cache_size 和 busy_timeout
+- 读取使用只读连接池（PRAGMA query_only），WAL 模式下读取不阻塞写入
+- 写入经唯一的写连接串行执行：会话第一次写入（flush、执行 INSERT/UPDATE/DELETE、非查询的 text() 语句，
+  或为后续写入加锁的 SELECT ... FOR UPDATE）时获取写连接，
+  此后该会话的所有语句都在写连接上执行（能读到自己的写入），提交、回滚或关闭时释放；
+  请求的读写会话在路由函数返回后即提交（DBSession 依赖的 scope 为 function），不等响应发送完毕
+- 批量提交：各会话的写入是写连接外层事务中的一个 SAVEPOINT，会话提交时只释放 SAVEPOINT；
+  没有其他会话等待写连接，或已合并 SQLITE_WRITE_BATCH_SIZE 个会话时才提交外层事务。
+  会话的 commit() 在外层事务提交后返回，某个会话回滚只撤销它自己的 SAVEPOINT
+
+同一个任务中，持有写连接的会话提交前不要用另一个会话写入，否则会一直等待到 DATABASE_POOL_TIMEOUT。
+"""
+
+import asyncio
+import re
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Connection, Engine, Select, TextClause, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.util import await_only
+
+from app.core.config import settings
+
+# 只读的原生 SQL（其余 text() 语句按写入处理）
+_READ_ONLY_SQL = re.compile(r"\s*(SELECT|EXPLAIN)\b", re.IGNORECASE)
+
+
+def _set_pragmas(dbapi_connection: Any, *, read_only: bool) -> None:
+    """为新连接设置 pragma"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE}")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT}")
+    if read_only:
+        cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+
+def configure_writer_engine(engine: AsyncEngine) -> None:
+    """
+    配置写连接引擎：设置 pragma，由 SQLAlchemy 控制事务并以 BEGIN IMMEDIATE 开始事务
+
+    关闭驱动自带的隐式事务后 SAVEPOINT 才能正常工作；BEGIN IMMEDIATE 在事务开始时即获取写锁，
+    多进程部署时由 busy_timeout 等待其他进程的写事务，不会在事务中途升级锁失败。
+
+    Args:
+        engine: 写连接引擎
+    """
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _connect(dbapi_connection: Any, _connection_record: Any) -> None:
+        _set_pragmas(dbapi_connection, read_only=False)
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin(conn: Connection) -> None:
+        conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def configure_reader_engine(engine: AsyncEngine) -> None:
+    """
+    配置只读连接池引擎：设置 pragma 并禁止写入
+
+    Args:
+        engine: 只读连接池引擎
+    """
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _connect(dbapi_connection: Any, _connection_record: Any) -> None:
+        _set_pragmas(dbapi_connection, read_only=True)
+
+
+@dataclass(frozen=True, slots=True)
+class SQLiteWriterStats:
+    """写连接指标快照"""
+
+    batch_size: int
+    waiting: int
+    leases: int
+    commits: int
+    committed_sessions: int
+    avg_batch: float
+    timeouts: int
+    avg_wait_ms: float
+
+
+class SQLiteWriter:
+    """唯一的写连接，串行执行各会话的写入并按批提交"""
+
+    def __init__(self, engine: AsyncEngine, *, batch_size: int, timeout: float) -> None:
+        self.engine = engine
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._lock = asyncio.Lock()
+        self._connection: AsyncConnection | None = None
+        # 已释放 SAVEPOINT、等待外层事务提交的会话
+        self._batch: list[asyncio.Future[None]] = []
+        self._waiting = 0
+        self._leases = 0
+        self._commits = 0
+        self._committed_sessions = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+
+    async def acquire(self) -> Connection:
+        """
+        获取写连接（开启外层事务），其他会话持有时排队等待
+
+        Returns:
+            处于外层事务中的同步连接
+
+        Raises:
+            TimeoutError: 等待超过 timeout 秒（sqlalchemy.exc.TimeoutError）
+        """
+        started = time.perf_counter()
+        self._waiting += 1
+        try:
+            async with asyncio.timeout(self.timeout):
+                await self._lock.acquire()
+        except TimeoutError as e:
+            self._timeouts += 1
+            raise PoolTimeoutError(f"等待 SQLite 写连接超时（{self.timeout}s）") from e
+        finally:
+            self._waiting -= 1
+        self._leases += 1
+        self._total_wait += time.perf_counter() - started
+
+        try:
+            if self._connection is None:
+                self._connection = await self.engine.connect()
+            if not self._connection.in_transaction():
+                await self._connection.begin()
+        except BaseException:
+            await self._discard()
+            self._lock.release()
+            raise
+        assert self._connection.sync_connection is not None
+        return self._connection.sync_connection
+
+    async def release(self, *, wait: bool) -> None:
+        """
+        释放写连接，必要时提交外层事务
+
+        Args:
+            wait: 是否等待本会话的写入随外层事务提交（会话提交时为 True）
+
+        Raises:
+            Exception: 外层事务提交失败（仅 wait 为 True 时抛出）
+        """
+        future: asyncio.Future[None] | None = None
+        if wait:
+            future = asyncio.get_running_loop().create_future()
+            self._batch.append(future)
+        try:
+            if not self._waiting or len(self._batch) >= self.batch_size:
+                await self._commit()
+        finally:
+            self._lock.release()
+        if future is not None:
+            await future
+
+    def stats(self) -> SQLiteWriterStats:
+        """返回当前指标"""
+        return SQLiteWriterStats(
+            batch_size=self.batch_size,
+            waiting=self._waiting,
+            leases=self._leases,
+            commits=self._commits,
+            committed_sessions=self._committed_sessions,
+            avg_batch=self._committed_sessions / self._commits if self._commits else 0.0,
+            timeouts=self._timeouts,
+            avg_wait_ms=self._total_wait * 1000 / (self._leases or 1),
+        )
+
+    async def close(self) -> None:
+        """关闭写连接（回滚未提交的外层事务）"""
+        async with self._lock:
+            await self._discard()
+
+    async def _commit(self) -> None:
+        """提交外层事务并通知本批会话；没有会话等待时把连接还给连接池"""
+        batch, self._batch = self._batch, []
+        assert self._connection is not None
+        try:
+            await self._connection.commit()
+        except Exception as e:
+            await self._discard()
+            for future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self._commits += 1
+        self._committed_sessions += len(batch)
+        for future in batch:
+            if not future.done():
+                future.set_result(None)
+        if not self._waiting:
+            await self._connection.close()
+            self._connection = None
+
+    async def _discard(self) -> None:
+        """丢弃写连接及其未提交的外层事务"""
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            await connection.close()
+
+
+def _needs_writer(clause: Any) -> bool:
+    """
+    判断语句是否要在写连接上执行
+
+    SELECT ... FOR UPDATE 读取的是随后要写入的行（如乐观锁的版本检查），需要和写入在同一个写事务中，
+    否则检查和写入之间可能被其他会话的写入插入。
+
+    Args:
+        clause: 要执行的语句
+
+    Returns:
+        是否需要写连接
+    """
+    if clause.is_dml:
+        return True
+    if isinstance(clause, Select):
+        return clause._for_update_arg is not None
+    if isinstance(clause, TextClause):
+        return not _READ_ONLY_SQL.match(clause.text)
+    return False
+
+
+class RoutingSession(Session):
+    """读取使用只读连接池、第一次写入后改用写连接的同步会话"""
+
+    def __init__(self, *args: Any, writer: SQLiteWriter, reader: AsyncEngine, **kwargs: Any) -> None:
+        kwargs.setdefault("join_transaction_mode", "create_savepoint")
+        super().__init__(*args, **kwargs)
+        self.writer = writer
+        self.reader: Engine = reader.sync_engine
+        self.writer_connection: Connection | None = None
+
+    def get_bind(self, mapper: Any = None, *, clause: Any = None, **kwargs: Any) -> Engine | Connection:
+        if self.writer_connection is None and clause is not None and _needs_writer(clause):
+            self.use_writer()
+        return self.writer_connection if self.writer_connection is not None else self.reader
+
+    def use_writer(self) -> None:
+        """获取写连接，此后的语句都在写连接上执行（只能在 AsyncSession 调用的同步代码中使用）"""
+        if self.writer_connection is None:
+            self.writer_connection = await_only(self.writer.acquire())
+
+
+@event.listens_for(RoutingSession, "before_flush")
+def _use_writer_before_flush(session: RoutingSession, _flush_context: Any, _instances: Any) -> None:
+    """有待写入的变更时先获取写连接"""
+    session.use_writer()
+
+
+class SQLiteSession(AsyncSession):
+    """提交、回滚或关闭时释放写连接的异步会话"""
+
+    sync_session_class = RoutingSession
+    sync_session: RoutingSession
+
+    async def commit(self) -> None:
+        # 提交失败时会话的 SAVEPOINT 仍未结束，写连接留到 rollback/close 时释放
+        await super().commit()
+        await self._release_writer(wait=True)
+
+    async def rollback(self) -> None:
+        try:
+            await super().rollback()
+        finally:
+            await self._release_writer(wait=False)
+
+    async def close(self) -> None:
+        try:
+            await super().close()
+        finally:
+            await self._release_writer(wait=False)
+
+    async def _release_writer(self, *, wait: bool) -> None:
+        """会话持有写连接时释放"""
+        session = self.sync_session
+        if session.writer_connection is not None:
+            session.writer_connection = None
+            await session.writer.release(wait=wait)
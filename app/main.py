@@ -11,6 +11,8 @@ from loguru import logger
 from app.api.admin import router as admin_router
 from app.api.cards import router as cards_router
 from app.api.decks import router as decks_router
+from app.api.fsrs import router as fsrs_router
+from app.api.jobs import router as jobs_router
 from app.api.note_models import router as note_models_router
 from app.api.notes import router as notes_router
 from app.api.review_logs import router as review_logs_router
@@ -90,9 +92,15 @@ app.include_router(cards_router, prefix="/api/v1")
 # 注册复习日志路由
 app.include_router(review_logs_router, prefix="/api/v1")
 
+# 注册 FSRS 参数路由
+app.include_router(fsrs_router, prefix="/api/v1")
+
 # 注册共享牌组路由
 app.include_router(shared_decks_router, prefix="/api/v1")
 
+# 注册后台任务路由
+app.include_router(jobs_router, prefix="/api/v1")
+
 # 注册管理员路由
 app.include_router(admin_router, prefix="/api/v1")
 
@@ -6,10 +6,13 @@ SQLAlchemy数据模型模块
 
 from app.models.base import Base, BasePageQuery, BaseResponse, BaseTableMixin, PageResponse, Token, TokenPayload
 from app.models.deck import Deck
+from app.models.fsrs_params import FSRSParams
+from app.models.job import Job
 from app.models.note import Card, Note
 from app.models.note_model import CardTemplate, NoteModel
-from app.models.review_log import ReviewLog
-from app.models.shared_deck import SharedDeck, SharedDeckSnapshot
+from app.models.review_log import ReviewDailyStat, ReviewLog
+from app.models.shared_deck import SharedDeck, SharedDeckSearch, SharedDeckSnapshot
+from app.models.tag import NoteTag, SharedDeckTag, Tag
 from app.models.user import User
 
 __all__ = [
@@ -27,6 +30,13 @@ __all__ = [
     "Note",
     "Card",
     "ReviewLog",
+    "ReviewDailyStat",
+    "FSRSParams",
     "SharedDeck",
     "SharedDeckSnapshot",
+    "SharedDeckSearch",
+    "Tag",
+    "NoteTag",
+    "SharedDeckTag",
+    "Job",
 ]
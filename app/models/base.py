@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 
 from pydantic import BaseModel, Field, computed_field
-from sqlalchemy import DateTime, String, func
+from sqlalchemy import DateTime, Index, String, func, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -32,6 +32,24 @@ class BaseTableMixin:
     deleted_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, comment="逻辑删除时间")
 
 
+def live_rows_index(name: str, *columns: str) -> Index:
+    """
+    创建只收录未删除记录（deleted_at IS NULL）的部分索引
+
+    业务查询都带有 deleted_at IS NULL 条件，可以直接使用部分索引；已删除的记录不进入索引。
+    SQLite 和 PostgreSQL 支持部分索引，其他数据库上为普通索引。
+
+    Args:
+        name: 索引名
+        columns: 索引列
+
+    Returns:
+        索引定义（放入模型的 __table_args__）
+    """
+    where = text("deleted_at IS NULL")
+    return Index(name, *columns, sqlite_where=where, postgresql_where=where)
+
+
 class BaseResponse[T](BaseModel):
     """所有API响应的基类"""
 
@@ -47,6 +65,8 @@ class BasePageQuery(BaseModel):
 
     page_num: int = Field(default=1, description="页码", ge=1)
     page_size: int = Field(default=10, description="数量", ge=1)
+    cursor: str | None = Field(default=None, description="分页游标（上一页返回的 next_cursor），传入后忽略页码")
+    with_total: bool | None = Field(default=None, description="是否统计总数，默认页码分页统计、游标分页不统计")
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -58,6 +78,11 @@ class BasePageQuery(BaseModel):
     def limit(self) -> int:
         return self.page_size
 
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def include_total(self) -> bool:
+        return self.with_total if self.with_total is not None else self.cursor is None
+
 
 # 分页数据
 class PageResponse[T](BaseModel):
@@ -65,7 +90,8 @@ class PageResponse[T](BaseModel):
 
     page_num: int = Field(1, description="当前页码")
     page_size: int = Field(10, description="每页数量")
-    total: int = Field(0, description="总记录数")
+    total: int | None = Field(0, description="总记录数（未统计时为空）")
+    next_cursor: str | None = Field(None, description="下一页游标，没有更多数据时为空")
     items: list[T] = Field(default_factory=list, description="分页数据")
 
 
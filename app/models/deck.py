@@ -6,6 +6,7 @@ from sqlalchemy import ForeignKey, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, BaseTableMixin
+from app.utils.content_digest import EMPTY_DIGEST
 
 
 class Deck(Base, BaseTableMixin):
@@ -24,6 +25,12 @@ class Deck(Base, BaseTableMixin):
     published_deck_id: Mapped[str | None] = mapped_column(
         String(36), ForeignKey("shared_decks.id"), nullable=True, index=True, comment="关联的已发布牌组ID"
     )
+    content_digest: Mapped[str | None] = mapped_column(
+        String(64),
+        nullable=True,
+        default=EMPTY_DIGEST,
+        comment="内容摘要（笔记和卡片元素哈希之和，为空时发布前全量计算）",
+    )
 
     # 关系
     published_deck = relationship("SharedDeck", foreign_keys=[published_deck_id])
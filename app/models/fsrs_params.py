@@ -0,0 +1,31 @@
+"""
+个人 FSRS 参数（FSRSParams）模型
+
+保存由用户复习日志优化得到的 FSRS 参数
+"""
+
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, Float, ForeignKey, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class FSRSParams(Base):
+    """个人 FSRS 参数模型（每个用户、每个 FSRS 版本一行）"""
+
+    __tablename__ = "fsrs_params"
+
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), primary_key=True, comment="用户ID")
+    scheduler: Mapped[str] = mapped_column(String(20), primary_key=True, comment="调度器类型: fsrs_v4, fsrs_v5")
+    weights: Mapped[list[float]] = mapped_column(JSON, nullable=False, comment="FSRS 参数")
+    sample_count: Mapped[int] = mapped_column(Integer, nullable=False, comment="参与优化的复习数")
+    loss_before: Mapped[float] = mapped_column(Float, nullable=False, comment="默认参数的对数损失")
+    loss_after: Mapped[float] = mapped_column(Float, nullable=False, comment="优化后参数的对数损失")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, server_default=func.now(), onupdate=func.now(), comment="更新时间"
+    )
+
+    def __repr__(self) -> str:
+        return f"<FSRSParams(user_id={self.user_id}, scheduler={self.scheduler}, sample_count={self.sample_count})>"
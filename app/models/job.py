@@ -0,0 +1,46 @@
+"""
+后台任务（Job）模型
+
+持久化记录耗时操作（发布、批量导入等）的执行状态，服务重启后可恢复
+"""
+
+from datetime import datetime
+
+from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, BaseTableMixin
+
+
+class Job(Base, BaseTableMixin):
+    """后台任务模型"""
+
+    __tablename__ = "jobs"
+
+    user_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("users.id"), nullable=False, index=True, comment="提交用户ID"
+    )
+    type: Mapped[str] = mapped_column(String(50), nullable=False, comment="任务类型")
+    status: Mapped[str] = mapped_column(
+        String(20),
+        nullable=False,
+        default="pending",
+        index=True,
+        comment="状态: pending, running, succeeded, failed, cancelled",
+    )
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict, comment="任务参数")
+    result: Mapped[dict | None] = mapped_column(JSON, nullable=True, comment="执行结果")
+    error: Mapped[str | None] = mapped_column(Text, nullable=True, comment="失败原因")
+
+    # 进度
+    progress_done: Mapped[int] = mapped_column(Integer, nullable=False, default=0, comment="已完成数量")
+    progress_total: Mapped[int | None] = mapped_column(Integer, nullable=True, comment="总数量（未知时为空）")
+
+    # 执行控制
+    cancel_requested: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False, comment="是否已请求取消")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0, comment="已执行次数")
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, comment="开始执行时间")
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, comment="结束时间")
+
+    def __repr__(self) -> str:
+        return f"<Job(id={self.id}, type={self.type}, status={self.status})>"
@@ -7,20 +7,24 @@ Note 是抽象知识单位，包含字段内容
 from sqlalchemy import JSON, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import Base, BaseTableMixin
+from app.models.base import Base, BaseTableMixin, live_rows_index
 
 
 class Note(Base, BaseTableMixin):
     """笔记模型 - 存储知识内容"""
 
     __tablename__ = "notes"
-
-    user_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("users.id"), nullable=False, index=True, comment="所属用户ID"
-    )
-    deck_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("decks.id"), nullable=False, index=True, comment="所属牌组ID"
+    # user_id、deck_id 的查询都带有 deleted_at IS NULL 条件，由以下部分索引覆盖，不再单独建索引
+    __table_args__ = (
+        # 笔记列表（按创建时间分页，可选按牌组过滤）
+        live_rows_index("ix_notes_user_created", "user_id", "created_at", "id"),
+        live_rows_index("ix_notes_user_deck_created", "user_id", "deck_id", "created_at", "id"),
+        # 牌组内 GUID 去重和导出
+        live_rows_index("ix_notes_deck_guid", "deck_id", "guid"),
     )
+
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), nullable=False, comment="所属用户ID")
+    deck_id: Mapped[str] = mapped_column(String(36), ForeignKey("decks.id"), nullable=False, comment="所属牌组ID")
     note_model_id: Mapped[str] = mapped_column(
         String(36), ForeignKey("note_models.id"), nullable=False, index=True, comment="笔记类型ID"
     )
@@ -53,10 +57,16 @@ class Card(Base, BaseTableMixin):
     """卡片模型 - 面向复习的具体单位"""
 
     __tablename__ = "cards"
-
-    user_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("users.id"), nullable=False, index=True, comment="所属用户ID"
+    # user_id 的查询都带有 deleted_at IS NULL 条件，由以下部分索引覆盖，不再单独建索引
+    __table_args__ = (
+        # 待复习队列：queue != 'suspended'，按 (queue, due) 排序，可选按牌组过滤
+        live_rows_index("ix_cards_user_queue_due", "user_id", "queue", "due"),
+        live_rows_index("ix_cards_user_deck_queue_due", "user_id", "deck_id", "queue", "due"),
+        # 卡片列表（按到期时间分页）
+        live_rows_index("ix_cards_user_due", "user_id", "due", "id"),
     )
+
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), nullable=False, comment="所属用户ID")
     note_id: Mapped[str] = mapped_column(
         String(36), ForeignKey("notes.id"), nullable=False, index=True, comment="所属笔记ID"
     )
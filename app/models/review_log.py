@@ -4,24 +4,28 @@
 记录每次复习的详细信息，用于统计和分析
 """
 
-from sqlalchemy import BigInteger, ForeignKey, Integer, String
+from datetime import date
+
+from sqlalchemy import BigInteger, Date, ForeignKey, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
-from app.models.base import Base, BaseTableMixin
+from app.models.base import Base, BaseTableMixin, live_rows_index
 
 
 class ReviewLog(Base, BaseTableMixin):
     """复习日志模型 - 记录每次复习"""
 
     __tablename__ = "review_logs"
-
-    user_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("users.id"), nullable=False, index=True, comment="所属用户ID"
+    __table_args__ = (
+        # 复习日志列表和统计（按用户、复习时间），代替 user_id 和 review_time 上的单列索引
+        live_rows_index("ix_review_logs_user_time", "user_id", "review_time", "id"),
     )
+
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), nullable=False, comment="所属用户ID")
     card_id: Mapped[str] = mapped_column(
         String(36), ForeignKey("cards.id"), nullable=False, index=True, comment="所属卡片ID"
     )
-    review_time: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True, comment="复习时间戳（毫秒）")
+    review_time: Mapped[int] = mapped_column(BigInteger, nullable=False, comment="复习时间戳（毫秒）")
     rating: Mapped[int] = mapped_column(Integer, nullable=False, comment="用户评分: 1=Again, 2=Hard, 3=Good, 4=Easy")
 
     # 调度状态变化
@@ -45,3 +49,24 @@ class ReviewLog(Base, BaseTableMixin):
 
     def __repr__(self) -> str:
         return f"<ReviewLog(id={self.id}, card_id={self.card_id}, rating={self.rating})>"
+
+
+class ReviewDailyStat(Base):
+    """
+    每日复习汇总模型
+
+    按用户和复习时间的 UTC 日期汇总复习日志，写入复习日志时在同一事务中增量更新。
+    统计、热力图、连续打卡等只需读取汇总行，不必扫描全部复习日志。
+    """
+
+    __tablename__ = "review_daily_stats"
+
+    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), primary_key=True, comment="用户ID")
+    day: Mapped[date] = mapped_column(Date, primary_key=True, comment="日期")
+    review_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, comment="复习次数")
+    rating_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0, comment="评分之和")
+    good_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, comment="Good/Easy 次数")
+    duration_ms: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0, comment="回答总耗时（毫秒）")
+
+    def __repr__(self) -> str:
+        return f"<ReviewDailyStat(user_id={self.user_id}, day={self.day}, review_count={self.review_count})>"
@@ -4,16 +4,22 @@
 用于牌组市场的公开分享
 """
 
-from sqlalchemy import JSON, Boolean, ForeignKey, Integer, String, Text
+from sqlalchemy import DDL, JSON, Boolean, ForeignKey, Integer, String, Text, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import Base, BaseTableMixin
+from app.models.base import Base, BaseTableMixin, live_rows_index
 
 
 class SharedDeck(Base, BaseTableMixin):
     """共享牌组模型 - 牌组市场元数据"""
 
     __tablename__ = "shared_decks"
+    __table_args__ = (
+        # 牌组市场默认排序：已上架，按精选、官方、下载量、创建时间倒序
+        live_rows_index(
+            "ix_shared_decks_market", "is_active", "is_featured", "is_official", "download_count", "created_at", "id"
+        ),
+    )
 
     author_id: Mapped[str] = mapped_column(
         String(36), ForeignKey("users.id"), nullable=False, index=True, comment="作者用户ID"
@@ -67,3 +73,68 @@ class SharedDeckSnapshot(Base, BaseTableMixin):
 
     def __repr__(self) -> str:
         return f"<SharedDeckSnapshot(id={self.id}, version={self.version})>"
+
+
+class SharedDeckSearch(Base):
+    """
+    共享牌组搜索索引模型
+
+    保存切分后的标题、描述和标签文本（见 app.utils.search_text），由
+    SharedDeckRepository 在共享牌组写入时同步维护。全文索引建立在这张表上：
+    SQLite 为 FTS5 外部内容表 shared_deck_fts（通过触发器与本表同步），
+    PostgreSQL 为加权 tsvector 表达式上的 GIN 索引。
+    """
+
+    __tablename__ = "shared_deck_search"
+
+    # FTS5 外部内容表要求整数 rowid
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, comment="主键ID")
+    shared_deck_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("shared_decks.id"), nullable=False, unique=True, comment="共享牌组ID"
+    )
+    title: Mapped[str] = mapped_column(Text, nullable=False, default="", comment="切分后的标题")
+    description: Mapped[str] = mapped_column(Text, nullable=False, default="", comment="切分后的描述")
+    tags: Mapped[str] = mapped_column(Text, nullable=False, default="", comment="切分后的标签")
+
+    def __repr__(self) -> str:
+        return f"<SharedDeckSearch(id={self.id}, shared_deck_id={self.shared_deck_id})>"
+
+
+# PostgreSQL 全文检索文档：标题权重最高，其次是标签、描述
+SHARED_DECK_TSVECTOR = (
+    "setweight(to_tsvector('simple', title), 'A') || "
+    "setweight(to_tsvector('simple', tags), 'B') || "
+    "setweight(to_tsvector('simple', description), 'C')"
+)
+
+# 建表后创建全文索引（与迁移 3f9a6c2d8b14 一致）
+_SHARED_DECK_SEARCH_DDL = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE shared_deck_fts USING fts5("
+        "title, description, tags, content='shared_deck_search', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER shared_deck_search_ai AFTER INSERT ON shared_deck_search BEGIN "
+        "INSERT INTO shared_deck_fts(rowid, title, description, tags) "
+        "VALUES (new.id, new.title, new.description, new.tags); END",
+        "CREATE TRIGGER shared_deck_search_ad AFTER DELETE ON shared_deck_search BEGIN "
+        "INSERT INTO shared_deck_fts(shared_deck_fts, rowid, title, description, tags) "
+        "VALUES ('delete', old.id, old.title, old.description, old.tags); END",
+        "CREATE TRIGGER shared_deck_search_au AFTER UPDATE ON shared_deck_search BEGIN "
+        "INSERT INTO shared_deck_fts(shared_deck_fts, rowid, title, description, tags) "
+        "VALUES ('delete', old.id, old.title, old.description, old.tags); "
+        "INSERT INTO shared_deck_fts(rowid, title, description, tags) "
+        "VALUES (new.id, new.title, new.description, new.tags); END",
+    ],
+    "postgresql": [
+        f"CREATE INDEX ix_shared_deck_search_document ON shared_deck_search USING gin (({SHARED_DECK_TSVECTOR}))",
+    ],
+}
+
+for _dialect, _statements in _SHARED_DECK_SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(SharedDeckSearch.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+event.listen(
+    SharedDeckSearch.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS shared_deck_fts").execute_if(dialect="sqlite"),
+)
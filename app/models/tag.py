@@ -0,0 +1,58 @@
+"""
+标签（Tag）模型
+
+笔记和共享牌组的标签仍以 JSON 数组保存在各自的 tags 字段中（保留顺序，用于展示和导出），
+这里的规范化标签字典和关联表是它们的索引，由 TagRepository 在写入时同步维护，
+用于按标签过滤、标签计数和列出用户的全部标签。
+"""
+
+from sqlalchemy import ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class Tag(Base):
+    """标签字典模型"""
+
+    __tablename__ = "tags"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True, comment="主键ID")
+    name: Mapped[str] = mapped_column(String(100), nullable=False, unique=True, comment="标签名")
+
+    def __repr__(self) -> str:
+        return f"<Tag(id={self.id}, name={self.name})>"
+
+
+class NoteTag(Base):
+    """笔记-标签关联模型（只包含未删除的笔记）"""
+
+    __tablename__ = "note_tags"
+    __table_args__ = (
+        # 按用户列出标签、按标签过滤笔记都只需要读这个索引
+        Index("ix_note_tags_user_tag_note", "user_id", "tag_id", "note_id"),
+    )
+
+    note_id: Mapped[str] = mapped_column(String(36), ForeignKey("notes.id"), primary_key=True, comment="笔记ID")
+    tag_id: Mapped[int] = mapped_column(Integer, ForeignKey("tags.id"), primary_key=True, comment="标签ID")
+    user_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("users.id"), nullable=False, comment="所属用户ID（冗余字段）"
+    )
+
+    def __repr__(self) -> str:
+        return f"<NoteTag(note_id={self.note_id}, tag_id={self.tag_id})>"
+
+
+class SharedDeckTag(Base):
+    """共享牌组-标签关联模型（只包含未删除的共享牌组）"""
+
+    __tablename__ = "shared_deck_tags"
+    __table_args__ = (Index("ix_shared_deck_tags_tag_deck", "tag_id", "shared_deck_id"),)
+
+    shared_deck_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("shared_decks.id"), primary_key=True, comment="共享牌组ID"
+    )
+    tag_id: Mapped[int] = mapped_column(Integer, ForeignKey("tags.id"), primary_key=True, comment="标签ID")
+
+    def __repr__(self) -> str:
+        return f"<SharedDeckTag(shared_deck_id={self.shared_deck_id}, tag_id={self.tag_id})>"
@@ -6,10 +6,13 @@ Repository 层
 
 from app.repositories.base import BaseRepository
 from app.repositories.deck import DeckRepository
+from app.repositories.fsrs_params import FSRSParamsRepository
+from app.repositories.job import JobRepository
 from app.repositories.note import CardRepository, NoteRepository
 from app.repositories.note_model import CardTemplateRepository, NoteModelRepository
-from app.repositories.review_log import ReviewLogRepository
+from app.repositories.review_log import ReviewDailyStatRepository, ReviewLogRepository
 from app.repositories.shared_deck import SharedDeckRepository, SharedDeckSnapshotRepository
+from app.repositories.tag import TagRepository
 from app.repositories.user import UserRepository
 
 __all__ = [
@@ -21,6 +24,10 @@ __all__ = [
     "NoteRepository",
     "CardRepository",
     "ReviewLogRepository",
+    "ReviewDailyStatRepository",
+    "FSRSParamsRepository",
     "SharedDeckRepository",
     "SharedDeckSnapshotRepository",
+    "JobRepository",
+    "TagRepository",
 ]
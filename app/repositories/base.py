@@ -4,12 +4,48 @@ Repository 基类
 提供通用的 CRUD 操作
 """
 
-from typing import Any
-
-from sqlalchemy import func, select
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, cast
+
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    String,
+    Table,
+    and_,
+    bindparam,
+    column,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy import values as values_clause
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 
 from app.models.base import Base
+from app.utils.pagination import decode_cursor, encode_cursor
+
+# 分页排序键：(排序表达式, 是否降序)
+SortKey = tuple[ColumnElement[Any] | InstrumentedAttribute[Any], bool]
+
+
+def _keyset_filter(keys: Sequence[SortKey], values: Sequence[Any]) -> ColumnElement[bool]:
+    """
+    构造“排在游标所指行之后”的过滤条件：k1 >= v1 AND ((k1 > v1) OR (k1 = v1 AND k2 > v2) OR ...)
+
+    冗余的首个排序键范围条件让数据库可以直接在索引上定位，而不是从头扫描再逐行过滤。
+    """
+    clauses = []
+    for i, (expr, descending) in enumerate(keys):
+        equal_prefix = [key == value for (key, _), value in zip(keys[:i], values[:i], strict=True)]
+        clauses.append(and_(*equal_prefix, expr < values[i] if descending else expr > values[i]))
+    first, descending = keys[0]
+    return and_(first <= values[0] if descending else first >= values[0], or_(*clauses))
 
 
 class BaseRepository[ModelType: Base]:
@@ -108,6 +144,80 @@ class BaseRepository[ModelType: Base]:
         result = await self.db.execute(query)
         return result.scalar() or 0
 
+    async def paginate(
+        self,
+        query: Select[Any],
+        order_by: Sequence[SortKey],
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        with_total: bool = True,
+    ) -> tuple[list[ModelType], int | None, str | None]:
+        """
+        分页执行列表查询
+
+        传入 cursor 时按排序键定位（keyset 分页），直接从上一页最后一行之后读取，
+        任意一页的代价都与第一页相同；否则按 skip 偏移（兼容页码分页）。
+        排序键末尾自动追加主键保证顺序唯一，排序键的值不能为 NULL。
+
+        Args:
+            query: 已应用过滤条件、未排序的查询
+            order_by: 排序键
+            skip: 跳过的记录数（未传入 cursor 时生效）
+            limit: 返回的最大记录数
+            cursor: 上一页返回的游标
+            with_total: 是否统计总数
+
+        Returns:
+            (记录列表, 总数, 下一页游标) 元组；未统计总数时总数为 None，没有下一页时游标为 None
+
+        Raises:
+            BadRequestException: 游标无效
+        """
+        keys = [*order_by, (self.model.id, order_by[-1][1] if order_by else False)]  # type: ignore[attr-defined]
+
+        total = None
+        if with_total:
+            count_result = await self.db.execute(select(func.count()).select_from(query.order_by(None).subquery()))
+            total = count_result.scalar() or 0
+
+        if cursor is not None:
+            # 游标取值按排序列的类型校验，伪造的游标不会进入 SQL 比较
+            types = [expr.type.python_type for expr, _ in keys]
+            values = [self._cursor_bind_value(value) for value in decode_cursor(cursor, types)]
+            query = query.where(_keyset_filter(keys, values))
+        else:
+            query = query.offset(skip)
+
+        # 多读一行判断是否还有下一页，排序键随记录一起读出用于生成游标
+        query = (
+            query.add_columns(*(expr for expr, _ in keys))
+            .order_by(*(expr.desc() if descending else expr.asc() for expr, descending in keys))
+            .limit(limit + 1)
+        )
+        rows = (await self.db.execute(query)).all()
+        next_cursor = encode_cursor(rows[limit - 1][1:]) if len(rows) > limit else None
+        return [row[0] for row in rows[:limit]], total, next_cursor
+
+    def _cursor_bind_value(self, value: Any) -> Any:
+        """
+        转换游标中的排序键取值用于比较
+
+        取值统一包装为绑定参数（布尔值不能直接参与大小比较）。
+        SQLite 以文本保存时间：服务端默认值 CURRENT_TIMESTAMP 精确到秒（无小数部分），
+        SQLAlchemy 写入的时间带 6 位微秒，绑定参数时按同样的文本格式比较才能正确判断相等。
+
+        Args:
+            value: 游标中的取值
+
+        Returns:
+            绑定到比较条件中的值
+        """
+        if isinstance(value, datetime) and self.db.get_bind().dialect.name == "sqlite":
+            return literal(value.isoformat(sep=" "), String)
+        return literal(value)
+
     async def create(self, obj_in: dict[str, Any]) -> ModelType:
         """
         创建新记录
@@ -124,6 +234,57 @@ class BaseRepository[ModelType: Base]:
         await self.db.refresh(db_obj)
         return db_obj
 
+    async def bulk_create(self, rows: Sequence[dict[str, Any]], *, chunk_size: int = 1000) -> None:
+        """
+        批量插入记录
+
+        按块以 executemany 方式写入，不回读模型实例，适合大批量导入。
+        调用方应预先生成主键并保证各行字段一致。
+
+        Args:
+            rows: 待插入的行数据
+            chunk_size: 每次 executemany 的行数
+        """
+        for start in range(0, len(rows), chunk_size):
+            await self.db.execute(insert(self.model), rows[start : start + chunk_size])
+
+    async def bulk_update(
+        self, rows: Sequence[dict[str, Any]], values: dict[str, Any] | None = None, *, chunk_size: int = 1000
+    ) -> None:
+        """
+        按主键批量更新记录
+
+        各行按要更新的列分组后分块写入：PostgreSQL 每块一条 UPDATE ... FROM (VALUES ...)，
+        其他数据库以 executemany 方式逐行 UPDATE。不回读模型实例，调用方应预先校验权限。
+
+        Args:
+            rows: 待更新的行数据，必须包含 id，其余键为要更新的列
+            values: 所有行统一设置的列值
+            chunk_size: 每条语句更新的行数
+        """
+        table = cast(Table, self.model.__table__)
+        groups: dict[tuple[str, ...], list[dict[str, Any]]] = {}
+        for row in rows:
+            groups.setdefault(tuple(sorted(key for key in row if key != "id")), []).append(row)
+
+        dialect = self.db.get_bind().dialect.name
+        for columns, group in groups.items():
+            for start in range(0, len(group), chunk_size):
+                chunk = group[start : start + chunk_size]
+                if dialect == "postgresql":
+                    names = ("id", *columns)
+                    data = values_clause(*(column(name, table.c[name].type) for name in names), name="v").data(
+                        [tuple(row[name] for name in names) for row in chunk]
+                    )
+                    stmt = update(table).where(table.c.id == data.c.id)
+                    await self.db.execute(stmt.values({**{name: data.c[name] for name in columns}, **(values or {})}))
+                else:
+                    stmt = update(table).where(table.c.id == bindparam("b_id"))
+                    await self.db.execute(
+                        stmt.values({**{name: bindparam(name) for name in columns}, **(values or {})}),
+                        [{"b_id": row["id"], **{name: row[name] for name in columns}} for row in chunk],
+                    )
+
     async def update(
         self,
         db_obj: ModelType,
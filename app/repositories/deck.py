@@ -4,11 +4,16 @@
 封装 Deck 相关的数据库操作
 """
 
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.deck import Deck
+from app.models.note import Card, Note
 from app.repositories.base import BaseRepository
+from app.utils import content_digest
+
+# 全量计算内容摘要时每批读取的行数
+DIGEST_SCAN_CHUNK_SIZE = 5000
 
 
 class DeckRepository(BaseRepository[Deck]):
@@ -24,7 +29,9 @@ class DeckRepository(BaseRepository[Deck]):
         keyword: str | None = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[list[Deck], int]:
+        cursor: str | None = None,
+        with_total: bool = True,
+    ) -> tuple[list[Deck], int | None, str | None]:
         """
         获取用户的牌组列表
 
@@ -33,30 +40,27 @@ class DeckRepository(BaseRepository[Deck]):
             keyword: 搜索关键词
             skip: 跳过的记录数
             limit: 返回的最大记录数
+            cursor: 分页游标
+            with_total: 是否统计总数
 
         Returns:
-            (牌组列表, 总数) 元组
+            (牌组列表, 总数, 下一页游标) 元组
         """
         # 基础查询
         query = select(Deck).where(Deck.user_id == user_id, Deck.deleted_at.is_(None))
-        count_query = select(func.count()).select_from(Deck).where(Deck.user_id == user_id, Deck.deleted_at.is_(None))
 
         # 关键词搜索
         if keyword:
-            keyword_filter = Deck.name.like(f"%{keyword}%")
-            query = query.where(keyword_filter)
-            count_query = count_query.where(keyword_filter)
-
-        # 获取总数
-        count_result = await self.db.execute(count_query)
-        total = count_result.scalar() or 0
-
-        # 分页查询
-        query = query.order_by(Deck.created_at.desc()).offset(skip).limit(limit)
-        result = await self.db.execute(query)
-        items = list(result.scalars().all())
-
-        return items, total
+            query = query.where(Deck.name.like(f"%{keyword}%"))
+
+        return await self.paginate(
+            query,
+            [(Deck.created_at, True)],
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            with_total=with_total,
+        )
 
     async def name_exists(
         self,
@@ -84,3 +88,53 @@ class DeckRepository(BaseRepository[Deck]):
             query = query.where(Deck.id != exclude_id)
         result = await self.db.execute(query)
         return result.scalar_one_or_none() is not None
+
+    async def get_by_id_for_update(self, id: str) -> Deck | None:
+        """
+        获取牌组并加行锁（用于更新内容摘要等读改写操作）
+
+        Args:
+            id: 牌组 ID
+
+        Returns:
+            Deck 实例或 None
+        """
+        result = await self.db.execute(
+            select(Deck)
+            .where(Deck.id == id, Deck.deleted_at.is_(None))
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def compute_content_digest(self, deck_id: str) -> str:
+        """
+        全量计算牌组内容摘要
+
+        逐批读取牌组内所有笔记和卡片，仅用于初始化和离线校验，日常变更走增量更新。
+
+        Args:
+            deck_id: 牌组 ID
+
+        Returns:
+            内容摘要
+        """
+        digest = content_digest.EMPTY_DIGEST
+
+        notes_stream = await self.db.stream(
+            select(Note.guid, Note.fields, Note.tags)
+            .where(Note.deck_id == deck_id, Note.deleted_at.is_(None))
+            .execution_options(yield_per=DIGEST_SCAN_CHUNK_SIZE)
+        )
+        async for rows in notes_stream.partitions():
+            digest = content_digest.apply_delta(digest, (content_digest.note_hash(*row) for row in rows))
+
+        cards_stream = await self.db.stream(
+            select(Card.note_id, Card.card_template_id, Card.ord)
+            .where(Card.deck_id == deck_id, Card.deleted_at.is_(None))
+            .execution_options(yield_per=DIGEST_SCAN_CHUNK_SIZE)
+        )
+        async for rows in cards_stream.partitions():
+            digest = content_digest.apply_delta(digest, (content_digest.card_hash(*row) for row in rows))
+
+        return digest
@@ -0,0 +1,80 @@
+"""
+个人 FSRS 参数 Repository
+
+封装 FSRSParams 相关的数据库操作
+"""
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.fsrs_params import FSRSParams
+from app.repositories.base import BaseRepository
+
+
+class FSRSParamsRepository(BaseRepository[FSRSParams]):
+    """个人 FSRS 参数数据访问层"""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(FSRSParams, db)
+
+    async def get_params(self, user_id: str, scheduler: str) -> FSRSParams | None:
+        """
+        获取用户某个 FSRS 版本的参数
+
+        Args:
+            user_id: 用户 ID
+            scheduler: 调度器类型
+
+        Returns:
+            FSRSParams 实例或 None
+        """
+        result = await self.db.execute(
+            select(FSRSParams).where(FSRSParams.user_id == user_id, FSRSParams.scheduler == scheduler)
+        )
+        return result.scalar_one_or_none()
+
+    async def save_params(
+        self,
+        user_id: str,
+        scheduler: str,
+        *,
+        weights: list[float],
+        sample_count: int,
+        loss_before: float,
+        loss_after: float,
+    ) -> FSRSParams:
+        """
+        保存（覆盖）用户某个 FSRS 版本的参数
+
+        Args:
+            user_id: 用户 ID
+            scheduler: 调度器类型
+            weights: FSRS 参数
+            sample_count: 参与优化的复习数
+            loss_before: 默认参数的对数损失
+            loss_after: 优化后参数的对数损失
+
+        Returns:
+            保存后的 FSRSParams 实例
+        """
+        values = {
+            "weights": weights,
+            "sample_count": sample_count,
+            "loss_before": loss_before,
+            "loss_after": loss_after,
+        }
+        insert_stmt = postgresql.insert if self.db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        stmt = insert_stmt(FSRSParams).values(user_id=user_id, scheduler=scheduler, **values)
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[FSRSParams.user_id, FSRSParams.scheduler],
+                set_={**values, "updated_at": func.now()},
+            )
+        )
+        result = await self.db.execute(
+            select(FSRSParams)
+            .where(FSRSParams.user_id == user_id, FSRSParams.scheduler == scheduler)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one()
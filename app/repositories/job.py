@@ -0,0 +1,59 @@
+"""
+后台任务 Repository
+
+封装 Job 相关的数据库操作
+"""
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job import Job
+from app.repositories.base import BaseRepository
+
+
+class JobRepository(BaseRepository[Job]):
+    """后台任务数据访问层"""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(Job, db)
+
+    async def get_by_user_id(
+        self,
+        user_id: str,
+        *,
+        status: str | None = None,
+        type: str | None = None,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: str | None = None,
+        with_total: bool = True,
+    ) -> tuple[list[Job], int | None, str | None]:
+        """
+        获取用户的后台任务列表
+
+        Args:
+            user_id: 用户 ID
+            status: 状态过滤
+            type: 任务类型过滤
+            skip: 跳过的记录数
+            limit: 返回的最大记录数
+            cursor: 分页游标
+            with_total: 是否统计总数
+
+        Returns:
+            (任务列表, 总数, 下一页游标) 元组
+        """
+        conditions = [Job.user_id == user_id, Job.deleted_at.is_(None)]
+        if status:
+            conditions.append(Job.status == status)
+        if type:
+            conditions.append(Job.type == type)
+
+        return await self.paginate(
+            select(Job).where(*conditions),
+            [(Job.created_at, True)],
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            with_total=with_total,
+        )
@@ -5,13 +5,24 @@
 """
 
 import hashlib
+from collections.abc import Collection
+from datetime import datetime
 
-from sqlalchemy import func, select
+from sqlalchemy import case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.models.note import Card, Note
 from app.repositories.base import BaseRepository
+from app.repositories.tag import TagRepository
+from app.scheduler.base import DAY_MS
+
+# 参与复习的队列（除 suspended 外的全部队列，按排序顺序列出）
+ACTIVE_QUEUES = ("learning", "new", "review")
+
+# 到期分布中新卡片和已逾期卡片的天序号
+NEW_CARD_BUCKET = -1
+OVERDUE_BUCKET = -2
 
 
 class NoteRepository(BaseRepository[Note]):
@@ -44,7 +55,9 @@ class NoteRepository(BaseRepository[Note]):
         tags: list[str] | None = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[list[Note], int]:
+        cursor: str | None = None,
+        with_total: bool = True,
+    ) -> tuple[list[Note], int | None, str | None]:
         """
         获取用户的笔记列表
 
@@ -55,45 +68,38 @@ class NoteRepository(BaseRepository[Note]):
             tags: 标签过滤
             skip: 跳过的记录数
             limit: 返回的最大记录数
+            cursor: 分页游标
+            with_total: 是否统计总数
 
         Returns:
-            (笔记列表, 总数) 元组
+            (笔记列表, 总数, 下一页游标) 元组
         """
         # 基础查询
         query = select(Note).options(selectinload(Note.cards)).where(Note.user_id == user_id, Note.deleted_at.is_(None))
-        count_query = select(func.count()).select_from(Note).where(Note.user_id == user_id, Note.deleted_at.is_(None))
 
         # 牌组过滤
         if deck_id:
             query = query.where(Note.deck_id == deck_id)
-            count_query = count_query.where(Note.deck_id == deck_id)
 
         # 关键词搜索（在 JSON 字段中搜索）
         # SQLite JSON 搜索：使用 LIKE 模糊匹配
         if keyword:
             # 简单实现：将 fields 转为文本搜索
-            keyword_filter = Note.fields.cast(str).like(f"%{keyword}%")
-            query = query.where(keyword_filter)
-            count_query = count_query.where(keyword_filter)
+            query = query.where(Note.fields.cast(str).like(f"%{keyword}%"))
 
-        # 标签过滤
+        # 标签过滤（精确匹配，同时带有全部标签）
         if tags:
-            # SQLite JSON 数组包含检查
             for tag in tags:
-                tag_filter = Note.tags.cast(str).like(f"%{tag}%")
-                query = query.where(tag_filter)
-                count_query = count_query.where(tag_filter)
-
-        # 获取总数
-        count_result = await self.db.execute(count_query)
-        total = count_result.scalar() or 0
-
-        # 分页查询
-        query = query.order_by(Note.created_at.desc()).offset(skip).limit(limit)
-        result = await self.db.execute(query)
-        items = list(result.scalars().all())
-
-        return items, total
+                query = query.where(TagRepository.note_tag_filter(user_id, tag))
+
+        return await self.paginate(
+            query,
+            [(Note.created_at, True)],
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            with_total=with_total,
+        )
 
     async def get_by_guid(self, user_id: str, guid: str) -> Note | None:
         """
@@ -115,17 +121,22 @@ class NoteRepository(BaseRepository[Note]):
         )
         return result.scalar_one_or_none()
 
-    async def get_guids_by_deck(self, deck_id: str) -> set[str]:
+    async def get_existing_guids(self, deck_id: str, guids: Collection[str]) -> set[str]:
         """
-        获取牌组内所有笔记的 GUID 集合
+        获取牌组内已存在的给定 GUID
 
         Args:
             deck_id: 牌组 ID
+            guids: 待检查的 GUID
 
         Returns:
-            GUID 集合
+            已存在的 GUID 集合
         """
-        result = await self.db.execute(select(Note.guid).where(Note.deck_id == deck_id, Note.deleted_at.is_(None)))
+        if not guids:
+            return set()
+        result = await self.db.execute(
+            select(Note.guid).where(Note.deck_id == deck_id, Note.guid.in_(guids), Note.deleted_at.is_(None))
+        )
         return {row[0] for row in result.all()}
 
     @staticmethod
@@ -165,7 +176,9 @@ class CardRepository(BaseRepository[Card]):
         due_before: int | None = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[list[Card], int]:
+        cursor: str | None = None,
+        with_total: bool = True,
+    ) -> tuple[list[Card], int | None, str | None]:
         """
         获取用户的卡片列表
 
@@ -177,44 +190,39 @@ class CardRepository(BaseRepository[Card]):
             due_before: 到期时间之前
             skip: 跳过的记录数
             limit: 返回的最大记录数
+            cursor: 分页游标
+            with_total: 是否统计总数
 
         Returns:
-            (卡片列表, 总数) 元组
+            (卡片列表, 总数, 下一页游标) 元组
         """
         # 基础查询
         query = select(Card).where(Card.user_id == user_id, Card.deleted_at.is_(None))
-        count_query = select(func.count()).select_from(Card).where(Card.user_id == user_id, Card.deleted_at.is_(None))
 
         # 牌组过滤
         if deck_id:
             query = query.where(Card.deck_id == deck_id)
-            count_query = count_query.where(Card.deck_id == deck_id)
 
         # 状态过滤
         if state:
             query = query.where(Card.state == state)
-            count_query = count_query.where(Card.state == state)
 
         # 队列过滤
         if queue:
             query = query.where(Card.queue == queue)
-            count_query = count_query.where(Card.queue == queue)
 
         # 到期时间过滤
         if due_before is not None:
             query = query.where(Card.due <= due_before)
-            count_query = count_query.where(Card.due <= due_before)
-
-        # 获取总数
-        count_result = await self.db.execute(count_query)
-        total = count_result.scalar() or 0
-
-        # 分页查询
-        query = query.order_by(Card.due.asc()).offset(skip).limit(limit)
-        result = await self.db.execute(query)
-        items = list(result.scalars().all())
 
-        return items, total
+        return await self.paginate(
+            query,
+            [(Card.due, False)],
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            with_total=with_total,
+        )
 
     async def get_due_cards(
         self,
@@ -238,7 +246,8 @@ class CardRepository(BaseRepository[Card]):
         query = select(Card).where(
             Card.user_id == user_id,
             Card.deleted_at.is_(None),
-            Card.queue != "suspended",
+            # 用 IN 而不是 != 'suspended'：可以在 (user_id, [deck_id,] queue, due) 索引上按队列逐段定位并保持有序
+            Card.queue.in_(ACTIVE_QUEUES),
         )
 
         if deck_id:
@@ -252,6 +261,116 @@ class CardRepository(BaseRepository[Card]):
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
+    async def get_due_queue_entries(self, user_id: str) -> list[tuple[str, str, str, int]]:
+        """
+        获取用户所有活跃队列中卡片的调度键（用于构造到期队列索引）
+
+        Args:
+            user_id: 用户 ID
+
+        Returns:
+            (卡片 ID, 牌组 ID, 队列, 到期时间) 列表，不排序
+        """
+        result = await self.db.execute(
+            select(Card.id, Card.deck_id, Card.queue, Card.due).where(
+                Card.user_id == user_id,
+                Card.deleted_at.is_(None),
+                Card.queue.in_(ACTIVE_QUEUES),
+            )
+        )
+        return list(result.tuples().all())
+
+    async def get_due_histogram(self, user_id: str, start: int, days: int) -> list[tuple[str, int, int]]:
+        """
+        按牌组和天统计活跃卡片的到期分布（单条 GROUP BY，走 (user_id, deck_id, queue, due) 覆盖索引）
+
+        Args:
+            user_id: 用户 ID
+            start: 第 0 天的起始时间戳（毫秒）
+            days: 统计的天数
+
+        Returns:
+            (牌组 ID, 天序号, 卡片数) 列表；学习中和复习卡片按到期时间落入 0 ~ days-1 天，
+            已逾期的天序号为 OVERDUE_BUCKET，新卡片（不论到期时间）为 NEW_CARD_BUCKET
+        """
+        bucket = case(
+            (Card.queue == "new", NEW_CARD_BUCKET),
+            (Card.due < start, OVERDUE_BUCKET),
+            else_=(Card.due - start) // DAY_MS,
+        )
+        # 在子查询中计算天序号，外层按列分组（避免 GROUP BY 重复表达式中的绑定参数）
+        cards = (
+            select(Card.deck_id, bucket.label("bucket"))
+            .where(
+                Card.user_id == user_id,
+                Card.deleted_at.is_(None),
+                Card.queue.in_(ACTIVE_QUEUES),
+                (Card.queue == "new") | (Card.due < start + days * DAY_MS),
+            )
+            .subquery()
+        )
+        result = await self.db.execute(
+            select(cards.c.deck_id, cards.c.bucket, func.count()).group_by(cards.c.deck_id, cards.c.bucket)
+        )
+        return list(result.tuples().all())
+
+    async def get_by_ids(self, card_ids: Collection[str]) -> dict[str, Card]:
+        """
+        按主键批量获取卡片（单条 IN 查询，包括已删除的卡片）
+
+        Args:
+            card_ids: 卡片 ID
+
+        Returns:
+            卡片 ID -> 卡片 字典，不存在的卡片不返回
+        """
+        if not card_ids:
+            return {}
+        result = await self.db.execute(select(Card).where(Card.id.in_(card_ids)))
+        return {card.id: card for card in result.scalars().all()}
+
+    async def get_owned_ids(self, user_id: str, card_ids: Collection[str]) -> set[str]:
+        """
+        筛选属于用户且未删除的卡片 ID（单条 IN 查询）
+
+        Args:
+            user_id: 用户 ID
+            card_ids: 待检查的卡片 ID
+
+        Returns:
+            其中属于该用户的卡片 ID 集合
+        """
+        if not card_ids:
+            return set()
+        result = await self.db.execute(
+            select(Card.id).where(Card.id.in_(card_ids), Card.user_id == user_id, Card.deleted_at.is_(None))
+        )
+        return set(result.scalars().all())
+
+    async def get_versions(
+        self, user_id: str, card_ids: Collection[str], *, for_update: bool = False
+    ) -> dict[str, datetime]:
+        """
+        获取属于用户且未删除的卡片的更新时间（单条 IN 查询）
+
+        Args:
+            user_id: 用户 ID
+            card_ids: 待查询的卡片 ID
+            for_update: 是否锁定这些行直到事务结束（支持行锁的数据库生效）
+
+        Returns:
+            卡片 ID -> 更新时间 字典，不属于该用户的卡片不返回
+        """
+        if not card_ids:
+            return {}
+        query = select(Card.id, Card.updated_at).where(
+            Card.id.in_(card_ids), Card.user_id == user_id, Card.deleted_at.is_(None)
+        )
+        if for_update:
+            query = query.with_for_update()
+        result = await self.db.execute(query)
+        return {row.id: row.updated_at for row in result.all()}
+
     async def get_by_note_id(self, note_id: str) -> list[Card]:
         """
         获取笔记的所有卡片
@@ -4,9 +4,11 @@
 封装 NoteModel 和 CardTemplate 相关的数据库操作
 """
 
-from sqlalchemy import func, select
+from collections.abc import Collection
+
+from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import contains_eager, selectinload
 
 from app.models.note_model import CardTemplate, NoteModel
 from app.repositories.base import BaseRepository
@@ -35,6 +37,36 @@ class NoteModelRepository(BaseRepository[NoteModel]):
         )
         return result.scalar_one_or_none()
 
+    async def get_by_ids_with_templates(self, ids: Collection[str]) -> list[NoteModel]:
+        """
+        批量获取笔记类型及其未删除的模板
+
+        通过一次 LEFT JOIN 查询同时加载笔记类型和模板，查询次数与笔记类型数量无关。
+        返回对象的 templates 只包含未删除的模板，并按 ord 排序。
+
+        Args:
+            ids: 笔记类型 ID 集合
+
+        Returns:
+            笔记类型列表（按创建时间排序，不含已删除的笔记类型）
+        """
+        if not ids:
+            return []
+
+        result = await self.db.execute(
+            select(NoteModel)
+            .outerjoin(
+                CardTemplate,
+                and_(CardTemplate.note_model_id == NoteModel.id, CardTemplate.deleted_at.is_(None)),
+            )
+            .options(contains_eager(NoteModel.templates))
+            .where(NoteModel.id.in_(ids), NoteModel.deleted_at.is_(None))
+            .order_by(NoteModel.created_at, NoteModel.id, CardTemplate.ord)
+            # 会话中已加载的对象也用本次过滤后的模板覆盖
+            .execution_options(populate_existing=True)
+        )
+        return list(result.unique().scalars().all())
+
     async def get_by_user_id(
         self,
         user_id: str,
@@ -42,7 +74,9 @@ class NoteModelRepository(BaseRepository[NoteModel]):
         keyword: str | None = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[list[NoteModel], int]:
+        cursor: str | None = None,
+        with_total: bool = True,
+    ) -> tuple[list[NoteModel], int | None, str | None]:
         """
         获取用户的笔记类型列表
 
@@ -51,9 +85,11 @@ class NoteModelRepository(BaseRepository[NoteModel]):
             keyword: 搜索关键词
             skip: 跳过的记录数
             limit: 返回的最大记录数
+            cursor: 分页游标
+            with_total: 是否统计总数
 
         Returns:
-            (笔记类型列表, 总数) 元组
+            (笔记类型列表, 总数, 下一页游标) 元组
         """
         # 基础查询
         query = (
@@ -61,28 +97,19 @@ class NoteModelRepository(BaseRepository[NoteModel]):
             .options(selectinload(NoteModel.templates))
             .where(NoteModel.user_id == user_id, NoteModel.deleted_at.is_(None))
         )
-        count_query = (
-            select(func.count())
-            .select_from(NoteModel)
-            .where(NoteModel.user_id == user_id, NoteModel.deleted_at.is_(None))
-        )
 
         # 关键词搜索
         if keyword:
-            keyword_filter = NoteModel.name.like(f"%{keyword}%")
-            query = query.where(keyword_filter)
-            count_query = count_query.where(keyword_filter)
-
-        # 获取总数
-        count_result = await self.db.execute(count_query)
-        total = count_result.scalar() or 0
-
-        # 分页查询
-        query = query.order_by(NoteModel.created_at.desc()).offset(skip).limit(limit)
-        result = await self.db.execute(query)
-        items = list(result.scalars().all())
+            query = query.where(NoteModel.name.like(f"%{keyword}%"))
 
-        return items, total
+        return await self.paginate(
+            query,
+            [(NoteModel.created_at, True)],
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            with_total=with_total,
+        )
 
     async def name_exists(self, user_id: str, name: str, exclude_id: str | None = None) -> bool:
         """
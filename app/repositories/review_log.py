@@ -4,14 +4,57 @@
 封装 ReviewLog 相关的数据库操作
 """
 
-from datetime import datetime, timedelta
+from collections.abc import AsyncIterator, Iterable, Sequence
+from datetime import UTC, date, datetime, time, timedelta
+from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import Row, case, func, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.review_log import ReviewLog
+from app.models.review_log import ReviewDailyStat, ReviewLog
 from app.repositories.base import BaseRepository
 
+# 每日汇总中累加的计数列
+DAILY_COUNTERS = ("review_count", "rating_sum", "good_count", "duration_ms")
+
+
+def review_day(review_time: int) -> date:
+    """
+    复习时间所在的 UTC 日期（与统计中“今日”“本周”及每日汇总回填的口径一致）
+
+    Args:
+        review_time: 复习时间戳（毫秒）
+
+    Returns:
+        日期
+    """
+    return datetime.fromtimestamp(review_time / 1000, UTC).date()
+
+
+def stats_today() -> date:
+    """复习统计中的“今日”（UTC 日期）"""
+    return datetime.now(UTC).date()
+
+
+def _day_start_ms(day: date) -> int:
+    """UTC 日期零点的毫秒时间戳"""
+    return int(datetime.combine(day, time.min, tzinfo=UTC).timestamp() * 1000)
+
+
+def _build_stats(
+    total: int | None, today: int | None, week: int | None, rating_sum: int | None, good: int | None
+) -> dict:
+    """由聚合结果组装统计数据"""
+    total = total or 0
+    return {
+        "total_reviews": total,
+        "reviews_today": today or 0,
+        "reviews_this_week": week or 0,
+        "average_rating": round((rating_sum or 0) / total, 2) if total else 0.0,
+        "retention_rate": round((good or 0) / total * 100, 2) if total else 0.0,
+    }
+
 
 class ReviewLogRepository(BaseRepository[ReviewLog]):
     """复习日志数据访问层"""
@@ -28,7 +71,9 @@ class ReviewLogRepository(BaseRepository[ReviewLog]):
         end_time: int | None = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[list[ReviewLog], int]:
+        cursor: str | None = None,
+        with_total: bool = True,
+    ) -> tuple[list[ReviewLog], int | None, str | None]:
         """
         获取用户的复习日志列表
 
@@ -39,51 +84,87 @@ class ReviewLogRepository(BaseRepository[ReviewLog]):
             end_time: 结束时间（毫秒）
             skip: 跳过的记录数
             limit: 返回的最大记录数
+            cursor: 分页游标
+            with_total: 是否统计总数
 
         Returns:
-            (复习日志列表, 总数) 元组
+            (复习日志列表, 总数, 下一页游标) 元组
         """
         # 基础查询
         query = select(ReviewLog).where(
             ReviewLog.user_id == user_id,
             ReviewLog.deleted_at.is_(None),
         )
-        count_query = (
-            select(func.count())
-            .select_from(ReviewLog)
-            .where(
-                ReviewLog.user_id == user_id,
-                ReviewLog.deleted_at.is_(None),
-            )
-        )
 
         # 卡片过滤
         if card_id:
             query = query.where(ReviewLog.card_id == card_id)
-            count_query = count_query.where(ReviewLog.card_id == card_id)
 
         # 时间范围过滤
         if start_time is not None:
             query = query.where(ReviewLog.review_time >= start_time)
-            count_query = count_query.where(ReviewLog.review_time >= start_time)
         if end_time is not None:
             query = query.where(ReviewLog.review_time <= end_time)
-            count_query = count_query.where(ReviewLog.review_time <= end_time)
 
-        # 获取总数
-        count_result = await self.db.execute(count_query)
-        total = count_result.scalar() or 0
+        return await self.paginate(
+            query,
+            [(ReviewLog.review_time, True)],
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            with_total=with_total,
+        )
+
+    async def insert_ignoring_existing(self, rows: Sequence[dict[str, Any]], *, chunk_size: int = 1000) -> set[str]:
+        """
+        批量插入复习日志，ID 已存在（包括已软删除的记录）的行由数据库跳过
+
+        以 INSERT ... ON CONFLICT (id) DO NOTHING RETURNING id 分块写入，
+        并发上传同一批日志时也只有一方写入成功。
+
+        Args:
+            rows: 待插入的行数据，必须包含客户端生成的 id
+            chunk_size: 每次 executemany 的行数
+
+        Returns:
+            实际插入的日志 ID 集合
+        """
+        insert_stmt = postgresql.insert if self.db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        stmt = insert_stmt(ReviewLog).on_conflict_do_nothing(index_elements=[ReviewLog.id]).returning(ReviewLog.id)
+        inserted: set[str] = set()
+        for start in range(0, len(rows), chunk_size):
+            result = await self.db.execute(stmt, rows[start : start + chunk_size])
+            inserted.update(result.scalars().all())
+        return inserted
+
+    async def iter_history(
+        self, user_id: str, *, chunk_size: int = 10000
+    ) -> AsyncIterator[Sequence[Row[tuple[str, int, int, str | None]]]]:
+        """
+        按 (卡片, 复习时间) 顺序分块读取用户的全部复习历史（用于 FSRS 参数优化）
 
-        # 分页查询
-        query = query.order_by(ReviewLog.review_time.desc()).offset(skip).limit(limit)
-        result = await self.db.execute(query)
-        items = list(result.scalars().all())
+        Args:
+            user_id: 用户 ID
+            chunk_size: 每块的行数
 
-        return items, total
+        Yields:
+            (卡片 ID, 复习时间, 评分, 复习前状态) 行
+        """
+        stream = await self.db.stream(
+            select(ReviewLog.card_id, ReviewLog.review_time, ReviewLog.rating, ReviewLog.prev_state)
+            .where(ReviewLog.user_id == user_id, ReviewLog.deleted_at.is_(None))
+            .order_by(ReviewLog.card_id, ReviewLog.review_time, ReviewLog.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        async for rows in stream.partitions():
+            yield rows
 
     async def get_stats(self, user_id: str) -> dict:
         """
-        获取复习统计
+        直接从复习日志计算复习统计（单条条件聚合查询）
+
+        接口使用 ReviewDailyStatRepository.get_stats 读取每日汇总，这里的结果应与其一致，
+        用于校验汇总数据。
 
         Args:
             user_id: 用户 ID
@@ -91,75 +172,106 @@ class ReviewLogRepository(BaseRepository[ReviewLog]):
         Returns:
             统计数据
         """
-        today_start = int(datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).timestamp() * 1000)
-        week_start = int(
-            (datetime.now() - timedelta(days=datetime.now().weekday()))
-            .replace(hour=0, minute=0, second=0, microsecond=0)
-            .timestamp()
-            * 1000
-        )
+        today = stats_today()
+        week_start = today - timedelta(days=today.weekday())
+        today_start = _day_start_ms(today)
+        week_start_ms = _day_start_ms(week_start)
 
-        # 总复习次数
-        total_result = await self.db.execute(
-            select(func.count())
-            .select_from(ReviewLog)
-            .where(
+        result = await self.db.execute(
+            select(
+                func.count(),
+                func.sum(case((ReviewLog.review_time >= today_start, 1), else_=0)),
+                func.sum(case((ReviewLog.review_time >= week_start_ms, 1), else_=0)),
+                func.sum(ReviewLog.rating),
+                func.sum(case((ReviewLog.rating >= 3, 1), else_=0)),
+            ).where(
                 ReviewLog.user_id == user_id,
                 ReviewLog.deleted_at.is_(None),
             )
         )
-        total_reviews = total_result.scalar() or 0
+        return _build_stats(*result.one())
 
-        # 今日复习次数
-        today_result = await self.db.execute(
-            select(func.count())
-            .select_from(ReviewLog)
-            .where(
-                ReviewLog.user_id == user_id,
-                ReviewLog.deleted_at.is_(None),
-                ReviewLog.review_time >= today_start,
+
+class ReviewDailyStatRepository(BaseRepository[ReviewDailyStat]):
+    """每日复习汇总数据访问层"""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(ReviewDailyStat, db)
+
+    async def add_reviews(self, user_id: str, reviews: Iterable[tuple[int, int, int | None]]) -> None:
+        """
+        将新写入的复习日志累加到每日汇总
+
+        Args:
+            user_id: 用户 ID
+            reviews: (复习时间（毫秒）, 评分, 耗时（毫秒）) 序列
+        """
+        days: dict[date, dict[str, int]] = {}
+        for review_time, rating, duration_ms in reviews:
+            row = days.setdefault(
+                review_day(review_time), {"review_count": 0, "rating_sum": 0, "good_count": 0, "duration_ms": 0}
             )
-        )
-        reviews_today = today_result.scalar() or 0
+            row["review_count"] += 1
+            row["rating_sum"] += rating
+            row["good_count"] += rating >= 3
+            row["duration_ms"] += duration_ms or 0
+        if not days:
+            return
 
-        # 本周复习次数
-        week_result = await self.db.execute(
-            select(func.count())
-            .select_from(ReviewLog)
-            .where(
-                ReviewLog.user_id == user_id,
-                ReviewLog.deleted_at.is_(None),
-                ReviewLog.review_time >= week_start,
+        insert_stmt = postgresql.insert if self.db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        stmt = insert_stmt(ReviewDailyStat).values(
+            [{"user_id": user_id, "day": day, **counts} for day, counts in days.items()]
+        )
+        # 并发写入同一天时由数据库原子累加
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[ReviewDailyStat.user_id, ReviewDailyStat.day],
+                set_={column: getattr(ReviewDailyStat, column) + stmt.excluded[column] for column in DAILY_COUNTERS},
             )
         )
-        reviews_this_week = week_result.scalar() or 0
 
-        # 平均评分
-        avg_result = await self.db.execute(
-            select(func.avg(ReviewLog.rating)).where(
-                ReviewLog.user_id == user_id,
-                ReviewLog.deleted_at.is_(None),
-            )
+    async def get_stats(self, user_id: str) -> dict:
+        """
+        从每日汇总计算复习统计（单条条件聚合查询）
+
+        Args:
+            user_id: 用户 ID
+
+        Returns:
+            统计数据
+        """
+        today = stats_today()
+        week_start = today - timedelta(days=today.weekday())
+        result = await self.db.execute(
+            select(
+                func.sum(ReviewDailyStat.review_count),
+                func.sum(case((ReviewDailyStat.day == today, ReviewDailyStat.review_count), else_=0)),
+                func.sum(case((ReviewDailyStat.day >= week_start, ReviewDailyStat.review_count), else_=0)),
+                func.sum(ReviewDailyStat.rating_sum),
+                func.sum(ReviewDailyStat.good_count),
+            ).where(ReviewDailyStat.user_id == user_id)
         )
-        average_rating = avg_result.scalar() or 0.0
+        return _build_stats(*result.one())
 
-        # 记忆保持率（Good/Easy 比例）
-        good_easy_result = await self.db.execute(
-            select(func.count())
-            .select_from(ReviewLog)
+    async def get_daily(self, user_id: str, start_day: date, end_day: date) -> list[ReviewDailyStat]:
+        """
+        获取日期范围内的每日汇总（没有复习的日期不返回）
+
+        Args:
+            user_id: 用户 ID
+            start_day: 开始日期（包含）
+            end_day: 结束日期（包含）
+
+        Returns:
+            每日汇总列表，按日期升序
+        """
+        result = await self.db.execute(
+            select(ReviewDailyStat)
             .where(
-                ReviewLog.user_id == user_id,
-                ReviewLog.deleted_at.is_(None),
-                ReviewLog.rating >= 3,
+                ReviewDailyStat.user_id == user_id,
+                ReviewDailyStat.day >= start_day,
+                ReviewDailyStat.day <= end_day,
             )
+            .order_by(ReviewDailyStat.day)
         )
-        good_easy_count = good_easy_result.scalar() or 0
-        retention_rate = (good_easy_count / total_reviews * 100) if total_reviews > 0 else 0.0
-
-        return {
-            "total_reviews": total_reviews,
-            "reviews_today": reviews_today,
-            "reviews_this_week": reviews_this_week,
-            "average_rating": round(float(average_rating), 2),
-            "retention_rate": round(retention_rate, 2),
-        }
+        return list(result.scalars().all())
@@ -4,12 +4,36 @@
 封装 SharedDeck 相关的数据库操作
 """
 
-from sqlalchemy import func, or_, select
+from collections.abc import Mapping
+from typing import Any, cast
+
+from sqlalchemy import (
+    ColumnElement,
+    Float,
+    Integer,
+    Subquery,
+    Table,
+    bindparam,
+    delete,
+    func,
+    literal_column,
+    select,
+    text,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.models.shared_deck import SharedDeck, SharedDeckSnapshot
-from app.repositories.base import BaseRepository
+from app.models.shared_deck import SHARED_DECK_TSVECTOR, SharedDeck, SharedDeckSearch, SharedDeckSnapshot
+from app.repositories.base import BaseRepository, SortKey
+from app.repositories.tag import TagRepository
+from app.utils import search_text
+
+# 参与全文搜索的字段
+SEARCH_FIELDS = frozenset({"title", "description", "tags"})
+
+# FTS5 bm25 各列权重（title、description、tags）
+_FTS5_RANK = "bm25(shared_deck_fts, 10.0, 2.0, 5.0)"
 
 
 class SharedDeckRepository(BaseRepository[SharedDeck]):
@@ -17,6 +41,7 @@ class SharedDeckRepository(BaseRepository[SharedDeck]):
 
     def __init__(self, db: AsyncSession):
         super().__init__(SharedDeck, db)
+        self.tag_repo = TagRepository(db)
 
     async def get_by_slug(self, slug: str) -> SharedDeck | None:
         """
@@ -52,6 +77,109 @@ class SharedDeckRepository(BaseRepository[SharedDeck]):
         )
         return result.scalar_one_or_none()
 
+    async def create(self, obj_in: dict[str, Any]) -> SharedDeck:
+        """
+        创建共享牌组并加入搜索索引和标签索引
+
+        Args:
+            obj_in: 创建数据
+
+        Returns:
+            创建的 SharedDeck 实例
+        """
+        shared_deck = await super().create(obj_in)
+        await self.sync_search_index(shared_deck)
+        await self.tag_repo.set_shared_deck_tags(shared_deck.id, shared_deck.tags)
+        return shared_deck
+
+    async def update(self, db_obj: SharedDeck, obj_in: dict[str, Any]) -> SharedDeck:
+        """
+        更新共享牌组，搜索字段变化时同步搜索索引和标签索引
+
+        Args:
+            db_obj: 要更新的共享牌组
+            obj_in: 更新数据
+
+        Returns:
+            更新后的 SharedDeck 实例
+        """
+        shared_deck = await super().update(db_obj, obj_in)
+        if SEARCH_FIELDS & obj_in.keys():
+            await self.sync_search_index(shared_deck)
+        if obj_in.get("tags") is not None:
+            await self.tag_repo.set_shared_deck_tags(shared_deck.id, shared_deck.tags)
+        return shared_deck
+
+    async def delete(self, id: str, *, soft_delete: bool = True) -> bool:
+        """
+        删除共享牌组并移出搜索索引和标签索引
+
+        Args:
+            id: 共享牌组 ID
+            soft_delete: 是否软删除
+
+        Returns:
+            是否删除成功
+        """
+        deleted = await super().delete(id, soft_delete=soft_delete)
+        if deleted:
+            await self.db.execute(delete(SharedDeckSearch).where(SharedDeckSearch.shared_deck_id == id))
+            await self.tag_repo.remove_shared_deck_tags(id)
+        return deleted
+
+    async def sync_search_index(self, shared_deck: SharedDeck) -> None:
+        """
+        写入或更新共享牌组的搜索索引
+
+        Args:
+            shared_deck: 共享牌组
+        """
+        values = {
+            "title": search_text.segment(shared_deck.title),
+            "description": search_text.segment(shared_deck.description),
+            "tags": search_text.segment(" ".join(shared_deck.tags or [])),
+        }
+        entry = await self.db.scalar(select(SharedDeckSearch).where(SharedDeckSearch.shared_deck_id == shared_deck.id))
+        if entry is None:
+            self.db.add(SharedDeckSearch(shared_deck_id=shared_deck.id, **values))
+        else:
+            for field, value in values.items():
+                setattr(entry, field, value)
+        await self.db.flush()
+
+    def _match_search(self, q: str) -> Subquery | None:
+        """
+        构造全文搜索子查询
+
+        Args:
+            q: 搜索关键词
+
+        Returns:
+            包含 shared_deck_id 和 rank（越小越相关）两列的子查询；关键词中没有可搜索的词时返回 None
+        """
+        terms = search_text.parse_query(q)
+        if not terms:
+            return None
+
+        if self.db.get_bind().dialect.name == "postgresql":
+            document: ColumnElement[Any] = literal_column(f"({SHARED_DECK_TSVECTOR})")
+            tsquery = func.to_tsquery("simple", search_text.to_tsquery(terms))
+            return (
+                select(SharedDeckSearch.shared_deck_id, (-func.ts_rank(document, tsquery, type_=Float)).label("rank"))
+                .where(document.op("@@")(tsquery))
+                .subquery()
+            )
+
+        fts = (
+            text(f"SELECT rowid, {_FTS5_RANK} AS rank FROM shared_deck_fts WHERE shared_deck_fts MATCH :match")
+            .bindparams(match=search_text.to_fts5_query(terms))
+            .columns(rowid=Integer, rank=Float)
+            .subquery()
+        )
+        return (
+            select(SharedDeckSearch.shared_deck_id, fts.c.rank).join(fts, fts.c.rowid == SharedDeckSearch.id).subquery()
+        )
+
     async def search(
         self,
         *,
@@ -63,7 +191,9 @@ class SharedDeckRepository(BaseRepository[SharedDeck]):
         author_id: str | None = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[list[SharedDeck], int]:
+        cursor: str | None = None,
+        with_total: bool = True,
+    ) -> tuple[list[SharedDeck], int | None, str | None]:
         """
         搜索共享牌组
 
@@ -76,78 +206,61 @@ class SharedDeckRepository(BaseRepository[SharedDeck]):
             author_id: 作者ID
             skip: 跳过的记录数
             limit: 返回的最大记录数
+            cursor: 分页游标
+            with_total: 是否统计总数
 
         Returns:
-            (共享牌组列表, 总数) 元组
+            (共享牌组列表, 总数, 下一页游标) 元组
         """
         # 基础查询 - 只返回已上架的
         query = select(SharedDeck).where(
             SharedDeck.deleted_at.is_(None),
             SharedDeck.is_active == True,  # noqa: E712
         )
-        count_query = (
-            select(func.count())
-            .select_from(SharedDeck)
-            .where(
-                SharedDeck.deleted_at.is_(None),
-                SharedDeck.is_active == True,  # noqa: E712
-            )
-        )
 
         # 语言过滤
         if language:
             query = query.where(SharedDeck.language == language)
-            count_query = count_query.where(SharedDeck.language == language)
 
-        # 标签过滤
+        # 标签过滤（精确匹配）
         if tag:
-            tag_filter = SharedDeck.tags.cast(str).like(f"%{tag}%")
-            query = query.where(tag_filter)
-            count_query = count_query.where(tag_filter)
-
-        # 关键词搜索
-        if q:
-            keyword_filter = or_(
-                SharedDeck.title.like(f"%{q}%"),
-                SharedDeck.description.like(f"%{q}%"),
-            )
-            query = query.where(keyword_filter)
-            count_query = count_query.where(keyword_filter)
+            query = query.where(TagRepository.shared_deck_tag_filter(tag))
+
+        # 关键词全文搜索（标题、描述、标签），结果按相关度排序
+        match = self._match_search(q) if q else None
+        if q and match is None:
+            return [], 0, None
+        if match is not None:
+            query = query.join(match, match.c.shared_deck_id == SharedDeck.id)
 
         # 精选过滤
         if is_featured is not None:
             query = query.where(SharedDeck.is_featured == is_featured)
-            count_query = count_query.where(SharedDeck.is_featured == is_featured)
 
         # 官方过滤
         if is_official is not None:
             query = query.where(SharedDeck.is_official == is_official)
-            count_query = count_query.where(SharedDeck.is_official == is_official)
 
         # 作者过滤
         if author_id:
             query = query.where(SharedDeck.author_id == author_id)
-            count_query = count_query.where(SharedDeck.author_id == author_id)
-
-        # 获取总数
-        count_result = await self.db.execute(count_query)
-        total = count_result.scalar() or 0
-
-        # 分页查询 - 按精选、官方、下载量排序
-        query = (
-            query.order_by(
-                SharedDeck.is_featured.desc(),
-                SharedDeck.is_official.desc(),
-                SharedDeck.download_count.desc(),
-                SharedDeck.created_at.desc(),
-            )
-            .offset(skip)
-            .limit(limit)
-        )
-        result = await self.db.execute(query)
-        items = list(result.scalars().all())
 
-        return items, total
+        # 搜索时先按相关度，再按精选、官方、下载量排序
+        order_by: list[SortKey] = [(match.c.rank, False)] if match is not None else []
+        order_by += [
+            (SharedDeck.is_featured, True),
+            (SharedDeck.is_official, True),
+            (SharedDeck.download_count, True),
+            (SharedDeck.created_at, True),
+        ]
+        return await self.paginate(
+            query,
+            order_by,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            with_total=with_total,
+        )
 
     async def slug_exists(self, slug: str, exclude_id: str | None = None) -> bool:
         """
@@ -169,17 +282,45 @@ class SharedDeckRepository(BaseRepository[SharedDeck]):
         result = await self.db.execute(query)
         return result.scalar_one_or_none() is not None
 
-    async def increment_download_count(self, id: str) -> None:
+    async def content_hash_in_use(self, content_hash: str, exclude_id: str | None = None) -> bool:
         """
-        增加下载计数
+        检查是否有共享牌组的当前版本使用该内容哈希
 
         Args:
-            id: 共享牌组 ID
+            content_hash: 快照内容哈希
+            exclude_id: 排除的 ID
+
+        Returns:
+            是否在使用
+        """
+        query = select(SharedDeck.id).where(
+            SharedDeck.content_hash == content_hash,
+            SharedDeck.deleted_at.is_(None),
+        )
+        if exclude_id:
+            query = query.where(SharedDeck.id != exclude_id)
+        result = await self.db.execute(query.limit(1))
+        return result.scalar_one_or_none() is not None
+
+    async def add_download_counts(self, counts: Mapping[str, int]) -> None:
+        """
+        原子地累加下载计数（UPDATE ... SET download_count = download_count + :n，不修改 updated_at）
+
+        Args:
+            counts: 共享牌组 ID -> 增量
         """
-        deck = await self.get_by_id(id)
-        if deck:
-            deck.download_count += 1
-            await self.db.flush()
+        if not counts:
+            return
+        table = cast(Table, SharedDeck.__table__)
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("shared_deck_id"))
+            .values(
+                download_count=table.c.download_count + bindparam("increment"),
+                updated_at=table.c.updated_at,
+            )
+        )
+        await self.db.execute(stmt, [{"shared_deck_id": id, "increment": count} for id, count in counts.items()])
 
 
 class SharedDeckSnapshotRepository(BaseRepository[SharedDeckSnapshot]):
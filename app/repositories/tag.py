@@ -0,0 +1,212 @@
+"""
+标签 Repository
+
+维护规范化标签字典以及笔记、共享牌组与标签的关联，提供按标签过滤和标签计数
+"""
+
+from collections.abc import Iterable, Sequence
+
+from sqlalchemy import ColumnElement, delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.note import Note
+from app.models.shared_deck import SharedDeck
+from app.models.tag import NoteTag, SharedDeckTag, Tag
+from app.repositories.base import BaseRepository
+
+# 单条 SQL 中的最大参数数量（按块查询和写入）
+TAG_CHUNK_SIZE = 500
+
+# 标签名最大长度
+MAX_TAG_LENGTH = 100
+
+
+def normalize_tags(tags: Iterable[str] | None) -> list[str]:
+    """
+    规范化标签列表：去除首尾空白、丢弃空标签和超长标签、去重（保留顺序）
+
+    Args:
+        tags: 原始标签列表
+
+    Returns:
+        规范化后的标签列表
+    """
+    names = (tag.strip() for tag in tags or ())
+    return list(dict.fromkeys(name for name in names if name and len(name) <= MAX_TAG_LENGTH))
+
+
+class TagRepository(BaseRepository[Tag]):
+    """标签数据访问层"""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(Tag, db)
+
+    async def get_or_create_ids(self, names: Iterable[str]) -> dict[str, int]:
+        """
+        获取标签 ID，不存在的标签自动创建
+
+        Args:
+            names: 规范化后的标签名
+
+        Returns:
+            标签名 -> 标签 ID 字典
+        """
+        names = list(dict.fromkeys(names))
+        insert_stmt = postgresql.insert if self.db.get_bind().dialect.name == "postgresql" else sqlite.insert
+        ids: dict[str, int] = {}
+        for start in range(0, len(names), TAG_CHUNK_SIZE):
+            chunk = names[start : start + TAG_CHUNK_SIZE]
+            # 并发写入同一个新标签时以先写入的为准
+            await self.db.execute(
+                insert_stmt(Tag)
+                .values([{"name": name} for name in chunk])
+                .on_conflict_do_nothing(index_elements=["name"])
+            )
+            result = await self.db.execute(select(Tag.name, Tag.id).where(Tag.name.in_(chunk)))
+            ids.update(result.tuples().all())
+        return ids
+
+    async def add_note_tags(self, notes: Sequence[tuple[str, str, Iterable[str]]]) -> None:
+        """
+        为新建的笔记写入标签关联
+
+        Args:
+            notes: (笔记 ID, 用户 ID, 标签列表) 序列
+        """
+        normalized = [(note_id, user_id, normalize_tags(tags)) for note_id, user_id, tags in notes]
+        tag_ids = await self.get_or_create_ids(name for _, _, names in normalized for name in names)
+        rows = [
+            {"note_id": note_id, "user_id": user_id, "tag_id": tag_ids[name]}
+            for note_id, user_id, names in normalized
+            for name in names
+        ]
+        for start in range(0, len(rows), TAG_CHUNK_SIZE):
+            await self.db.execute(insert(NoteTag), rows[start : start + TAG_CHUNK_SIZE])
+
+    async def set_note_tags(self, note_id: str, user_id: str, tags: Iterable[str]) -> None:
+        """
+        替换笔记的标签关联
+
+        Args:
+            note_id: 笔记 ID
+            user_id: 用户 ID
+            tags: 新的标签列表
+        """
+        await self.remove_note_tags(note_id)
+        await self.add_note_tags([(note_id, user_id, tags)])
+
+    async def remove_note_tags(self, note_id: str) -> None:
+        """
+        删除笔记的全部标签关联
+
+        Args:
+            note_id: 笔记 ID
+        """
+        await self.db.execute(delete(NoteTag).where(NoteTag.note_id == note_id))
+
+    async def set_shared_deck_tags(self, shared_deck_id: str, tags: Iterable[str]) -> None:
+        """
+        替换共享牌组的标签关联
+
+        Args:
+            shared_deck_id: 共享牌组 ID
+            tags: 新的标签列表
+        """
+        await self.remove_shared_deck_tags(shared_deck_id)
+        tag_ids = await self.get_or_create_ids(normalize_tags(tags))
+        if tag_ids:
+            await self.db.execute(
+                insert(SharedDeckTag),
+                [{"shared_deck_id": shared_deck_id, "tag_id": tag_id} for tag_id in tag_ids.values()],
+            )
+
+    async def remove_shared_deck_tags(self, shared_deck_id: str) -> None:
+        """
+        删除共享牌组的全部标签关联
+
+        Args:
+            shared_deck_id: 共享牌组 ID
+        """
+        await self.db.execute(delete(SharedDeckTag).where(SharedDeckTag.shared_deck_id == shared_deck_id))
+
+    @staticmethod
+    def note_tag_filter(user_id: str, tag: str) -> ColumnElement[bool]:
+        """
+        构造“笔记带有指定标签”的过滤条件
+
+        Args:
+            user_id: 用户 ID
+            tag: 标签名（精确匹配）
+
+        Returns:
+            可用于 Note 查询的过滤条件
+        """
+        return Note.id.in_(
+            select(NoteTag.note_id)
+            .join(Tag, Tag.id == NoteTag.tag_id)
+            .where(NoteTag.user_id == user_id, Tag.name == tag.strip())
+        )
+
+    @staticmethod
+    def shared_deck_tag_filter(tag: str) -> ColumnElement[bool]:
+        """
+        构造“共享牌组带有指定标签”的过滤条件
+
+        Args:
+            tag: 标签名（精确匹配）
+
+        Returns:
+            可用于 SharedDeck 查询的过滤条件
+        """
+        return SharedDeck.id.in_(
+            select(SharedDeckTag.shared_deck_id)
+            .join(Tag, Tag.id == SharedDeckTag.tag_id)
+            .where(Tag.name == tag.strip())
+        )
+
+    async def get_note_tag_counts(self, user_id: str, deck_id: str | None = None) -> list[tuple[str, int]]:
+        """
+        统计用户每个标签下的笔记数
+
+        Args:
+            user_id: 用户 ID
+            deck_id: 只统计指定牌组
+
+        Returns:
+            (标签名, 笔记数) 列表，按标签名排序
+        """
+        counts = (
+            select(NoteTag.tag_id, func.count().label("count"))
+            .where(NoteTag.user_id == user_id)
+            .group_by(NoteTag.tag_id)
+        )
+        if deck_id:
+            counts = counts.join(Note, Note.id == NoteTag.note_id).where(Note.deck_id == deck_id)
+        subquery = counts.subquery()
+        result = await self.db.execute(
+            select(Tag.name, subquery.c.count).join(subquery, subquery.c.tag_id == Tag.id).order_by(Tag.name)
+        )
+        return [(name, count) for name, count in result.all()]
+
+    async def get_shared_deck_tag_counts(self, limit: int = 100) -> list[tuple[str, int]]:
+        """
+        统计已上架共享牌组中每个标签的牌组数
+
+        Args:
+            limit: 返回的最大标签数
+
+        Returns:
+            (标签名, 牌组数) 列表，按牌组数降序
+        """
+        count = func.count().label("count")
+        result = await self.db.execute(
+            select(Tag.name, count)
+            .join(SharedDeckTag, SharedDeckTag.tag_id == Tag.id)
+            .join(SharedDeck, SharedDeck.id == SharedDeckTag.shared_deck_id)
+            .where(SharedDeck.is_active == True)  # noqa: E712
+            .group_by(Tag.id, Tag.name)
+            .order_by(count.desc(), Tag.name)
+            .limit(limit)
+        )
+        return [(name, count) for name, count in result.all()]
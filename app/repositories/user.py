@@ -51,7 +51,9 @@ class UserRepository(BaseRepository[User]):
         is_superuser: bool | None = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> tuple[list[User], int]:
+        cursor: str | None = None,
+        with_total: bool = True,
+    ) -> tuple[list[User], int | None, str | None]:
         """
         搜索用户（支持关键词、状态过滤和分页）
 
@@ -61,13 +63,14 @@ class UserRepository(BaseRepository[User]):
             is_superuser: 超级管理员过滤
             skip: 跳过的记录数
             limit: 返回的最大记录数
+            cursor: 分页游标
+            with_total: 是否统计总数
 
         Returns:
-            (用户列表, 总数) 元组
+            (用户列表, 总数, 下一页游标) 元组
         """
         # 基础查询
         query = select(User).where(User.deleted_at.is_(None))
-        count_query = select(User).where(User.deleted_at.is_(None))
 
         # 关键词搜索
         if keyword:
@@ -77,30 +80,23 @@ class UserRepository(BaseRepository[User]):
                 User.nickname.like(f"%{keyword}%"),
             )
             query = query.where(keyword_filter)
-            count_query = count_query.where(keyword_filter)
 
         # 激活状态过滤
         if is_active is not None:
             query = query.where(User.is_active == is_active)
-            count_query = count_query.where(User.is_active == is_active)
 
         # 超级管理员过滤
         if is_superuser is not None:
             query = query.where(User.is_superuser == is_superuser)
-            count_query = count_query.where(User.is_superuser == is_superuser)
 
-        # 获取总数
-        from sqlalchemy import func
-
-        count_result = await self.db.execute(select(func.count()).select_from(count_query.subquery()))
-        total = count_result.scalar() or 0
-
-        # 分页查询
-        query = query.order_by(User.created_at.desc()).offset(skip).limit(limit)
-        result = await self.db.execute(query)
-        users = list(result.scalars().all())
-
-        return users, total
+        return await self.paginate(
+            query,
+            [(User.created_at, True)],
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            with_total=with_total,
+        )
 
     async def username_exists(self, username: str, exclude_id: str | None = None) -> bool:
         """
@@ -0,0 +1,30 @@
+"""
+调度算法模块
+
+在服务端实现与前端一致的 SM-2 和 FSRS（ts-fsrs 的 FSRS-6）调度，供批量重排、到期预测、导入等使用。
+向量化的批量接口位于 app.scheduler.batch，参数优化位于 app.scheduler.optimizer（均依赖 NumPy，按需导入）。
+"""
+
+from app.scheduler.base import (
+    DAY_MS,
+    MINUTE_MS,
+    SchedulableCard,
+    ScheduleResult,
+    SchedulerType,
+)
+from app.scheduler.engine import schedule
+from app.scheduler.fsrs import FSRS_DEFAULT_WEIGHTS, FSRSParameters, schedule_fsrs
+from app.scheduler.sm2 import schedule_sm2
+
+__all__ = [
+    "DAY_MS",
+    "MINUTE_MS",
+    "SchedulableCard",
+    "SchedulerType",
+    "ScheduleResult",
+    "schedule",
+    "schedule_sm2",
+    "schedule_fsrs",
+    "FSRSParameters",
+    "FSRS_DEFAULT_WEIGHTS",
+]
@@ -0,0 +1,62 @@
+"""
+调度器公共类型
+
+定义调度器读取的卡片字段、调度结果，以及与前端（TypeScript）保持一致的数值工具
+"""
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Literal, Protocol
+
+# 调度器类型（与前端 SchedulerType 一致）
+SchedulerType = Literal["sm2", "fsrs_v4", "fsrs_v5"]
+CardState = Literal["new", "learning", "review", "relearning"]
+CardQueue = Literal["new", "learning", "review", "suspended"]
+Rating = Literal[1, 2, 3, 4]
+
+MINUTE_MS = 60 * 1000
+DAY_MS = 24 * 60 * MINUTE_MS
+
+
+class SchedulableCard(Protocol):
+    """调度器读取的卡片字段（Card 模型、CardResponse 等均满足）"""
+
+    state: str
+    interval: int
+    ease_factor: int
+    stability: float
+    difficulty: float
+    last_review: int | None
+
+
+@dataclass(slots=True)
+class ScheduleResult:
+    """单张卡片的调度结果（字段与 CardUpdate 对应）"""
+
+    state: CardState
+    queue: CardQueue
+    due: int
+    interval: int
+    ease_factor: int
+    stability: float
+    difficulty: float
+
+
+def js_round(value: float) -> int:
+    """与 JavaScript Math.round 一致的取整（.5 向上取整，而不是 Python round 的银行家舍入）"""
+    return math.floor(value + 0.5)
+
+
+def now_ms() -> int:
+    """当前时间戳（毫秒）"""
+    return int(time.time() * 1000)
+
+
+def queue_for_state(state: CardState) -> CardQueue:
+    """调度后卡片所在的队列"""
+    if state == "new":
+        return "new"
+    if state == "review":
+        return "review"
+    return "learning"
@@ -0,0 +1,317 @@
+"""
+批量调度（NumPy 向量化）
+
+对一批卡片同时应用评分，用于批量重排、到期预测、导入等需要在服务端计算大量卡片间隔的场景。
+FSRS 复用 app.scheduler.fsrs 中的公式（以 NumPy 逐元素运算代入），SM-2 按 sm2.py 的分支逐项向量化，
+结果与标量实现逐张一致。
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.scheduler.base import (
+    DAY_MS,
+    MINUTE_MS,
+    CardState,
+    SchedulableCard,
+    ScheduleResult,
+    SchedulerType,
+    now_ms,
+    queue_for_state,
+)
+from app.scheduler.fsrs import (
+    S_MIN,
+    FSRSParameters,
+    MathOps,
+    init_difficulty,
+    init_stability,
+    learning_step_minutes,
+    next_interval,
+    next_state,
+    review_intervals,
+)
+from app.scheduler.sm2 import INITIAL_EASE_FACTOR, MAX_INTERVAL, MIN_EASE_FACTOR
+
+# 状态编码：数组中以下标表示状态
+STATES: tuple[CardState, ...] = ("new", "learning", "review", "relearning")
+NEW, LEARNING, REVIEW, RELEARNING = range(len(STATES))
+
+NUMPY_OPS = MathOps(
+    exp=np.exp,
+    floor=np.floor,
+    minimum=np.minimum,
+    maximum=np.maximum,
+    where=np.where,
+    round=np.round,
+)
+
+
+@dataclass(slots=True)
+class CardBatch:
+    """一批卡片的调度字段（每个字段为等长的一维数组）"""
+
+    state: np.ndarray
+    interval: np.ndarray
+    ease_factor: np.ndarray
+    stability: np.ndarray
+    difficulty: np.ndarray
+    last_review: np.ndarray
+
+    def __post_init__(self) -> None:
+        self.state = np.asarray(self.state, dtype=np.int8)
+        self.interval = np.asarray(self.interval, dtype=np.int64)
+        self.ease_factor = np.asarray(self.ease_factor, dtype=np.int64)
+        self.stability = np.asarray(self.stability, dtype=np.float64)
+        self.difficulty = np.asarray(self.difficulty, dtype=np.float64)
+        self.last_review = np.asarray(self.last_review, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.state)
+
+    @classmethod
+    def from_cards(cls, cards: Iterable[SchedulableCard]) -> "CardBatch":
+        """
+        由卡片对象构造（last_review 为空时记为 0）
+
+        Args:
+            cards: 卡片
+
+        Returns:
+            卡片批次
+        """
+        rows = [
+            (
+                STATES.index(card.state),
+                card.interval,
+                card.ease_factor,
+                card.stability,
+                card.difficulty,
+                card.last_review or 0,
+            )
+            for card in cards
+        ]
+        columns = list(zip(*rows, strict=True)) if rows else [()] * 6
+        return cls(*(np.asarray(column) for column in columns))
+
+
+@dataclass(slots=True)
+class ScheduleBatchResult:
+    """批量调度结果（每个字段为等长的一维数组）"""
+
+    state: np.ndarray
+    due: np.ndarray
+    interval: np.ndarray
+    ease_factor: np.ndarray
+    stability: np.ndarray
+    difficulty: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.state)
+
+    def to_results(self) -> list[ScheduleResult]:
+        """
+        转换为逐张卡片的调度结果
+
+        Returns:
+            调度结果列表
+        """
+        results = []
+        for state, due, interval, ease_factor, stability, difficulty in zip(
+            self.state.tolist(),
+            self.due.tolist(),
+            self.interval.tolist(),
+            self.ease_factor.tolist(),
+            self.stability.tolist(),
+            self.difficulty.tolist(),
+            strict=True,
+        ):
+            results.append(
+                ScheduleResult(
+                    state=STATES[state],
+                    queue=queue_for_state(STATES[state]),
+                    due=due,
+                    interval=interval,
+                    ease_factor=ease_factor,
+                    stability=stability,
+                    difficulty=difficulty,
+                )
+            )
+        return results
+
+
+def _check_ratings(cards: CardBatch, ratings: np.ndarray | Iterable[int]) -> np.ndarray:
+    g = np.asarray(ratings, dtype=np.int64)
+    if g.shape != (len(cards),):
+        raise ValueError("评分数量与卡片数量不一致")
+    if g.size and (g.min() < 1 or g.max() > 4):
+        raise ValueError("评分必须在 1 到 4 之间")
+    return g
+
+
+def schedule_fsrs_batch(
+    cards: CardBatch,
+    ratings: np.ndarray | Iterable[int],
+    *,
+    now: int | None = None,
+    params: FSRSParameters | None = None,
+    rng: np.random.Generator | None = None,
+) -> ScheduleBatchResult:
+    """
+    FSRS 批量调度
+
+    Args:
+        cards: 卡片批次
+        ratings: 每张卡片的评分 (1=Again, 2=Hard, 3=Good, 4=Easy)
+        now: 复习时间戳（毫秒），默认为当前时间
+        params: FSRS 参数，默认为 ts-fsrs 默认参数
+        rng: 间隔扰动使用的随机数生成器（仅 enable_fuzz 时使用）
+
+    Returns:
+        批量调度结果
+
+    Raises:
+        ValueError: 评分数量或取值无效
+    """
+    if now is None:
+        now = now_ms()
+    params = params or FSRSParameters()
+    g = _check_ratings(cards, ratings)
+    w = np.asarray(params.weights, dtype=np.float64)
+    n = len(cards)
+
+    is_new = cards.state == NEW
+    is_review = cards.state == REVIEW
+    is_relearning = cards.state == RELEARNING
+    elapsed = np.where(is_new | (cards.last_review <= 0), 0, np.maximum(0, now // DAY_MS - cards.last_review // DAY_MS))
+    has_memory = ~is_new & (cards.stability >= S_MIN) & (cards.difficulty >= 1)
+    # 没有有效记忆状态的行先用占位值参与计算（避免非法的幂运算），再替换为按评分初始化的值
+    d = np.where(has_memory, cards.difficulty, 5.0)
+    s = np.where(has_memory, cards.stability, 1.0)
+
+    def memory(grade: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        next_d, next_s = next_state(w, d, s, elapsed, grade, enable_short_term=params.enable_short_term, ops=NUMPY_OPS)
+        return (
+            np.where(has_memory, next_d, init_difficulty(w, grade, NUMPY_OPS)),
+            np.where(has_memory, next_s, init_stability(w, grade, NUMPY_OPS)),
+        )
+
+    fuzz_factor = (rng or np.random.default_rng()).random(n) if params.enable_fuzz else None
+    difficulty, stability = memory(g)
+
+    # 复习卡片的 Hard/Good/Easy 间隔需要同时计算三种评分的稳定性以保证递增
+    stabilities = (memory(np.full(n, 2))[1], memory(np.full(n, 3))[1], memory(np.full(n, 4))[1])
+    review = np.choose(np.clip(g - 2, 0, 2), review_intervals(stabilities, elapsed, params, NUMPY_OPS, fuzz_factor))
+    graduate = next_interval(stability, elapsed, params, NUMPY_OPS, fuzz_factor)
+    interval = np.where(is_review & (g >= 2), review, graduate)
+
+    # 学习/重学步骤：评分 -> 等待分钟数，0 表示毕业
+    learn_table = np.array([0, *(learning_step_minutes(params.learning_steps, r) or 0 for r in range(1, 5))])
+    relearn_table = np.array([0, *(learning_step_minutes(params.relearning_steps, r) or 0 for r in range(1, 5))])
+    minutes = np.where(
+        is_review,
+        np.where(g == 1, relearn_table[g], 0),
+        np.where(is_relearning, relearn_table[g], learn_table[g]),
+    )
+    in_steps = minutes > 0
+
+    interval = np.where(in_steps, 0, interval).astype(np.int64)
+    return ScheduleBatchResult(
+        state=np.where(in_steps, np.where(is_review | is_relearning, RELEARNING, LEARNING), REVIEW).astype(np.int8),
+        due=np.where(in_steps, now + minutes * MINUTE_MS, now + interval * DAY_MS).astype(np.int64),
+        interval=interval,
+        ease_factor=np.floor(2500 * (1 - difficulty / 10) + 0.5).astype(np.int64),
+        stability=stability.astype(np.float64),
+        difficulty=difficulty.astype(np.float64),
+    )
+
+
+def schedule_sm2_batch(
+    cards: CardBatch, ratings: np.ndarray | Iterable[int], *, now: int | None = None
+) -> ScheduleBatchResult:
+    """
+    SM-2 批量调度
+
+    Args:
+        cards: 卡片批次
+        ratings: 每张卡片的评分 (1=Again, 2=Hard, 3=Good, 4=Easy)
+        now: 复习时间戳（毫秒），默认为当前时间
+
+    Returns:
+        批量调度结果（稳定性和难度保持不变）
+
+    Raises:
+        ValueError: 评分数量或取值无效
+    """
+    if now is None:
+        now = now_ms()
+    g = _check_ratings(cards, ratings)
+    ease = np.where(cards.ease_factor > 0, cards.ease_factor, INITIAL_EASE_FACTOR)
+    again = g == 1
+    learning = ~again & ((cards.state == NEW) | (cards.state == RELEARNING))
+
+    # 新卡片/重学中的卡片：Hard 5 分钟后，Good 1 天，Easy 4 天
+    learn_interval = np.choose(np.clip(g - 2, 0, 2), (0, 1, 4))
+    learn_ease = np.where(g == 4, ease + 150, ease)
+
+    # 复习中的卡片
+    review_ease = np.maximum(MIN_EASE_FACTOR, ease + np.select([g == 2, g == 4], [-150, 150], 0))
+    review_interval = np.select(
+        [g == 2, g == 3],
+        [
+            np.floor(cards.interval * 1.2 + 0.5),
+            np.floor(cards.interval * (review_ease / 1000) + 0.5),
+        ],
+        np.floor(cards.interval * (review_ease / 1000) * 1.3 + 0.5),
+    )
+    review_interval = np.minimum(MAX_INTERVAL, np.maximum(1, review_interval))
+
+    interval = np.where(again, 0, np.where(learning, learn_interval, review_interval)).astype(np.int64)
+    ease_factor = np.where(
+        again, np.maximum(MIN_EASE_FACTOR, ease - 200), np.where(learning, learn_ease, review_ease)
+    ).astype(np.int64)
+    state = np.where(again, RELEARNING, np.where(learning & (g == 2), LEARNING, REVIEW)).astype(np.int8)
+    due = np.where(
+        again,
+        now + 10 * MINUTE_MS,
+        np.where(learning & (g == 2), now + 5 * MINUTE_MS, now + interval * DAY_MS),
+    ).astype(np.int64)
+    return ScheduleBatchResult(
+        state=state,
+        due=due,
+        interval=interval,
+        ease_factor=ease_factor,
+        stability=cards.stability.copy(),
+        difficulty=cards.difficulty.copy(),
+    )
+
+
+def schedule_batch(
+    cards: CardBatch,
+    ratings: np.ndarray | Iterable[int],
+    scheduler: SchedulerType = "sm2",
+    *,
+    now: int | None = None,
+    params: FSRSParameters | None = None,
+    rng: np.random.Generator | None = None,
+) -> ScheduleBatchResult:
+    """
+    批量执行卡片调度
+
+    Args:
+        cards: 卡片批次
+        ratings: 每张卡片的评分
+        scheduler: 调度器类型
+        now: 复习时间戳（毫秒），默认为当前时间
+        params: FSRS 参数，默认按调度器类型取默认参数
+        rng: 间隔扰动使用的随机数生成器
+
+    Returns:
+        批量调度结果
+    """
+    if scheduler == "sm2":
+        return schedule_sm2_batch(cards, ratings, now=now)
+    return schedule_fsrs_batch(
+        cards, ratings, now=now, params=params or FSRSParameters.for_scheduler(scheduler), rng=rng
+    )
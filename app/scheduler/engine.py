@@ -0,0 +1,44 @@
+"""
+调度器统一入口
+
+根据调度器类型选择 SM-2 或 FSRS 算法（与前端 web/src/scheduler/index.ts 对应）
+"""
+
+import random
+
+from app.scheduler.base import SchedulableCard, ScheduleResult, SchedulerType
+from app.scheduler.fsrs import FSRSParameters, schedule_fsrs
+from app.scheduler.sm2 import schedule_sm2
+
+
+def schedule(
+    card: SchedulableCard,
+    rating: int,
+    scheduler: SchedulerType = "sm2",
+    *,
+    now: int | None = None,
+    params: FSRSParameters | None = None,
+    rng: random.Random | None = None,
+) -> ScheduleResult:
+    """
+    执行卡片调度
+
+    Args:
+        card: 当前卡片
+        rating: 用户评分 (1=Again, 2=Hard, 3=Good, 4=Easy)
+        scheduler: 调度器类型
+        now: 复习时间戳（毫秒），默认为当前时间
+        params: FSRS 参数（例如优化后的个人参数），默认按调度器类型取默认参数
+        rng: 间隔扰动使用的随机数生成器
+
+    Returns:
+        调度结果
+
+    Raises:
+        ValueError: 评分不在 1 到 4 之间
+    """
+    if rating not in (1, 2, 3, 4):
+        raise ValueError("评分必须在 1 到 4 之间")
+    if scheduler == "sm2":
+        return schedule_sm2(card, rating, now=now)
+    return schedule_fsrs(card, rating, now=now, params=params or FSRSParameters.for_scheduler(scheduler), rng=rng)
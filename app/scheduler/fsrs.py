@@ -0,0 +1,412 @@
+"""
+FSRS 调度算法
+
+与前端使用的 ts-fsrs 5.x 一致，实现 FSRS-6：21 个参数，遗忘曲线的衰减指数由参数学习（DECAY = -w[20]）。
+前端对 fsrs_v4 和 fsrs_v5 使用同一组 ts-fsrs 默认参数（generatorParameters），这里同样不区分版本。
+
+调度流程：启用同日短期记忆（enable_short_term），新卡片/学习中的卡片按学习步骤（默认 1m、10m）、
+遗忘的卡片按重学步骤（默认 10m）安排，毕业或复习后的间隔由稳定性和目标保留率计算，
+复习时 Hard/Good/Easy 的间隔保持严格递增。
+
+公式通过 MathOps 参数化，标量实现与 app.scheduler.batch 中的 NumPy 向量化实现共用同一份代码。
+tests/unit/fsrs_golden.json 中的期望值由参考实现生成（scripts/gen_fsrs_golden.py、web/scripts/fsrs-golden.mjs）。
+"""
+
+import math
+import random
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from app.scheduler.base import (
+    DAY_MS,
+    MINUTE_MS,
+    CardState,
+    SchedulableCard,
+    ScheduleResult,
+    SchedulerType,
+    js_round,
+    now_ms,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# FSRS 参数：标量计算时为元组，向量化计算时为 NumPy 数组
+type Weights = Sequence[float] | np.ndarray
+
+# FSRS-6 默认参数（ts-fsrs default_w）
+FSRS_DEFAULT_WEIGHTS: tuple[float, ...] = (
+    0.212,
+    1.2931,
+    2.3065,
+    8.2956,
+    6.4133,
+    0.8334,
+    3.0194,
+    0.001,
+    1.8722,
+    0.1666,
+    0.796,
+    1.4835,
+    0.0614,
+    0.2629,
+    1.6483,
+    0.6014,
+    1.8729,
+    0.5425,
+    0.0912,
+    0.0658,
+    0.1542,
+)
+
+FSRS_WEIGHT_COUNT = len(FSRS_DEFAULT_WEIGHTS)
+
+S_MIN = 0.001
+S_MAX = 36500.0
+
+# 间隔随机扰动的范围：(区间起点, 区间终点, 每天增加的扰动幅度)
+FUZZ_RANGES = ((2.5, 7.0, 0.15), (7.0, 20.0, 0.1), (20.0, math.inf, 0.05))
+
+
+def decay_factor(w: Weights) -> tuple[Any, Any]:
+    """
+    遗忘曲线 R(t, S) = (1 + FACTOR * t / S) ^ DECAY 的系数，满足 R(S, S) = 0.9
+
+    Args:
+        w: FSRS 参数
+
+    Returns:
+        (DECAY, FACTOR) 元组
+    """
+    decay = -w[20]
+    return decay, 0.9 ** (1 / decay) - 1
+
+
+@dataclass(frozen=True, slots=True)
+class FSRSParameters:
+    """FSRS 参数"""
+
+    weights: tuple[float, ...] = FSRS_DEFAULT_WEIGHTS
+    request_retention: float = 0.9
+    maximum_interval: int = 36500
+    learning_steps: tuple[int, ...] = (1, 10)
+    relearning_steps: tuple[int, ...] = (10,)
+    enable_short_term: bool = True
+    enable_fuzz: bool = False
+
+    def __post_init__(self) -> None:
+        if len(self.weights) != FSRS_WEIGHT_COUNT:
+            raise ValueError(f"FSRS 参数个数必须为 {FSRS_WEIGHT_COUNT}（FSRS-6）")
+        if self.weights[20] <= 0:
+            raise ValueError("FSRS 参数 w[20]（遗忘曲线衰减）必须大于 0")
+        if not 0 < self.request_retention < 1:
+            raise ValueError("目标保留率必须在 0 和 1 之间")
+        if self.maximum_interval < 1:
+            raise ValueError("最大间隔不能小于 1 天")
+        if any(not 0 < step < 24 * 60 for step in (*self.learning_steps, *self.relearning_steps)):
+            raise ValueError("学习步骤必须在 1 分钟到 1 天之间")
+
+    @classmethod
+    def for_scheduler(cls, scheduler: SchedulerType, **kwargs: Any) -> "FSRSParameters":
+        """
+        按调度器类型创建默认参数（与前端一致，fsrs_v4 和 fsrs_v5 均为 ts-fsrs 默认参数）
+
+        Args:
+            scheduler: fsrs_v4 或 fsrs_v5
+            **kwargs: 覆盖的其他参数
+
+        Returns:
+            FSRS 参数
+        """
+        if scheduler not in ("fsrs_v4", "fsrs_v5"):
+            raise ValueError(f"不是 FSRS 调度器: {scheduler}")
+        return cls(**kwargs)
+
+    @property
+    def interval_modifier(self) -> float:
+        """稳定性到间隔的换算系数（保留率为 0.9 时为 1）"""
+        decay, factor = decay_factor(self.weights)
+        return float(round((self.request_retention ** (1 / decay) - 1) / factor, 8))
+
+
+@dataclass(frozen=True, slots=True)
+class MathOps:
+    """公式用到的数学运算（标量使用 math 和内置函数，向量化时替换为 NumPy 的逐元素函数）"""
+
+    exp: Callable[[Any], Any]
+    floor: Callable[[Any], Any]
+    minimum: Callable[[Any, Any], Any]
+    maximum: Callable[[Any, Any], Any]
+    where: Callable[[Any, Any, Any], Any]
+    round: Callable[[Any, int], Any]
+
+
+SCALAR_OPS = MathOps(
+    exp=math.exp,
+    floor=math.floor,
+    minimum=min,
+    maximum=max,
+    where=lambda condition, a, b: a if condition else b,
+    round=round,
+)
+
+
+def _clamp(value: Any, low: Any, high: Any, ops: MathOps) -> Any:
+    return ops.minimum(ops.maximum(value, low), high)
+
+
+def _raw_init_difficulty(w: Weights, g: Any, ops: MathOps) -> Any:
+    return ops.round(w[4] - ops.exp((g - 1) * w[5]) + 1, 8)
+
+
+def init_stability(w: Weights, g: Any, ops: MathOps = SCALAR_OPS) -> Any:
+    """首次评分后的稳定性"""
+    return ops.maximum(w[g - 1], S_MIN)
+
+
+def init_difficulty(w: Weights, g: Any, ops: MathOps = SCALAR_OPS) -> Any:
+    """首次评分后的难度"""
+    return _clamp(_raw_init_difficulty(w, g, ops), 1, 10, ops)
+
+
+def next_difficulty(w: Weights, d: Any, g: Any, ops: MathOps = SCALAR_OPS) -> Any:
+    """复习后的难度（对变化量做线性阻尼，并向 Easy 的初始难度回归）"""
+    next_d = d + ops.round(-w[6] * (g - 3) * (10 - d) / 9, 8)
+    reverted = ops.round(w[7] * _raw_init_difficulty(w, 4, ops) + (1 - w[7]) * next_d, 8)
+    return _clamp(reverted, 1, 10, ops)
+
+
+def forgetting_curve(w: Weights, elapsed_days: Any, s: Any, ops: MathOps = SCALAR_OPS) -> Any:
+    """经过 elapsed_days 天后的可提取性"""
+    decay, factor = decay_factor(w)
+    return ops.round((1 + factor * elapsed_days / s) ** decay, 8)
+
+
+def next_recall_stability(w: Weights, d: Any, s: Any, r: Any, g: Any, ops: MathOps = SCALAR_OPS) -> Any:
+    """成功回忆（Hard/Good/Easy）后的稳定性"""
+    hard_penalty = ops.where(g == 2, w[15], 1.0)
+    easy_bonus = ops.where(g == 4, w[16], 1.0)
+    new_s = s * (
+        1 + ops.exp(w[8]) * (11 - d) * s ** (-w[9]) * (ops.exp((1 - r) * w[10]) - 1) * hard_penalty * easy_bonus
+    )
+    return ops.round(_clamp(new_s, S_MIN, S_MAX, ops), 8)
+
+
+def next_forget_stability(w: Weights, d: Any, s: Any, r: Any, ops: MathOps = SCALAR_OPS) -> Any:
+    """遗忘（Again）后的稳定性"""
+    new_s = w[11] * d ** (-w[12]) * ((s + 1) ** w[13] - 1) * ops.exp((1 - r) * w[14])
+    return ops.round(_clamp(new_s, S_MIN, S_MAX, ops), 8)
+
+
+def next_short_term_stability(w: Weights, s: Any, g: Any, ops: MathOps = SCALAR_OPS) -> Any:
+    """同日复习后的稳定性（稳定性越高增幅越小，Good/Easy 不降低稳定性）"""
+    sinc = ops.exp(w[17] * (g - 3 + w[18])) * s ** (-w[19])
+    sinc = ops.where(g >= 3, ops.maximum(sinc, 1.0), sinc)
+    return ops.round(_clamp(s * sinc, S_MIN, S_MAX, ops), 8)
+
+
+def next_state(
+    w: Weights,
+    d: Any,
+    s: Any,
+    elapsed_days: Any,
+    g: Any,
+    *,
+    enable_short_term: bool = True,
+    ops: MathOps = SCALAR_OPS,
+) -> tuple[Any, Any]:
+    """
+    由当前记忆状态和评分计算新的记忆状态
+
+    Args:
+        w: FSRS 参数
+        d: 当前难度
+        s: 当前稳定性
+        elapsed_days: 距上次复习的天数
+        g: 评分
+        enable_short_term: 是否对同日复习使用短期稳定性公式
+        ops: 数学运算
+
+    Returns:
+        (难度, 稳定性) 元组
+    """
+    r = forgetting_curve(w, elapsed_days, s, ops)
+    s_recall = next_recall_stability(w, d, s, r, g, ops)
+    s_forget = next_forget_stability(w, d, s, r, ops)
+    w17, w18 = (w[17], w[18]) if enable_short_term else (0.0, 0.0)
+    # 遗忘后的稳定性不超过同日连续 Again 所能达到的值
+    s_forget = ops.minimum(ops.maximum(ops.round(s / ops.exp(w17 * w18), 8), S_MIN), s_forget)
+    new_s = ops.where(g == 1, s_forget, s_recall)
+    if enable_short_term:
+        new_s = ops.where(elapsed_days == 0, next_short_term_stability(w, s, g, ops), new_s)
+    return next_difficulty(w, d, g, ops), new_s
+
+
+def next_interval(
+    s: Any, elapsed_days: Any, params: FSRSParameters, ops: MathOps = SCALAR_OPS, fuzz_factor: Any = None
+) -> Any:
+    """
+    由稳定性计算复习间隔（天）
+
+    Args:
+        s: 稳定性
+        elapsed_days: 距上次复习的天数（用于限制扰动下界）
+        params: FSRS 参数
+        ops: 数学运算
+        fuzz_factor: [0, 1) 的随机数，传入时对 3 天及以上的间隔做随机扰动
+
+    Returns:
+        间隔（天）
+    """
+    interval = ops.minimum(ops.maximum(1, ops.floor(s * params.interval_modifier + 0.5)), params.maximum_interval)
+    if fuzz_factor is None:
+        return interval
+
+    delta = 1.0
+    for start, end, factor in FUZZ_RANGES:
+        delta = delta + factor * ops.maximum(ops.minimum(interval, end) - start, 0.0)
+    min_ivl = ops.maximum(2, ops.floor(interval - delta + 0.5))
+    max_ivl = ops.minimum(ops.floor(interval + delta + 0.5), params.maximum_interval)
+    min_ivl = ops.where(interval > elapsed_days, ops.maximum(min_ivl, elapsed_days + 1), min_ivl)
+    min_ivl = ops.minimum(min_ivl, max_ivl)
+    fuzzed = ops.floor(fuzz_factor * (max_ivl - min_ivl + 1) + min_ivl)
+    return ops.where(interval < 2.5, interval, fuzzed)
+
+
+def review_intervals(
+    stabilities: tuple[Any, Any, Any],
+    elapsed_days: Any,
+    params: FSRSParameters,
+    ops: MathOps = SCALAR_OPS,
+    fuzz_factor: Any = None,
+) -> tuple[Any, Any, Any]:
+    """
+    复习卡片 Hard/Good/Easy 的间隔（保证 Hard < Good < Easy，且均不超过最大间隔）
+
+    Args:
+        stabilities: Hard/Good/Easy 对应的新稳定性
+        elapsed_days: 距上次复习的天数
+        params: FSRS 参数
+        ops: 数学运算
+        fuzz_factor: 随机扰动因子
+
+    Returns:
+        (Hard, Good, Easy) 间隔
+    """
+    s_hard, s_good, s_easy = stabilities
+    hard = next_interval(s_hard, elapsed_days, params, ops, fuzz_factor)
+    good = next_interval(s_good, elapsed_days, params, ops, fuzz_factor)
+    hard = ops.minimum(hard, good)
+    good = ops.maximum(good, hard + 1)
+    easy = ops.maximum(next_interval(s_easy, elapsed_days, params, ops, fuzz_factor), good + 1)
+    limit = params.maximum_interval
+    return ops.minimum(hard, limit), ops.minimum(good, limit), ops.minimum(easy, limit)
+
+
+def learning_step_minutes(steps: Sequence[int], rating: int) -> int | None:
+    """
+    学习/重学阶段评分后的等待时间
+
+    Card 不保存当前所处的步骤（与前端一致，每次都从第一步计算）：
+    Again 回到第一步，Hard 取前两步的平均值（只有一步时为 1.5 倍），Good 进入第二步。
+
+    Args:
+        steps: 学习步骤（分钟）
+        rating: 评分
+
+    Returns:
+        等待分钟数；None 表示毕业，按间隔进入复习
+    """
+    if not steps:
+        return None
+    if rating == 1:
+        return steps[0]
+    if rating == 2:
+        return js_round(steps[0] * 1.5) if len(steps) == 1 else js_round((steps[0] + steps[1]) / 2)
+    if rating == 3 and len(steps) > 1:
+        return steps[1]
+    return None
+
+
+def elapsed_days(last_review: int | None, now: int) -> int:
+    """距上次复习的天数（按 UTC 自然日计算，与 ts-fsrs 一致）"""
+    if not last_review:
+        return 0
+    return max(0, now // DAY_MS - last_review // DAY_MS)
+
+
+def schedule_fsrs(
+    card: SchedulableCard,
+    rating: int,
+    *,
+    now: int | None = None,
+    params: FSRSParameters | None = None,
+    rng: random.Random | None = None,
+) -> ScheduleResult:
+    """
+    FSRS 调度计算
+
+    非新卡片缺少有效的记忆状态时（例如从 SM-2 切换过来），按首次评分初始化记忆状态。
+
+    Args:
+        card: 当前卡片
+        rating: 用户评分 (1=Again, 2=Hard, 3=Good, 4=Easy)
+        now: 复习时间戳（毫秒），默认为当前时间
+        params: FSRS 参数，默认为 ts-fsrs 默认参数
+        rng: 间隔扰动使用的随机数生成器（仅 enable_fuzz 时使用）
+
+    Returns:
+        调度结果
+    """
+    if now is None:
+        now = now_ms()
+    params = params or FSRSParameters()
+    w = params.weights
+    state = card.state
+    elapsed = 0 if state == "new" else elapsed_days(card.last_review, now)
+    has_memory = state != "new" and card.stability >= S_MIN and card.difficulty >= 1
+
+    def memory(g: int) -> tuple[float, float]:
+        if not has_memory:
+            return init_difficulty(w, g), init_stability(w, g)
+        return next_state(w, card.difficulty, card.stability, elapsed, g, enable_short_term=params.enable_short_term)
+
+    fuzz_factor = (rng or random).random() if params.enable_fuzz else None
+    difficulty, stability = memory(rating)
+
+    to_state: CardState
+    if state == "review":
+        to_state = "relearning"
+        minutes = learning_step_minutes(params.relearning_steps, 1) if rating == 1 else None
+        if rating == 1:
+            interval = next_interval(stability, elapsed, params, fuzz_factor=fuzz_factor)
+        else:
+            stabilities = (memory(2)[1], memory(3)[1], memory(4)[1])
+            interval = review_intervals(stabilities, elapsed, params, fuzz_factor=fuzz_factor)[rating - 2]
+    else:
+        to_state = "relearning" if state == "relearning" else "learning"
+        steps = params.relearning_steps if state == "relearning" else params.learning_steps
+        minutes = learning_step_minutes(steps, rating)
+        interval = next_interval(stability, elapsed, params, fuzz_factor=fuzz_factor)
+
+    ease_factor = js_round(2500 * (1 - difficulty / 10))
+    if minutes is not None:
+        return ScheduleResult(
+            state=to_state,
+            queue="learning",
+            due=now + minutes * MINUTE_MS,
+            interval=0,
+            ease_factor=ease_factor,
+            stability=stability,
+            difficulty=difficulty,
+        )
+    return ScheduleResult(
+        state="review",
+        queue="review",
+        due=now + interval * DAY_MS,
+        interval=interval,
+        ease_factor=ease_factor,
+        stability=stability,
+        difficulty=difficulty,
+    )
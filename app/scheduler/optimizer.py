@@ -0,0 +1,356 @@
+"""
+FSRS 参数优化（NumPy 向量化）
+
+由复习日志拟合个人 FSRS 参数：按卡片从首次复习开始重放复习历史，用当前参数预测每次复习时的可提取性 R，
+以实际结果（Again 为遗忘，其余为记住）的对数损失为目标做小批量梯度下降（Adam，学习率余弦退火）。
+
+- 数据：按 (卡片, 时间) 顺序分块追加到紧凑的 NumPy 数组（每条复习 5 字节），每张卡片最多保留前
+  MAX_REVIEWS_PER_CARD 次复习；只有一次复习的卡片不参与训练
+- 梯度：对每个参数做中心差分，所有扰动后的参数组作为额外的一维与卡片一起向量化计算
+- 批次：卡片按复习次数排序后切分，每批的“卡片数 × 最长复习次数”不超过 batch_cells（不超过 MAX_BATCH_CELLS），
+  训练时的内存占用只与批次大小有关，与日志总量无关
+"""
+
+import math
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from app.scheduler.base import DAY_MS
+from app.scheduler.fsrs import (
+    FSRS_DEFAULT_WEIGHTS,
+    FSRS_WEIGHT_COUNT,
+    S_MIN,
+    MathOps,
+    forgetting_curve,
+    init_difficulty,
+    next_state,
+)
+
+# 每张卡片参与训练的最大复习次数（只保留最早的若干次，保证从首次复习开始重放）
+MAX_REVIEWS_PER_CARD = 64
+
+# 训练默认值
+DEFAULT_EPOCHS = 5
+DEFAULT_LEARNING_RATE = 4e-2
+# 每批单元数（卡片数 × 最长复习次数）的取值范围：日志较少时用小批次保证步数，
+# 日志较多时增大批次把每轮步数限制在 STEPS_PER_EPOCH 左右，上限控制单批内存
+MIN_BATCH_CELLS = 512
+MAX_BATCH_CELLS = 65536
+STEPS_PER_EPOCH = 100
+
+# 参数取值范围（按参数下标，与 FSRS-6 参考实现一致）
+WEIGHT_BOUNDS: tuple[tuple[float, float], ...] = (
+    (S_MIN, 100.0),
+    (S_MIN, 100.0),
+    (S_MIN, 100.0),
+    (S_MIN, 100.0),
+    (1.0, 10.0),
+    (0.001, 4.0),
+    (0.001, 4.0),
+    (0.001, 0.75),
+    (0.0, 4.5),
+    (0.0, 0.8),
+    (0.001, 3.5),
+    (0.001, 5.0),
+    (0.001, 0.25),
+    (0.001, 0.9),
+    (0.0, 4.0),
+    (0.0, 1.0),
+    (1.0, 6.0),
+    (0.0, 2.0),
+    (0.0, 2.0),
+    (0.0, 0.8),
+    (0.1, 0.8),
+)
+
+# 中心差分的相对步长
+_FD_STEP = 1e-4
+# 预测概率的截断范围，避免 log(0)
+_EPS = 1e-6
+_ADAM_BETAS = (0.9, 0.999)
+
+# 训练时不做舍入：公式中的 8 位小数舍入会抹掉差分梯度
+TRAIN_OPS = MathOps(
+    exp=np.exp,
+    floor=np.floor,
+    minimum=np.minimum,
+    maximum=np.maximum,
+    where=np.where,
+    round=lambda value, _ndigits: value,
+)
+
+
+@dataclass(slots=True)
+class ReviewHistory:
+    """按卡片分组的复习历史，第 i 张卡片的复习为 [offsets[i], offsets[i + 1])"""
+
+    offsets: np.ndarray
+    elapsed: np.ndarray
+    rating: np.ndarray
+
+    @property
+    def card_count(self) -> int:
+        """卡片数"""
+        return len(self.offsets) - 1
+
+    @property
+    def review_count(self) -> int:
+        """复习数"""
+        return len(self.rating)
+
+    @property
+    def sample_count(self) -> int:
+        """参与损失计算的复习数（非首次复习且距上次复习至少一天）"""
+        return int(np.count_nonzero(self.elapsed > 0))
+
+
+class ReviewHistoryBuilder:
+    """
+    复习历史构造器
+
+    逐块追加按 (卡片, 复习时间) 排序的复习记录，每块立即转换为 NumPy 数组，不保留原始行。
+    """
+
+    def __init__(self, max_reviews_per_card: int = MAX_REVIEWS_PER_CARD):
+        self.max_reviews_per_card = max_reviews_per_card
+        self._days: list[np.ndarray] = []
+        self._ratings: list[np.ndarray] = []
+        self._first: list[np.ndarray] = []
+        self._card_id: str | None = None
+        self._length = 0
+        self._skip = False
+
+    def add(self, rows: Iterable[Sequence[Any]]) -> None:
+        """
+        追加一块复习记录
+
+        卡片的第一条记录不是从新卡片开始（例如导入的卡片）时，初始记忆状态未知，整张卡片跳过。
+
+        Args:
+            rows: (卡片 ID, 复习时间戳毫秒, 评分, 复习前状态)，整体按卡片、时间排序
+        """
+        days: list[int] = []
+        ratings: list[int] = []
+        first: list[bool] = []
+        for card_id, review_time, rating, prev_state in rows:
+            if card_id != self._card_id:
+                self._card_id = card_id
+                self._length = 0
+                self._skip = prev_state not in (None, "new")
+            if self._skip or self._length >= self.max_reviews_per_card:
+                continue
+            days.append(review_time // DAY_MS)
+            ratings.append(rating)
+            first.append(self._length == 0)
+            self._length += 1
+        if days:
+            self._days.append(np.array(days, dtype=np.int64))
+            self._ratings.append(np.array(ratings, dtype=np.int8))
+            self._first.append(np.array(first, dtype=bool))
+
+    def build(self) -> ReviewHistory:
+        """
+        构造复习历史（去掉只有一次复习的卡片）
+
+        Returns:
+            复习历史
+        """
+        if not self._days:
+            return ReviewHistory(np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int8))
+        days = np.concatenate(self._days)
+        rating = np.concatenate(self._ratings)
+        starts = np.flatnonzero(np.concatenate(self._first))
+        self._days, self._ratings, self._first = [], [], []
+
+        elapsed = np.diff(days, prepend=days[0])
+        elapsed[starts] = 0
+        elapsed = np.maximum(elapsed, 0).astype(np.int32)
+
+        lengths = np.diff(starts, append=len(days))
+        keep = lengths >= 2
+        rows = np.repeat(keep, lengths)
+        offsets = np.concatenate(([0], np.cumsum(lengths[keep])))
+        return ReviewHistory(offsets=offsets, elapsed=elapsed[rows], rating=rating[rows])
+
+
+@dataclass(slots=True)
+class FitResult:
+    """参数优化结果"""
+
+    weights: tuple[float, ...]
+    loss_before: float
+    loss_after: float
+    sample_count: int
+
+
+def default_batch_cells(history: ReviewHistory) -> int:
+    """按复习数选择每批单元数"""
+    return min(MAX_BATCH_CELLS, max(MIN_BATCH_CELLS, history.review_count // STEPS_PER_EPOCH))
+
+
+def _make_batches(history: ReviewHistory, batch_cells: int) -> list[np.ndarray]:
+    """按复习次数排序后切分卡片，每批“卡片数 × 最长复习次数”不超过 batch_cells"""
+    lengths = np.diff(history.offsets)
+    order = np.argsort(lengths, kind="stable")
+    batches = []
+    start = 0
+    while start < len(order):
+        end = min(len(order), start + max(1, batch_cells // int(lengths[order[start]])))
+        while end - start > 1 and (end - start) * int(lengths[order[end - 1]]) > batch_cells:
+            end = start + max(1, batch_cells // int(lengths[order[end - 1]]))
+        batches.append(order[start:end])
+        start = end
+    return batches
+
+
+def _pad(history: ReviewHistory, cards: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """取出一批卡片的复习历史，按最长的卡片补齐为 (卡片数, 复习次数) 矩阵"""
+    starts = history.offsets[cards]
+    lengths = history.offsets[cards + 1] - starts
+    steps = np.arange(int(lengths.max()))
+    mask = steps < lengths[:, None]
+    index = np.where(mask, starts[:, None] + steps, 0)
+    return history.elapsed[index].astype(np.float64), history.rating[index].astype(np.int64), mask
+
+
+def _batch_loss(
+    weights: np.ndarray, elapsed: np.ndarray, rating: np.ndarray, mask: np.ndarray, enable_short_term: bool
+) -> np.ndarray:
+    """
+    一批卡片在多组参数下的对数损失之和
+
+    Args:
+        weights: (参数组数, 参数个数)
+        elapsed: (卡片数, 复习次数) 距上次复习的天数
+        rating: (卡片数, 复习次数) 评分
+        mask: (卡片数, 复习次数) 是否为有效复习
+        enable_short_term: 是否使用同日短期稳定性公式
+
+    Returns:
+        (参数组数,) 每组参数的损失之和
+    """
+    # w[i] 的形状为 (参数组数, 1)，与 (参数组数, 卡片数) 的记忆状态广播
+    w = weights.T[:, :, None]
+    first = rating[:, 0]
+    s = np.maximum(weights[:, first - 1], S_MIN)
+    d = init_difficulty(w, first, TRAIN_OPS)
+    loss = np.zeros(len(weights))
+    for t in range(1, rating.shape[1]):
+        dt, g, valid = elapsed[:, t], rating[:, t], mask[:, t]
+        p = np.clip(forgetting_curve(w, dt, s, TRAIN_OPS), _EPS, 1 - _EPS)
+        labeled = valid & (dt > 0)
+        loss -= np.where(labeled, np.where(g > 1, np.log(p), np.log1p(-p)), 0.0).sum(axis=1)
+        next_d, next_s = next_state(w, d, s, dt, g, enable_short_term=enable_short_term, ops=TRAIN_OPS)
+        d = np.where(valid, next_d, d)
+        s = np.where(valid, next_s, s)
+    return loss
+
+
+def evaluate(
+    history: ReviewHistory,
+    weights: tuple[float, ...] | np.ndarray,
+    *,
+    enable_short_term: bool = True,
+    batch_cells: int = MAX_BATCH_CELLS,
+) -> float:
+    """
+    计算参数在复习历史上的平均对数损失
+
+    Args:
+        history: 复习历史
+        weights: FSRS 参数
+        enable_short_term: 是否使用同日短期稳定性公式
+        batch_cells: 每批的最大单元数（只影响内存和速度，不影响结果）
+
+    Returns:
+        平均对数损失（没有可用样本时为 0）
+    """
+    w = np.asarray(weights, dtype=np.float64)[None, :]
+    total = sum(
+        float(_batch_loss(w, *_pad(history, cards), enable_short_term)[0])
+        for cards in _make_batches(history, batch_cells)
+    )
+    return total / max(history.sample_count, 1)
+
+
+def fit(
+    history: ReviewHistory,
+    weights: tuple[float, ...] = FSRS_DEFAULT_WEIGHTS,
+    *,
+    enable_short_term: bool = True,
+    epochs: int = DEFAULT_EPOCHS,
+    batch_cells: int | None = None,
+    learning_rate: float = DEFAULT_LEARNING_RATE,
+    seed: int = 0,
+    on_step: Callable[[int, int], None] | None = None,
+) -> FitResult:
+    """
+    由复习历史拟合 FSRS 参数
+
+    Args:
+        history: 复习历史
+        weights: 初始参数（21 个，FSRS-6）
+        enable_short_term: 是否使用同日短期稳定性公式
+        epochs: 训练轮数
+        batch_cells: 每批的最大单元数（卡片数 × 最长复习次数），默认按复习数选择
+        learning_rate: 初始学习率
+        seed: 批次顺序的随机种子
+        on_step: 每个批次完成后的回调 (已完成步数, 总步数)，可抛出异常中止训练
+
+    Returns:
+        优化结果；拟合后的损失不低于初始参数时返回初始参数
+
+    Raises:
+        ValueError: 参数个数无效或没有可用于训练的复习
+    """
+    k = len(weights)
+    if k != FSRS_WEIGHT_COUNT:
+        raise ValueError(f"FSRS 参数个数必须为 {FSRS_WEIGHT_COUNT}（FSRS-6）")
+    if history.sample_count == 0:
+        raise ValueError("没有可用于训练的复习记录")
+
+    low, high = np.array(WEIGHT_BOUNDS).T
+    initial = np.clip(np.asarray(weights, dtype=np.float64), low, high)
+    batches = _make_batches(history, batch_cells or default_batch_cells(history))
+    loss_before = evaluate(history, initial, enable_short_term=enable_short_term)
+
+    rng = np.random.default_rng(seed)
+    beta1, beta2 = _ADAM_BETAS
+    w = initial.copy()
+    m = np.zeros(k)
+    v = np.zeros(k)
+    total_steps = epochs * len(batches)
+    step = 0
+    for _ in range(epochs):
+        for i in rng.permutation(len(batches)):
+            elapsed, rating, mask = _pad(history, batches[i])
+            count = np.count_nonzero(mask & (elapsed > 0))
+            if count:
+                h = _FD_STEP * np.maximum(np.abs(w), 1.0)
+                probes = np.vstack([w + np.diag(h), w - np.diag(h)])
+                losses = _batch_loss(probes, elapsed, rating, mask, enable_short_term) / count
+                grad = (losses[:k] - losses[k:]) / (2 * h)
+
+                m = beta1 * m + (1 - beta1) * grad
+                v = beta2 * v + (1 - beta2) * grad**2
+                m_hat = m / (1 - beta1 ** (step + 1))
+                v_hat = v / (1 - beta2 ** (step + 1))
+                lr = learning_rate * 0.5 * (1 + math.cos(math.pi * step / total_steps))
+                w = np.clip(w - lr * m_hat / (np.sqrt(v_hat) + 1e-8), low, high)
+            step += 1
+            if on_step is not None:
+                on_step(step, total_steps)
+
+    fitted = np.round(w, 4)
+    loss_after = evaluate(history, fitted, enable_short_term=enable_short_term)
+    if not loss_after < loss_before:
+        fitted, loss_after = initial, loss_before
+    return FitResult(
+        weights=tuple(float(x) for x in fitted),
+        loss_before=loss_before,
+        loss_after=loss_after,
+        sample_count=history.sample_count,
+    )
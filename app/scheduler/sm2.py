@@ -0,0 +1,72 @@
+"""
+SM-2 调度算法
+
+与前端 web/src/scheduler/sm2.ts 逐分支一致（包括取整方式），
+难度系数以千分制整数保存（2500 = 2.5）。
+"""
+
+from app.scheduler.base import DAY_MS, MINUTE_MS, SchedulableCard, ScheduleResult, js_round, now_ms
+
+MIN_EASE_FACTOR = 1300
+INITIAL_EASE_FACTOR = 2500
+MAX_INTERVAL = 365
+
+
+def schedule_sm2(card: SchedulableCard, rating: int, *, now: int | None = None) -> ScheduleResult:
+    """
+    SM-2 调度计算
+
+    Args:
+        card: 当前卡片
+        rating: 用户评分 (1=Again, 2=Hard, 3=Good, 4=Easy)
+        now: 复习时间戳（毫秒），默认为当前时间
+
+    Returns:
+        调度结果（稳定性和难度保持不变）
+    """
+    if now is None:
+        now = now_ms()
+    ease_factor = card.ease_factor or INITIAL_EASE_FACTOR
+
+    def result(state, queue, interval: int, ease: int, due: int) -> ScheduleResult:
+        return ScheduleResult(
+            state=state,
+            queue=queue,
+            due=due,
+            interval=interval,
+            ease_factor=ease,
+            stability=card.stability,
+            difficulty=card.difficulty,
+        )
+
+    if rating == 1:
+        # Again - 重新学习，10 分钟后
+        return result("relearning", "learning", 0, max(MIN_EASE_FACTOR, ease_factor - 200), now + 10 * MINUTE_MS)
+
+    if card.state in ("new", "relearning"):
+        if rating == 2:
+            # Hard - 5 分钟后
+            return result("learning", "learning", 0, ease_factor, now + 5 * MINUTE_MS)
+        if rating == 3:
+            # Good - 毕业到复习队列，明天
+            return result("review", "review", 1, ease_factor, now + DAY_MS)
+        # Easy - 直接跳到 4 天后
+        return result("review", "review", 4, ease_factor + 150, now + 4 * DAY_MS)
+
+    # 复习中的卡片（学习中的卡片也按此计算）
+    new_ease_factor = ease_factor
+    if rating == 2:
+        new_ease_factor = ease_factor - 150
+    elif rating == 4:
+        new_ease_factor = ease_factor + 150
+    new_ease_factor = max(MIN_EASE_FACTOR, new_ease_factor)
+
+    if rating == 2:
+        new_interval = max(1, js_round(card.interval * 1.2))
+    elif rating == 3:
+        new_interval = max(1, js_round(card.interval * (new_ease_factor / 1000)))
+    else:
+        new_interval = max(1, js_round(card.interval * (new_ease_factor / 1000) * 1.3))
+    new_interval = min(MAX_INTERVAL, new_interval)
+
+    return result("review", "review", new_interval, new_ease_factor, now + new_interval * DAY_MS)
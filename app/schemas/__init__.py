@@ -4,19 +4,34 @@ Pydantic Schema 模块
 用于 API 请求和响应的数据验证和序列化
 """
 
+from app.schemas.cache import CacheStatsResponse
 from app.schemas.deck import (
     DeckCreate,
     DeckListQuery,
     DeckResponse,
     DeckUpdate,
 )
+from app.schemas.fsrs_params import FSRSOptimizeRequest, FSRSParamsQuery, FSRSParamsResponse
+from app.schemas.job import JobListQuery, JobResponse
+from app.schemas.metrics import DatabasePoolStatsResponse, PasswordHasherStatsResponse, SQLiteWriterStatsResponse
 from app.schemas.note import (
+    CardBatchUpdate,
+    CardBatchUpdateItem,
+    CardBatchUpdateItemResult,
+    CardBatchUpdateResult,
+    CardForecastDay,
+    CardForecastDeck,
+    CardForecastQuery,
+    CardForecastResponse,
     CardListQuery,
     CardResponse,
     CardUpdate,
     NoteBatchCreate,
     NoteBatchResult,
     NoteCreate,
+    NoteImportError,
+    NoteImportQuery,
+    NoteImportResult,
     NoteListQuery,
     NoteResponse,
     NoteUpdate,
@@ -32,6 +47,10 @@ from app.schemas.note_model import (
     NoteModelUpdate,
 )
 from app.schemas.review_log import (
+    ReviewDailyStatResponse,
+    ReviewLogBatchCreate,
+    ReviewLogBatchItem,
+    ReviewLogBatchResult,
     ReviewLogCreate,
     ReviewLogListQuery,
     ReviewLogResponse,
@@ -41,12 +60,15 @@ from app.schemas.shared_deck import (
     PublishDeckRequest,
     PublishVersionRequest,
     SharedDeckCreate,
+    SharedDeckDeltaResponse,
+    SharedDeckDeltaSection,
     SharedDeckDetailResponse,
     SharedDeckListQuery,
     SharedDeckResponse,
     SharedDeckSnapshotResponse,
     SharedDeckUpdate,
 )
+from app.schemas.tag import TagCountResponse
 from app.schemas.user import (
     LoginRequest,
     PasswordChange,
@@ -87,15 +109,34 @@ __all__ = [
     "NoteListQuery",
     "NoteBatchCreate",
     "NoteBatchResult",
+    "NoteImportQuery",
+    "NoteImportError",
+    "NoteImportResult",
     # Card
     "CardResponse",
     "CardUpdate",
+    "CardBatchUpdateItem",
+    "CardBatchUpdate",
+    "CardBatchUpdateItemResult",
+    "CardBatchUpdateResult",
     "CardListQuery",
+    "CardForecastQuery",
+    "CardForecastDay",
+    "CardForecastDeck",
+    "CardForecastResponse",
     # ReviewLog
     "ReviewLogCreate",
+    "ReviewLogBatchItem",
+    "ReviewLogBatchCreate",
+    "ReviewLogBatchResult",
     "ReviewLogResponse",
     "ReviewLogListQuery",
+    "ReviewDailyStatResponse",
     "ReviewStats",
+    # FSRSParams
+    "FSRSParamsQuery",
+    "FSRSOptimizeRequest",
+    "FSRSParamsResponse",
     # SharedDeck
     "SharedDeckCreate",
     "SharedDeckUpdate",
@@ -103,6 +144,19 @@ __all__ = [
     "SharedDeckDetailResponse",
     "SharedDeckListQuery",
     "SharedDeckSnapshotResponse",
+    "SharedDeckDeltaSection",
+    "SharedDeckDeltaResponse",
     "PublishDeckRequest",
     "PublishVersionRequest",
+    # Tag
+    "TagCountResponse",
+    # Job
+    "JobResponse",
+    "JobListQuery",
+    # Cache
+    "CacheStatsResponse",
+    # Metrics
+    "PasswordHasherStatsResponse",
+    "DatabasePoolStatsResponse",
+    "SQLiteWriterStatsResponse",
 ]
@@ -0,0 +1,24 @@
+"""
+缓存指标相关的 Pydantic Schema
+
+用于 API 请求和响应的数据验证和序列化
+"""
+
+from pydantic import BaseModel, Field
+
+
+class CacheStatsResponse(BaseModel):
+    """进程内缓存指标响应"""
+
+    name: str = Field(..., description="缓存名称")
+    size: int = Field(..., description="当前条目数")
+    max_size: int = Field(..., description="最大条目数")
+    ttl_seconds: float = Field(..., description="条目有效期（秒）")
+    hits: int = Field(..., description="命中次数")
+    misses: int = Field(..., description="未命中次数")
+    evictions: int = Field(..., description="因容量淘汰的条目数")
+    expirations: int = Field(..., description="因过期删除的条目数")
+    invalidations: int = Field(..., description="因数据变化丢弃的条目数")
+    hit_rate: float = Field(..., description="命中率")
+
+    model_config = {"from_attributes": True}
@@ -0,0 +1,36 @@
+"""
+个人 FSRS 参数相关的 Pydantic Schema
+
+用于 API 请求和响应的数据验证和序列化
+"""
+
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+FSRSScheduler = Literal["fsrs_v4", "fsrs_v5"]
+
+
+class FSRSParamsQuery(BaseModel):
+    """个人 FSRS 参数查询参数"""
+
+    scheduler: FSRSScheduler = Field(default="fsrs_v5", description="调度器类型: fsrs_v4, fsrs_v5")
+
+
+class FSRSOptimizeRequest(BaseModel):
+    """FSRS 参数优化请求"""
+
+    scheduler: FSRSScheduler = Field(default="fsrs_v5", description="调度器类型: fsrs_v4, fsrs_v5")
+
+
+class FSRSParamsResponse(BaseModel):
+    """个人 FSRS 参数响应"""
+
+    scheduler: FSRSScheduler = Field(..., description="调度器类型")
+    weights: list[float] = Field(..., description="FSRS 参数")
+    is_default: bool = Field(..., description="是否为默认参数（尚未优化）")
+    sample_count: int = Field(default=0, description="参与优化的复习数")
+    loss_before: float | None = Field(default=None, description="默认参数的对数损失")
+    loss_after: float | None = Field(default=None, description="优化后参数的对数损失")
+    updated_at: datetime | None = Field(default=None, description="优化时间")
@@ -0,0 +1,38 @@
+"""
+后台任务相关的 Pydantic Schema
+
+用于 API 请求和响应的数据验证和序列化
+"""
+
+from datetime import datetime
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+JobStatus = Literal["pending", "running", "succeeded", "failed", "cancelled"]
+
+
+class JobResponse(BaseModel):
+    """后台任务响应"""
+
+    id: str = Field(..., description="任务ID")
+    type: str = Field(..., description="任务类型")
+    status: JobStatus = Field(..., description="状态: pending, running, succeeded, failed, cancelled")
+    progress_done: int = Field(default=0, description="已完成数量")
+    progress_total: int | None = Field(default=None, description="总数量（未知时为空）")
+    result: dict[str, Any] | None = Field(default=None, description="执行结果")
+    error: str | None = Field(default=None, description="失败原因")
+    cancel_requested: bool = Field(default=False, description="是否已请求取消")
+    attempts: int = Field(default=0, description="已执行次数")
+    created_at: datetime | None = Field(default=None, description="创建时间")
+    started_at: datetime | None = Field(default=None, description="开始执行时间")
+    finished_at: datetime | None = Field(default=None, description="结束时间")
+
+    model_config = {"from_attributes": True}
+
+
+class JobListQuery(BaseModel):
+    """后台任务列表查询参数"""
+
+    status: JobStatus | None = Field(default=None, description="状态过滤")
+    type: str | None = Field(default=None, description="任务类型过滤")
@@ -0,0 +1,57 @@
+"""
+运行指标相关的 Pydantic Schema
+
+用于 API 请求和响应的数据验证和序列化
+"""
+
+from pydantic import BaseModel, Field
+
+
+class PasswordHasherStatsResponse(BaseModel):
+    """密码哈希执行器指标响应"""
+
+    workers: int = Field(..., description="执行 bcrypt 的线程数")
+    rounds: int = Field(..., description="bcrypt 成本因子")
+    max_pending: int = Field(..., description="最多同时提交的请求数（含执行中）")
+    running: int = Field(..., description="执行中的请求数")
+    waiting: int = Field(..., description="排队等待的请求数")
+    peak_waiting: int = Field(..., description="峰值排队数")
+    completed: int = Field(..., description="已完成的请求数")
+    rejected: int = Field(..., description="因排队已满被拒绝的请求数")
+    avg_wait_ms: float = Field(..., description="平均排队耗时（毫秒）")
+    avg_run_ms: float = Field(..., description="平均执行耗时（毫秒）")
+
+    model_config = {"from_attributes": True}
+
+
+class DatabasePoolStatsResponse(BaseModel):
+    """数据库连接池指标响应"""
+
+    name: str = Field(..., description="引擎名称（primary 主库，replica 只读副本）")
+    backend: str = Field(..., description="数据库类型")
+    pool_size: int = Field(..., description="常驻连接数")
+    max_overflow: int = Field(..., description="最多额外创建的连接数")
+    checked_out: int = Field(..., description="已签出（使用中）的连接数")
+    overflow: int = Field(..., description="当前额外创建的连接数")
+    saturation: float = Field(..., description="饱和度（已签出连接数 / 最大连接数）")
+    checkouts: int = Field(..., description="签出次数")
+    timeouts: int = Field(..., description="等待空闲连接超时的次数")
+    avg_wait_ms: float = Field(..., description="平均签出等待耗时（毫秒）")
+    max_wait_ms: float = Field(..., description="最大签出等待耗时（毫秒）")
+
+    model_config = {"from_attributes": True}
+
+
+class SQLiteWriterStatsResponse(BaseModel):
+    """SQLite 写连接指标响应"""
+
+    batch_size: int = Field(..., description="每次提交最多合并的会话写事务数")
+    waiting: int = Field(..., description="等待写连接的会话数")
+    leases: int = Field(..., description="获取写连接的次数")
+    commits: int = Field(..., description="外层事务提交次数")
+    committed_sessions: int = Field(..., description="已提交的会话写事务数")
+    avg_batch: float = Field(..., description="平均每次提交合并的会话写事务数")
+    timeouts: int = Field(..., description="等待写连接超时的次数")
+    avg_wait_ms: float = Field(..., description="平均等待写连接耗时（毫秒）")
+
+    model_config = {"from_attributes": True}
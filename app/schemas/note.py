@@ -4,10 +4,10 @@
 用于 API 请求和响应的数据验证和序列化
 """
 
-from datetime import datetime
+from datetime import UTC, date, datetime
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 # ==================== 卡片 Schema ====================
 
@@ -57,6 +57,50 @@ class CardUpdate(BaseModel):
     difficulty: float | None = Field(default=None, description="FSRS 难度")
 
 
+class CardBatchUpdateItem(CardUpdate):
+    """批量更新卡片的单项"""
+
+    id: str = Field(..., description="卡片ID")
+    expected_updated_at: datetime | None = Field(
+        default=None, description="预期的卡片更新时间（乐观并发控制：与当前值不一致时不更新）"
+    )
+
+    @field_validator("expected_updated_at")
+    @classmethod
+    def normalize_expected_updated_at(cls, v: datetime | None) -> datetime | None:
+        """带时区的时间统一转换为 UTC（数据库中保存不带时区的 UTC 时间）"""
+        if v is not None and v.tzinfo is not None:
+            return v.astimezone(UTC).replace(tzinfo=None)
+        return v
+
+
+class CardBatchUpdate(BaseModel):
+    """批量更新卡片请求（同步一次复习会话的调度结果）"""
+
+    cards: list[CardBatchUpdateItem] = Field(..., min_length=1, max_length=10000, description="卡片列表（最多10000条）")
+
+
+class CardBatchUpdateItemResult(BaseModel):
+    """批量更新卡片的单项结果"""
+
+    id: str = Field(..., description="卡片ID")
+    status: Literal["updated", "conflict", "not_found"] = Field(
+        ..., description="结果: updated=已更新, conflict=更新时间不一致未更新, not_found=卡片不存在或无权限"
+    )
+    updated_at: datetime | None = Field(
+        default=None, description="卡片当前的更新时间（updated 为新值，conflict 为服务端现有值）"
+    )
+
+
+class CardBatchUpdateResult(BaseModel):
+    """批量更新卡片结果"""
+
+    updated_count: int = Field(..., description="已更新的卡片数")
+    conflict_count: int = Field(..., description="因并发冲突未更新的卡片数")
+    not_found_count: int = Field(..., description="不存在或无权限的卡片数")
+    items: list[CardBatchUpdateItemResult] = Field(default_factory=list, description="逐项结果（与请求顺序一致）")
+
+
 # ==================== 笔记 Schema ====================
 
 
@@ -122,6 +166,45 @@ class CardListQuery(BaseModel):
     due_before: int | None = Field(default=None, description="到期时间之前")
 
 
+# 复习预测最多覆盖的天数
+MAX_FORECAST_DAYS = 365
+
+
+class CardForecastQuery(BaseModel):
+    """复习预测查询参数"""
+
+    days: int = Field(default=90, ge=1, le=MAX_FORECAST_DAYS, description="预测天数（包含今天）")
+    deck_id: str | None = Field(default=None, description="牌组ID")
+    new_per_day: int = Field(default=20, ge=0, le=9999, description="每天引入的新卡片数（用于估计新卡片）")
+    by_deck: bool = Field(default=False, description="是否按牌组分别返回")
+
+
+class CardForecastDay(BaseModel):
+    """复习预测的一天"""
+
+    day: date = Field(..., description="日期")
+    review_count: int = Field(..., description="到期的学习中/复习卡片数（今天包含已逾期的卡片）")
+    new_count: int = Field(..., description="预计引入的新卡片数")
+
+
+class CardForecastDeck(BaseModel):
+    """单个牌组的复习预测"""
+
+    deck_id: str = Field(..., description="牌组ID")
+    review_counts: list[int] = Field(..., description="每天到期的学习中/复习卡片数（与 days 对齐）")
+    overdue_count: int = Field(..., description="已逾期的卡片数（计入今天）")
+    new_remaining: int = Field(..., description="未学习的新卡片数")
+
+
+class CardForecastResponse(BaseModel):
+    """复习预测（按服务器本地时区的日期划分）"""
+
+    days: list[CardForecastDay] = Field(..., description="每天的预测")
+    overdue_count: int = Field(..., description="已逾期的卡片数（计入今天）")
+    new_remaining: int = Field(..., description="未学习的新卡片数")
+    decks: list[CardForecastDeck] | None = Field(default=None, description="按牌组的预测（by_deck 为真时返回）")
+
+
 # ==================== 批量操作 Schema ====================
 
 
@@ -137,7 +220,7 @@ class NoteBatchCreate(BaseModel):
 
     deck_id: str = Field(..., description="所属牌组ID")
     note_model_id: str = Field(..., description="笔记类型ID")
-    notes: list[NoteBatchItem] = Field(..., min_length=1, max_length=1000, description="笔记列表（最多1000条）")
+    notes: list[NoteBatchItem] = Field(..., min_length=1, max_length=50000, description="笔记列表（最多50000条）")
     source_type: Literal["manual", "ai", "import"] = Field(default="import", description="来源类型")
 
 
@@ -148,3 +231,35 @@ class NoteBatchResult(BaseModel):
     skipped_count: int = Field(..., description="跳过的笔记数（重复）")
     error_count: int = Field(..., description="失败的笔记数")
     created_ids: list[str] = Field(default_factory=list, description="创建的笔记ID列表")
+
+
+# ==================== 流式导入 Schema ====================
+
+
+class NoteImportQuery(BaseModel):
+    """流式导入笔记查询参数"""
+
+    deck_id: str = Field(..., description="所属牌组ID")
+    note_model_id: str = Field(..., description="笔记类型ID")
+    format: Literal["ndjson", "csv"] | None = Field(
+        default=None, description="导入格式（默认根据 Content-Type 判断，无法判断时按 NDJSON 处理）"
+    )
+    source_type: Literal["manual", "ai", "import"] = Field(default="import", description="来源类型")
+
+
+class NoteImportError(BaseModel):
+    """导入失败的单行记录"""
+
+    line: int = Field(..., description="行号（从1开始）")
+    msg: str = Field(..., description="错误信息")
+
+
+class NoteImportResult(BaseModel):
+    """流式导入结果"""
+
+    total_rows: int = Field(..., description="读取的记录数（不含空行和 CSV 表头）")
+    created_count: int = Field(..., description="成功创建的笔记数")
+    skipped_count: int = Field(..., description="跳过的笔记数（重复）")
+    error_count: int = Field(..., description="失败的笔记数")
+    committed_chunks: int = Field(..., description="已提交的批次数")
+    errors: list[NoteImportError] = Field(default_factory=list, description="失败记录明细（最多返回前100条）")
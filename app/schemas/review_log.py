@@ -4,7 +4,7 @@
 用于 API 请求和响应的数据验证和序列化
 """
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import Literal
 
 from pydantic import BaseModel, Field
@@ -37,6 +37,28 @@ class ReviewLogCreate(BaseModel):
     duration_ms: int | None = Field(default=None, ge=0, description="本次回答耗时（毫秒）")
 
 
+class ReviewLogBatchItem(ReviewLogCreate):
+    """批量上传复习日志的单项"""
+
+    id: str = Field(..., min_length=1, max_length=36, description="客户端生成的日志ID（UUID），重试时据此去重")
+
+
+class ReviewLogBatchCreate(BaseModel):
+    """批量上传复习日志请求（离线复习后同步）"""
+
+    reviews: list[ReviewLogBatchItem] = Field(
+        ..., min_length=1, max_length=10000, description="复习日志列表（最多10000条）"
+    )
+
+
+class ReviewLogBatchResult(BaseModel):
+    """批量上传复习日志结果"""
+
+    created_count: int = Field(..., description="成功写入的日志数")
+    skipped_count: int = Field(..., description="跳过的日志数（ID 已存在，即重复上传）")
+    error_count: int = Field(..., description="失败的日志数（卡片不存在或无权限）")
+
+
 class ReviewLogResponse(BaseModel):
     """复习日志响应"""
 
@@ -80,3 +102,14 @@ class ReviewStats(BaseModel):
     reviews_this_week: int = Field(..., description="本周复习次数")
     average_rating: float = Field(..., description="平均评分")
     retention_rate: float = Field(..., description="记忆保持率（Good/Easy 比例）")
+
+
+class ReviewDailyStatResponse(BaseModel):
+    """每日复习汇总（用于热力图、连续打卡等）"""
+
+    day: date = Field(..., description="日期")
+    review_count: int = Field(..., description="复习次数")
+    good_count: int = Field(..., description="Good/Easy 次数")
+    duration_ms: int = Field(..., description="回答总耗时（毫秒）")
+
+    model_config = {"from_attributes": True}
@@ -5,6 +5,7 @@
 """
 
 from datetime import datetime
+from typing import Any
 
 from pydantic import BaseModel, Field
 
@@ -26,6 +27,29 @@ class SharedDeckSnapshotResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class SharedDeckDeltaSection(BaseModel):
+    """共享牌组增量中的一类记录"""
+
+    added: list[dict[str, Any]] = Field(default_factory=list, description="新增的记录")
+    changed: list[dict[str, Any]] = Field(default_factory=list, description="内容变化的记录（完整新内容）")
+    removed: list[str] = Field(default_factory=list, description="删除的记录键（笔记为 guid，卡片为 ID）")
+
+
+class SharedDeckDeltaResponse(BaseModel):
+    """共享牌组版本增量响应"""
+
+    from_version: int = Field(..., description="起始版本号")
+    to_version: int = Field(..., description="目标版本号（最新版本）")
+    from_content_hash: str = Field(..., description="起始版本内容哈希")
+    to_content_hash: str = Field(..., description="目标版本内容哈希")
+    deck: dict[str, Any] | None = Field(default=None, description="目标版本牌组信息（没有变化时为空）")
+    note_models: list[dict[str, Any]] = Field(default_factory=list, description="目标版本的完整笔记类型列表")
+    notes: SharedDeckDeltaSection = Field(
+        default_factory=SharedDeckDeltaSection, description="笔记增量（以 guid 为键）"
+    )
+    cards: SharedDeckDeltaSection = Field(default_factory=SharedDeckDeltaSection, description="卡片增量（以 ID 为键）")
+
+
 # ==================== 共享牌组 Schema ====================
 
 
@@ -0,0 +1,14 @@
+"""
+标签相关的 Pydantic Schema
+
+用于 API 请求和响应的数据验证和序列化
+"""
+
+from pydantic import BaseModel, Field
+
+
+class TagCountResponse(BaseModel):
+    """标签及其计数响应"""
+
+    name: str = Field(..., description="标签名")
+    count: int = Field(..., description="带有该标签的笔记数或共享牌组数")
@@ -6,6 +6,7 @@ Service 层
 
 from app.services.auth import AuthService
 from app.services.deck import DeckService
+from app.services.job import JobService
 from app.services.note import CardService, NoteService
 from app.services.note_model import NoteModelService
 from app.services.review_log import ReviewLogService
@@ -21,4 +22,5 @@ __all__ = [
     "CardService",
     "ReviewLogService",
     "SharedDeckService",
+    "JobService",
 ]
@@ -6,8 +6,15 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.exceptions import BadRequestException, ForbiddenException, UnauthorizedException
-from app.core.security import create_tokens, get_password_hash, verify_password, verify_refresh_token
+from app.core.exceptions import (
+    BadRequestException,
+    ForbiddenException,
+    TooManyRequestsException,
+    UnauthorizedException,
+)
+from app.core.password import password_hasher
+from app.core.principal import invalidate_principal
+from app.core.security import create_tokens, verify_refresh_token
 from app.models.base import Token
 from app.models.user import User
 from app.repositories.user import UserRepository
@@ -34,18 +41,29 @@ class AuthService:
         Raises:
             UnauthorizedException: 用户名或密码错误
             ForbiddenException: 用户已被禁用
+            TooManyRequestsException: 密码校验排队已满
         """
         # 查找用户
         user = await self.user_repo.get_by_username(login_data.username)
 
         # 验证用户和密码
-        if not user or not verify_password(login_data.password, user.hashed_password):
+        if not user or not await password_hasher.verify(login_data.password, user.hashed_password):
             raise UnauthorizedException(msg="用户名或密码错误")
 
         # 检查用户状态
         if not user.is_active:
             raise ForbiddenException(msg="用户已被禁用")
 
+        # bcrypt 成本因子调整后，按新成本重新哈希（只有登录时能拿到明文密码）；
+        # 线程池繁忙时跳过升级，留待下次登录，不因此拒绝已通过校验的登录
+        if password_hasher.needs_rehash(user.hashed_password):
+            try:
+                user.hashed_password = await password_hasher.hash(login_data.password)
+            except TooManyRequestsException:
+                pass
+            else:
+                await self.db.flush()
+
         # 创建 token
         access_token, refresh_token = create_tokens({"user_id": user.id})
 
@@ -68,6 +86,7 @@ class AuthService:
 
         Raises:
             BadRequestException: 用户名或邮箱已存在
+            TooManyRequestsException: 密码哈希排队已满
         """
         # 检查用户名是否已存在
         if await self.user_repo.username_exists(user_data.username):
@@ -83,7 +102,7 @@ class AuthService:
                 "username": user_data.username,
                 "email": user_data.email,
                 "nickname": user_data.nickname,
-                "hashed_password": get_password_hash(user_data.password),
+                "hashed_password": await password_hasher.hash(user_data.password),
                 "is_active": True,
                 "is_superuser": False,
             }
@@ -147,9 +166,10 @@ class AuthService:
 
         Raises:
             BadRequestException: 旧密码错误或新旧密码相同
+            TooManyRequestsException: 密码哈希排队已满
         """
         # 验证旧密码
-        if not verify_password(old_password, user.hashed_password):
+        if not await password_hasher.verify(old_password, user.hashed_password):
             raise BadRequestException(msg="旧密码错误")
 
         # 检查新旧密码是否相同
@@ -157,5 +177,6 @@ class AuthService:
             raise BadRequestException(msg="新密码不能与旧密码相同")
 
         # 更新密码
-        user.hashed_password = get_password_hash(new_password)
+        user.hashed_password = await password_hasher.hash(new_password)
         await self.db.flush()
+        invalidate_principal(self.db, user.id)
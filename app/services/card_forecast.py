@@ -0,0 +1,143 @@
+"""
+复习预测
+
+用一条 GROUP BY 统计用户活跃卡片按牌组、按天的到期分布（总是统计最多天数），
+结果按用户缓存，不同的天数、牌组、每日新卡片数都由同一份分布计算。
+
+- 失效：卡片写入时经由 due_queue_cache 的变更通知丢弃该用户的缓存；
+  统计期间有任何卡片变更时不缓存本次结果
+- 日期：按服务器本地时区划分（与复习统计的“今日”一致），跨过零点后重新统计
+"""
+
+from datetime import date, datetime, timedelta
+
+from app.core.cache import SessionInvalidator, TTLCache, register_cache
+from app.core.config import settings
+from app.repositories.note import NEW_CARD_BUCKET, OVERDUE_BUCKET, CardRepository
+from app.schemas.note import (
+    MAX_FORECAST_DAYS,
+    CardForecastDay,
+    CardForecastDeck,
+    CardForecastQuery,
+    CardForecastResponse,
+)
+from app.services.due_queue import due_queue_cache
+
+# 到期分布：(牌组 ID, 天序号, 卡片数)
+Histogram = list[tuple[str, int, int]]
+
+
+def today_start() -> tuple[date, int]:
+    """今天的日期和零点（服务器本地时区）的毫秒时间戳"""
+    today = date.today()
+    return today, int(datetime.combine(today, datetime.min.time()).timestamp() * 1000)
+
+
+def build_forecast(histogram: Histogram, start_day: date, query: CardForecastQuery) -> CardForecastResponse:
+    """
+    由到期分布计算复习预测
+
+    新卡片按每天 new_per_day 张依次引入，直到用完。
+
+    Args:
+        histogram: 到期分布
+        start_day: 第 0 天的日期
+        query: 查询参数
+
+    Returns:
+        复习预测
+    """
+    decks: dict[str, CardForecastDeck] = {}
+    for deck_id, bucket, count in histogram:
+        if query.deck_id and deck_id != query.deck_id:
+            continue
+        deck = decks.get(deck_id)
+        if deck is None:
+            deck = decks[deck_id] = CardForecastDeck(
+                deck_id=deck_id, review_counts=[0] * query.days, overdue_count=0, new_remaining=0
+            )
+        if bucket == NEW_CARD_BUCKET:
+            deck.new_remaining += count
+        elif bucket == OVERDUE_BUCKET:
+            deck.overdue_count += count
+            deck.review_counts[0] += count
+        elif bucket < query.days:
+            deck.review_counts[bucket] += count
+
+    review_counts = [sum(counts) for counts in zip(*(deck.review_counts for deck in decks.values()), strict=True)]
+    new_remaining = sum(deck.new_remaining for deck in decks.values())
+    days = []
+    remaining = new_remaining
+    for offset in range(query.days):
+        new_count = min(query.new_per_day, remaining)
+        remaining -= new_count
+        days.append(
+            CardForecastDay(
+                day=start_day + timedelta(days=offset),
+                review_count=review_counts[offset] if review_counts else 0,
+                new_count=new_count,
+            )
+        )
+    return CardForecastResponse(
+        days=days,
+        overdue_count=sum(deck.overdue_count for deck in decks.values()),
+        new_remaining=new_remaining,
+        decks=sorted(decks.values(), key=lambda deck: deck.deck_id) if query.by_deck else None,
+    )
+
+
+class CardForecastCache:
+    """按用户缓存到期分布"""
+
+    def __init__(self) -> None:
+        # 用户 ID -> (第 0 天的起始时间戳, 到期分布)
+        self.cache: TTLCache[str, tuple[int, Histogram]] = register_cache(
+            TTLCache(
+                "card_forecast",
+                max_size=settings.CARD_FORECAST_CACHE_MAX_USERS,
+                ttl_seconds=settings.CARD_FORECAST_CACHE_TTL,
+            )
+        )
+        # 卡片写入经由 due_queue_cache 的变更通知（已跟随事务）调用 invalidate，这里只用其 generation
+        self.invalidator: SessionInvalidator[str] = SessionInvalidator(
+            "card_forecast_invalidations", self.cache.invalidate
+        )
+
+    async def get_histogram(self, card_repo: CardRepository, user_id: str, start: int) -> Histogram:
+        """
+        获取用户从 start 开始 MAX_FORECAST_DAYS 天的到期分布
+
+        Args:
+            card_repo: 卡片 Repository（使用其数据库会话）
+            user_id: 用户 ID
+            start: 第 0 天的起始时间戳（毫秒）
+
+        Returns:
+            到期分布
+        """
+        cached = self.cache.peek(user_id)
+        if cached is not None and cached[0] != start:
+            # 已跨过零点
+            self.cache.invalidate(user_id)
+        cached = self.cache.get(user_id)
+        if cached is not None:
+            return cached[1]
+
+        generation = self.invalidator.generation
+        histogram = await card_repo.get_due_histogram(user_id, start, MAX_FORECAST_DAYS)
+        if generation == self.invalidator.generation:
+            self.cache.set(user_id, (start, histogram))
+        return histogram
+
+    def invalidate(self, user_id: str) -> None:
+        """
+        丢弃用户的缓存（卡片变更时调用）
+
+        Args:
+            user_id: 用户 ID
+        """
+        self.invalidator.invalidate(user_id)
+
+
+card_forecast_cache = CardForecastCache()
+due_queue_cache.listeners.append(card_forecast_cache.invalidate)
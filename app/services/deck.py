@@ -7,6 +7,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import BadRequestException, ForbiddenException, NotFoundException
+from app.models.base import BasePageQuery
 from app.models.deck import Deck
 from app.repositories.deck import DeckRepository
 from app.schemas.deck import DeckCreate, DeckListQuery, DeckUpdate
@@ -45,27 +46,26 @@ class DeckService:
         self,
         user_id: str,
         query_params: DeckListQuery,
-        page_num: int = 1,
-        page_size: int = 10,
-    ) -> tuple[list[Deck], int]:
+        page_query: BasePageQuery,
+    ) -> tuple[list[Deck], int | None, str | None]:
         """
         获取牌组列表
 
         Args:
             user_id: 用户 ID
             query_params: 查询参数
-            page_num: 页码
-            page_size: 每页数量
+            page_query: 分页参数
 
         Returns:
-            (牌组列表, 总数) 元组
+            (牌组列表, 总数, 下一页游标) 元组
         """
-        skip = (page_num - 1) * page_size
         return await self.deck_repo.get_by_user_id(
             user_id=user_id,
             keyword=query_params.keyword,
-            skip=skip,
-            limit=page_size,
+            skip=page_query.offset,
+            limit=page_query.limit,
+            cursor=page_query.cursor,
+            with_total=page_query.include_total,
         )
 
     async def create_deck(self, user_id: str, data: DeckCreate) -> Deck:
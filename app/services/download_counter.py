@@ -0,0 +1,110 @@
+"""
+共享牌组下载计数（写回缓冲）
+
+下载时只在内存中累加计数，由后台任务每隔 DOWNLOAD_COUNT_FLUSH_INTERVAL 秒把累计的增量以
+UPDATE shared_decks SET download_count = download_count + :n 原子地写入数据库，
+热门牌组的下载不再每次都对同一行执行读-改-写。
+
+- 分片：计数按牌组 ID 分散到 DOWNLOAD_COUNT_SHARDS 个分片，每个分片一把锁，
+  线程池中执行的同步代码也可以调用 add
+- 不丢失：写入失败时把增量加回缓冲，下次重试；应用关闭时（lifespan）写入剩余的计数
+- 延迟：详情、列表中的下载次数最多落后一个写入周期；进程异常退出时丢失未写入的增量
+"""
+
+import asyncio
+import threading
+from collections import Counter
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.repositories.shared_deck import SharedDeckRepository
+
+
+class DownloadCounter:
+    """分片的内存下载计数，定期写回数据库"""
+
+    def __init__(self, shards: int) -> None:
+        self.session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal
+        self._shards: list[Counter[str]] = [Counter() for _ in range(max(shards, 1))]
+        self._locks = [threading.Lock() for _ in self._shards]
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+
+    def add(self, shared_deck_id: str, count: int = 1) -> None:
+        """
+        累加下载计数
+
+        Args:
+            shared_deck_id: 共享牌组 ID
+            count: 增量
+        """
+        index = hash(shared_deck_id) % len(self._shards)
+        with self._locks[index]:
+            self._shards[index][shared_deck_id] += count
+
+    def pending(self) -> dict[str, int]:
+        """返回尚未写入数据库的计数"""
+        totals: Counter[str] = Counter()
+        for shard, lock in zip(self._shards, self._locks, strict=True):
+            with lock:
+                totals.update(shard)
+        return dict(totals)
+
+    async def flush(self) -> int:
+        """
+        把累计的计数写入数据库（失败时加回缓冲）
+
+        Returns:
+            写入的下载次数
+        """
+        async with self._flush_lock:
+            totals = self._drain()
+            if not totals:
+                return 0
+            try:
+                async with self.session_factory() as session:
+                    await SharedDeckRepository(session).add_download_counts(totals)
+                    await session.commit()
+            except Exception:
+                for shared_deck_id, count in totals.items():
+                    self.add(shared_deck_id, count)
+                raise
+            return sum(totals.values())
+
+    def start(self) -> None:
+        """启动定期写入的后台任务"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="download-counter-flush")
+
+    async def stop(self) -> None:
+        """停止后台任务并写入剩余的计数"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    def _drain(self) -> Counter[str]:
+        """取出所有分片的计数并清空分片"""
+        totals: Counter[str] = Counter()
+        for index, lock in enumerate(self._locks):
+            with lock:
+                shard, self._shards[index] = self._shards[index], Counter()
+            totals.update(shard)
+        return totals
+
+    async def _run(self) -> None:
+        """每隔 DOWNLOAD_COUNT_FLUSH_INTERVAL 秒写入一次"""
+        while True:
+            await asyncio.sleep(settings.DOWNLOAD_COUNT_FLUSH_INTERVAL)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"写入下载计数失败，下次重试: {e}")
+
+
+# 全局下载计数
+download_counter = DownloadCounter(settings.DOWNLOAD_COUNT_SHARDS)
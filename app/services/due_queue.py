@@ -0,0 +1,310 @@
+"""
+到期队列缓存
+
+每个用户的活跃卡片按 (队列, 到期时间, 卡片 ID) 排序保存在内存中，获取前 N 张到期卡片时
+只需在有序数组上二分定位，再按主键读取这 N 张卡片，不必每次扫描、排序用户的全部卡片。
+
+- 构造：首次访问时扫描一次用户的活跃卡片（只读调度相关的四列），排序后缓存
+- 维护：卡片写入路径调用 record，变更立即应用到已缓存的索引，事务提交后再应用一次
+  （覆盖提交前开始的并发构造），回滚时丢弃该用户的缓存
+- 校验：读出的卡片与索引不一致（如其他进程修改过）时丢弃缓存并回退为数据库查询
+- 淘汰：LRU + TTL（DUE_QUEUE_CACHE_MAX_USERS / DUE_QUEUE_CACHE_TTL）
+- 其他按用户缓存的卡片派生数据（如复习预测）通过 listeners 在同样的时机得到变更通知
+"""
+
+from bisect import bisect_left, insort
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import SessionInvalidator, TTLCache, register_cache
+from app.core.config import settings
+from app.models.note import Card
+from app.repositories.note import ACTIVE_QUEUES, CardRepository
+
+# 活跃队列按排序次序排列（与 ORDER BY queue 一致）
+QUEUES_BY_RANK = tuple(sorted(ACTIVE_QUEUES))
+QUEUE_RANK = {queue: rank for rank, queue in enumerate(QUEUES_BY_RANK)}
+
+# 索引键：(队列次序, 到期时间, 卡片 ID)
+DueKey = tuple[int, int, str]
+
+
+def card_change(card: Card) -> dict[str, Any]:
+    """
+    由卡片当前状态生成卡片变更（用于 DueQueueCache.record）
+
+    Args:
+        card: 卡片
+
+    Returns:
+        卡片变更
+    """
+    return {"id": card.id, "deck_id": card.deck_id, "queue": card.queue, "due": card.due}
+
+
+class DueQueue:
+    """单个用户的到期队列索引（全部活跃卡片一个有序数组，另按牌组各一个有序数组）"""
+
+    __slots__ = ("_all", "_by_deck", "_cards")
+
+    def __init__(self) -> None:
+        self._all: list[DueKey] = []
+        self._by_deck: dict[str, list[DueKey]] = {}
+        # 卡片 ID -> (索引键, 牌组 ID)
+        self._cards: dict[str, tuple[DueKey, str]] = {}
+
+    @classmethod
+    def build(cls, rows: Iterable[Sequence[Any]]) -> "DueQueue":
+        """
+        由活跃卡片构造索引（整体排序一次）
+
+        Args:
+            rows: (卡片 ID, 牌组 ID, 队列, 到期时间) 序列
+
+        Returns:
+            到期队列索引
+        """
+        queue = cls()
+        for card_id, deck_id, card_queue, due in rows:
+            key = (QUEUE_RANK[card_queue], due, card_id)
+            queue._cards[card_id] = (key, deck_id)
+            queue._all.append(key)
+            queue._by_deck.setdefault(deck_id, []).append(key)
+        queue._all.sort()
+        for keys in queue._by_deck.values():
+            keys.sort()
+        return queue
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def get(self, card_id: str) -> tuple[str, str, int] | None:
+        """
+        获取卡片在索引中的调度键
+
+        Args:
+            card_id: 卡片 ID
+
+        Returns:
+            (牌组 ID, 队列, 到期时间)，不在活跃队列中时返回 None
+        """
+        entry = self._cards.get(card_id)
+        if entry is None:
+            return None
+        (rank, due, _), deck_id = entry
+        return deck_id, QUEUES_BY_RANK[rank], due
+
+    def take(self, limit: int, *, deck_id: str | None = None, due_before: int | None = None) -> list[str]:
+        """
+        按 (队列, 到期时间) 顺序取前 limit 张卡片
+
+        指定 due_before 时在每个队列的区段内二分定位到期时间上界，复杂度 O(队列数 · log n + limit)。
+
+        Args:
+            limit: 最多返回的卡片数
+            deck_id: 牌组 ID
+            due_before: 到期时间上界（包含）
+
+        Returns:
+            卡片 ID 列表
+        """
+        keys = self._all if deck_id is None else self._by_deck.get(deck_id, [])
+        if due_before is None:
+            return [key[2] for key in keys[:limit]]
+
+        card_ids: list[str] = []
+        for rank in range(len(QUEUES_BY_RANK)):
+            start = bisect_left(keys, (rank,))
+            end = min(bisect_left(keys, (rank, due_before + 1)), start + limit - len(card_ids))
+            card_ids.extend(key[2] for key in keys[start:end])
+            if len(card_ids) >= limit:
+                break
+        return card_ids
+
+    def apply(self, change: Mapping[str, Any]) -> bool:
+        """
+        应用一条卡片变更
+
+        Args:
+            change: 卡片变更，必须包含 id；deck_id / queue / due 为变更后的值（未给出表示不变），
+                deleted 为真表示卡片已删除
+
+        Returns:
+            是否成功应用；卡片进入活跃队列但缺少牌组或到期时间、无法确定索引键时返回 False
+        """
+        card_id = change["id"]
+        current = self.get(card_id)
+        if change.get("deleted"):
+            self._remove(card_id)
+            return True
+
+        if current is None:
+            queue = change.get("queue")
+            if queue is None or queue not in QUEUE_RANK:
+                # 不在活跃队列中的卡片（或新卡片）仍不在活跃队列中
+                return True
+            if change.get("deck_id") is None or change.get("due") is None:
+                return False
+            deck_id, due = change["deck_id"], change["due"]
+        else:
+            deck_id = change.get("deck_id") or current[0]
+            queue = change.get("queue") or current[1]
+            due = current[2] if change.get("due") is None else change["due"]
+
+        self._remove(card_id)
+        if queue in QUEUE_RANK:
+            key = (QUEUE_RANK[queue], due, card_id)
+            self._cards[card_id] = (key, deck_id)
+            insort(self._all, key)
+            insort(self._by_deck.setdefault(deck_id, []), key)
+        return True
+
+    def _remove(self, card_id: str) -> None:
+        """从索引中移除卡片"""
+        entry = self._cards.pop(card_id, None)
+        if entry is None:
+            return
+        key, deck_id = entry
+        del self._all[bisect_left(self._all, key)]
+        deck_keys = self._by_deck[deck_id]
+        del deck_keys[bisect_left(deck_keys, key)]
+        if not deck_keys:
+            del self._by_deck[deck_id]
+
+
+class DueQueueCache:
+    """按用户缓存到期队列索引"""
+
+    def __init__(self) -> None:
+        self.cache: TTLCache[str, DueQueue] = register_cache(
+            TTLCache(
+                "due_queue",
+                max_size=settings.DUE_QUEUE_CACHE_MAX_USERS,
+                ttl_seconds=settings.DUE_QUEUE_CACHE_TTL,
+            )
+        )
+        # 正在构造索引的用户（用户 ID -> 并发构造数），构造期间有变更的用户不缓存构造结果
+        self._building: dict[str, int] = {}
+        self._dirty: set[str] = set()
+        # 用户卡片变更时的回调（参数为用户 ID），在应用变更和丢弃缓存时调用
+        self.listeners: list[Callable[[str], None]] = []
+        # 提交后再次应用变更，回滚后丢弃该用户的缓存
+        self.invalidator: SessionInvalidator[tuple[str, list[Mapping[str, Any]]]] = SessionInvalidator(
+            "due_queue_changes",
+            lambda item: self.apply(*item),
+            on_rollback=lambda item: self.invalidate(item[0]),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """是否启用缓存"""
+        return self.cache.max_size > 0
+
+    async def get_due_cards(
+        self,
+        card_repo: CardRepository,
+        user_id: str,
+        *,
+        deck_id: str | None = None,
+        due_before: int | None = None,
+        limit: int = 100,
+    ) -> list[Card]:
+        """
+        获取待复习的卡片（排序规则与 CardRepository.get_due_cards 一致，同一到期时间按卡片 ID 排序）
+
+        Args:
+            card_repo: 卡片 Repository（使用其数据库会话）
+            user_id: 用户 ID
+            deck_id: 牌组 ID
+            due_before: 到期时间之前
+            limit: 返回的最大记录数
+
+        Returns:
+            卡片列表
+        """
+        queue = self.cache.get(user_id) if self.enabled else None
+        if queue is None and self.enabled:
+            queue = await self._load(card_repo, user_id)
+        if queue is None:
+            return await card_repo.get_due_cards(user_id, deck_id=deck_id, due_before=due_before, limit=limit)
+
+        card_ids = queue.take(limit, deck_id=deck_id, due_before=due_before)
+        cards = await card_repo.get_by_ids(card_ids)
+        result: list[Card] = []
+        for card_id in card_ids:
+            card = cards.get(card_id)
+            if (
+                card is None
+                or card.deleted_at is not None
+                or queue.get(card_id) != (card.deck_id, card.queue, card.due)
+            ):
+                # 索引已过期（如其他进程修改了卡片）：丢弃缓存，本次回退为数据库查询
+                self.cache.invalidate(user_id)
+                return await card_repo.get_due_cards(user_id, deck_id=deck_id, due_before=due_before, limit=limit)
+            result.append(card)
+        return result
+
+    def record(self, db: AsyncSession, user_id: str, changes: Iterable[Mapping[str, Any]]) -> None:
+        """
+        记录卡片变更：立即应用到已缓存的索引，并在会话提交后再次应用、回滚后丢弃缓存
+
+        Args:
+            db: 执行写入的数据库会话
+            user_id: 用户 ID
+            changes: 卡片变更（格式见 DueQueue.apply）
+        """
+        changes = list(changes)
+        if changes:
+            self.invalidator.defer(db, (user_id, changes))
+
+    def apply(self, user_id: str, changes: Sequence[Mapping[str, Any]]) -> None:
+        """
+        将卡片变更应用到已缓存的索引，无法应用时丢弃该用户的缓存
+
+        Args:
+            user_id: 用户 ID
+            changes: 卡片变更
+        """
+        self._notify(user_id)
+        queue = self.cache.peek(user_id)
+        if queue is not None and not all(queue.apply(change) for change in changes):
+            self.cache.invalidate(user_id)
+
+    def invalidate(self, user_id: str) -> None:
+        """
+        丢弃用户的缓存
+
+        Args:
+            user_id: 用户 ID
+        """
+        self._notify(user_id)
+        self.cache.invalidate(user_id)
+
+    def _notify(self, user_id: str) -> None:
+        """标记构造中的索引已过期，并通知监听者"""
+        if user_id in self._building:
+            self._dirty.add(user_id)
+        for listener in self.listeners:
+            listener(user_id)
+
+    async def _load(self, card_repo: CardRepository, user_id: str) -> DueQueue | None:
+        """扫描用户的活跃卡片构造索引；构造期间有变更时不缓存，返回 None"""
+        self._building[user_id] = self._building.get(user_id, 0) + 1
+        try:
+            queue = DueQueue.build(await card_repo.get_due_queue_entries(user_id))
+        finally:
+            remaining = self._building.pop(user_id) - 1
+            if remaining:
+                self._building[user_id] = remaining
+        dirty = user_id in self._dirty
+        if user_id not in self._building:
+            self._dirty.discard(user_id)
+        if dirty:
+            return None
+        self.cache.set(user_id, queue)
+        return queue
+
+
+due_queue_cache = DueQueueCache()
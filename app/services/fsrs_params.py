@@ -0,0 +1,114 @@
+"""
+个人 FSRS 参数服务
+
+处理 FSRS 参数的查询和基于复习日志的优化
+"""
+
+import asyncio
+from collections.abc import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import BadRequestException
+from app.models.fsrs_params import FSRSParams
+from app.repositories.fsrs_params import FSRSParamsRepository
+from app.repositories.review_log import ReviewLogRepository
+from app.scheduler import FSRSParameters
+from app.schemas.fsrs_params import FSRSParamsResponse, FSRSScheduler
+
+# 优化至少需要的有效复习数（非首次复习且距上次复习至少一天）
+MIN_OPTIMIZE_SAMPLES = 100
+
+# 读取复习日志时每块的行数
+HISTORY_CHUNK_SIZE = 10000
+
+
+class FSRSParamsService:
+    """个人 FSRS 参数服务类"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.params_repo = FSRSParamsRepository(db)
+        self.review_log_repo = ReviewLogRepository(db)
+
+    async def get_params(self, user_id: str, scheduler: FSRSScheduler) -> FSRSParamsResponse:
+        """
+        获取用户的 FSRS 参数，尚未优化时返回默认参数
+
+        Args:
+            user_id: 用户 ID
+            scheduler: 调度器类型
+
+        Returns:
+            FSRS 参数
+        """
+        params = await self.params_repo.get_params(user_id, scheduler)
+        if params is None:
+            return FSRSParamsResponse(
+                scheduler=scheduler,
+                weights=list(FSRSParameters.for_scheduler(scheduler).weights),
+                is_default=True,
+            )
+        return self.to_response(params)
+
+    async def optimize(
+        self,
+        user_id: str,
+        scheduler: FSRSScheduler,
+        *,
+        on_step: Callable[[int, int], None] | None = None,
+    ) -> FSRSParamsResponse:
+        """
+        由用户的复习日志优化 FSRS 参数并保存
+
+        复习日志按卡片分块读入 NumPy 数组，拟合在线程池中执行，不阻塞事件循环。
+        优化总是从该版本的默认参数开始，结果覆盖之前保存的参数。
+
+        Args:
+            user_id: 用户 ID
+            scheduler: 调度器类型
+            on_step: 每个训练批次完成后的回调 (已完成步数, 总步数)，可抛出异常中止优化
+
+        Returns:
+            优化后的 FSRS 参数
+
+        Raises:
+            BadRequestException: 有效复习数不足
+        """
+        from app.scheduler.optimizer import ReviewHistoryBuilder, fit
+
+        builder = ReviewHistoryBuilder()
+        async for rows in self.review_log_repo.iter_history(user_id, chunk_size=HISTORY_CHUNK_SIZE):
+            builder.add(rows)
+        history = builder.build()
+        if history.sample_count < MIN_OPTIMIZE_SAMPLES:
+            raise BadRequestException(
+                msg=f"有效复习记录不足（{history.sample_count} 条），至少需要 {MIN_OPTIMIZE_SAMPLES} 条"
+            )
+
+        defaults = FSRSParameters.for_scheduler(scheduler)
+        result = await asyncio.to_thread(
+            fit, history, defaults.weights, enable_short_term=defaults.enable_short_term, on_step=on_step
+        )
+        params = await self.params_repo.save_params(
+            user_id,
+            scheduler,
+            weights=list(result.weights),
+            sample_count=result.sample_count,
+            loss_before=result.loss_before,
+            loss_after=result.loss_after,
+        )
+        return self.to_response(params)
+
+    @staticmethod
+    def to_response(params: FSRSParams) -> FSRSParamsResponse:
+        """将已保存的参数转换为响应"""
+        return FSRSParamsResponse(
+            scheduler=params.scheduler,  # type: ignore[arg-type]
+            weights=params.weights,
+            is_default=False,
+            sample_count=params.sample_count,
+            loss_before=params.loss_before,
+            loss_after=params.loss_after,
+            updated_at=params.updated_at,
+        )
@@ -0,0 +1,148 @@
+"""
+后台任务服务
+
+处理 Job 的提交、查询和取消
+"""
+
+from typing import Any
+
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import BadRequestException, ForbiddenException, NotFoundException
+from app.core.jobs import JOB_CANCELLED, JOB_FINISHED_STATUSES, JOB_PENDING, job_queue
+from app.models.base import BasePageQuery
+from app.models.job import Job
+from app.repositories.job import JobRepository
+from app.schemas.job import JobListQuery, JobResponse
+
+
+class JobService:
+    """后台任务服务类"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.job_repo = JobRepository(db)
+
+    async def submit_job(self, user_id: str, job_type: str, payload: dict[str, Any]) -> Job:
+        """
+        创建并提交后台任务
+
+        任务记录先提交到数据库再放入队列，保证 worker 能读到任务且重启后可恢复。
+
+        Args:
+            user_id: 用户 ID
+            job_type: 任务类型
+            payload: 任务参数（需可 JSON 序列化）
+
+        Returns:
+            创建的任务
+
+        Raises:
+            BadRequestException: 任务类型无效
+        """
+        if not job_queue.has_handler(job_type):
+            raise BadRequestException(msg=f"不支持的任务类型: {job_type}")
+
+        job = await self.job_repo.create({"user_id": user_id, "type": job_type, "payload": payload})
+        await self.db.commit()
+        job_queue.submit(job.id)
+        return job
+
+    async def get_job(self, job_id: str, user_id: str) -> Job:
+        """
+        获取单个任务
+
+        Args:
+            job_id: 任务 ID
+            user_id: 当前用户 ID
+
+        Returns:
+            Job 实例
+
+        Raises:
+            NotFoundException: 任务不存在
+            ForbiddenException: 无权限访问
+        """
+        job = await self.job_repo.get_by_id(job_id)
+        if not job:
+            raise NotFoundException(msg="任务不存在")
+        if job.user_id != user_id:
+            raise ForbiddenException(msg="无权限访问此任务")
+        return job
+
+    async def get_jobs(
+        self,
+        user_id: str,
+        query_params: JobListQuery,
+        page_query: BasePageQuery,
+    ) -> tuple[list[Job], int | None, str | None]:
+        """
+        获取任务列表
+
+        Args:
+            user_id: 用户 ID
+            query_params: 查询参数
+            page_query: 分页参数
+
+        Returns:
+            (任务列表, 总数, 下一页游标) 元组
+        """
+        return await self.job_repo.get_by_user_id(
+            user_id,
+            status=query_params.status,
+            type=query_params.type,
+            skip=page_query.offset,
+            limit=page_query.limit,
+            cursor=page_query.cursor,
+            with_total=page_query.include_total,
+        )
+
+    async def cancel_job(self, job_id: str, user_id: str) -> Job:
+        """
+        取消任务
+
+        未开始的任务直接标记为已取消；执行中的任务会在下一个检查点退出并回滚。
+
+        Args:
+            job_id: 任务 ID
+            user_id: 当前用户 ID
+
+        Returns:
+            更新后的任务
+
+        Raises:
+            NotFoundException: 任务不存在
+            ForbiddenException: 无权限访问
+            BadRequestException: 任务已结束
+        """
+        job = await self.get_job(job_id, user_id)
+        if job.status in JOB_FINISHED_STATUSES:
+            raise BadRequestException(msg="任务已结束，无法取消")
+
+        job.cancel_requested = True
+        if job.status == JOB_PENDING:
+            job.status = JOB_CANCELLED
+            job.finished_at = func.now()
+        # 先提交取消标记再通知 worker，worker 结束任务时读到的是已持久化的状态
+        await self.db.commit()
+        job_queue.request_cancel(job.id)
+        await self.db.refresh(job)
+        return job
+
+    @staticmethod
+    def to_response(job: Job) -> JobResponse:
+        """
+        转换为响应模型，执行中的任务使用内存中的最新进度
+
+        Args:
+            job: 任务
+
+        Returns:
+            任务响应
+        """
+        response = JobResponse.model_validate(job)
+        progress = job_queue.progress.get(job.id)
+        if progress is not None and job.status not in JOB_FINISHED_STATUSES:
+            response.progress_done, response.progress_total = progress
+        return response
@@ -0,0 +1,89 @@
+"""
+后台任务处理函数
+
+把耗时的业务操作包装为可在后台 worker 中执行的任务
+"""
+
+from typing import Any
+
+from app.core.jobs import JobContext, JobQueue
+from app.schemas.fsrs_params import FSRSOptimizeRequest
+from app.schemas.note import NoteBatchCreate
+from app.schemas.shared_deck import PublishDeckRequest, SharedDeckResponse
+from app.services.fsrs_params import FSRSParamsService
+from app.services.note import NoteService
+from app.services.shared_deck import SharedDeckService
+
+# 任务类型
+JOB_TYPE_PUBLISH_DECK = "publish_deck"
+JOB_TYPE_PUBLISH_NEW_VERSION = "publish_new_version"
+JOB_TYPE_CREATE_NOTES_BATCH = "create_notes_batch"
+JOB_TYPE_OPTIMIZE_FSRS_PARAMS = "optimize_fsrs_params"
+
+# 批量创建笔记任务每次处理（并更新进度、检查取消）的笔记数
+NOTES_BATCH_JOB_CHUNK_SIZE = 1000
+
+
+async def publish_deck_job(ctx: JobContext) -> dict[str, Any]:
+    """发布牌组为共享牌组"""
+    data = PublishDeckRequest.model_validate(ctx.payload["data"])
+    service = SharedDeckService(ctx.db)
+    shared_deck = await service.publish_deck(ctx.payload["deck_id"], ctx.user_id, data)
+    return SharedDeckResponse.model_validate(shared_deck).model_dump(mode="json")
+
+
+async def publish_new_version_job(ctx: JobContext) -> dict[str, Any]:
+    """发布共享牌组的新版本"""
+    service = SharedDeckService(ctx.db)
+    shared_deck = await service.publish_new_version(ctx.payload["shared_deck_id"], ctx.user_id)
+    return SharedDeckResponse.model_validate(shared_deck).model_dump(mode="json")
+
+
+async def create_notes_batch_job(ctx: JobContext) -> dict[str, Any]:
+    """
+    批量创建笔记
+
+    模板和去重只做一次，分块写入以便更新进度和响应取消；
+    所有块在同一事务中提交，取消时不会留下部分数据。
+    """
+    data = NoteBatchCreate.model_validate(ctx.payload)
+    ctx.set_progress(0, len(data.notes))
+
+    def on_chunk(done: int, total: int) -> None:
+        ctx.set_progress(done, total)
+        ctx.check_cancelled()
+
+    ctx.check_cancelled()
+    result = await NoteService(ctx.db).create_notes_batch(
+        ctx.user_id, data, chunk_size=NOTES_BATCH_JOB_CHUNK_SIZE, on_chunk=on_chunk
+    )
+    return result.model_dump()
+
+
+async def optimize_fsrs_params_job(ctx: JobContext) -> dict[str, Any]:
+    """
+    由复习日志优化个人 FSRS 参数
+
+    进度为已完成的训练批次数，取消请求在每个批次结束时检查。
+    """
+    data = FSRSOptimizeRequest.model_validate(ctx.payload)
+
+    def on_step(done: int, total: int) -> None:
+        ctx.set_progress(done, total)
+        ctx.check_cancelled()
+
+    params = await FSRSParamsService(ctx.db).optimize(ctx.user_id, data.scheduler, on_step=on_step)
+    return params.model_dump(mode="json")
+
+
+def register_job_handlers(queue: JobQueue) -> None:
+    """
+    注册所有后台任务处理函数
+
+    Args:
+        queue: 任务队列
+    """
+    queue.register(JOB_TYPE_PUBLISH_DECK, publish_deck_job)
+    queue.register(JOB_TYPE_PUBLISH_NEW_VERSION, publish_new_version_job)
+    queue.register(JOB_TYPE_CREATE_NOTES_BATCH, create_notes_batch_job)
+    queue.register(JOB_TYPE_OPTIMIZE_FSRS_PARAMS, optimize_fsrs_params_job)
@@ -4,22 +4,52 @@
 处理 Note 和 Card 相关的业务逻辑
 """
 
+import uuid
+from collections.abc import AsyncIterable, Callable, Mapping, Sequence
+from datetime import UTC, datetime
+from typing import Any
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import BadRequestException, ForbiddenException, NotFoundException
+from app.models.base import BasePageQuery
 from app.models.note import Card, Note
+from app.models.note_model import CardTemplate
 from app.repositories.deck import DeckRepository
 from app.repositories.note import CardRepository, NoteRepository
 from app.repositories.note_model import CardTemplateRepository, NoteModelRepository
+from app.repositories.tag import TagRepository
 from app.schemas.note import (
+    CardBatchUpdate,
+    CardBatchUpdateItemResult,
+    CardBatchUpdateResult,
+    CardForecastQuery,
+    CardForecastResponse,
     CardListQuery,
     CardUpdate,
     NoteBatchCreate,
+    NoteBatchItem,
     NoteBatchResult,
     NoteCreate,
+    NoteImportError,
+    NoteImportQuery,
+    NoteImportResult,
     NoteListQuery,
     NoteUpdate,
 )
+from app.services.card_forecast import build_forecast, card_forecast_cache, today_start
+from app.services.due_queue import card_change, due_queue_cache
+from app.utils import content_digest
+from app.utils.note_import import ImportRow
+
+# 批量写入时每次 executemany 的行数
+BULK_INSERT_CHUNK_SIZE = 1000
+
+# 流式导入时每次提交的笔记数
+IMPORT_CHUNK_SIZE = 2000
+
+# 流式导入结果中返回的失败记录明细上限
+IMPORT_MAX_ERRORS = 100
 
 
 class NoteService:
@@ -32,6 +62,7 @@ class NoteService:
         self.deck_repo = DeckRepository(db)
         self.note_model_repo = NoteModelRepository(db)
         self.card_template_repo = CardTemplateRepository(db)
+        self.tag_repo = TagRepository(db)
 
     async def get_note(self, note_id: str, user_id: str) -> Note:
         """
@@ -59,31 +90,43 @@ class NoteService:
         self,
         user_id: str,
         query_params: NoteListQuery,
-        page_num: int = 1,
-        page_size: int = 10,
-    ) -> tuple[list[Note], int]:
+        page_query: BasePageQuery,
+    ) -> tuple[list[Note], int | None, str | None]:
         """
         获取笔记列表
 
         Args:
             user_id: 用户 ID
             query_params: 查询参数
-            page_num: 页码
-            page_size: 每页数量
+            page_query: 分页参数
 
         Returns:
-            (笔记列表, 总数) 元组
+            (笔记列表, 总数, 下一页游标) 元组
         """
-        skip = (page_num - 1) * page_size
         return await self.note_repo.get_by_user_id(
             user_id=user_id,
             deck_id=query_params.deck_id,
             keyword=query_params.keyword,
             tags=query_params.get_tags_list(),
-            skip=skip,
-            limit=page_size,
+            skip=page_query.offset,
+            limit=page_query.limit,
+            cursor=page_query.cursor,
+            with_total=page_query.include_total,
         )
 
+    async def get_tag_counts(self, user_id: str, deck_id: str | None = None) -> list[tuple[str, int]]:
+        """
+        获取用户的全部标签及每个标签的笔记数
+
+        Args:
+            user_id: 用户 ID
+            deck_id: 只统计指定牌组
+
+        Returns:
+            (标签名, 笔记数) 列表，按标签名排序
+        """
+        return await self.tag_repo.get_note_tag_counts(user_id, deck_id)
+
     async def create_note(self, user_id: str, data: NoteCreate) -> Note:
         """
         创建笔记（同时创建关联的卡片）
@@ -130,10 +173,14 @@ class NoteService:
             }
         )
 
+        await self.tag_repo.add_note_tags([(note.id, user_id, note.tags)])
+
         # 为每个模板创建卡片
+        added = [content_digest.note_hash(note.guid, note.fields, note.tags)]
+        cards: list[Card] = []
         for template in note_model.templates:
             if template.deleted_at is None:
-                await self.card_repo.create(
+                card = await self.card_repo.create(
                     {
                         "user_id": user_id,
                         "note_id": note.id,
@@ -152,17 +199,34 @@ class NoteService:
                         "dirty": 1,
                     }
                 )
+                cards.append(card)
+                added.append(content_digest.card_hash(card.note_id, card.card_template_id, card.ord))
+
+        due_queue_cache.record(self.db, user_id, map(card_change, cards))
+        await self._update_content_digest(data.deck_id, added=added)
 
         # 重新加载以获取卡片
         return await self.note_repo.get_by_id_with_cards(note.id)  # type: ignore
 
-    async def create_notes_batch(self, user_id: str, data: NoteBatchCreate) -> NoteBatchResult:
+    async def create_notes_batch(
+        self,
+        user_id: str,
+        data: NoteBatchCreate,
+        *,
+        chunk_size: int = BULK_INSERT_CHUNK_SIZE,
+        on_chunk: Callable[[int, int], None] | None = None,
+    ) -> NoteBatchResult:
         """
         批量创建笔记
 
+        先在内存中按 GUID 去重（包括同一批次内的重复），再按块以一次查询排除牌组中已存在的笔记并写入，
+        笔记模板只加载一次。所有块在当前事务中写入，由调用方提交。
+
         Args:
             user_id: 用户 ID
             data: 批量创建数据
+            chunk_size: 每块的笔记数
+            on_chunk: 每块写入后的回调 (已写入的去重后笔记数, 去重后笔记总数)，可抛出异常中止写入
 
         Returns:
             批量创建结果
@@ -170,86 +234,324 @@ class NoteService:
         Raises:
             BadRequestException: 牌组或笔记类型无效
         """
-        # 验证牌组
-        deck = await self.deck_repo.get_by_id(data.deck_id)
-        if not deck:
-            raise BadRequestException(msg="牌组不存在")
-        if deck.user_id != user_id:
-            raise ForbiddenException(msg="无权限访问此牌组")
+        templates = await self._get_batch_templates(user_id, data.deck_id, data.note_model_id)
 
-        # 验证笔记类型
-        note_model = await self.note_model_repo.get_by_id_with_templates(data.note_model_id)
-        if not note_model:
-            raise BadRequestException(msg="笔记类型不存在")
+        summary = NoteBatchResult(created_count=0, skipped_count=0, error_count=0)
+        notes: dict[str, NoteBatchItem] = {}
+        for item in data.notes:
+            try:
+                guid = NoteRepository.generate_guid(item.fields)
+            except Exception:
+                summary.error_count += 1
+                continue
+            if guid in notes:
+                summary.skipped_count += 1
+                continue
+            notes[guid] = item
+
+        items = list(notes.items())
+        for start in range(0, len(items), chunk_size):
+            result = await self._create_notes_chunk(
+                user_id,
+                deck_id=data.deck_id,
+                note_model_id=data.note_model_id,
+                templates=templates,
+                notes=dict(items[start : start + chunk_size]),
+                source_type=data.source_type,
+            )
+            summary.created_count += result.created_count
+            summary.skipped_count += result.skipped_count
+            summary.error_count += result.error_count
+            summary.created_ids.extend(result.created_ids)
+            if on_chunk is not None:
+                on_chunk(min(start + chunk_size, len(items)), len(items))
+
+        return summary
+
+    async def import_notes_stream(
+        self,
+        user_id: str,
+        query: NoteImportQuery,
+        rows: AsyncIterable[ImportRow],
+    ) -> NoteImportResult:
+        """
+        流式导入笔记
 
-        # 获取现有 GUID 用于去重
-        existing_guids = await self.note_repo.get_guids_by_deck(data.deck_id)
+        逐条消费已解析的导入记录，去重规则与批量创建一致；
+        每累计 IMPORT_CHUNK_SIZE 条笔记先在块内去重，再以一次查询排除牌组中已存在的 GUID，
+        写入并提交后丢弃该块，内存占用与文件大小无关。
 
+        Args:
+            user_id: 用户 ID
+            query: 导入参数
+            rows: 导入记录
+
+        Returns:
+            导入结果
+
+        Raises:
+            BadRequestException: 牌组或笔记类型无效，或导入内容格式错误
+            ForbiddenException: 无权限访问牌组
+        """
+        templates = await self._get_batch_templates(user_id, query.deck_id, query.note_model_id)
+
+        total_rows = 0
         created_count = 0
         skipped_count = 0
         error_count = 0
-        created_ids = []
+        committed_chunks = 0
+        errors: list[NoteImportError] = []
+        # 当前块内按 GUID 去重后的待写入笔记，写入后即清空
+        pending: dict[str, NoteBatchItem] = {}
+
+        async def flush() -> None:
+            nonlocal created_count, skipped_count, error_count, committed_chunks
+            result = await self._create_notes_chunk(
+                user_id,
+                deck_id=query.deck_id,
+                note_model_id=query.note_model_id,
+                templates=templates,
+                notes=pending,
+                source_type=query.source_type,
+            )
+            pending.clear()
+            skipped_count += result.skipped_count
+            error_count += result.error_count
+            if result.created_count:
+                await self.db.commit()
+                created_count += result.created_count
+                committed_chunks += 1
+
+        async for row in rows:
+            total_rows += 1
+            if row.item is None:
+                error_count += 1
+                if len(errors) < IMPORT_MAX_ERRORS:
+                    errors.append(NoteImportError(line=row.line, msg=row.error or "无效记录"))
+                continue
 
-        templates = [t for t in note_model.templates if t.deleted_at is None]
+            guid = NoteRepository.generate_guid(row.item.fields)
+            if guid in pending:
+                skipped_count += 1
+                continue
+            pending[guid] = row.item
 
-        for item in data.notes:
-            try:
-                guid = NoteRepository.generate_guid(item.fields)
+            if len(pending) >= IMPORT_CHUNK_SIZE:
+                await flush()
 
-                # 检查是否重复
-                if guid in existing_guids:
-                    skipped_count += 1
-                    continue
+        if pending:
+            await flush()
 
-                # 创建笔记
-                note = await self.note_repo.create(
-                    {
-                        "user_id": user_id,
-                        "deck_id": data.deck_id,
-                        "note_model_id": data.note_model_id,
-                        "guid": guid,
-                        "fields": item.fields,
-                        "tags": item.tags,
-                        "source_type": data.source_type,
-                        "dirty": 1,
-                    }
-                )
+        return NoteImportResult(
+            total_rows=total_rows,
+            created_count=created_count,
+            skipped_count=skipped_count,
+            error_count=error_count,
+            committed_chunks=committed_chunks,
+            errors=errors,
+        )
 
-                # 为每个模板创建卡片
-                for template in templates:
-                    await self.card_repo.create(
-                        {
-                            "user_id": user_id,
-                            "note_id": note.id,
-                            "deck_id": data.deck_id,
-                            "card_template_id": template.id,
-                            "ord": template.ord,
-                            "state": "new",
-                            "queue": "new",
-                            "due": 0,
-                            "interval": 0,
-                            "ease_factor": 2500,
-                            "reps": 0,
-                            "lapses": 0,
-                            "stability": 0.0,
-                            "difficulty": 0.0,
-                            "dirty": 1,
-                        }
-                    )
-
-                existing_guids.add(guid)
-                created_ids.append(note.id)
-                created_count += 1
+    async def _create_notes_chunk(
+        self,
+        user_id: str,
+        *,
+        deck_id: str,
+        note_model_id: str,
+        templates: Sequence[CardTemplate],
+        notes: Mapping[str, NoteBatchItem],
+        source_type: str,
+    ) -> NoteBatchResult:
+        """
+        写入一块已按 GUID 去重的笔记（不提交）
+
+        以一次 guid IN (...) 查询跳过牌组中已存在的笔记，其余笔记批量写入。
+
+        Args:
+            user_id: 用户 ID
+            deck_id: 牌组 ID
+            note_model_id: 笔记类型 ID
+            templates: 有效的卡片模板
+            notes: GUID 到笔记内容的映射
+            source_type: 来源类型
+
+        Returns:
+            本块的创建结果
+        """
+        existing_guids = await self.note_repo.get_existing_guids(deck_id, notes.keys())
+
+        error_count = 0
+        note_rows: list[dict[str, Any]] = []
+        card_rows: list[dict[str, Any]] = []
+        for guid, item in notes.items():
+            if guid in existing_guids:
+                continue
+            try:
+                note_row, note_card_rows = self._build_note_rows(
+                    user_id,
+                    deck_id=deck_id,
+                    note_model_id=note_model_id,
+                    templates=templates,
+                    guid=guid,
+                    fields=item.fields,
+                    tags=item.tags,
+                    source_type=source_type,
+                )
             except Exception:
                 error_count += 1
+                continue
+            note_rows.append(note_row)
+            card_rows.extend(note_card_rows)
+
+        await self._bulk_insert_notes(deck_id, note_rows, card_rows)
 
         return NoteBatchResult(
-            created_count=created_count,
-            skipped_count=skipped_count,
+            created_count=len(note_rows),
+            skipped_count=len(existing_guids),
             error_count=error_count,
-            created_ids=created_ids,
+            created_ids=[row["id"] for row in note_rows],
+        )
+
+    async def _get_batch_templates(self, user_id: str, deck_id: str, note_model_id: str) -> list[CardTemplate]:
+        """
+        校验批量写入的目标牌组和笔记类型，返回有效的卡片模板
+
+        Args:
+            user_id: 用户 ID
+            deck_id: 牌组 ID
+            note_model_id: 笔记类型 ID
+
+        Returns:
+            有效的卡片模板列表
+
+        Raises:
+            BadRequestException: 牌组或笔记类型不存在
+            ForbiddenException: 无权限访问此牌组或笔记类型
+        """
+        # 验证牌组
+        deck = await self.deck_repo.get_by_id(deck_id)
+        if not deck:
+            raise BadRequestException(msg="牌组不存在")
+        if deck.user_id != user_id:
+            raise ForbiddenException(msg="无权限访问此牌组")
+
+        # 验证笔记类型
+        note_model = await self.note_model_repo.get_by_id_with_templates(note_model_id)
+        if not note_model:
+            raise BadRequestException(msg="笔记类型不存在")
+        if note_model.user_id != user_id:
+            raise ForbiddenException(msg="无权限访问此笔记类型")
+
+        return [t for t in note_model.templates if t.deleted_at is None]
+
+    @staticmethod
+    def _build_note_rows(
+        user_id: str,
+        *,
+        deck_id: str,
+        note_model_id: str,
+        templates: Sequence[CardTemplate],
+        guid: str,
+        fields: dict[str, str],
+        tags: list[str],
+        source_type: str,
+    ) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+        """
+        构造一条笔记及其卡片的待插入行
+
+        Args:
+            user_id: 用户 ID
+            deck_id: 牌组 ID
+            note_model_id: 笔记类型 ID
+            templates: 有效的卡片模板
+            guid: 笔记 GUID
+            fields: 字段内容
+            tags: 标签列表
+            source_type: 来源类型
+
+        Returns:
+            (笔记行, 卡片行列表) 元组
+        """
+        note_id = str(uuid.uuid4())
+        note_row = {
+            "id": note_id,
+            "user_id": user_id,
+            "deck_id": deck_id,
+            "note_model_id": note_model_id,
+            "guid": guid,
+            "fields": fields,
+            "tags": tags,
+            "source_type": source_type,
+            "dirty": 1,
+        }
+        card_rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": user_id,
+                "note_id": note_id,
+                "deck_id": deck_id,
+                "card_template_id": template.id,
+                "ord": template.ord,
+                "state": "new",
+                "queue": "new",
+                "due": 0,
+                "interval": 0,
+                "ease_factor": 2500,
+                "reps": 0,
+                "lapses": 0,
+                "stability": 0.0,
+                "difficulty": 0.0,
+                "dirty": 1,
+            }
+            for template in templates
+        ]
+        return note_row, card_rows
+
+    async def _bulk_insert_notes(
+        self, deck_id: str, note_rows: list[dict[str, Any]], card_rows: list[dict[str, Any]]
+    ) -> None:
+        """
+        批量写入笔记和卡片行
+
+        在当前事务内分块执行 executemany，先写笔记再写卡片和标签关联，并增量更新牌组内容摘要。
+
+        Args:
+            deck_id: 牌组 ID
+            note_rows: 笔记行
+            card_rows: 卡片行
+        """
+        if not note_rows:
+            return
+        await self.note_repo.bulk_create(note_rows, chunk_size=BULK_INSERT_CHUNK_SIZE)
+        await self.card_repo.bulk_create(card_rows, chunk_size=BULK_INSERT_CHUNK_SIZE)
+        due_queue_cache.record(self.db, note_rows[0]["user_id"], card_rows)
+        await self.tag_repo.add_note_tags([(r["id"], r["user_id"], r["tags"]) for r in note_rows])
+        await self._update_content_digest(
+            deck_id,
+            added=[
+                *(content_digest.note_hash(r["guid"], r["fields"], r["tags"]) for r in note_rows),
+                *(content_digest.card_hash(r["note_id"], r["card_template_id"], r["ord"]) for r in card_rows),
+            ],
         )
 
+    async def _update_content_digest(
+        self, deck_id: str, *, added: Sequence[int] = (), removed: Sequence[int] = ()
+    ) -> None:
+        """
+        增量更新牌组内容摘要
+
+        摘要尚未初始化（为空）的牌组跳过，发布时会全量计算。
+
+        Args:
+            deck_id: 牌组 ID
+            added: 加入的元素哈希
+            removed: 移除的元素哈希
+        """
+        deck = await self.deck_repo.get_by_id_for_update(deck_id)
+        if deck is None or deck.content_digest is None:
+            return
+        deck.content_digest = content_digest.apply_delta(deck.content_digest, added, removed)
+        await self.db.flush()
+
     async def update_note(
         self,
         note_id: str,
@@ -277,6 +579,13 @@ class NoteService:
             if deck.user_id != user_id:
                 raise ForbiddenException(msg="无权限访问此牌组")
 
+        # 记录更新前的内容，用于增量更新牌组内容摘要
+        old_deck_id = note.deck_id
+        old_note_hash = content_digest.note_hash(note.guid, note.fields, note.tags)
+        card_hashes = [
+            content_digest.card_hash(c.note_id, c.card_template_id, c.ord) for c in note.cards if c.deleted_at is None
+        ]
+
         # 更新数据
         update_data = data.model_dump(exclude_unset=True)
         update_data["dirty"] = 1
@@ -286,12 +595,20 @@ class NoteService:
             update_data["guid"] = NoteRepository.generate_guid(update_data["fields"])
 
         await self.note_repo.update(note, update_data)
+        if "tags" in update_data:
+            await self.tag_repo.set_note_tags(note.id, user_id, note.tags)
+        new_note_hash = content_digest.note_hash(note.guid, note.fields, note.tags)
 
         # 如果牌组变化，同步更新卡片的牌组
-        if data.deck_id is not None and data.deck_id != note.deck_id:
+        if note.deck_id != old_deck_id:
             cards = await self.card_repo.get_by_note_id(note_id)
             for card in cards:
-                await self.card_repo.update(card, {"deck_id": data.deck_id, "dirty": 1})
+                await self.card_repo.update(card, {"deck_id": note.deck_id, "dirty": 1})
+            due_queue_cache.record(self.db, user_id, map(card_change, cards))
+            await self._update_content_digest(old_deck_id, removed=[old_note_hash, *card_hashes])
+            await self._update_content_digest(note.deck_id, added=[new_note_hash, *card_hashes])
+        elif new_note_hash != old_note_hash:
+            await self._update_content_digest(note.deck_id, added=[new_note_hash], removed=[old_note_hash])
 
         return await self.note_repo.get_by_id_with_cards(note_id)  # type: ignore
 
@@ -303,15 +620,20 @@ class NoteService:
             note_id: 笔记 ID
             user_id: 当前用户 ID
         """
-        await self.get_note(note_id, user_id)  # 验证权限
+        note = await self.get_note(note_id, user_id)  # 验证权限
+        removed = [content_digest.note_hash(note.guid, note.fields, note.tags)]
 
         # 删除关联的卡片
         cards = await self.card_repo.get_by_note_id(note_id)
         for card in cards:
+            removed.append(content_digest.card_hash(card.note_id, card.card_template_id, card.ord))
             await self.card_repo.delete(card.id, soft_delete=True)
+        due_queue_cache.record(self.db, user_id, ({"id": card.id, "deleted": True} for card in cards))
 
         # 删除笔记
         await self.note_repo.delete(note_id, soft_delete=True)
+        await self.tag_repo.remove_note_tags(note_id)
+        await self._update_content_digest(note.deck_id, removed=removed)
 
 
 class CardService:
@@ -343,30 +665,29 @@ class CardService:
         self,
         user_id: str,
         query_params: CardListQuery,
-        page_num: int = 1,
-        page_size: int = 10,
-    ) -> tuple[list[Card], int]:
+        page_query: BasePageQuery,
+    ) -> tuple[list[Card], int | None, str | None]:
         """
         获取卡片列表
 
         Args:
             user_id: 用户 ID
             query_params: 查询参数
-            page_num: 页码
-            page_size: 每页数量
+            page_query: 分页参数
 
         Returns:
-            (卡片列表, 总数) 元组
+            (卡片列表, 总数, 下一页游标) 元组
         """
-        skip = (page_num - 1) * page_size
         return await self.card_repo.get_by_user_id(
             user_id=user_id,
             deck_id=query_params.deck_id,
             state=query_params.state,
             queue=query_params.queue,
             due_before=query_params.due_before,
-            skip=skip,
-            limit=page_size,
+            skip=page_query.offset,
+            limit=page_query.limit,
+            cursor=page_query.cursor,
+            with_total=page_query.include_total,
         )
 
     async def get_due_cards(
@@ -377,7 +698,7 @@ class CardService:
         limit: int = 100,
     ) -> list[Card]:
         """
-        获取待复习的卡片
+        获取待复习的卡片（从按用户缓存的到期队列索引读取，见 app.services.due_queue）
 
         Args:
             user_id: 用户 ID
@@ -388,13 +709,29 @@ class CardService:
         Returns:
             卡片列表
         """
-        return await self.card_repo.get_due_cards(
-            user_id=user_id,
+        return await due_queue_cache.get_due_cards(
+            self.card_repo,
+            user_id,
             deck_id=deck_id,
             due_before=due_before,
             limit=limit,
         )
 
+    async def get_forecast(self, user_id: str, query: CardForecastQuery) -> CardForecastResponse:
+        """
+        获取复习预测（每天到期的卡片数和预计引入的新卡片数）
+
+        Args:
+            user_id: 用户 ID
+            query: 查询参数
+
+        Returns:
+            复习预测
+        """
+        today, start = today_start()
+        histogram = await card_forecast_cache.get_histogram(self.card_repo, user_id, start)
+        return build_forecast(histogram, today, query)
+
     async def update_card(
         self,
         card_id: str,
@@ -415,7 +752,51 @@ class CardService:
         card = await self.get_card(card_id, user_id)
         update_data = data.model_dump(exclude_unset=True)
         update_data["dirty"] = 1
-        return await self.card_repo.update(card, update_data)
+        card = await self.card_repo.update(card, update_data)
+        due_queue_cache.record(self.db, user_id, [card_change(card)])
+        return card
+
+    async def update_cards_batch(self, user_id: str, data: CardBatchUpdate) -> CardBatchUpdateResult:
+        """
+        批量更新卡片（同步一次复习会话的调度结果）
+
+        卡片归属和更新时间用一条 IN 查询读出（并锁定这些行），按主键批量写入，不回读卡片。
+        传入 expected_updated_at 时进行乐观并发控制：与卡片当前更新时间不一致说明卡片已被
+        其他设备修改，该项不更新并返回服务端的更新时间。
+
+        Args:
+            user_id: 用户 ID
+            data: 批量更新数据
+
+        Returns:
+            批量更新结果（逐项结果与请求顺序一致）
+        """
+        versions = await self.card_repo.get_versions(user_id, {item.id for item in data.cards}, for_update=True)
+        now = datetime.now(UTC).replace(tzinfo=None)
+
+        items: list[CardBatchUpdateItemResult] = []
+        rows: list[dict[str, Any]] = []
+        for item in data.cards:
+            current = versions.get(item.id)
+            if current is None:
+                items.append(CardBatchUpdateItemResult(id=item.id, status="not_found"))
+                continue
+            if item.expected_updated_at is not None and item.expected_updated_at != current:
+                items.append(CardBatchUpdateItemResult(id=item.id, status="conflict", updated_at=current))
+                continue
+            # 与单条更新一致，未传入或为 None 的字段不更新
+            rows.append({"id": item.id, **item.model_dump(exclude={"id", "expected_updated_at"}, exclude_none=True)})
+            versions[item.id] = now
+            items.append(CardBatchUpdateItemResult(id=item.id, status="updated", updated_at=now))
+
+        await self.card_repo.bulk_update(rows, {"dirty": 1, "updated_at": now})
+        due_queue_cache.record(self.db, user_id, rows)
+        return CardBatchUpdateResult(
+            updated_count=sum(item.status == "updated" for item in items),
+            conflict_count=sum(item.status == "conflict" for item in items),
+            not_found_count=sum(item.status == "not_found" for item in items),
+            items=items,
+        )
 
     async def suspend_card(self, card_id: str, user_id: str) -> Card:
         """
@@ -429,7 +810,9 @@ class CardService:
             更新后的 Card 实例
         """
         card = await self.get_card(card_id, user_id)
-        return await self.card_repo.update(card, {"queue": "suspended", "dirty": 1})
+        card = await self.card_repo.update(card, {"queue": "suspended", "dirty": 1})
+        due_queue_cache.record(self.db, user_id, [card_change(card)])
+        return card
 
     async def unsuspend_card(self, card_id: str, user_id: str) -> Card:
         """
@@ -445,7 +828,9 @@ class CardService:
         card = await self.get_card(card_id, user_id)
         # 根据状态恢复到对应队列
         queue = "new" if card.state == "new" else "review"
-        return await self.card_repo.update(card, {"queue": queue, "dirty": 1})
+        card = await self.card_repo.update(card, {"queue": queue, "dirty": 1})
+        due_queue_cache.record(self.db, user_id, [card_change(card)])
+        return card
 
     async def get_stats(self, user_id: str, deck_id: str | None = None) -> dict[str, int]:
         """
@@ -7,6 +7,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import BadRequestException, ForbiddenException, NotFoundException
+from app.models.base import BasePageQuery
 from app.models.note_model import CardTemplate, NoteModel
 from app.repositories.note_model import CardTemplateRepository, NoteModelRepository
 from app.schemas.note_model import (
@@ -53,27 +54,26 @@ class NoteModelService:
         self,
         user_id: str,
         query_params: NoteModelListQuery,
-        page_num: int = 1,
-        page_size: int = 10,
-    ) -> tuple[list[NoteModel], int]:
+        page_query: BasePageQuery,
+    ) -> tuple[list[NoteModel], int | None, str | None]:
         """
         获取笔记类型列表
 
         Args:
             user_id: 用户 ID
             query_params: 查询参数
-            page_num: 页码
-            page_size: 每页数量
+            page_query: 分页参数
 
         Returns:
-            (笔记类型列表, 总数) 元组
+            (笔记类型列表, 总数, 下一页游标) 元组
         """
-        skip = (page_num - 1) * page_size
         return await self.note_model_repo.get_by_user_id(
             user_id=user_id,
             keyword=query_params.keyword,
-            skip=skip,
-            limit=page_size,
+            skip=page_query.offset,
+            limit=page_query.limit,
+            cursor=page_query.cursor,
+            with_total=page_query.include_total,
         )
 
     async def get_available_note_models(
@@ -4,13 +4,20 @@
 处理 ReviewLog 相关的业务逻辑
 """
 
+from datetime import timedelta
+from typing import Any
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import ForbiddenException, NotFoundException
-from app.models.review_log import ReviewLog
+from app.models.base import BasePageQuery
+from app.models.review_log import ReviewDailyStat, ReviewLog
 from app.repositories.note import CardRepository
-from app.repositories.review_log import ReviewLogRepository
-from app.schemas.review_log import ReviewLogCreate, ReviewLogListQuery
+from app.repositories.review_log import ReviewDailyStatRepository, ReviewLogRepository, stats_today
+from app.schemas.review_log import ReviewLogBatchCreate, ReviewLogBatchResult, ReviewLogCreate, ReviewLogListQuery
+
+# 批量写入时每次 executemany 的行数
+BULK_INSERT_CHUNK_SIZE = 1000
 
 
 class ReviewLogService:
@@ -19,6 +26,7 @@ class ReviewLogService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.review_log_repo = ReviewLogRepository(db)
+        self.daily_stat_repo = ReviewDailyStatRepository(db)
         self.card_repo = CardRepository(db)
 
     async def get_review_log(self, log_id: str, user_id: str) -> ReviewLog:
@@ -43,29 +51,28 @@ class ReviewLogService:
         self,
         user_id: str,
         query_params: ReviewLogListQuery,
-        page_num: int = 1,
-        page_size: int = 10,
-    ) -> tuple[list[ReviewLog], int]:
+        page_query: BasePageQuery,
+    ) -> tuple[list[ReviewLog], int | None, str | None]:
         """
         获取复习日志列表
 
         Args:
             user_id: 用户 ID
             query_params: 查询参数
-            page_num: 页码
-            page_size: 每页数量
+            page_query: 分页参数
 
         Returns:
-            (复习日志列表, 总数) 元组
+            (复习日志列表, 总数, 下一页游标) 元组
         """
-        skip = (page_num - 1) * page_size
         return await self.review_log_repo.get_by_user_id(
             user_id=user_id,
             card_id=query_params.card_id,
             start_time=query_params.start_time,
             end_time=query_params.end_time,
-            skip=skip,
-            limit=page_size,
+            skip=page_query.offset,
+            limit=page_query.limit,
+            cursor=page_query.cursor,
+            with_total=page_query.include_total,
         )
 
     async def create_review_log(self, user_id: str, data: ReviewLogCreate) -> ReviewLog:
@@ -87,27 +94,50 @@ class ReviewLogService:
             raise ForbiddenException(msg="无权限访问此卡片")
 
         # 创建日志
-        return await self.review_log_repo.create(
-            {
-                "user_id": user_id,
-                "card_id": data.card_id,
-                "review_time": data.review_time,
-                "rating": data.rating,
-                "prev_state": data.prev_state,
-                "new_state": data.new_state,
-                "prev_interval": data.prev_interval,
-                "new_interval": data.new_interval,
-                "prev_ease_factor": data.prev_ease_factor,
-                "new_ease_factor": data.new_ease_factor,
-                "prev_due": data.prev_due,
-                "new_due": data.new_due,
-                "prev_stability": data.prev_stability,
-                "new_stability": data.new_stability,
-                "prev_difficulty": data.prev_difficulty,
-                "new_difficulty": data.new_difficulty,
-                "duration_ms": data.duration_ms,
-            }
+        review_log = await self.review_log_repo.create(self._build_log_row(user_id, data))
+        await self.daily_stat_repo.add_reviews(user_id, [(data.review_time, data.rating, data.duration_ms)])
+        return review_log
+
+    async def create_review_logs_batch(self, user_id: str, data: ReviewLogBatchCreate) -> ReviewLogBatchResult:
+        """
+        批量写入复习日志（离线复习后一次性同步）
+
+        卡片归属用一条 IN 查询校验，日志以 INSERT ... ON CONFLICT (id) DO NOTHING 批量写入，
+        只有实际插入的日志累加到每日汇总（同一事务内一次累加）。日志 ID 由客户端生成，
+        重试或并发上传时已写入的日志会被跳过，不会重复计数。
+
+        Args:
+            user_id: 用户 ID
+            data: 批量上传数据
+
+        Returns:
+            批量写入结果
+        """
+        owned_card_ids = await self.card_repo.get_owned_ids(user_id, {item.card_id for item in data.reviews})
+
+        error_count = 0
+        rows: dict[str, dict[str, Any]] = {}
+        for item in data.reviews:
+            if item.card_id not in owned_card_ids:
+                error_count += 1
+                continue
+            # 同一批次内重复的 ID 以第一条为准
+            rows.setdefault(item.id, {"id": item.id, **self._build_log_row(user_id, item)})
+
+        inserted_ids = await self.review_log_repo.insert_ignoring_existing(
+            list(rows.values()), chunk_size=BULK_INSERT_CHUNK_SIZE
         )
+        await self.daily_stat_repo.add_reviews(
+            user_id,
+            [
+                (row["review_time"], row["rating"], row["duration_ms"])
+                for row in rows.values()
+                if row["id"] in inserted_ids
+            ],
+        )
+        created_count = len(inserted_ids)
+        skipped_count = len(data.reviews) - error_count - created_count
+        return ReviewLogBatchResult(created_count=created_count, skipped_count=skipped_count, error_count=error_count)
 
     async def get_stats(self, user_id: str) -> dict:
         """
@@ -119,4 +149,50 @@ class ReviewLogService:
         Returns:
             统计数据
         """
-        return await self.review_log_repo.get_stats(user_id)
+        return await self.daily_stat_repo.get_stats(user_id)
+
+    async def get_daily_stats(self, user_id: str, days: int) -> list[ReviewDailyStat]:
+        """
+        获取最近若干天的每日复习汇总
+
+        Args:
+            user_id: 用户 ID
+            days: 天数（包含今天）
+
+        Returns:
+            每日汇总列表，按日期升序，没有复习的日期不返回
+        """
+        today = stats_today()
+        return await self.daily_stat_repo.get_daily(user_id, today - timedelta(days=days - 1), today)
+
+    @staticmethod
+    def _build_log_row(user_id: str, data: ReviewLogCreate) -> dict[str, Any]:
+        """
+        构造复习日志行数据
+
+        Args:
+            user_id: 用户 ID
+            data: 复习日志数据
+
+        Returns:
+            日志行数据（不含主键）
+        """
+        return {
+            "user_id": user_id,
+            "card_id": data.card_id,
+            "review_time": data.review_time,
+            "rating": data.rating,
+            "prev_state": data.prev_state,
+            "new_state": data.new_state,
+            "prev_interval": data.prev_interval,
+            "new_interval": data.new_interval,
+            "prev_ease_factor": data.prev_ease_factor,
+            "new_ease_factor": data.new_ease_factor,
+            "prev_due": data.prev_due,
+            "new_due": data.new_due,
+            "prev_stability": data.prev_stability,
+            "new_stability": data.new_stability,
+            "prev_difficulty": data.prev_difficulty,
+            "new_difficulty": data.new_difficulty,
+            "duration_ms": data.duration_ms,
+        }
@@ -4,24 +4,53 @@
 处理 SharedDeck 相关的业务逻辑
 """
 
-import hashlib
+import asyncio
 import json
+from collections.abc import AsyncIterator
+from pathlib import Path
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.exceptions import BadRequestException, ForbiddenException, NotFoundException
+from app.core.response_cache import invalidate_market_cache
+from app.models.base import BasePageQuery
 from app.models.deck import Deck
 from app.models.note import Card, Note
-from app.models.note_model import CardTemplate, NoteModel
 from app.models.shared_deck import SharedDeck, SharedDeckSnapshot
+from app.repositories.deck import DeckRepository
+from app.repositories.note_model import NoteModelRepository
 from app.repositories.shared_deck import SharedDeckRepository, SharedDeckSnapshotRepository
+from app.repositories.tag import TagRepository
 from app.schemas.shared_deck import (
     PublishDeckRequest,
     SharedDeckCreate,
     SharedDeckListQuery,
     SharedDeckUpdate,
 )
+from app.services.download_counter import download_counter
+from app.utils import content_digest, deck_delta, export_store
+
+# 流式导出时每批读取的行数
+EXPORT_CHUNK_SIZE = 1000
+
+
+# 与 /shared-decks 下固定路由冲突的 slug（如 /shared-decks/tags），不能用作共享牌组标识
+RESERVED_SLUGS = frozenset({"tags"})
+
+# 整体 JSON 导出中各类记录对应的字段名
+_EXPORT_JSON_KEYS = {"note_model": b"note_models", "note": b"notes", "card": b"cards"}
+
+
+def _json_bytes(obj: dict) -> bytes:
+    """紧凑序列化为 UTF-8 JSON"""
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _ndjson_line(record: dict) -> bytes:
+    """将一条记录序列化为 NDJSON 行"""
+    return _json_bytes(record) + b"\n"
 
 
 class SharedDeckService:
@@ -31,6 +60,9 @@ class SharedDeckService:
         self.db = db
         self.shared_deck_repo = SharedDeckRepository(db)
         self.snapshot_repo = SharedDeckSnapshotRepository(db)
+        self.note_model_repo = NoteModelRepository(db)
+        self.deck_repo = DeckRepository(db)
+        self.tag_repo = TagRepository(db)
 
     async def get_shared_deck(self, shared_deck_id: str) -> SharedDeck:
         """
@@ -65,31 +97,42 @@ class SharedDeckService:
     async def search_shared_decks(
         self,
         query_params: SharedDeckListQuery,
-        page_num: int = 1,
-        page_size: int = 10,
-    ) -> tuple[list[SharedDeck], int]:
+        page_query: BasePageQuery,
+    ) -> tuple[list[SharedDeck], int | None, str | None]:
         """
         搜索共享牌组
 
         Args:
             query_params: 查询参数
-            page_num: 页码
-            page_size: 每页数量
+            page_query: 分页参数
 
         Returns:
-            (共享牌组列表, 总数) 元组
+            (共享牌组列表, 总数, 下一页游标) 元组
         """
-        skip = (page_num - 1) * page_size
         return await self.shared_deck_repo.search(
             language=query_params.language,
             tag=query_params.tag,
             q=query_params.q,
             is_featured=query_params.is_featured,
             is_official=query_params.is_official,
-            skip=skip,
-            limit=page_size,
+            skip=page_query.offset,
+            limit=page_query.limit,
+            cursor=page_query.cursor,
+            with_total=page_query.include_total,
         )
 
+    async def get_tag_counts(self, limit: int = 100) -> list[tuple[str, int]]:
+        """
+        获取牌组市场的标签及每个标签的共享牌组数
+
+        Args:
+            limit: 返回的最大标签数
+
+        Returns:
+            (标签名, 牌组数) 列表，按牌组数降序
+        """
+        return await self.tag_repo.get_shared_deck_tag_counts(limit)
+
     async def create_shared_deck(self, author_id: str, data: SharedDeckCreate) -> SharedDeck:
         """
         创建共享牌组
@@ -101,10 +144,9 @@ class SharedDeckService:
         Returns:
             创建的 SharedDeck 实例
         """
-        # 检查 slug 是否已存在
-        if await self.shared_deck_repo.slug_exists(data.slug):
-            raise BadRequestException(msg="该标识已被使用")
+        await self._check_slug_available(data.slug)
 
+        invalidate_market_cache(self.db)
         return await self.shared_deck_repo.create(
             {
                 "author_id": author_id,
@@ -139,6 +181,7 @@ class SharedDeckService:
             raise ForbiddenException(msg="无权限修改此共享牌组")
 
         update_data = data.model_dump(exclude_unset=True)
+        invalidate_market_cache(self.db)
         return await self.shared_deck_repo.update(shared_deck, update_data)
 
     async def delete_shared_deck(self, shared_deck_id: str, user_id: str) -> None:
@@ -152,11 +195,12 @@ class SharedDeckService:
         shared_deck = await self.get_shared_deck(shared_deck_id)
         if shared_deck.author_id != user_id:
             raise ForbiddenException(msg="无权限删除此共享牌组")
+        invalidate_market_cache(self.db)
         await self.shared_deck_repo.delete(shared_deck_id, soft_delete=True)
 
     async def get_download_info(self, slug: str) -> SharedDeckSnapshot:
         """
-        获取下载信息（最新版本快照）
+        获取下载信息（最新版本快照，只读，下载计数由调用方通过 record_download 记录）
 
         Args:
             slug: URL 友好标识
@@ -166,9 +210,6 @@ class SharedDeckService:
         """
         shared_deck = await self.get_shared_deck_by_slug(slug)
 
-        # 增加下载计数
-        await self.shared_deck_repo.increment_download_count(shared_deck.id)
-
         # 获取最新快照
         snapshot = await self.snapshot_repo.get_latest_by_deck_id(shared_deck.id)
         if not snapshot:
@@ -200,24 +241,19 @@ class SharedDeckService:
         if deck.user_id != user_id:
             raise ForbiddenException(msg="无权限发布此牌组")
 
-        # 检查 slug 是否已存在
-        if await self.shared_deck_repo.slug_exists(data.slug):
-            raise BadRequestException(msg="该标识已被使用")
+        await self._check_slug_available(data.slug)
 
         # 统计笔记和卡片数量
-        notes_result = await self.db.execute(select(Note).where(Note.deck_id == deck_id, Note.deleted_at.is_(None)))
-        notes = list(notes_result.scalars().all())
-        note_count = len(notes)
-
-        cards_result = await self.db.execute(select(Card).where(Card.deck_id == deck_id, Card.deleted_at.is_(None)))
-        cards = list(cards_result.scalars().all())
-        card_count = len(cards)
+        note_count, card_count = await self._count_deck_content(deck.id)
 
         if note_count == 0:
             raise BadRequestException(msg="牌组中没有笔记，无法发布")
 
-        # 计算内容哈希
-        content_hash = self._compute_content_hash(notes, cards)
+        # 内容哈希由增量维护的牌组摘要得到
+        content_hash = content_digest.to_content_hash(await self._get_content_digest(deck))
+
+        # 预生成导出文件
+        file_size = await self._materialize_export(deck, content_hash)
 
         # 创建共享牌组
         shared_deck = await self.shared_deck_repo.create(
@@ -244,11 +280,13 @@ class SharedDeckService:
                 "export_format_version": 1,
                 "file_url": f"/api/v1/shared-decks/{data.slug}/export",
                 "content_hash": content_hash,
+                "file_size": file_size,
             }
         )
 
         # 更新源牌组的 published_deck_id
         deck.published_deck_id = shared_deck.id
+        invalidate_market_cache(self.db)
         await self.db.commit()
 
         return shared_deck
@@ -280,24 +318,23 @@ class SharedDeckService:
         if not deck:
             raise NotFoundException(msg="未找到关联的牌组，请确保牌组名称与共享牌组标题一致")
 
-        # 统计笔记和卡片
-        notes_result = await self.db.execute(select(Note).where(Note.deck_id == deck.id, Note.deleted_at.is_(None)))
-        notes = list(notes_result.scalars().all())
-        note_count = len(notes)
-
-        cards_result = await self.db.execute(select(Card).where(Card.deck_id == deck.id, Card.deleted_at.is_(None)))
-        cards = list(cards_result.scalars().all())
-        card_count = len(cards)
-
-        # 计算新的内容哈希
-        new_content_hash = self._compute_content_hash(notes, cards)
-
-        # 检查内容是否有变化
+        # 由增量维护的牌组摘要得到新的内容哈希，O(1) 判断内容是否有变化
+        new_content_hash = content_digest.to_content_hash(await self._get_content_digest(deck))
         if new_content_hash == shared_deck.content_hash:
             raise BadRequestException(msg="内容没有变化，无需发布新版本")
 
+        # 统计笔记和卡片
+        note_count, card_count = await self._count_deck_content(deck.id)
+
+        # 预生成导出文件，以及与上一版本之间的增量
+        old_content_hash = shared_deck.content_hash
+        file_size = await self._materialize_export(deck, new_content_hash)
+        if old_content_hash:
+            await self._materialize_delta(old_content_hash, new_content_hash)
+
         # 更新版本号
         new_version = shared_deck.version + 1
+        invalidate_market_cache(self.db)
 
         # 更新共享牌组
         await self.shared_deck_repo.update(
@@ -318,35 +355,76 @@ class SharedDeckService:
                 "export_format_version": 1,
                 "file_url": f"/api/v1/shared-decks/{shared_deck.slug}/export",
                 "content_hash": new_content_hash,
+                "file_size": file_size,
             }
         )
 
+        # 删除新版本发布后不再使用的导出文件
+        await self._remove_stale_exports(shared_deck, old_content_hash, new_version)
+
         # 重新获取更新后的共享牌组
         return await self.get_shared_deck(shared_deck_id)
 
-    def _compute_content_hash(self, notes: list[Note], cards: list[Card]) -> str:
-        """计算笔记和卡片的内容哈希"""
-        notes_data = [{"guid": n.guid, "fields": n.fields, "tags": n.tags} for n in notes]
-        notes_data.sort(key=lambda x: str(x.get("guid", "")))
+    async def _check_slug_available(self, slug: str) -> None:
+        """
+        检查 slug 可用（未被保留且未被使用）
 
-        cards_data = [{"note_id": c.note_id, "card_template_id": c.card_template_id, "ord": c.ord} for c in cards]
-        cards_data.sort(key=lambda x: (str(x.get("note_id", "")), x.get("ord", 0)))
+        Args:
+            slug: URL 友好标识
 
-        content = {"notes": notes_data, "cards": cards_data}
-        return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()[:32]
+        Raises:
+            BadRequestException: slug 为保留字或已被使用
+        """
+        if slug in RESERVED_SLUGS:
+            raise BadRequestException(msg="该标识为系统保留")
+        if await self.shared_deck_repo.slug_exists(slug):
+            raise BadRequestException(msg="该标识已被使用")
 
-    async def export_shared_deck(self, slug: str) -> dict:
+    async def _get_content_digest(self, deck: Deck) -> str:
         """
-        导出共享牌组完整数据
+        获取牌组内容摘要
+
+        摘要由 NoteService 在笔记和卡片变更时增量维护；
+        尚未初始化的牌组（如迁移前创建的牌组）在这里全量计算一次并保存。
 
         Args:
-            slug: URL 友好标识
+            deck: 牌组
 
         Returns:
-            包含笔记类型、牌组、笔记、卡片的完整数据
+            内容摘要
         """
-        shared_deck = await self.get_shared_deck_by_slug(slug)
+        if deck.content_digest is None:
+            deck.content_digest = await self.deck_repo.compute_content_digest(deck.id)
+        return deck.content_digest
+
+    async def _count_deck_content(self, deck_id: str) -> tuple[int, int]:
+        """
+        统计牌组内的笔记数和卡片数
+
+        Args:
+            deck_id: 牌组 ID
+
+        Returns:
+            (笔记数, 卡片数) 元组
+        """
+        note_count = await self.db.scalar(
+            select(func.count()).select_from(Note).where(Note.deck_id == deck_id, Note.deleted_at.is_(None))
+        )
+        card_count = await self.db.scalar(
+            select(func.count()).select_from(Card).where(Card.deck_id == deck_id, Card.deleted_at.is_(None))
+        )
+        return note_count or 0, card_count or 0
+
+    async def _get_source_deck(self, shared_deck: SharedDeck) -> Deck:
+        """
+        获取共享牌组对应的源牌组
 
+        Args:
+            shared_deck: 共享牌组
+
+        Returns:
+            Deck 实例
+        """
         # 通过作者和标题找到源牌组
         deck_result = await self.db.execute(
             select(Deck).where(
@@ -359,6 +437,50 @@ class SharedDeckService:
 
         if not deck:
             raise NotFoundException(msg="共享牌组数据不存在")
+        return deck
+
+    async def _load_note_models_data(self, note_model_ids: set[str]) -> list[dict]:
+        """
+        加载笔记类型及其模板的导出数据
+
+        Args:
+            note_model_ids: 笔记类型 ID 集合
+
+        Returns:
+            笔记类型导出数据列表
+        """
+        note_models = await self.note_model_repo.get_by_ids_with_templates(note_model_ids)
+        return [
+            {
+                "id": nm.id,
+                "name": nm.name,
+                "fields_schema": nm.fields_schema,
+                "css": nm.css,
+                "templates": [
+                    {
+                        "id": t.id,
+                        "name": t.name,
+                        "ord": t.ord,
+                        "question_template": t.question_template,
+                        "answer_template": t.answer_template,
+                    }
+                    for t in nm.templates
+                ],
+            }
+            for nm in note_models
+        ]
+
+    async def export_shared_deck(self, shared_deck: SharedDeck) -> dict:
+        """
+        导出共享牌组完整数据（只读，下载计数由调用方通过 record_download 记录）
+
+        Args:
+            shared_deck: 共享牌组
+
+        Returns:
+            包含笔记类型、牌组、笔记、卡片的完整数据
+        """
+        deck = await self._get_source_deck(shared_deck)
 
         # 获取笔记
         notes_result = await self.db.execute(select(Note).where(Note.deck_id == deck.id, Note.deleted_at.is_(None)))
@@ -366,51 +488,12 @@ class SharedDeckService:
 
         # 获取笔记类型
         note_model_ids = {note.note_model_id for note in notes}
-
-        note_models_data = []
-        for nm_id in note_model_ids:
-            nm_result = await self.db.execute(
-                select(NoteModel).where(NoteModel.id == nm_id, NoteModel.deleted_at.is_(None))
-            )
-            nm = nm_result.scalar_one_or_none()
-            if nm:
-                # 获取模板
-                tpl_result = await self.db.execute(
-                    select(CardTemplate)
-                    .where(
-                        CardTemplate.note_model_id == nm_id,
-                        CardTemplate.deleted_at.is_(None),
-                    )
-                    .order_by(CardTemplate.ord)
-                )
-                templates = list(tpl_result.scalars().all())
-
-                note_models_data.append(
-                    {
-                        "id": nm.id,
-                        "name": nm.name,
-                        "fields_schema": nm.fields_schema,
-                        "css": nm.css,
-                        "templates": [
-                            {
-                                "id": t.id,
-                                "name": t.name,
-                                "ord": t.ord,
-                                "question_template": t.question_template,
-                                "answer_template": t.answer_template,
-                            }
-                            for t in templates
-                        ],
-                    }
-                )
+        note_models_data = await self._load_note_models_data(note_model_ids)
 
         # 获取卡片
         cards_result = await self.db.execute(select(Card).where(Card.deck_id == deck.id, Card.deleted_at.is_(None)))
         cards = list(cards_result.scalars().all())
 
-        # 增加下载计数
-        await self.shared_deck_repo.increment_download_count(shared_deck.id)
-
         return {
             "note_models": note_models_data,
             "deck": {
@@ -439,6 +522,271 @@ class SharedDeckService:
             ],
         }
 
+    async def stream_export_shared_deck(
+        self, shared_deck: SharedDeck, version: int | None = None
+    ) -> AsyncIterator[bytes]:
+        """
+        以 NDJSON 流的形式导出共享牌组（只读，下载计数由调用方通过 record_download 记录）
+
+        校验在返回前完成，之后通过服务端游标分批读取笔记和卡片，
+        内存占用只与批大小有关，与牌组规模无关。
+
+        每行一条记录，``type`` 依次为 deck、note_model、note、card。
+        流式导出读取源牌组的实时内容，不支持导出历史版本。
+
+        Args:
+            shared_deck: 共享牌组
+            version: 版本号，必须为空
+
+        Returns:
+            逐块产出 NDJSON 字节的异步迭代器
+
+        Raises:
+            BadRequestException: 指定了版本号
+        """
+        if version is not None:
+            raise BadRequestException(msg="流式导出不支持指定版本，请去掉 stream 或 version 参数")
+        deck = await self._get_source_deck(shared_deck)
+        return self._iter_export_ndjson(deck)
+
+    def get_export_artifact(
+        self,
+        shared_deck: SharedDeck,
+        version: int | None = None,
+    ) -> tuple[SharedDeckSnapshot, Path] | None:
+        """
+        获取快照对应的预生成导出文件
+
+        Args:
+            shared_deck: 共享牌组
+            version: 版本号，为空时取最新版本
+
+        Returns:
+            (快照, 导出文件路径) 元组；最新版本尚未生成导出文件时返回 None
+
+        Raises:
+            NotFoundException: 指定版本的导出文件不存在
+        """
+        snapshots = [s for s in shared_deck.snapshots if s.deleted_at is None]
+
+        if version is None:
+            snapshot = max(snapshots, key=lambda s: s.version, default=None)
+        else:
+            snapshot = next((s for s in snapshots if s.version == version), None)
+            if not snapshot:
+                raise NotFoundException(msg="该版本不存在")
+
+        if snapshot is not None:
+            path = export_store.get_artifact_path(snapshot.content_hash)
+            if path.exists():
+                return snapshot, path
+
+        if version is not None:
+            raise NotFoundException(msg="该版本的导出文件不存在")
+        return None
+
+    async def get_delta(
+        self,
+        slug: str,
+        from_version: int,
+    ) -> tuple[SharedDeckSnapshot, dict | None]:
+        """
+        获取从指定版本更新到最新版本的增量
+
+        依次合并相邻版本之间预生成的增量。需要合并的版本数超过
+        DELTA_MAX_CHAIN_LENGTH，或中间缺少增量文件（如早于增量功能发布的版本）时，
+        返回 None，由调用方回退为完整导出。
+
+        Args:
+            slug: URL 友好标识
+            from_version: 客户端当前版本号
+
+        Returns:
+            (最新快照, 增量) 元组；无法提供增量时增量为 None
+
+        Raises:
+            NotFoundException: 共享牌组或起始版本不存在
+        """
+        shared_deck = await self.get_shared_deck_by_slug(slug)
+        snapshots = sorted(
+            (s for s in shared_deck.snapshots if s.deleted_at is None and s.version >= from_version),
+            key=lambda s: s.version,
+        )
+        if not snapshots or snapshots[0].version != from_version:
+            raise NotFoundException(msg="该版本不存在")
+
+        base, latest = snapshots[0], snapshots[-1]
+        if len(snapshots) - 1 > settings.DELTA_MAX_CHAIN_LENGTH:
+            return latest, None
+
+        delta: dict | None = None
+        for previous, current in zip(snapshots, snapshots[1:], strict=False):
+            path = export_store.get_delta_path(previous.content_hash, current.content_hash)
+            if not path.exists():
+                return latest, None
+            step = await export_store.read_json(path)
+            delta = step if delta is None else deck_delta.compose_deltas(delta, step)
+
+        return latest, {
+            "from_version": base.version,
+            "to_version": latest.version,
+            "from_content_hash": base.content_hash,
+            "to_content_hash": latest.content_hash,
+            **(delta or {}),
+        }
+
+    def record_download(self, shared_deck_id: str) -> None:
+        """
+        记录一次下载（累加到内存计数，由 download_counter 定期写入数据库）
+
+        Args:
+            shared_deck_id: 共享牌组 ID
+        """
+        download_counter.add(shared_deck_id)
+
+    async def _materialize_export(self, deck: Deck, content_hash: str) -> int:
+        """
+        预生成导出文件
+
+        Args:
+            deck: 源牌组
+            content_hash: 内容哈希
+
+        Returns:
+            导出文件大小（字节）
+        """
+        path = await export_store.write_artifact(content_hash, self._iter_export_json(deck))
+        return path.stat().st_size
+
+    async def _materialize_delta(self, from_hash: str, to_hash: str) -> None:
+        """
+        预生成两个版本之间的增量
+
+        比较两个版本预生成的导出文件得到增量；旧版本没有导出文件时跳过，
+        下载时回退为完整导出。
+
+        Args:
+            from_hash: 上一版本内容哈希
+            to_hash: 新版本内容哈希
+        """
+        old_path = export_store.get_artifact_path(from_hash)
+        if not old_path.exists() or export_store.get_delta_path(from_hash, to_hash).exists():
+            return
+
+        old_export = await export_store.read_json(old_path)
+        new_export = await export_store.read_json(export_store.get_artifact_path(to_hash))
+        delta = await asyncio.to_thread(deck_delta.compute_delta, old_export["data"], new_export["data"])
+        await export_store.write_delta(from_hash, to_hash, delta)
+
+    async def _remove_stale_exports(
+        self, shared_deck: SharedDeck, old_content_hash: str | None, new_version: int
+    ) -> None:
+        """
+        删除新版本发布后不再使用的导出文件
+
+        上一版本的导出文件在没有其他共享牌组的当前版本使用时删除，之后按版本导出旧版本返回 404；
+        超出 DELTA_MAX_CHAIN_LENGTH 的增量不会再被合并，一并删除。每个共享牌组保留的文件数因此有上限。
+
+        Args:
+            shared_deck: 共享牌组（快照尚未包含新版本）
+            old_content_hash: 上一版本内容哈希
+            new_version: 新版本号
+        """
+        if old_content_hash and not await self.shared_deck_repo.content_hash_in_use(
+            old_content_hash, exclude_id=shared_deck.id
+        ):
+            export_store.remove_artifact(old_content_hash)
+
+        # 早于 oldest 的版本到新版本的增量链超过上限，(oldest - 1 -> oldest) 的增量不会再被用到
+        oldest = new_version - settings.DELTA_MAX_CHAIN_LENGTH
+        by_version = {s.version: s for s in shared_deck.snapshots if s.deleted_at is None}
+        if oldest - 1 in by_version and oldest in by_version:
+            export_store.remove_delta(by_version[oldest - 1].content_hash, by_version[oldest].content_hash)
+
+    async def _iter_export_records(self, deck: Deck) -> AsyncIterator[tuple[str, list[dict]]]:
+        """
+        按 deck、note_model、note、card 的顺序分批产出导出记录
+
+        每种记录至少产出一次（可能为空批次），便于序列化时输出完整结构。
+        """
+        yield "deck", [{"id": deck.id, "name": deck.name, "description": deck.description}]
+
+        # 笔记类型数量很少，一次性加载
+        nm_result = await self.db.execute(
+            select(Note.note_model_id).where(Note.deck_id == deck.id, Note.deleted_at.is_(None)).distinct()
+        )
+        note_model_ids = set(nm_result.scalars().all())
+        yield "note_model", await self._load_note_models_data(note_model_ids)
+
+        # 笔记：只取导出需要的列，避免构造 ORM 对象
+        yield "note", []
+        notes_stream = await self.db.stream(
+            select(Note.id, Note.guid, Note.note_model_id, Note.fields, Note.tags)
+            .where(Note.deck_id == deck.id, Note.deleted_at.is_(None))
+            .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+        )
+        async for rows in notes_stream.partitions():
+            yield (
+                "note",
+                [
+                    {
+                        "id": row.id,
+                        "guid": row.guid,
+                        "note_model_id": row.note_model_id,
+                        "fields": row.fields,
+                        "tags": row.tags,
+                    }
+                    for row in rows
+                ],
+            )
+
+        # 卡片
+        yield "card", []
+        cards_stream = await self.db.stream(
+            select(Card.id, Card.note_id, Card.card_template_id, Card.ord)
+            .where(Card.deck_id == deck.id, Card.deleted_at.is_(None))
+            .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+        )
+        async for rows in cards_stream.partitions():
+            yield (
+                "card",
+                [
+                    {
+                        "id": row.id,
+                        "note_id": row.note_id,
+                        "card_template_id": row.card_template_id,
+                        "ord": row.ord,
+                    }
+                    for row in rows
+                ],
+            )
+
+    async def _iter_export_ndjson(self, deck: Deck) -> AsyncIterator[bytes]:
+        """逐块生成牌组导出的 NDJSON 内容"""
+        async for record_type, items in self._iter_export_records(deck):
+            if items:
+                yield b"".join(_ndjson_line({"type": record_type, "data": item}) for item in items)
+
+    async def _iter_export_json(self, deck: Deck) -> AsyncIterator[bytes]:
+        """逐块生成与整体导出接口响应结构一致的 JSON 内容"""
+        yield b'{"success":true,"code":200,"msg":"' + "导出共享牌组成功".encode() + b'","data":{'
+        current_type = None
+        first_item = True
+        async for record_type, items in self._iter_export_records(deck):
+            if record_type == "deck":
+                yield b'"deck":' + _json_bytes(items[0])
+                continue
+            if record_type != current_type:
+                if current_type is not None:
+                    yield b"]"
+                yield b',"' + _EXPORT_JSON_KEYS[record_type] + b'":['
+                current_type = record_type
+                first_item = True
+            if items:
+                yield (b"" if first_item else b",") + b",".join(_json_bytes(item) for item in items)
+                first_item = False
+        yield b']},"err":null}'
+
     # ==================== 管理员功能 ====================
 
     async def set_featured(self, shared_deck_id: str, featured: bool) -> SharedDeck:
@@ -456,6 +804,7 @@ class SharedDeckService:
         if not shared_deck:
             raise NotFoundException(msg="共享牌组不存在")
 
+        invalidate_market_cache(self.db)
         await self.shared_deck_repo.update(shared_deck, {"is_featured": featured})
         return await self.get_shared_deck(shared_deck_id)
 
@@ -474,6 +823,7 @@ class SharedDeckService:
         if not shared_deck:
             raise NotFoundException(msg="共享牌组不存在")
 
+        invalidate_market_cache(self.db)
         await self.shared_deck_repo.update(shared_deck, {"is_official": official})
         return await self.get_shared_deck(shared_deck_id)
 
@@ -492,5 +842,6 @@ class SharedDeckService:
         if not shared_deck:
             raise NotFoundException(msg="共享牌组不存在")
 
+        invalidate_market_cache(self.db)
         await self.shared_deck_repo.update(shared_deck, {"is_active": active})
         return await self.get_shared_deck(shared_deck_id)
@@ -7,7 +7,9 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.exceptions import BadRequestException, NotFoundException
-from app.core.security import get_password_hash
+from app.core.password import password_hasher
+from app.core.principal import invalidate_principal
+from app.models.base import BasePageQuery
 from app.models.user import User
 from app.repositories.user import UserRepository
 from app.schemas.user import UserCreate, UserListQuery, UserUpdate
@@ -41,27 +43,26 @@ class UserService:
     async def get_users(
         self,
         query_params: UserListQuery,
-        page_num: int = 1,
-        page_size: int = 10,
-    ) -> tuple[list[User], int]:
+        page_query: BasePageQuery,
+    ) -> tuple[list[User], int | None, str | None]:
         """
         获取用户列表
 
         Args:
             query_params: 查询参数
-            page_num: 页码
-            page_size: 每页数量
+            page_query: 分页参数
 
         Returns:
-            (用户列表, 总数) 元组
+            (用户列表, 总数, 下一页游标) 元组
         """
-        skip = (page_num - 1) * page_size
         return await self.user_repo.search(
             keyword=query_params.keyword,
             is_active=query_params.is_active,
             is_superuser=query_params.is_superuser,
-            skip=skip,
-            limit=page_size,
+            skip=page_query.offset,
+            limit=page_query.limit,
+            cursor=page_query.cursor,
+            with_total=page_query.include_total,
         )
 
     async def create_user(self, user_data: UserCreate) -> User:
@@ -91,7 +92,7 @@ class UserService:
                 "username": user_data.username,
                 "email": user_data.email,
                 "nickname": user_data.nickname,
-                "hashed_password": get_password_hash(user_data.password),
+                "hashed_password": await password_hasher.hash(user_data.password),
                 "is_active": user_data.is_active,
                 "is_superuser": user_data.is_superuser,
             }
@@ -130,6 +131,7 @@ class UserService:
         # 更新用户
         update_data = user_data.model_dump(exclude_unset=True)
         user = await self.user_repo.update(user, update_data)
+        invalidate_principal(self.db, user_id)
 
         return user
 
@@ -165,6 +167,7 @@ class UserService:
 
         if update_data:
             user = await self.user_repo.update(user, update_data)
+            invalidate_principal(self.db, user.id)
 
         return user
 
@@ -181,3 +184,4 @@ class UserService:
         success = await self.user_repo.delete(user_id, soft_delete=True)
         if not success:
             raise NotFoundException(msg="用户不存在")
+        invalidate_principal(self.db, user_id)
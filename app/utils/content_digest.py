@@ -0,0 +1,87 @@
+"""
+牌组内容摘要
+
+牌组内容摘要是所有笔记和卡片元素哈希之和（模 2^256），与元素顺序无关，
+可以在增加、删除元素时以 O(1) 增量更新，不需要重新读取整个牌组。
+相同元素重复出现时也不会互相抵消（与异或不同）。
+
+参与摘要的内容与共享牌组导出的内容一致：
+- 笔记：guid、字段内容、标签
+- 卡片：所属笔记 ID、卡片模板 ID、模板序号
+"""
+
+import hashlib
+import json
+from collections.abc import Iterable
+from typing import Any
+
+# 摘要取值范围
+DIGEST_MODULUS = 1 << 256
+
+# 空牌组的摘要
+EMPTY_DIGEST = "0" * 64
+
+
+def _element_hash(kind: str, data: dict[str, Any]) -> int:
+    """计算单个元素的哈希（整数形式）"""
+    payload = json.dumps([kind, data], sort_keys=True, separators=(",", ":")).encode()
+    return int.from_bytes(hashlib.sha256(payload).digest(), "big")
+
+
+def note_hash(guid: str, fields: dict[str, Any], tags: list[str]) -> int:
+    """
+    计算笔记元素哈希
+
+    Args:
+        guid: 笔记 GUID
+        fields: 字段内容
+        tags: 标签列表
+
+    Returns:
+        元素哈希
+    """
+    return _element_hash("note", {"guid": guid, "fields": fields, "tags": tags})
+
+
+def card_hash(note_id: str, card_template_id: str, ord: int) -> int:
+    """
+    计算卡片元素哈希
+
+    Args:
+        note_id: 所属笔记 ID
+        card_template_id: 卡片模板 ID
+        ord: 模板序号
+
+    Returns:
+        元素哈希
+    """
+    return _element_hash("card", {"note_id": note_id, "card_template_id": card_template_id, "ord": ord})
+
+
+def apply_delta(digest: str, added: Iterable[int] = (), removed: Iterable[int] = ()) -> str:
+    """
+    在摘要中加入或移除元素
+
+    Args:
+        digest: 当前摘要（64 位十六进制）
+        added: 加入的元素哈希
+        removed: 移除的元素哈希
+
+    Returns:
+        新的摘要
+    """
+    value = int(digest, 16) + sum(added) - sum(removed)
+    return f"{value % DIGEST_MODULUS:064x}"
+
+
+def to_content_hash(digest: str) -> str:
+    """
+    由牌组摘要得到共享牌组快照使用的内容哈希
+
+    Args:
+        digest: 牌组摘要
+
+    Returns:
+        32 位十六进制内容哈希
+    """
+    return hashlib.sha256(digest.encode()).hexdigest()[:32]
@@ -0,0 +1,87 @@
+"""
+共享牌组版本增量
+
+比较相邻两个版本的导出内容，得到笔记和卡片级别的增量：
+- 笔记以 guid 为键，卡片以卡片 ID 为键
+- 每类记录分为 added（新增）、changed（内容变化）、removed（删除，只记录键）
+- 笔记类型和牌组信息很小，直接携带目标版本的完整内容
+
+多个相邻增量可以依次合并为跨多个版本的增量。
+"""
+
+from typing import Any
+
+# 增量中按键比较的记录类型及其键字段
+DELTA_SECTIONS = {"notes": "guid", "cards": "id"}
+
+
+def empty_section() -> dict[str, list]:
+    """返回空的增量分段"""
+    return {"added": [], "changed": [], "removed": []}
+
+
+def compute_delta(old_export: dict[str, Any], new_export: dict[str, Any]) -> dict[str, Any]:
+    """
+    计算两个版本导出内容之间的增量
+
+    Args:
+        old_export: 旧版本导出内容（包含 deck、note_models、notes、cards）
+        new_export: 新版本导出内容
+
+    Returns:
+        增量内容
+    """
+    delta: dict[str, Any] = {"deck": new_export["deck"], "note_models": new_export["note_models"]}
+    for section, key in DELTA_SECTIONS.items():
+        old_items = {item[key]: item for item in old_export[section]}
+        result = empty_section()
+        for item in new_export[section]:
+            old_item = old_items.pop(item[key], None)
+            if old_item is None:
+                result["added"].append(item)
+            elif old_item != item:
+                result["changed"].append(item)
+        result["removed"] = list(old_items)
+        delta[section] = result
+    return delta
+
+
+def compose_deltas(first: dict[str, Any], second: dict[str, Any]) -> dict[str, Any]:
+    """
+    合并两个相邻的增量（first 的目标版本即 second 的起始版本）
+
+    Args:
+        first: 较早的增量
+        second: 紧接其后的增量
+
+    Returns:
+        从 first 起始版本到 second 目标版本的增量
+    """
+    delta: dict[str, Any] = {"deck": second["deck"], "note_models": second["note_models"]}
+    for section, key in DELTA_SECTIONS.items():
+        added = {item[key]: item for item in first[section]["added"]}
+        changed = {item[key]: item for item in first[section]["changed"]}
+        removed = dict.fromkeys(first[section]["removed"])
+
+        for item in second[section]["added"]:
+            if item[key] in removed:
+                # 起始版本中存在、中间被删除又重新加入
+                del removed[item[key]]
+                changed[item[key]] = item
+            else:
+                added[item[key]] = item
+        for item in second[section]["changed"]:
+            if item[key] in added:
+                added[item[key]] = item
+            else:
+                changed[item[key]] = item
+        for item_key in second[section]["removed"]:
+            if item_key in added:
+                # 中间版本新增又被删除，对起始版本而言没有变化
+                del added[item_key]
+            else:
+                changed.pop(item_key, None)
+                removed[item_key] = None
+
+        delta[section] = {"added": list(added.values()), "changed": list(changed.values()), "removed": list(removed)}
+    return delta
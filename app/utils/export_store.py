@@ -0,0 +1,167 @@
+"""
+共享牌组导出文件存储
+
+发布时把导出内容预先生成为 gzip 压缩文件，以内容哈希命名存放在本地目录。
+同一内容哈希对应的文件不可变，可以被任意多次下载直接复用。
+相邻版本之间的增量同样以两端的内容哈希命名存放。发布新版本后不再使用的文件由调用方删除。
+"""
+
+import asyncio
+import contextlib
+import gzip
+import json
+import os
+import tempfile
+from collections.abc import AsyncIterable, AsyncIterator
+from pathlib import Path
+from typing import Any
+
+from app.core.config import settings
+
+# 导出文件后缀（gzip 压缩的 JSON）
+ARTIFACT_SUFFIX = ".json.gz"
+
+# 增量文件后缀（gzip 压缩的 JSON）
+DELTA_SUFFIX = ".delta.json.gz"
+
+# 读取文件时每块的大小
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def get_artifact_path(content_hash: str) -> Path:
+    """
+    获取内容哈希对应的导出文件路径
+
+    Args:
+        content_hash: 快照内容哈希
+
+    Returns:
+        导出文件路径（文件不一定存在）
+    """
+    return Path(settings.EXPORT_STORAGE_DIR) / f"{content_hash}{ARTIFACT_SUFFIX}"
+
+
+def get_delta_path(from_hash: str, to_hash: str) -> Path:
+    """
+    获取两个快照之间增量文件的路径
+
+    Args:
+        from_hash: 起始快照内容哈希
+        to_hash: 目标快照内容哈希
+
+    Returns:
+        增量文件路径（文件不一定存在）
+    """
+    return Path(settings.EXPORT_STORAGE_DIR) / f"{from_hash}-{to_hash}{DELTA_SUFFIX}"
+
+
+async def write_artifact(content_hash: str, chunks: AsyncIterable[bytes]) -> Path:
+    """
+    将导出内容压缩写入以内容哈希命名的文件
+
+    Args:
+        content_hash: 快照内容哈希
+        chunks: 导出内容（未压缩）的字节块
+
+    Returns:
+        导出文件路径
+    """
+    return await _write_gzip(get_artifact_path(content_hash), chunks)
+
+
+async def write_delta(from_hash: str, to_hash: str, delta: dict[str, Any]) -> Path:
+    """
+    将增量内容压缩写入以两端内容哈希命名的文件
+
+    Args:
+        from_hash: 起始快照内容哈希
+        to_hash: 目标快照内容哈希
+        delta: 增量内容
+
+    Returns:
+        增量文件路径
+    """
+
+    async def chunks() -> AsyncIterator[bytes]:
+        yield json.dumps(delta, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    return await _write_gzip(get_delta_path(from_hash, to_hash), chunks())
+
+
+def remove_artifact(content_hash: str) -> None:
+    """
+    删除内容哈希对应的导出文件（不存在时忽略）
+
+    Args:
+        content_hash: 快照内容哈希
+    """
+    get_artifact_path(content_hash).unlink(missing_ok=True)
+
+
+def remove_delta(from_hash: str, to_hash: str) -> None:
+    """
+    删除两个快照之间的增量文件（不存在时忽略）
+
+    Args:
+        from_hash: 起始快照内容哈希
+        to_hash: 目标快照内容哈希
+    """
+    get_delta_path(from_hash, to_hash).unlink(missing_ok=True)
+
+
+async def _write_gzip(path: Path, chunks: AsyncIterable[bytes]) -> Path:
+    """
+    压缩写入不可变文件
+
+    先写入同目录的临时文件再原子替换，读者不会看到写了一半的文件。
+    文件已存在时直接返回，不会重复生成。
+    """
+    if path.exists():
+        return path
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        # mtime=0 保证相同内容生成完全相同的文件
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as gz:
+            async for chunk in chunks:
+                await asyncio.to_thread(gz.write, chunk)
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_name)
+        raise
+    return path
+
+
+async def read_json(path: Path) -> Any:
+    """
+    在线程池中读取并解析压缩的 JSON 文件
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        解析后的内容
+    """
+
+    def load() -> Any:
+        with gzip.open(path, "rb") as f:
+            return json.load(f)
+
+    return await asyncio.to_thread(load)
+
+
+async def iter_decompressed(path: Path) -> AsyncIterator[bytes]:
+    """
+    逐块读取并解压导出文件（用于不支持 gzip 的客户端）
+
+    Args:
+        path: 导出文件路径
+
+    Returns:
+        解压后内容的异步迭代器
+    """
+    with gzip.open(path, "rb") as f:
+        while chunk := await asyncio.to_thread(f.read, READ_CHUNK_SIZE):
+            yield chunk
@@ -0,0 +1,150 @@
+"""
+笔记导入流解析
+
+把请求体的字节流增量解码为逐行记录，按 NDJSON 或 CSV 格式逐条解析和校验，
+内存占用只与单行长度有关，与文件大小无关。
+"""
+
+import codecs
+import csv
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass
+
+from pydantic import ValidationError
+
+from app.core.exceptions import BadRequestException
+from app.schemas.note import NoteBatchItem
+
+# 单行（单条记录）允许的最大字符数
+MAX_LINE_LENGTH = 1024 * 1024
+
+# CSV 中表示标签的列名（值按空格分隔，与 Anki 导出格式一致）
+CSV_TAGS_COLUMN = "tags"
+
+
+@dataclass(slots=True)
+class ImportRow:
+    """解析后的单条导入记录"""
+
+    line: int
+    item: NoteBatchItem | None = None
+    error: str | None = None
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, str]]:
+    """
+    将字节流增量解码为文本行
+
+    Args:
+        chunks: 请求体字节块
+
+    Returns:
+        (行号, 行内容) 的异步迭代器，行内容保留换行符
+
+    Raises:
+        BadRequestException: 编码错误或单行过长
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    line_no = 0
+    try:
+        async for chunk in chunks:
+            buffer += decoder.decode(chunk)
+            *lines, buffer = buffer.split("\n")
+            for line in lines:
+                line_no += 1
+                yield line_no, line + "\n"
+            if len(buffer) > MAX_LINE_LENGTH:
+                raise BadRequestException(msg=f"第 {line_no + 1} 行内容过长")
+        buffer += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as e:
+        raise BadRequestException(msg="导入内容必须为 UTF-8 编码") from e
+    if buffer:
+        yield line_no + 1, buffer
+
+
+async def iter_ndjson_rows(chunks: AsyncIterable[bytes]) -> AsyncIterator[ImportRow]:
+    """
+    逐行解析 NDJSON 导入内容
+
+    每行是一个 JSON 对象：{"fields": {...}, "tags": [...]}，空行会被忽略。
+
+    Args:
+        chunks: 请求体字节块
+
+    Returns:
+        导入记录的异步迭代器
+    """
+    async for line_no, line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            yield ImportRow(line=line_no, item=NoteBatchItem.model_validate_json(line))
+        except ValidationError as e:
+            yield ImportRow(line=line_no, error=_format_validation_error(e))
+
+
+async def iter_csv_rows(chunks: AsyncIterable[bytes]) -> AsyncIterator[ImportRow]:
+    """
+    逐条解析 CSV 导入内容
+
+    第一行为表头，除 tags 列外的每一列对应一个笔记字段。
+    支持引号包裹的多行字段，记录的行号为其起始行。
+
+    Args:
+        chunks: 请求体字节块
+
+    Returns:
+        导入记录的异步迭代器
+
+    Raises:
+        BadRequestException: 缺少表头或表头无效
+    """
+    header: list[str] | None = None
+    pending = ""
+    start_line = 0
+
+    async for line_no, line in iter_lines(chunks):
+        if not pending:
+            start_line = line_no
+        pending += line
+        # 引号数为奇数说明字段尚未结束（转义的引号成对出现）
+        if pending.count('"') % 2:
+            if len(pending) > MAX_LINE_LENGTH:
+                raise BadRequestException(msg=f"第 {start_line} 行内容过长")
+            continue
+
+        record, pending = pending, ""
+        if not record.strip():
+            continue
+        try:
+            values = next(csv.reader([record]))
+        except csv.Error as e:
+            yield ImportRow(line=start_line, error=f"CSV 格式错误：{e}")
+            continue
+
+        if header is None:
+            header = [name.strip() for name in values]
+            if not any(name and name != CSV_TAGS_COLUMN for name in header) or len(set(header)) != len(header):
+                raise BadRequestException(msg="CSV 表头无效：需要至少一个字段列且列名不能重复")
+            continue
+
+        if len(values) != len(header):
+            yield ImportRow(line=start_line, error=f"列数不匹配：期望 {len(header)} 列，实际 {len(values)} 列")
+            continue
+
+        fields = dict(zip(header, values, strict=True))
+        tags = fields.pop(CSV_TAGS_COLUMN, "").split()
+        yield ImportRow(line=start_line, item=NoteBatchItem(fields=fields, tags=tags))
+
+    if pending:
+        yield ImportRow(line=start_line, error="CSV 格式错误：引号未闭合")
+    elif header is None:
+        raise BadRequestException(msg="CSV 缺少表头")
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    """将 pydantic 校验错误格式化为简短的提示"""
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first["loc"])
+    return f"{location}: {first['msg']}" if location else first["msg"]
@@ -0,0 +1,79 @@
+"""
+游标分页
+
+游标是上一页最后一行各排序键取值（末尾为主键）组成的 JSON 数组，经 base64url 编码，
+对客户端不透明；客户端只需原样回传上一页响应中的 next_cursor。
+"""
+
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any
+
+from app.core.exceptions import BadRequestException
+
+# JSON 中表示 datetime 的键
+_DATETIME_KEY = "$dt"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {_DATETIME_KEY: value.isoformat()}
+    raise TypeError(f"不支持的游标值类型: {type(value).__name__}")
+
+
+def _decode_value(obj: dict[str, Any]) -> Any:
+    if _DATETIME_KEY in obj:
+        return datetime.fromisoformat(obj[_DATETIME_KEY])
+    return obj
+
+
+def _matches_type(value: Any, expected: type) -> bool:
+    # bool 是 int 的子类，需单独区分；浮点列同时接受 JSON 中的整数
+    if isinstance(value, bool) or expected is bool:
+        return isinstance(value, bool) and expected is bool
+    if expected is float:
+        return isinstance(value, int | float)
+    return isinstance(value, expected)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    编码游标
+
+    Args:
+        values: 排序键取值
+
+    Returns:
+        游标字符串
+    """
+    raw = json.dumps(list(values), default=_encode_value, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> list[Any]:
+    """
+    解码游标
+
+    Args:
+        cursor: 游标字符串
+        types: 各排序键取值的 Python 类型
+
+    Returns:
+        排序键取值
+
+    Raises:
+        BadRequestException: 游标格式错误或与当前排序不匹配
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw, object_hook=_decode_value)
+    except (binascii.Error, ValueError) as e:
+        raise BadRequestException(msg="无效的分页游标") from e
+    if not isinstance(values, list) or len(values) != len(types):
+        raise BadRequestException(msg="无效的分页游标")
+    if not all(_matches_type(value, expected) for value, expected in zip(values, types, strict=True)):
+        raise BadRequestException(msg="无效的分页游标")
+    return values
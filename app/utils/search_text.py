@@ -0,0 +1,81 @@
+"""
+全文搜索文本处理
+
+SQLite FTS5 的 unicode61 分词器和 PostgreSQL 的 simple 配置都按空白和标点切分，
+连续的中日韩文字会被当作一个词，无法按其中的一部分搜索。
+这里在建索引和查询前把每个中日韩字符切成单独的词：
+
+- 建索引：``segment("日语词汇 N5")`` -> ``"日 语 词 汇 N5"``
+- 查询：每个搜索词的字符作为一个短语（相邻且有序）匹配，等价于子串匹配；
+  最后一个字符按前缀匹配，拉丁文单词输入一部分即可命中
+"""
+
+import re
+
+# 中日韩文字：平假名/片假名、CJK 扩展 A、CJK 统一表意文字、韩文音节、CJK 兼容表意文字
+_CJK_RE = re.compile(r"([\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff])")
+
+# 切分后的词（字母、数字、单个中日韩字符）
+_TOKEN_RE = re.compile(r"\w+")
+
+# 搜索词最多包含的词数，避免构造过长的查询
+MAX_QUERY_TERMS = 8
+
+
+def segment(text: str | None) -> str:
+    """
+    将文本切分为以空格分隔的索引词
+
+    Args:
+        text: 原始文本
+
+    Returns:
+        切分后的文本
+    """
+    if not text:
+        return ""
+    return " ".join(_TOKEN_RE.findall(_CJK_RE.sub(r" \1 ", text.lower())))
+
+
+def parse_query(q: str) -> list[list[str]]:
+    """
+    将用户输入的搜索关键词解析为搜索词
+
+    Args:
+        q: 搜索关键词（以空白分隔多个词，全部匹配）
+
+    Returns:
+        搜索词列表，每个搜索词是按顺序相邻匹配的词列表
+    """
+    terms = []
+    for word in q.split():
+        tokens = segment(word).split()
+        if tokens:
+            terms.append(tokens)
+    return terms[:MAX_QUERY_TERMS]
+
+
+def to_fts5_query(terms: list[list[str]]) -> str:
+    """
+    生成 SQLite FTS5 的 MATCH 表达式
+
+    Args:
+        terms: parse_query 的结果
+
+    Returns:
+        形如 ``"日 语"* "vocab"*`` 的表达式（各短语之间为 AND）
+    """
+    return " ".join(f'"{" ".join(tokens)}"*' for tokens in terms)
+
+
+def to_tsquery(terms: list[list[str]]) -> str:
+    """
+    生成 PostgreSQL to_tsquery 表达式
+
+    Args:
+        terms: parse_query 的结果
+
+    Returns:
+        形如 ``(日 <-> 语:*) & (vocab:*)`` 的表达式
+    """
+    return " & ".join("(" + " <-> ".join([*tokens[:-1], f"{tokens[-1]}:*"]) + ")" for tokens in terms)
@@ -0,0 +1,123 @@
+"""
+复习预测基准测试脚本
+
+在临时 SQLite 数据库中为一个用户生成不同规模的卡片（分布在若干牌组中），记录：
+读出全部卡片在 Python 中分桶（没有预测接口时客户端的做法）、GROUP BY 统计（缓存未命中）、
+命中缓存时由到期分布计算 90 天预测的平均耗时。
+
+用法:
+    uv run python -m scripts.bench_card_forecast --sizes 100000 500000
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models import Base, Card
+from app.repositories.note import CardRepository
+from app.scheduler.base import DAY_MS
+from app.schemas.note import MAX_FORECAST_DAYS, CardForecastQuery
+from app.services.card_forecast import build_forecast, today_start
+
+USER_ID = str(uuid.uuid4())
+DECK_COUNT = 20
+INSERT_CHUNK_SIZE = 10000
+REPEAT = 5
+
+
+async def seed(session: AsyncSession, card_count: int, start: int) -> None:
+    """生成卡片：约 20% 新卡片、5% 暂停，其余在前后一年内到期"""
+    rng = random.Random(0)
+    decks = [str(uuid.uuid4()) for _ in range(DECK_COUNT)]
+    for offset in range(0, card_count, INSERT_CHUNK_SIZE):
+        rows = []
+        for _ in range(min(INSERT_CHUNK_SIZE, card_count - offset)):
+            queue = rng.choices(["new", "learning", "review", "suspended"], [20, 5, 70, 5])[0]
+            rows.append(
+                {
+                    "id": str(uuid.uuid4()),
+                    "user_id": USER_ID,
+                    "note_id": str(uuid.uuid4()),
+                    "deck_id": rng.choice(decks),
+                    "card_template_id": str(uuid.uuid4()),
+                    "ord": 0,
+                    "state": "new" if queue == "new" else "review",
+                    "queue": queue,
+                    "due": 0 if queue == "new" else start + rng.randint(-30, 365) * DAY_MS,
+                }
+            )
+        await session.execute(insert(Card), rows)
+    await session.commit()
+
+
+async def bucket_in_python(session: AsyncSession, start: int) -> dict[int, int]:
+    """读出全部卡片后在 Python 中分桶"""
+    result = await session.execute(
+        select(Card.queue, Card.due).where(Card.user_id == USER_ID, Card.deleted_at.is_(None))
+    )
+    counts: dict[int, int] = {}
+    for queue, due in result.tuples():
+        if queue in ("learning", "review"):
+            bucket = max(0, (due - start) // DAY_MS)
+            counts[bucket] = counts.get(bucket, 0) + 1
+    return counts
+
+
+async def run(db_path: Path, card_count: int) -> dict[str, float]:
+    """返回各方式的平均耗时（毫秒）"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    today, start = today_start()
+
+    results = {}
+    async with session_factory() as session:
+        await seed(session, card_count, start)
+        repo = CardRepository(session)
+
+        begin = time.perf_counter()
+        for _ in range(REPEAT):
+            await bucket_in_python(session, start)
+        results["python"] = (time.perf_counter() - begin) * 1000 / REPEAT
+
+        begin = time.perf_counter()
+        for _ in range(REPEAT):
+            histogram = await repo.get_due_histogram(USER_ID, start, MAX_FORECAST_DAYS)
+        results["group_by"] = (time.perf_counter() - begin) * 1000 / REPEAT
+
+        query = CardForecastQuery(days=90, by_deck=True)
+        begin = time.perf_counter()
+        for _ in range(REPEAT * 20):
+            build_forecast(histogram, today, query)
+        results["cached"] = (time.perf_counter() - begin) * 1000 / (REPEAT * 20)
+
+    await engine.dispose()
+    return results
+
+
+def main() -> None:
+    """主函数"""
+    parser = argparse.ArgumentParser(description="复习预测基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100000, 500000], help="卡片数量")
+    args = parser.parse_args()
+
+    print(f"{'cards':>8} | {'python(ms)':>10} | {'group_by(ms)':>12} | {'cached(ms)':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for card_count in args.sizes:
+            results = asyncio.run(run(Path(tmp) / f"bench_{card_count}.db", card_count))
+            print(
+                f"{card_count:>8} | {results['python']:>10.1f} | {results['group_by']:>12.1f} | "
+                f"{results['cached']:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
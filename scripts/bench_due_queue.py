@@ -0,0 +1,72 @@
+"""
+到期队列索引基准测试脚本
+
+对不同规模的活跃卡片构造 DueQueue，记录构造耗时、取前 N 张到期卡片的耗时
+（对比每次全量过滤排序）以及单张卡片变更的耗时。
+
+用法:
+    uv run python -m scripts.bench_due_queue --sizes 10000 100000 1000000
+"""
+
+import argparse
+import random
+import time
+import uuid
+
+from app.services.due_queue import QUEUE_RANK, DueQueue
+
+# 每个规模重复取卡/变更的次数
+REPEAT = 200
+
+
+def run(card_count: int, limit: int) -> None:
+    """执行一次基准测试并输出结果"""
+    rng = random.Random(0)
+    queues = list(QUEUE_RANK)
+    decks = [str(uuid.uuid4()) for _ in range(10)]
+    rows = [
+        (str(uuid.uuid4()), rng.choice(decks), rng.choice(queues), rng.randint(0, 10**9)) for _ in range(card_count)
+    ]
+    due_before = 5 * 10**8
+
+    start = time.perf_counter()
+    queue = DueQueue.build(rows)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        queue.take(limit, deck_id=rng.choice(decks), due_before=due_before)
+    take_us = (time.perf_counter() - start) / REPEAT * 1e6
+
+    # 对照：每次全量过滤排序（相当于没有索引时数据库的工作量）
+    start = time.perf_counter()
+    for _ in range(max(1, REPEAT // 20)):
+        deck_id = rng.choice(decks)
+        sorted(
+            (QUEUE_RANK[q], due, card_id) for card_id, deck, q, due in rows if deck == deck_id and due <= due_before
+        )[:limit]
+    scan_us = (time.perf_counter() - start) / max(1, REPEAT // 20) * 1e6
+
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        card_id, deck_id, _, _ = rng.choice(rows)
+        queue.apply({"id": card_id, "deck_id": deck_id, "queue": "review", "due": rng.randint(0, 10**9)})
+    apply_us = (time.perf_counter() - start) / REPEAT * 1e6
+
+    print(f"{card_count:>9} | {build_ms:>9.0f} | {take_us:>8.1f} | {scan_us:>10.0f} | {apply_us:>8.1f}")
+
+
+def main() -> None:
+    """主函数"""
+    parser = argparse.ArgumentParser(description="到期队列索引基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000], help="活跃卡片数")
+    parser.add_argument("--limit", type=int, default=100, help="每次取出的卡片数")
+    args = parser.parse_args()
+
+    print(f"{'cards':>9} | {'build(ms)':>9} | {'take(us)':>8} | {'scan(us)':>10} | {'apply(us)':>8}")
+    for card_count in args.sizes:
+        run(card_count, args.limit)
+
+
+if __name__ == "__main__":
+    main()
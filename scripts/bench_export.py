@@ -0,0 +1,185 @@
+"""
+共享牌组导出基准测试脚本
+
+对比整体导出（BaseResponse）与 NDJSON 流式导出在不同牌组规模下的
+峰值内存（RSS 增量）和首字节时间。
+
+每个规模先在临时 SQLite 文件中造数，再分别在独立子进程中执行两种导出，
+保证峰值 RSS 互不干扰。
+
+用法:
+    uv run python -m scripts.bench_export --sizes 10000 100000 500000
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models import Base, Card, CardTemplate, Deck, Note, NoteModel, SharedDeck, User
+from app.models.base import BaseResponse
+from app.services.shared_deck import SharedDeckService
+
+BENCH_SLUG = "bench-export"
+SEED_CHUNK_SIZE = 10000
+
+
+def _rss_kb() -> int:
+    """当前进程常驻内存（KB）"""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+async def seed(db_path: Path, card_count: int) -> None:
+    """生成包含 card_count 张卡片（每条笔记一张卡片）的共享牌组"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+        user_id, model_id, template_id, deck_id = (str(uuid.uuid4()) for _ in range(4))
+        await conn.execute(
+            insert(User),
+            [
+                {
+                    "id": user_id,
+                    "username": "bench",
+                    "email": "bench@example.com",
+                    "nickname": "bench",
+                    "hashed_password": "x",
+                }
+            ],
+        )
+        await conn.execute(
+            insert(NoteModel),
+            [
+                {
+                    "id": model_id,
+                    "user_id": user_id,
+                    "name": "Basic",
+                    "fields_schema": [{"name": "Front"}, {"name": "Back"}],
+                }
+            ],
+        )
+        await conn.execute(
+            insert(CardTemplate),
+            [{"id": template_id, "note_model_id": model_id, "name": "Card 1", "ord": 0}],
+        )
+        await conn.execute(insert(Deck), [{"id": deck_id, "user_id": user_id, "name": "Bench Deck"}])
+        await conn.execute(
+            insert(SharedDeck),
+            [{"author_id": user_id, "slug": BENCH_SLUG, "title": "Bench Deck", "tags": []}],
+        )
+
+        for start in range(0, card_count, SEED_CHUNK_SIZE):
+            end = min(start + SEED_CHUNK_SIZE, card_count)
+            note_ids = [str(uuid.uuid4()) for _ in range(start, end)]
+            await conn.execute(
+                insert(Note),
+                [
+                    {
+                        "id": note_id,
+                        "user_id": user_id,
+                        "deck_id": deck_id,
+                        "note_model_id": model_id,
+                        "guid": uuid.uuid4().hex,
+                        "fields": {"Front": f"question {i} " * 4, "Back": f"answer {i} " * 8},
+                        "tags": ["bench", f"group-{i % 50}"],
+                    }
+                    for i, note_id in zip(range(start, end), note_ids, strict=True)
+                ],
+            )
+            await conn.execute(
+                insert(Card),
+                [
+                    {"user_id": user_id, "note_id": note_id, "deck_id": deck_id, "card_template_id": template_id}
+                    for note_id in note_ids
+                ],
+            )
+    await engine.dispose()
+
+
+async def run_export(db_path: Path, mode: str) -> dict:
+    """在当前进程中执行一次导出并返回测量结果"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with session_factory() as session:
+        service = SharedDeckService(session)
+        shared_deck = await service.get_shared_deck_by_slug(BENCH_SLUG)
+        baseline_rss = _rss_kb()
+        size = 0
+        start = time.perf_counter()
+
+        if mode == "buffered":
+            data = await service.export_shared_deck(shared_deck)
+            body = BaseResponse(success=True, code=200, msg="导出共享牌组成功", data=data).model_dump_json().encode()
+            ttfb = time.perf_counter() - start
+            size = len(body)
+        else:
+            chunks = await service.stream_export_shared_deck(shared_deck)
+            ttfb = None
+            async for chunk in chunks:
+                if ttfb is None:
+                    ttfb = time.perf_counter() - start
+                size += len(chunk)
+
+        total = time.perf_counter() - start
+        await session.rollback()
+
+    await engine.dispose()
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "mode": mode,
+        "ttfb_ms": round((ttfb or 0.0) * 1000, 1),
+        "total_ms": round(total * 1000, 1),
+        "peak_rss_delta_mb": round((peak_rss - baseline_rss) / 1024, 1),
+        "bytes": size,
+    }
+
+
+def main() -> None:
+    """主函数"""
+    parser = argparse.ArgumentParser(description="共享牌组导出基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 500000], help="卡片数量")
+    parser.add_argument("--run", choices=["buffered", "stream"], help=argparse.SUPPRESS)
+    parser.add_argument("--db", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # 子进程模式：执行单次导出并输出 JSON 结果
+    if args.run:
+        print(json.dumps(asyncio.run(run_export(args.db, args.run))))
+        return
+
+    print(f"{'cards':>8} | {'mode':>8} | {'ttfb(ms)':>9} | {'total(ms)':>9} | {'peak RSS Δ(MB)':>14} | {'bytes':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for card_count in args.sizes:
+            db_path = Path(tmp) / f"bench_{card_count}.db"
+            asyncio.run(seed(db_path, card_count))
+            for mode in ("buffered", "stream"):
+                output = subprocess.run(
+                    [sys.executable, "-m", "scripts.bench_export", "--run", mode, "--db", str(db_path)],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+                r = json.loads(output.strip().splitlines()[-1])
+                print(
+                    f"{card_count:>8} | {r['mode']:>8} | {r['ttfb_ms']:>9} | {r['total_ms']:>9} | "
+                    f"{r['peak_rss_delta_mb']:>14} | {r['bytes']:>11}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+FSRS 参数优化基准测试脚本
+
+按已知参数模拟不同规模的复习日志（每张卡片固定复习次数），按块喂给 ReviewHistoryBuilder
+（与从数据库分块读取时相同），记录构造历史和拟合参数的耗时、峰值内存（tracemalloc）以及损失变化。
+
+用法:
+    uv run python -m scripts.bench_fsrs_optimizer --sizes 10000 100000 1000000
+"""
+
+import argparse
+import time
+import tracemalloc
+from collections.abc import Iterator
+
+import numpy as np
+
+from app.scheduler.base import DAY_MS
+from app.scheduler.batch import NUMPY_OPS
+from app.scheduler.fsrs import FSRS_DEFAULT_WEIGHTS, S_MIN, forgetting_curve, init_difficulty, next_state
+from app.scheduler.optimizer import ReviewHistoryBuilder, fit
+
+# 模拟用的参数：初始稳定性明显高于默认值
+TRUE_WEIGHTS = (1.0, 2.5, 6.0, 25.0, *FSRS_DEFAULT_WEIGHTS[4:])
+
+# 每次生成的卡片数（模拟按块读取）
+CARDS_PER_CHUNK = 1000
+
+
+def simulate_chunks(review_count: int, reviews_per_card: int, seed: int = 0) -> Iterator[list[tuple]]:
+    """按块生成模拟的复习记录 (卡片 ID, 复习时间, 评分, 复习前状态)，整体按卡片、时间排序"""
+    rng = np.random.default_rng(seed)
+    w = np.asarray(TRUE_WEIGHTS)
+    total_cards = review_count // reviews_per_card
+    for first_card in range(0, total_cards, CARDS_PER_CHUNK):
+        cards = min(CARDS_PER_CHUNK, total_cards - first_card)
+        g = rng.choice([1, 2, 3, 4], cards, p=[0.2, 0.1, 0.6, 0.1])
+        s = np.maximum(w[g - 1], S_MIN)
+        d = init_difficulty(w, g, NUMPY_OPS)
+        day = rng.integers(0, 365, cards)
+        days, ratings = [day.copy()], [g.copy()]
+        for _ in range(reviews_per_card - 1):
+            interval = np.maximum(1, np.round(s * rng.uniform(0.5, 1.5, cards)))
+            day = day + interval
+            recalled = rng.random(cards) < forgetting_curve(w, interval, s, NUMPY_OPS)
+            g = np.where(recalled, rng.choice([2, 3, 4], cards, p=[0.15, 0.75, 0.1]), 1)
+            d, s = next_state(w, d, s, interval, g, ops=NUMPY_OPS)
+            days.append(day.copy())
+            ratings.append(g.copy())
+        yield [
+            (f"card-{first_card + card}", int(days[i][card]) * DAY_MS, int(ratings[i][card]), None)
+            for card in range(cards)
+            for i in range(reviews_per_card)
+        ]
+
+
+def run(review_count: int, reviews_per_card: int, epochs: int) -> None:
+    """执行一次构造和拟合并输出结果"""
+    chunks = list(simulate_chunks(review_count, reviews_per_card))
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    builder = ReviewHistoryBuilder()
+    for rows in chunks:
+        builder.add(rows)
+    history = builder.build()
+    build_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = fit(history, FSRS_DEFAULT_WEIGHTS, epochs=epochs)
+    fit_elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{history.review_count:>9} | {build_elapsed * 1000:>9.0f} | {fit_elapsed:>7.2f} | "
+        f"{history.review_count / fit_elapsed:>11.0f} | {peak / 1e6:>8.1f} | "
+        f"{result.loss_before:.4f} -> {result.loss_after:.4f}"
+    )
+
+
+def main() -> None:
+    """主函数"""
+    parser = argparse.ArgumentParser(description="FSRS 参数优化基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000], help="复习日志条数")
+    parser.add_argument("--reviews-per-card", type=int, default=10, help="每张卡片的复习次数")
+    parser.add_argument("--epochs", type=int, default=5, help="训练轮数")
+    args = parser.parse_args()
+
+    print(f"{'reviews':>9} | {'build(ms)':>9} | {'fit(s)':>7} | {'reviews/sec':>11} | {'peak(MB)':>8} | log loss")
+    for review_count in args.sizes:
+        run(review_count, args.reviews_per_card, args.epochs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+牌组市场搜索基准测试脚本
+
+对比 LIKE '%q%' 全表扫描（全文索引引入前的实现）与 FTS5 全文索引
+在不同共享牌组数量下的单次搜索耗时（包含总数统计和第一页结果）。
+
+用法:
+    uv run python -m scripts.bench_market_search --sizes 10000 50000
+"""
+
+import argparse
+import asyncio
+import random
+import string
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy import func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models import Base, SharedDeck, SharedDeckSearch, User
+from app.repositories.shared_deck import SharedDeckRepository
+from app.utils import search_text
+
+# 词表：随机拉丁文单词和中文词，每个牌组的标题、描述、标签从中随机抽取
+_rng = random.Random(42)
+WORDS = ["".join(_rng.choices(string.ascii_lowercase, k=7)) for _ in range(5000)] + [
+    a + b for a in ("日语", "汉字", "历史", "生物", "音乐", "医学") for b in ("词汇", "语法", "入门", "考试")
+]
+QUERIES = [WORDS[42], "日语词汇", f"{WORDS[7]} {WORDS[1999]}", WORDS[12][:4]]
+REPEAT = 20
+
+
+async def seed(session: AsyncSession, deck_count: int) -> None:
+    """创建用户和共享牌组（以及搜索索引）"""
+    user_id = str(uuid.uuid4())
+    await session.execute(
+        insert(User),
+        [
+            {
+                "id": user_id,
+                "username": "bench",
+                "email": "bench@example.com",
+                "nickname": "bench",
+                "hashed_password": "x",
+            }
+        ],
+    )
+    rng = random.Random(0)
+    decks = []
+    for i in range(deck_count):
+        title = " ".join(rng.sample(WORDS, 3))
+        decks.append(
+            {
+                "id": str(uuid.uuid4()),
+                "author_id": user_id,
+                "slug": f"deck-{i}",
+                "title": f"{title} {i}",
+                "description": " ".join(rng.choices(WORDS, k=30)),
+                "tags": rng.sample(WORDS, 3),
+            }
+        )
+    await session.execute(insert(SharedDeck), decks)
+    await session.execute(
+        insert(SharedDeckSearch),
+        [
+            {
+                "shared_deck_id": d["id"],
+                "title": search_text.segment(d["title"]),
+                "description": search_text.segment(d["description"]),
+                "tags": search_text.segment(" ".join(d["tags"])),
+            }
+            for d in decks
+        ],
+    )
+    await session.commit()
+
+
+async def search_like(session: AsyncSession, q: str) -> int:
+    """LIKE 全表扫描搜索（全文索引引入前的实现）"""
+    keyword_filter = or_(SharedDeck.title.like(f"%{q}%"), SharedDeck.description.like(f"%{q}%"))
+    base = select(SharedDeck).where(SharedDeck.deleted_at.is_(None), SharedDeck.is_active == True)  # noqa: E712
+    total = await session.scalar(select(func.count()).select_from(base.where(keyword_filter).subquery()))
+    query = base.where(keyword_filter).order_by(SharedDeck.download_count.desc()).limit(20)
+    await session.execute(query)
+    return total or 0
+
+
+async def run(db_path: Path, deck_count: int) -> dict[str, float]:
+    """对每种方式执行若干次搜索，返回平均耗时（毫秒）"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    results = {}
+    async with session_factory() as session:
+        await seed(session, deck_count)
+        repo = SharedDeckRepository(session)
+        for mode in ("like", "fts"):
+            start = time.perf_counter()
+            for _ in range(REPEAT):
+                for q in QUERIES:
+                    if mode == "like":
+                        await search_like(session, q)
+                    else:
+                        await repo.search(q=q, limit=20)
+            results[mode] = (time.perf_counter() - start) * 1000 / (REPEAT * len(QUERIES))
+
+    await engine.dispose()
+    return results
+
+
+def main() -> None:
+    """主函数"""
+    parser = argparse.ArgumentParser(description="牌组市场搜索基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000], help="共享牌组数量")
+    args = parser.parse_args()
+
+    print(f"{'decks':>8} | {'like(ms)':>10} | {'fts(ms)':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for deck_count in args.sizes:
+            results = asyncio.run(run(Path(tmp) / f"bench_{deck_count}.db", deck_count))
+            print(f"{deck_count:>8} | {results['like']:>10.2f} | {results['fts']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+批量创建笔记基准测试脚本
+
+对比逐条 create（每条笔记和卡片各一次 flush + refresh）与批量写入
+（预生成主键、分块 executemany）在不同批次规模下的吞吐量（notes/sec）。
+
+每个规模、每种方式都使用一个新的临时 SQLite 文件，笔记类型包含两个卡片模板。
+
+用法:
+    uv run python -m scripts.bench_note_batch --sizes 1000 10000 50000
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models import Base, CardTemplate, Deck, NoteModel, User
+from app.repositories.note import NoteRepository
+from app.schemas.note import NoteBatchCreate, NoteBatchItem
+from app.services.note import NoteService
+
+TEMPLATE_COUNT = 2
+
+
+async def seed(session: AsyncSession) -> tuple[str, str, str]:
+    """创建用户、笔记类型（两个模板）和牌组，返回 (user_id, deck_id, note_model_id)"""
+    user_id, model_id, deck_id = (str(uuid.uuid4()) for _ in range(3))
+    await session.execute(
+        insert(User),
+        [
+            {
+                "id": user_id,
+                "username": "bench",
+                "email": "bench@example.com",
+                "nickname": "bench",
+                "hashed_password": "x",
+            }
+        ],
+    )
+    await session.execute(
+        insert(NoteModel),
+        [
+            {
+                "id": model_id,
+                "user_id": user_id,
+                "name": "Basic (and reversed)",
+                "fields_schema": [{"name": "Front"}, {"name": "Back"}],
+            }
+        ],
+    )
+    await session.execute(
+        insert(CardTemplate),
+        [{"note_model_id": model_id, "name": f"Card {i + 1}", "ord": i} for i in range(TEMPLATE_COUNT)],
+    )
+    await session.execute(insert(Deck), [{"id": deck_id, "user_id": user_id, "name": "Bench Deck"}])
+    await session.commit()
+    return user_id, deck_id, model_id
+
+
+async def create_notes_per_row(service: NoteService, user_id: str, data: NoteBatchCreate) -> int:
+    """逐条创建笔记和卡片（批量写入引入前的实现）"""
+    note_model = await service.note_model_repo.get_by_id_with_templates(data.note_model_id)
+    assert note_model is not None
+    existing_guids = await service.note_repo.get_guids_by_deck(data.deck_id)
+    created = 0
+    for item in data.notes:
+        guid = NoteRepository.generate_guid(item.fields)
+        if guid in existing_guids:
+            continue
+        note = await service.note_repo.create(
+            {
+                "user_id": user_id,
+                "deck_id": data.deck_id,
+                "note_model_id": data.note_model_id,
+                "guid": guid,
+                "fields": item.fields,
+                "tags": item.tags,
+                "source_type": data.source_type,
+                "dirty": 1,
+            }
+        )
+        for template in note_model.templates:
+            await service.card_repo.create(
+                {
+                    "user_id": user_id,
+                    "note_id": note.id,
+                    "deck_id": data.deck_id,
+                    "card_template_id": template.id,
+                    "ord": template.ord,
+                }
+            )
+        existing_guids.add(guid)
+        created += 1
+    return created
+
+
+async def run(db_path: Path, note_count: int, mode: str) -> float:
+    """执行一次批量创建并返回耗时（秒）"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with session_factory() as session:
+        user_id, deck_id, model_id = await seed(session)
+        data = NoteBatchCreate.model_construct(
+            deck_id=deck_id,
+            note_model_id=model_id,
+            source_type="import",
+            notes=[
+                NoteBatchItem(fields={"Front": f"question {i}", "Back": f"answer {i}"}, tags=["bench"])
+                for i in range(note_count)
+            ],
+        )
+        service = NoteService(session)
+
+        start = time.perf_counter()
+        if mode == "per-row":
+            created = await create_notes_per_row(service, user_id, data)
+        else:
+            created = (await service.create_notes_batch(user_id, data)).created_count
+        await session.commit()
+        elapsed = time.perf_counter() - start
+
+    await engine.dispose()
+    assert created == note_count
+    return elapsed
+
+
+def main() -> None:
+    """主函数"""
+    parser = argparse.ArgumentParser(description="批量创建笔记基准测试")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000], help="每批笔记数量")
+    args = parser.parse_args()
+
+    print(f"{'notes':>8} | {'mode':>8} | {'total(ms)':>10} | {'notes/sec':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for note_count in args.sizes:
+            for mode in ("per-row", "bulk"):
+                db_path = Path(tmp) / f"bench_{mode}_{note_count}.db"
+                elapsed = asyncio.run(run(db_path, note_count, mode))
+                print(f"{note_count:>8} | {mode:>8} | {elapsed * 1000:>10.1f} | {note_count / elapsed:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+用户身份缓存基准测试脚本
+
+在临时 SQLite 数据库中创建若干用户，对比每次认证都查询 users 表（缓存未命中）
+与命中用户身份缓存时，解析 token 并获取用户身份的平均耗时。
+
+用法:
+    uv run python -m scripts.bench_principal_cache --users 10000 --requests 5000
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from fastapi import HTTPException
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.principal import principal_cache
+from app.core.security import create_tokens, verify_access_token
+from app.models import Base, User
+
+CREDENTIALS_EXCEPTION = HTTPException(status_code=401)
+
+
+async def authenticate(session: AsyncSession, token: str) -> None:
+    """与 get_current_user 相同：校验 token 并获取用户身份"""
+    user_id = verify_access_token(token, CREDENTIALS_EXCEPTION)
+    principal = await principal_cache.get(session, user_id)
+    assert principal is not None and principal.is_active
+
+
+async def run(db_path: Path, user_count: int, request_count: int) -> dict[str, float]:
+    """返回未命中和命中时的平均耗时（微秒）"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    user_ids = [str(uuid.uuid4()) for _ in range(user_count)]
+    rng = random.Random(0)
+    tokens = [create_tokens({"user_id": rng.choice(user_ids)})[0] for _ in range(request_count)]
+    results = {}
+    async with session_factory() as session:
+        await session.execute(
+            insert(User),
+            [
+                {
+                    "id": user_id,
+                    "username": f"bench_{i}",
+                    "email": f"bench_{i}@example.com",
+                    "nickname": "bench",
+                    "hashed_password": "x",
+                }
+                for i, user_id in enumerate(user_ids)
+            ],
+        )
+        await session.commit()
+
+        principal_cache.cache.clear()
+        start = time.perf_counter()
+        for token in tokens:
+            principal_cache.cache.clear()
+            await authenticate(session, token)
+        results["miss"] = (time.perf_counter() - start) * 1e6 / request_count
+
+        for token in tokens:
+            await authenticate(session, token)
+        start = time.perf_counter()
+        for token in tokens:
+            await authenticate(session, token)
+        results["hit"] = (time.perf_counter() - start) * 1e6 / request_count
+
+    await engine.dispose()
+    return results
+
+
+def main() -> None:
+    """主函数"""
+    parser = argparse.ArgumentParser(description="用户身份缓存基准测试")
+    parser.add_argument("--users", type=int, default=10000, help="用户数量")
+    parser.add_argument("--requests", type=int, default=5000, help="认证请求数量")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = asyncio.run(run(Path(tmp) / "bench.db", args.users, args.requests))
+    print(f"{'miss(us)':>10} | {'hit(us)':>10}")
+    print(f"{results['miss']:>10.1f} | {results['hit']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
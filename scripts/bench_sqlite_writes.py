@@ -0,0 +1,150 @@
+"""
+SQLite 并发写入基准测试脚本
+
+在临时 SQLite 文件数据库中模拟并发复习提交：每个事务读取一张卡片、写入一条复习记录并更新卡片，
+中间等待片刻（模拟请求中的其他 await）。对比默认连接方式（每个会话一个连接，回滚日志）
+与 SQLite 生产模式（WAL、单个写连接、批量提交、只读连接池）的吞吐、p99 延迟和失败数。
+
+用法:
+    uv run python -m scripts.bench_sqlite_writes --workers 64 --transactions 50
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import create_sqlite_engines
+from app.core.sqlite import SQLiteSession, SQLiteWriter
+from app.models import Base, Card, ReviewLog
+
+USER_ID = str(uuid.uuid4())
+CARD_COUNT = 1000
+
+
+async def seed(session_factory: async_sessionmaker) -> list[str]:
+    """生成卡片，返回卡片 ID"""
+    card_ids = [str(uuid.uuid4()) for _ in range(CARD_COUNT)]
+    async with session_factory() as session:
+        await session.execute(
+            insert(Card),
+            [
+                {
+                    "id": card_id,
+                    "user_id": USER_ID,
+                    "note_id": str(uuid.uuid4()),
+                    "deck_id": str(uuid.uuid4()),
+                    "card_template_id": str(uuid.uuid4()),
+                    "ord": 0,
+                    "state": "review",
+                    "queue": "review",
+                    "due": 0,
+                }
+                for card_id in card_ids
+            ],
+        )
+        await session.commit()
+    return card_ids
+
+
+async def review(session_factory: async_sessionmaker, card_id: str) -> None:
+    """一次复习提交"""
+    async with session_factory() as session:
+        card = (await session.execute(select(Card).where(Card.id == card_id))).scalar_one()
+        await asyncio.sleep(0.002)
+        session.add(ReviewLog(user_id=USER_ID, card_id=card_id, review_time=int(time.time() * 1000), rating=3))
+        card.due += 1
+        await session.commit()
+
+
+async def run(session_factory: async_sessionmaker, workers: int, transactions: int) -> dict[str, float]:
+    """并发执行复习提交，返回吞吐、延迟和失败数"""
+    card_ids = await seed(session_factory)
+    rng = random.Random(0)
+    latencies: list[float] = []
+    failures = 0
+
+    async def worker() -> None:
+        nonlocal failures
+        for _ in range(transactions):
+            begin = time.perf_counter()
+            try:
+                await review(session_factory, rng.choice(card_ids))
+            except (OperationalError, PoolTimeoutError):
+                failures += 1
+            latencies.append((time.perf_counter() - begin) * 1000)
+
+    begin = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    elapsed = time.perf_counter() - begin
+    return {
+        "tps": (len(latencies) - failures) / elapsed,
+        "p50": statistics.median(latencies),
+        "p99": statistics.quantiles(latencies, n=100)[98],
+        "failures": failures,
+    }
+
+
+async def run_default(db_path: Path, workers: int, transactions: int) -> dict[str, float]:
+    """默认连接方式"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", pool_size=workers, max_overflow=0)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        return await run(async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False), workers, transactions)
+    finally:
+        await engine.dispose()
+
+
+async def run_tuned(db_path: Path, workers: int, transactions: int) -> dict[str, float]:
+    """SQLite 生产模式"""
+    writer_engine, reader_engine = create_sqlite_engines(f"sqlite+aiosqlite:///{db_path}")
+    async with writer_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    writer = SQLiteWriter(writer_engine, batch_size=16, timeout=30)
+    session_factory = async_sessionmaker(
+        reader_engine,
+        class_=SQLiteSession,
+        expire_on_commit=False,
+        autoflush=False,
+        writer=writer,
+        reader=reader_engine,
+    )
+    try:
+        results = await run(session_factory, workers, transactions)
+        results["avg_batch"] = writer.stats().avg_batch
+        return results
+    finally:
+        await writer.close()
+        await writer_engine.dispose()
+        await reader_engine.dispose()
+
+
+def main() -> None:
+    """主函数"""
+    parser = argparse.ArgumentParser(description="SQLite 并发写入基准测试")
+    parser.add_argument("--workers", type=int, default=64, help="并发数")
+    parser.add_argument("--transactions", type=int, default=50, help="每个并发执行的事务数")
+    args = parser.parse_args()
+
+    print(f"{'mode':>8} | {'tx/s':>8} | {'p50(ms)':>8} | {'p99(ms)':>8} | {'failed':>6} | {'batch':>5}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, runner in (("default", run_default), ("tuned", run_tuned)):
+            results = asyncio.run(runner(Path(tmp) / f"{mode}.db", args.workers, args.transactions))
+            print(
+                f"{mode:>8} | {results['tps']:>8.1f} | {results['p50']:>8.1f} | {results['p99']:>8.1f} | "
+                f"{results['failures']:>6} | {results.get('avg_batch', 1):>5.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
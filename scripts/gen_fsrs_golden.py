@@ -0,0 +1,129 @@
+"""
+FSRS 期望值生成脚本
+
+用 FSRS-6 的 Python 参考实现（py-fsrs 6.3.1，与 ts-fsrs 5.x 同为 open-spaced-repetition 维护）计算
+tests/unit/fsrs_golden.json：首次评分的记忆状态、单次复习的记忆状态转移、稳定性到间隔的换算，
+以及随机复习序列逐次重放后的记忆状态。输入由固定种子生成，期望值只来自参考实现。
+
+前端实际运行的是 ts-fsrs，web/scripts/fsrs-golden.mjs 读取同一文件的输入，用 ts-fsrs 重新计算期望值并覆盖，
+两者的差异即为 py-fsrs 与 ts-fsrs 的差异。
+
+用法:
+    uv run --no-project --with fsrs==6.3.1 python -m scripts.gen_fsrs_golden
+"""
+
+import json
+import random
+from datetime import UTC, datetime, timedelta
+from importlib.metadata import version
+from pathlib import Path
+
+from fsrs import Card, Rating, Scheduler, State
+
+OUTPUT = Path(__file__).resolve().parent.parent / "tests" / "unit" / "fsrs_golden.json"
+
+START = datetime(2025, 10, 1, 12, 0, tzinfo=UTC)
+RETENTIONS = (0.8, 0.9, 0.95)
+
+# 固定的转移用例：(难度, 稳定性, 距上次复习天数)
+FIXED_TRANSITIONS = ((5.0, 10.0, 10), (6.0, 3.0, 0), (7.0, 2.0, 3), (9.0, 0.5, 2), (2.0, 300.0, 400))
+
+
+def review(scheduler: Scheduler, card: Card, rating: int, elapsed_days: int) -> Card:
+    """以复习状态的卡片在距上次复习 elapsed_days 天后评分（复习时刻与上次复习在一天中的同一时间）"""
+    assert card.last_review is not None
+    reviewed, _ = scheduler.review_card(card, Rating(rating), card.last_review + timedelta(days=elapsed_days))
+    return reviewed
+
+
+def review_card(difficulty: float, stability: float) -> Card:
+    """构造复习状态的卡片"""
+    return Card(state=State.Review, step=None, stability=stability, difficulty=difficulty, due=START, last_review=START)
+
+
+def _memory(card: Card) -> tuple[float, float]:
+    """卡片的 (难度, 稳定性)"""
+    assert card.difficulty is not None and card.stability is not None
+    return card.difficulty, card.stability
+
+
+def main() -> None:
+    """主函数"""
+    rng = random.Random(20251001)
+    scheduler = Scheduler(enable_fuzzing=False)
+
+    init = []
+    for rating in range(1, 5):
+        card, _ = scheduler.review_card(Card(), Rating(rating), START)
+        init.append(
+            {
+                "rating": rating,
+                "difficulty": card.difficulty,
+                "stability": card.stability,
+                "interval": scheduler._next_interval(stability=card.stability),
+            }
+        )
+
+    cases = list(FIXED_TRANSITIONS)
+    for _ in range(40):
+        stability = round(10 ** rng.uniform(-1, 3), 4)
+        elapsed = rng.choice([0, rng.randint(1, max(1, int(stability * 3)))])
+        cases.append((round(rng.uniform(1, 10), 4), stability, elapsed))
+    transitions = []
+    for difficulty, stability, elapsed in cases:
+        for rating in range(1, 5):
+            card = review(scheduler, review_card(difficulty, stability), rating, elapsed)
+            transitions.append(
+                {
+                    "difficulty": difficulty,
+                    "stability": stability,
+                    "elapsed_days": elapsed,
+                    "rating": rating,
+                    "expected": {
+                        "difficulty": card.difficulty,
+                        "stability": card.stability,
+                        "interval": scheduler._next_interval(stability=card.stability),
+                    },
+                }
+            )
+
+    intervals = []
+    for retention in RETENTIONS:
+        by_retention = Scheduler(desired_retention=retention, enable_fuzzing=False)
+        for _ in range(15):
+            stability = round(10 ** rng.uniform(-2, 4), 4)
+            intervals.append(
+                {
+                    "stability": stability,
+                    "request_retention": retention,
+                    "interval": by_retention._next_interval(stability=stability),
+                }
+            )
+
+    histories = []
+    for _ in range(12):
+        ratings = [rng.choices([1, 2, 3, 4], [0.2, 0.1, 0.6, 0.1])[0] for _ in range(10)]
+        card, _ = scheduler.review_card(Card(), Rating(ratings[0]), START)
+        card = review_card(card.difficulty, card.stability)
+        reviews, states = [], []
+        for rating in ratings[1:]:
+            elapsed = rng.choice([0, rng.randint(1, max(1, round(card.stability * 2)))])
+            card = review_card(*_memory(review(scheduler, card, rating, elapsed)))
+            reviews.append([elapsed, rating])
+            states.append([card.difficulty, card.stability])
+        histories.append({"first_rating": ratings[0], "reviews": reviews, "states": states})
+
+    golden = {
+        "source": f"fsrs {version('fsrs')} (Python)",
+        "weights": list(scheduler.parameters),
+        "init": init,
+        "transitions": transitions,
+        "intervals": intervals,
+        "histories": histories,
+    }
+    OUTPUT.write_text(json.dumps(golden, indent=2) + "\n")
+    print(f"wrote {OUTPUT}")
+
+
+if __name__ == "__main__":
+    main()
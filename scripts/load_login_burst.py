@@ -0,0 +1,167 @@
+"""
+登录洪峰负载测试脚本
+
+用临时 SQLite 数据库启动一个 uvicorn 进程（生产成本因子 12 rounds），持续请求与登录无关的接口
+（GET /health 和已认证的 GET /api/v1/decks），先单独测一段时间，再同时发起持续的并发登录，
+对比两段时间内无关接口的 p50/p99 延迟以及登录吞吐。
+
+默认分别以 PASSWORD_HASH_WORKERS=0（bcrypt 在事件循环中直接执行，即改动前的行为）和 2 运行。
+
+用法:
+    uv run python -m scripts.load_login_burst --workers 0 2 --logins 32 --duration 10
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+PORT = 8765
+BASE_URL = f"http://127.0.0.1:{PORT}"
+PASSWORD = "password123"
+
+
+def start_server(db_path: Path, workers: int, max_pending: int) -> subprocess.Popen:
+    """启动 uvicorn 进程"""
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite+aiosqlite:///{db_path}",
+        "DEBUG": "false",
+        "BCRYPT_ROUNDS": "12",
+        "PASSWORD_HASH_WORKERS": str(workers),
+        "PASSWORD_HASH_MAX_PENDING": str(max_pending),
+    }
+    env.pop("TESTING", None)
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(PORT), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient) -> None:
+    """等待服务启动"""
+    for _ in range(100):
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("服务启动超时")
+
+
+async def create_users(client: httpx.AsyncClient, count: int) -> tuple[list[str], str]:
+    """注册用户，返回用户名列表和第一个用户的访问令牌"""
+    usernames = [f"burst_{i}" for i in range(count)]
+    for username in usernames:
+        response = await client.post(
+            "/api/v1/auth/register",
+            json={
+                "username": username,
+                "email": f"{username}@example.com",
+                "nickname": "Burst",
+                "password": PASSWORD,
+            },
+        )
+        response.raise_for_status()
+    response = await client.post("/api/v1/auth/login", json={"username": usernames[0], "password": PASSWORD})
+    return usernames, response.json()["data"]["access_token"]
+
+
+async def probe(client: httpx.AsyncClient, token: str, stop: asyncio.Event) -> list[float]:
+    """持续请求无关接口，返回每次请求的延迟（毫秒）"""
+    latencies = []
+    headers = {"Authorization": f"Bearer {token}"}
+    while not stop.is_set():
+        for path in ("/health", "/api/v1/decks"):
+            begin = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            latencies.append((time.perf_counter() - begin) * 1000)
+            response.raise_for_status()
+        await asyncio.sleep(0.01)
+    return latencies
+
+
+async def login_loop(client: httpx.AsyncClient, username: str, stop: asyncio.Event, counts: dict[int, int]) -> None:
+    """持续登录，按状态码计数"""
+    while not stop.is_set():
+        response = await client.post("/api/v1/auth/login", json={"username": username, "password": PASSWORD})
+        counts[response.status_code] = counts.get(response.status_code, 0) + 1
+
+
+def percentile(values: list[float], q: int) -> float:
+    """返回第 q 百分位数"""
+    return statistics.quantiles(values, n=100)[q - 1]
+
+
+async def measure(logins: int, duration: float) -> dict[str, float]:
+    """分别测量空闲和登录洪峰期间无关接口的延迟"""
+    limits = httpx.Limits(max_connections=logins + 8)
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=60, limits=limits) as client:
+        await wait_ready(client)
+        usernames, token = await create_users(client, logins)
+
+        stop = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, token, stop))
+        await asyncio.sleep(duration)
+        stop.set()
+        idle = await probe_task
+
+        stop = asyncio.Event()
+        counts: dict[int, int] = {}
+        login_tasks = [asyncio.create_task(login_loop(client, username, stop, counts)) for username in usernames]
+        probe_task = asyncio.create_task(probe(client, token, stop))
+        await asyncio.sleep(duration)
+        stop.set()
+        burst = await probe_task
+        await asyncio.gather(*login_tasks)
+
+    return {
+        "idle_p50": percentile(idle, 50),
+        "idle_p99": percentile(idle, 99),
+        "burst_p50": percentile(burst, 50),
+        "burst_p99": percentile(burst, 99),
+        "logins_per_s": counts.get(200, 0) / duration,
+        "rejected": counts.get(429, 0),
+    }
+
+
+def main() -> None:
+    """主函数"""
+    parser = argparse.ArgumentParser(description="登录洪峰负载测试")
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 2], help="PASSWORD_HASH_WORKERS 取值")
+    parser.add_argument("--logins", type=int, default=32, help="并发登录的客户端数")
+    parser.add_argument("--max-pending", type=int, default=64, help="PASSWORD_HASH_MAX_PENDING")
+    parser.add_argument("--duration", type=float, default=10, help="每个阶段的持续时间（秒）")
+    args = parser.parse_args()
+
+    print(
+        f"{'workers':>7} | {'idle p50(ms)':>12} | {'idle p99(ms)':>12} | {'burst p50(ms)':>13} | "
+        f"{'burst p99(ms)':>13} | {'logins/s':>8} | {'429':>5}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in args.workers:
+            server = start_server(Path(tmp) / f"load_{workers}.db", workers, args.max_pending)
+            try:
+                results = asyncio.run(measure(args.logins, args.duration))
+            finally:
+                server.terminate()
+                server.wait()
+            print(
+                f"{workers:>7} | {results['idle_p50']:>12.1f} | {results['idle_p99']:>12.1f} | "
+                f"{results['burst_p50']:>13.1f} | {results['burst_p99']:>13.1f} | "
+                f"{results['logins_per_s']:>8.1f} | {results['rejected']:>5}"
+            )
+
+
+if __name__ == "__main__":
+    main()
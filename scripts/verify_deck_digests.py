@@ -0,0 +1,74 @@
+"""
+牌组内容摘要校验脚本
+
+对每个牌组全量重算内容摘要，与增量维护的摘要比较。
+使用 --fix 时把不一致或尚未初始化的摘要改为重算结果。
+
+用法:
+    uv run python -m scripts.verify_deck_digests [--deck-id ID] [--fix]
+"""
+
+import argparse
+import asyncio
+
+from loguru import logger
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal
+from app.models.deck import Deck
+from app.repositories.deck import DeckRepository
+
+
+async def verify(deck_id: str | None, fix: bool) -> int:
+    """
+    校验牌组内容摘要
+
+    Args:
+        deck_id: 只校验指定牌组（为空时校验全部）
+        fix: 是否修正不一致的摘要
+
+    Returns:
+        不一致的牌组数
+    """
+    async with AsyncSessionLocal() as db:
+        repo = DeckRepository(db)
+        query = select(Deck.id, Deck.name, Deck.content_digest).where(Deck.deleted_at.is_(None))
+        if deck_id:
+            query = query.where(Deck.id == deck_id)
+        decks = (await db.execute(query)).all()
+
+        mismatched = 0
+        for id, name, stored in decks:
+            expected = await repo.compute_content_digest(id)
+            if stored == expected:
+                continue
+            mismatched += 1
+            state = "未初始化" if stored is None else "不一致"
+            logger.warning(f"⚠️  牌组摘要{state}: {name} ({id})")
+            if fix:
+                deck = await repo.get_by_id_for_update(id)
+                if deck is not None:
+                    deck.content_digest = expected
+
+        if fix:
+            await db.commit()
+
+    logger.info(
+        f"✅ 共校验 {len(decks)} 个牌组，{mismatched} 个摘要需要修正{'（已修正）' if fix and mismatched else ''}"
+    )
+    return mismatched
+
+
+def main() -> None:
+    """主函数"""
+    parser = argparse.ArgumentParser(description="牌组内容摘要校验")
+    parser.add_argument("--deck-id", help="只校验指定牌组")
+    parser.add_argument("--fix", action="store_true", help="修正不一致的摘要")
+    args = parser.parse_args()
+
+    mismatched = asyncio.run(verify(args.deck_id, args.fix))
+    raise SystemExit(1 if mismatched and not args.fix else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,7 +14,7 @@ from sqlalchemy.pool import StaticPool
 
 # 确保所有模型被加载到元数据中
 from app import models  # noqa: F401
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models.base import Base
 
 try:
@@ -88,6 +88,55 @@ async def setup_db(db_engine):
     await db_engine.dispose()
 
 
+@pytest.fixture(scope="session", autouse=True)
+def export_storage_dir(tmp_path_factory):
+    """
+    将共享牌组导出文件写入临时目录（整个测试会话共享）
+    """
+    from app.core.config import settings
+
+    original = settings.EXPORT_STORAGE_DIR
+    settings.EXPORT_STORAGE_DIR = str(tmp_path_factory.mktemp("exports"))
+    yield settings.EXPORT_STORAGE_DIR
+    settings.EXPORT_STORAGE_DIR = original
+
+
+@pytest.fixture(scope="session", autouse=True)
+def job_session_factory(db_engine):
+    """
+    让后台任务 worker 使用测试数据库（整个测试会话共享）
+    """
+    from app.core.jobs import job_queue
+
+    original = job_queue.session_factory
+    job_queue.session_factory = async_sessionmaker(bind=db_engine, class_=AsyncSession, expire_on_commit=False)
+    yield job_queue.session_factory
+    job_queue.session_factory = original
+
+
+@pytest.fixture(scope="session", autouse=True)
+def download_counter_session_factory(job_session_factory):
+    """
+    让下载计数写入测试数据库（整个测试会话共享）
+    """
+    from app.services.download_counter import download_counter
+
+    original = download_counter.session_factory
+    download_counter.session_factory = job_session_factory
+    yield download_counter.session_factory
+    download_counter.session_factory = original
+
+
+@pytest.fixture(autouse=True)
+def clear_market_cache():
+    """
+    每个测试前清空牌组市场响应缓存（测试直接写库、清理数据时不经过服务层失效）
+    """
+    from app.core.response_cache import market_response_cache
+
+    market_response_cache.invalidate()
+
+
 @pytest.fixture(scope="class")
 async def db(db_engine):
     """
@@ -110,8 +159,14 @@ async def db(db_engine):
 
             # 按外键依赖顺序删除（不包括 users）
             tables = [
+                "jobs",
+                "note_tags",
+                "shared_deck_tags",
+                "tags",
                 "shared_deck_snapshots",
+                "shared_deck_search",
                 "shared_decks",
+                "review_daily_stats",
                 "review_logs",
                 "cards",
                 "notes",
@@ -142,6 +197,7 @@ async def override_get_db(db: AsyncSession):
             pass
 
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_read_db] = _override_get_db
     yield
     app.dependency_overrides.clear()
 
@@ -7,6 +7,8 @@ import uuid
 from fastapi import status
 from fastapi.testclient import TestClient
 
+from app.core import database
+
 
 class TestAdminAPI:
     """管理员 API 测试"""
@@ -97,6 +99,26 @@ class TestAdminAPI:
         assert "total_downloads" in data["data"]
         assert data["data"]["user_count"] >= 1  # 至少有管理员
 
+    def test_get_db_pools(self, client: TestClient, auth_headers: dict):
+        """测试获取数据库连接池指标"""
+        response = client.get("/api/v1/admin/db-pools", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        pools = response.json()["data"]
+        primary = next(pool for pool in pools if pool["name"] == "primary")
+        assert primary["backend"] == "sqlite"
+        assert 0 <= primary["saturation"] <= 1
+
+    def test_get_sqlite_writer_stats(self, client: TestClient, auth_headers: dict):
+        """测试获取 SQLite 写连接指标"""
+        response = client.get("/api/v1/admin/sqlite-writer", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["data"]
+        if database.sqlite_writer is None:
+            assert data is None
+        else:
+            assert data["batch_size"] == database.sqlite_writer.batch_size
+            assert data["waiting"] == 0
+
     def test_unauthorized_access(self, client: TestClient):
         """测试未授权访问"""
         response = client.get("/api/v1/admin/stats")
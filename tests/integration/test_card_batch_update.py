@@ -0,0 +1,130 @@
+"""
+批量更新卡片 API 集成测试
+"""
+
+import uuid
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+
+class TestCardBatchUpdateAPI:
+    """批量更新卡片测试"""
+
+    def test_batch_update_cards(self, client: TestClient, auth_headers: dict):
+        """测试批量更新卡片，各卡片可更新不同的字段"""
+        cards = self._create_cards(client, auth_headers, 3)
+        payload = {
+            "cards": [
+                {"id": cards[0]["id"], "state": "review", "queue": "review", "due": 1000, "interval": 3},
+                {"id": cards[1]["id"], "state": "learning", "queue": "learning", "due": 2000},
+                {"id": cards[2]["id"], "stability": 2.5, "difficulty": 5.0, "reps": 1},
+            ]
+        }
+
+        response = client.put("/api/v1/cards/batch", json=payload, headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        result = response.json()["data"]
+        assert result["updated_count"] == 3
+        assert [item["status"] for item in result["items"]] == ["updated"] * 3
+        card = self._get_card(client, auth_headers, cards[0]["id"])
+        assert (card["state"], card["queue"], card["due"], card["interval"]) == ("review", "review", 1000, 3)
+        assert card["updated_at"] == result["items"][0]["updated_at"]
+        card = self._get_card(client, auth_headers, cards[1]["id"])
+        assert (card["state"], card["due"], card["interval"]) == ("learning", 2000, 0)
+        card = self._get_card(client, auth_headers, cards[2]["id"])
+        assert (card["state"], card["stability"], card["reps"]) == ("new", 2.5, 1)
+
+    def test_batch_update_optimistic_concurrency(self, client: TestClient, auth_headers: dict):
+        """测试更新时间不一致的卡片返回冲突且不更新"""
+        cards = self._create_cards(client, auth_headers, 2)
+        response = client.put(
+            "/api/v1/cards/batch",
+            json={"cards": [{"id": cards[0]["id"], "due": 500, "expected_updated_at": cards[0]["updated_at"]}]},
+            headers=auth_headers,
+        )
+        new_updated_at = response.json()["data"]["items"][0]["updated_at"]
+
+        # 另一设备仍持有旧的更新时间
+        response = client.put(
+            "/api/v1/cards/batch",
+            json={
+                "cards": [
+                    {"id": cards[0]["id"], "due": 900, "expected_updated_at": cards[0]["updated_at"]},
+                    {"id": cards[1]["id"], "due": 900, "expected_updated_at": cards[1]["updated_at"]},
+                ]
+            },
+            headers=auth_headers,
+        )
+
+        result = response.json()["data"]
+        assert (result["updated_count"], result["conflict_count"]) == (1, 1)
+        assert result["items"][0] == {"id": cards[0]["id"], "status": "conflict", "updated_at": new_updated_at}
+        assert self._get_card(client, auth_headers, cards[0]["id"])["due"] == 500
+        assert self._get_card(client, auth_headers, cards[1]["id"])["due"] == 900
+
+        # 使用最新的更新时间可以继续更新
+        response = client.put(
+            "/api/v1/cards/batch",
+            json={"cards": [{"id": cards[0]["id"], "due": 900, "expected_updated_at": new_updated_at}]},
+            headers=auth_headers,
+        )
+        assert response.json()["data"]["updated_count"] == 1
+        assert self._get_card(client, auth_headers, cards[0]["id"])["due"] == 900
+
+    def test_batch_update_unknown_card(self, client: TestClient, auth_headers: dict):
+        """测试不存在的卡片返回 not_found，不影响其他卡片"""
+        cards = self._create_cards(client, auth_headers, 1)
+        missing_id = str(uuid.uuid4())
+
+        response = client.put(
+            "/api/v1/cards/batch",
+            json={"cards": [{"id": missing_id, "due": 1}, {"id": cards[0]["id"], "due": 1}]},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        result = response.json()["data"]
+        assert (result["updated_count"], result["not_found_count"]) == (1, 1)
+        assert result["items"][0] == {"id": missing_id, "status": "not_found", "updated_at": None}
+
+    def _get_card(self, client: TestClient, auth_headers: dict, card_id: str) -> dict:
+        """辅助方法：获取卡片详情"""
+        response = client.get(f"/api/v1/cards/{card_id}", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        return response.json()["data"]
+
+    def _create_cards(self, client: TestClient, auth_headers: dict, count: int) -> list[dict]:
+        """辅助方法：创建牌组、笔记类型和笔记，返回卡片列表"""
+        unique_id = uuid.uuid4().hex[:8]
+        response = client.post(
+            "/api/v1/note-models",
+            json={
+                "name": f"CardBatchModel_{unique_id}",
+                "fields_schema": [
+                    {"name": "Front", "ord": 0},
+                    {"name": "Back", "ord": 1},
+                ],
+                "css": "",
+            },
+            headers=auth_headers,
+        )
+        note_model_id = response.json()["data"]["id"]
+        response = client.post(
+            "/api/v1/decks",
+            json={"name": f"CardBatchDeck_{unique_id}", "note_model_id": note_model_id},
+            headers=auth_headers,
+        )
+        deck_id = response.json()["data"]["id"]
+        client.post(
+            "/api/v1/notes/batch",
+            json={
+                "deck_id": deck_id,
+                "note_model_id": note_model_id,
+                "notes": [{"fields": {"Front": f"Q{i}", "Back": f"A{i}"}} for i in range(count)],
+            },
+            headers=auth_headers,
+        )
+        response = client.get("/api/v1/cards", params={"deck_id": deck_id}, headers=auth_headers)
+        return response.json()["data"]["items"]
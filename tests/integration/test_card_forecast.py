@@ -0,0 +1,176 @@
+"""
+复习预测 API 集成测试
+"""
+
+import uuid
+from datetime import date, datetime, timedelta
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+class TestCardForecastAPI:
+    """复习预测测试"""
+
+    def test_forecast(self, client: TestClient):
+        """测试按天统计到期卡片（今天包含已逾期），新卡片按每日上限依次引入"""
+        headers = self._new_user_headers(client)
+        _, card_ids = self._create_cards(client, headers, 6)
+        start = self._today_start_ms()
+        self._schedule(
+            client,
+            headers,
+            {
+                card_ids[0]: ("review", start - 3 * DAY_MS),
+                card_ids[1]: ("learning", start + 60_000),
+                card_ids[2]: ("review", start + 2 * DAY_MS + 5),
+                card_ids[3]: ("review", start + 30 * DAY_MS),
+            },
+        )
+
+        data = self._forecast(client, headers, days=7, new_per_day=1)
+
+        assert [day["day"] for day in data["days"]] == [
+            (date.today() + timedelta(days=i)).isoformat() for i in range(7)
+        ]
+        assert [day["review_count"] for day in data["days"]] == [2, 0, 1, 0, 0, 0, 0]
+        assert [day["new_count"] for day in data["days"]] == [1, 1, 0, 0, 0, 0, 0]
+        assert data["overdue_count"] == 1
+        assert data["new_remaining"] == 2
+        assert data["decks"] is None
+
+        data = self._forecast(client, headers, days=31)
+        assert data["days"][30]["review_count"] == 1
+        assert data["days"][0]["new_count"] == 2
+
+    def test_by_deck(self, client: TestClient):
+        """测试按牌组分别返回和按牌组过滤"""
+        headers = self._new_user_headers(client)
+        deck_a, cards_a = self._create_cards(client, headers, 2)
+        deck_b, cards_b = self._create_cards(client, headers, 3)
+        start = self._today_start_ms()
+        self._schedule(client, headers, {cards_a[0]: ("review", start + DAY_MS), cards_b[0]: ("review", start)})
+
+        data = self._forecast(client, headers, days=3, by_deck=True)
+        decks = {deck["deck_id"]: deck for deck in data["decks"]}
+        assert decks[deck_a]["review_counts"] == [0, 1, 0]
+        assert decks[deck_a]["new_remaining"] == 1
+        assert decks[deck_b]["review_counts"] == [1, 0, 0]
+        assert decks[deck_b]["new_remaining"] == 2
+        assert [day["review_count"] for day in data["days"]] == [1, 1, 0]
+
+        data = self._forecast(client, headers, days=3, deck_id=deck_a)
+        assert [day["review_count"] for day in data["days"]] == [0, 1, 0]
+        assert data["new_remaining"] == 1
+
+    def test_cached_and_invalidated_on_card_writes(self, client: TestClient, auth_headers: dict):
+        """测试重复请求命中缓存，卡片变更后立即反映"""
+        headers = self._new_user_headers(client)
+        _, card_ids = self._create_cards(client, headers, 2)
+        before = self._cache_stats(client, auth_headers)
+
+        assert self._forecast(client, headers, days=5)["new_remaining"] == 2
+        assert self._forecast(client, headers, days=10)["new_remaining"] == 2
+        after = self._cache_stats(client, auth_headers)
+        assert after["misses"] - before["misses"] == 1
+        assert after["hits"] - before["hits"] == 1
+
+        client.post(f"/api/v1/cards/{card_ids[0]}/suspend", headers=headers)
+        assert self._forecast(client, headers, days=5)["new_remaining"] == 1
+
+        self._schedule(client, headers, {card_ids[1]: ("review", self._today_start_ms() + DAY_MS)})
+        data = self._forecast(client, headers, days=5)
+        assert data["new_remaining"] == 0
+        assert data["days"][1]["review_count"] == 1
+
+    def test_invalid_days(self, client: TestClient, auth_headers: dict):
+        """测试预测天数超出范围"""
+        for days in (0, 366):
+            response = client.get("/api/v1/cards/forecast", params={"days": days}, headers=auth_headers)
+            assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    @staticmethod
+    def _today_start_ms() -> int:
+        """辅助方法：今天零点（服务器本地时区）的毫秒时间戳"""
+        return int(datetime.combine(date.today(), datetime.min.time()).timestamp() * 1000)
+
+    @staticmethod
+    def _forecast(client: TestClient, headers: dict, **params) -> dict:
+        """辅助方法：获取复习预测"""
+        response = client.get("/api/v1/cards/forecast", params=params, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        return response.json()["data"]
+
+    @staticmethod
+    def _schedule(client: TestClient, headers: dict, schedule: dict[str, tuple[str, int]]) -> None:
+        """辅助方法：批量设置卡片的队列和到期时间"""
+        response = client.put(
+            "/api/v1/cards/batch",
+            json={
+                "cards": [
+                    {"id": card_id, "state": queue, "queue": queue, "due": due}
+                    for card_id, (queue, due) in schedule.items()
+                ]
+            },
+            headers=headers,
+        )
+        assert response.json()["data"]["updated_count"] == len(schedule)
+
+    @staticmethod
+    def _cache_stats(client: TestClient, auth_headers: dict) -> dict:
+        """辅助方法：获取复习预测缓存指标"""
+        response = client.get("/api/v1/admin/caches", headers=auth_headers)
+        return next(item for item in response.json()["data"] if item["name"] == "card_forecast")
+
+    @staticmethod
+    def _new_user_headers(client: TestClient) -> dict:
+        """辅助方法：注册新用户（预测按用户统计，避免与其他测试共享数据）"""
+        unique_id = uuid.uuid4().hex[:8]
+        client.post(
+            "/api/v1/auth/register",
+            json={
+                "username": f"forecast_{unique_id}",
+                "email": f"forecast_{unique_id}@example.com",
+                "nickname": "Forecast User",
+                "password": "password123",
+            },
+        )
+        response = client.post(
+            "/api/v1/auth/login",
+            json={"username": f"forecast_{unique_id}", "password": "password123"},
+        )
+        return {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+
+    @staticmethod
+    def _create_cards(client: TestClient, headers: dict, count: int) -> tuple[str, list[str]]:
+        """辅助方法：创建笔记类型、牌组和笔记，返回牌组 ID 和卡片 ID 列表"""
+        unique_id = uuid.uuid4().hex[:8]
+        response = client.post(
+            "/api/v1/note-models",
+            json={
+                "name": f"ForecastModel_{unique_id}",
+                "fields_schema": [{"name": "Front", "ord": 0}, {"name": "Back", "ord": 1}],
+                "css": "",
+            },
+            headers=headers,
+        )
+        note_model_id = response.json()["data"]["id"]
+        response = client.post(
+            "/api/v1/decks",
+            json={"name": f"ForecastDeck_{unique_id}", "note_model_id": note_model_id},
+            headers=headers,
+        )
+        deck_id = response.json()["data"]["id"]
+        client.post(
+            "/api/v1/notes/batch",
+            json={
+                "deck_id": deck_id,
+                "note_model_id": note_model_id,
+                "notes": [{"fields": {"Front": f"Q{i}", "Back": f"A{i}"}} for i in range(count)],
+            },
+            headers=headers,
+        )
+        response = client.get("/api/v1/cards", params={"deck_id": deck_id, "page_size": count}, headers=headers)
+        return deck_id, [item["id"] for item in response.json()["data"]["items"]]
@@ -0,0 +1,165 @@
+"""
+牌组内容摘要集成测试
+"""
+
+import json
+import uuid
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app.core.jobs import job_queue
+from app.models.deck import Deck
+from app.repositories.deck import DeckRepository
+
+
+class TestDeckContentDigestAPI:
+    """牌组内容摘要测试"""
+
+    def test_publish_version_detects_changes(self, client: TestClient, auth_headers: dict):
+        """测试发布新版本时根据摘要判断内容是否变化"""
+        deck_id, deck_name, note_model_id = self._create_deck(client, auth_headers)
+        note_id = self._create_note(client, auth_headers, deck_id, note_model_id, "Question")
+        shared_deck_id = self._publish(client, auth_headers, deck_id, deck_name)
+
+        # 内容未变化
+        response = client.post(f"/api/v1/shared-decks/{shared_deck_id}/publish-version", headers=auth_headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        # 修改后再改回原内容，摘要回到原值
+        self._update_note(client, auth_headers, note_id, "Changed")
+        self._update_note(client, auth_headers, note_id, "Question")
+        response = client.post(f"/api/v1/shared-decks/{shared_deck_id}/publish-version", headers=auth_headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        # 内容变化
+        self._update_note(client, auth_headers, note_id, "Changed")
+        response = client.post(f"/api/v1/shared-decks/{shared_deck_id}/publish-version", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"]["version"] == 2
+
+        # 删除笔记同样视为变化
+        self._create_note(client, auth_headers, deck_id, note_model_id, "Another")
+        client.post(f"/api/v1/shared-decks/{shared_deck_id}/publish-version", headers=auth_headers)
+        client.delete(f"/api/v1/notes/{note_id}", headers=auth_headers)
+        response = client.post(f"/api/v1/shared-decks/{shared_deck_id}/publish-version", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"]["note_count"] == 1
+
+    def test_incremental_digest_matches_full_rehash(self, client: TestClient, auth_headers: dict):
+        """测试各种写操作后增量摘要与全量重算结果一致"""
+        deck_id, _, note_model_id = self._create_deck(client, auth_headers)
+        other_deck_id, _, _ = self._create_deck(client, auth_headers, note_model_id=note_model_id)
+
+        note_id = self._create_note(client, auth_headers, deck_id, note_model_id, "Single")
+        moved_id = self._create_note(client, auth_headers, deck_id, note_model_id, "Moved")
+        client.post(
+            "/api/v1/notes/batch",
+            json={
+                "deck_id": deck_id,
+                "note_model_id": note_model_id,
+                "notes": [{"fields": {"Front": f"Batch {i}", "Back": "x"}, "tags": ["b"]} for i in range(5)],
+            },
+            headers=auth_headers,
+        )
+        client.post(
+            "/api/v1/notes/import",
+            params={"deck_id": deck_id, "note_model_id": note_model_id},
+            content="\n".join(json.dumps({"fields": {"Front": f"Import {i}", "Back": "y"}}) for i in range(3)),
+            headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+        )
+        client.put(f"/api/v1/notes/{note_id}", json={"tags": ["edited"]}, headers=auth_headers)
+        client.put(f"/api/v1/notes/{moved_id}", json={"deck_id": other_deck_id}, headers=auth_headers)
+        client.delete(f"/api/v1/notes/{note_id}", headers=auth_headers)
+
+        for id in (deck_id, other_deck_id):
+            stored, expected = client.portal.call(self._load_digests, id)
+            assert stored == expected
+
+    def test_uninitialized_digest_computed_on_publish(self, client: TestClient, auth_headers: dict):
+        """测试摘要为空的牌组在发布时全量计算"""
+        deck_id, deck_name, note_model_id = self._create_deck(client, auth_headers)
+        self._create_note(client, auth_headers, deck_id, note_model_id, "Legacy")
+        client.portal.call(self._clear_digest, deck_id)
+
+        self._publish(client, auth_headers, deck_id, deck_name)
+
+        stored, expected = client.portal.call(self._load_digests, deck_id)
+        assert stored == expected
+
+    @staticmethod
+    async def _load_digests(deck_id: str) -> tuple[str | None, str]:
+        """辅助方法：读取保存的摘要和全量重算的摘要"""
+        async with job_queue.session_factory() as session:
+            deck = await session.get(Deck, deck_id)
+            assert deck is not None
+            return deck.content_digest, await DeckRepository(session).compute_content_digest(deck_id)
+
+    @staticmethod
+    async def _clear_digest(deck_id: str) -> None:
+        """辅助方法：模拟迁移前创建、摘要未初始化的牌组"""
+        async with job_queue.session_factory() as session:
+            await session.execute(update(Deck).where(Deck.id == deck_id).values(content_digest=None))
+            await session.commit()
+
+    def _create_deck(
+        self, client: TestClient, auth_headers: dict, note_model_id: str | None = None
+    ) -> tuple[str, str, str]:
+        """辅助方法：创建牌组（以及笔记类型），返回 (牌组ID, 牌组名称, 笔记类型ID)"""
+        unique_id = uuid.uuid4().hex[:8]
+
+        if note_model_id is None:
+            response = client.post(
+                "/api/v1/note-models",
+                json={
+                    "name": f"DigestTestModel_{unique_id}",
+                    "fields_schema": [
+                        {"name": "Front", "ord": 0},
+                        {"name": "Back", "ord": 1},
+                    ],
+                    "css": "",
+                },
+                headers=auth_headers,
+            )
+            note_model_id = response.json()["data"]["id"]
+
+            client.post(
+                f"/api/v1/note-models/{note_model_id}/templates",
+                json={"name": "Card 1", "question_template": "{{Front}}", "answer_template": "{{Back}}"},
+                headers=auth_headers,
+            )
+
+        deck_name = f"DigestTestDeck_{unique_id}"
+        response = client.post(
+            "/api/v1/decks",
+            json={"name": deck_name, "note_model_id": note_model_id},
+            headers=auth_headers,
+        )
+        return response.json()["data"]["id"], deck_name, note_model_id
+
+    def _create_note(self, client: TestClient, auth_headers: dict, deck_id: str, note_model_id: str, front: str) -> str:
+        """辅助方法：创建笔记"""
+        response = client.post(
+            "/api/v1/notes",
+            json={"deck_id": deck_id, "note_model_id": note_model_id, "fields": {"Front": front, "Back": "A"}},
+            headers=auth_headers,
+        )
+        return response.json()["data"]["id"]
+
+    def _update_note(self, client: TestClient, auth_headers: dict, note_id: str, front: str) -> None:
+        """辅助方法：修改笔记正面内容"""
+        response = client.put(
+            f"/api/v1/notes/{note_id}", json={"fields": {"Front": front, "Back": "A"}}, headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+    def _publish(self, client: TestClient, auth_headers: dict, deck_id: str, deck_name: str) -> str:
+        """辅助方法：以牌组名称为标题发布牌组，返回共享牌组 ID"""
+        response = client.post(
+            f"/api/v1/decks/{deck_id}/publish",
+            json={"slug": f"digest-test-{uuid.uuid4().hex[:8]}", "title": deck_name},
+            headers=auth_headers,
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        return response.json()["data"]["id"]
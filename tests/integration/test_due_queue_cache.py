@@ -0,0 +1,176 @@
+"""
+到期队列缓存集成测试
+"""
+
+import uuid
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.note import Card
+
+
+class TestDueQueueCacheAPI:
+    """到期队列缓存测试"""
+
+    def test_hit_and_miss_metrics(self, client: TestClient, auth_headers: dict):
+        """测试首次获取构造索引（未命中），之后命中缓存"""
+        headers = self._new_user_headers(client)
+        deck_id, card_ids = self._create_cards(client, headers, 3)
+        before = self._cache_stats(client, auth_headers)
+
+        first = self._due_ids(client, headers)
+        second = self._due_ids(client, headers)
+
+        after = self._cache_stats(client, auth_headers)
+        assert first == second == sorted(card_ids)
+        assert after["misses"] - before["misses"] == 1
+        assert after["hits"] - before["hits"] == 1
+        assert after["size"] >= 1
+
+    def test_card_updates_are_reflected(self, client: TestClient):
+        """测试更新、暂停、恢复卡片后到期队列立即反映变化"""
+        headers = self._new_user_headers(client)
+        _, card_ids = self._create_cards(client, headers, 3)
+        a, b, c = sorted(card_ids)
+        assert self._due_ids(client, headers) == [a, b, c]
+
+        client.put(
+            "/api/v1/cards/batch",
+            json={
+                "cards": [
+                    {"id": a, "state": "review", "queue": "review", "due": 500},
+                    {"id": b, "state": "learning", "queue": "learning", "due": 900},
+                ]
+            },
+            headers=headers,
+        )
+        assert self._due_ids(client, headers) == [b, c, a]
+        assert self._due_ids(client, headers, due_before=100) == [c]
+
+        client.put(f"/api/v1/cards/{a}", json={"due": 50}, headers=headers)
+        assert self._due_ids(client, headers, due_before=100) == [c, a]
+
+        client.post(f"/api/v1/cards/{b}/suspend", headers=headers)
+        assert self._due_ids(client, headers) == [c, a]
+        client.post(f"/api/v1/cards/{b}/unsuspend", headers=headers)
+        assert self._due_ids(client, headers) == [c, a, b]
+
+    def test_notes_and_decks(self, client: TestClient):
+        """测试新增、移动和删除笔记后到期队列立即反映变化"""
+        headers = self._new_user_headers(client)
+        deck_id, card_ids = self._create_cards(client, headers, 2)
+        other_deck_id = self._create_deck(client, headers)
+        assert self._due_ids(client, headers, deck_id=deck_id) == sorted(card_ids)
+
+        note = client.get(f"/api/v1/cards/{card_ids[0]}", headers=headers).json()["data"]
+        client.put(f"/api/v1/notes/{note['note_id']}", json={"deck_id": other_deck_id}, headers=headers)
+        assert self._due_ids(client, headers, deck_id=deck_id) == [card_ids[1]]
+        assert self._due_ids(client, headers, deck_id=other_deck_id) == [card_ids[0]]
+
+        client.delete(f"/api/v1/notes/{note['note_id']}", headers=headers)
+        assert self._due_ids(client, headers) == [card_ids[1]]
+
+        new_card_ids = self._create_cards(client, headers, 1, deck_id=deck_id)[1]
+        assert self._due_ids(client, headers, deck_id=deck_id) == sorted([card_ids[1], *new_card_ids])
+
+    async def test_stale_index_falls_back(self, client: TestClient, db: AsyncSession):
+        """测试绕过写入路径修改卡片后，校验发现索引过期并回退为数据库查询"""
+        headers = self._new_user_headers(client)
+        _, card_ids = self._create_cards(client, headers, 2)
+        a, b = sorted(card_ids)
+        assert self._due_ids(client, headers) == [a, b]
+
+        await db.execute(update(Card).where(Card.id == a).values(queue="suspended"))
+        await db.flush()
+
+        assert self._due_ids(client, headers) == [b]
+        # 丢弃缓存后重新构造的索引与数据库一致
+        assert self._due_ids(client, headers) == [b]
+
+    def test_cache_stats_requires_superuser(self, client: TestClient):
+        """测试普通用户不能查看缓存指标"""
+        headers = self._new_user_headers(client)
+
+        response = client.get("/api/v1/admin/caches", headers=headers)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    @staticmethod
+    def _due_ids(client: TestClient, headers: dict, **params) -> list[str]:
+        """辅助方法：获取待复习卡片 ID 列表"""
+        response = client.get("/api/v1/cards/due", params=params, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        return [card["id"] for card in response.json()["data"]]
+
+    @staticmethod
+    def _cache_stats(client: TestClient, auth_headers: dict) -> dict:
+        """辅助方法：获取到期队列缓存指标"""
+        response = client.get("/api/v1/admin/caches", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        return next(item for item in response.json()["data"] if item["name"] == "due_queue")
+
+    @staticmethod
+    def _new_user_headers(client: TestClient) -> dict:
+        """辅助方法：注册新用户（到期队列按用户缓存，避免与其他测试共享数据）"""
+        unique_id = uuid.uuid4().hex[:8]
+        client.post(
+            "/api/v1/auth/register",
+            json={
+                "username": f"dueuser_{unique_id}",
+                "email": f"due_{unique_id}@example.com",
+                "nickname": "Due User",
+                "password": "password123",
+            },
+        )
+        response = client.post(
+            "/api/v1/auth/login",
+            json={"username": f"dueuser_{unique_id}", "password": "password123"},
+        )
+        return {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+
+    @staticmethod
+    def _create_deck(client: TestClient, headers: dict) -> str:
+        """辅助方法：创建笔记类型和绑定它的牌组，返回牌组 ID"""
+        unique_id = uuid.uuid4().hex[:8]
+        response = client.post(
+            "/api/v1/note-models",
+            json={
+                "name": f"DueModel_{unique_id}",
+                "fields_schema": [{"name": "Front", "ord": 0}, {"name": "Back", "ord": 1}],
+                "css": "",
+            },
+            headers=headers,
+        )
+        note_model_id = response.json()["data"]["id"]
+        response = client.post(
+            "/api/v1/decks",
+            json={"name": f"DueDeck_{unique_id}", "note_model_id": note_model_id},
+            headers=headers,
+        )
+        return response.json()["data"]["id"]
+
+    def _create_cards(
+        self, client: TestClient, headers: dict, count: int, deck_id: str | None = None
+    ) -> tuple[str, list[str]]:
+        """辅助方法：批量创建笔记，返回牌组 ID 和新卡片 ID 列表"""
+        deck_id = deck_id or self._create_deck(client, headers)
+        deck = client.get(f"/api/v1/decks/{deck_id}", headers=headers).json()["data"]
+        before = self._deck_card_ids(client, headers, deck_id)
+        client.post(
+            "/api/v1/notes/batch",
+            json={
+                "deck_id": deck_id,
+                "note_model_id": deck["note_model_id"],
+                "notes": [{"fields": {"Front": f"Q{uuid.uuid4().hex}", "Back": "A"}} for _ in range(count)],
+            },
+            headers=headers,
+        )
+        return deck_id, sorted(self._deck_card_ids(client, headers, deck_id) - before)
+
+    @staticmethod
+    def _deck_card_ids(client: TestClient, headers: dict, deck_id: str) -> set[str]:
+        """辅助方法：获取牌组内的卡片 ID"""
+        response = client.get("/api/v1/cards", params={"deck_id": deck_id, "page_size": 100}, headers=headers)
+        return {item["id"] for item in response.json()["data"]["items"]}
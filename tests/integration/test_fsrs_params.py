@@ -0,0 +1,160 @@
+"""
+个人 FSRS 参数 API 集成测试
+"""
+
+import random
+import time
+import uuid
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+# 每张卡片的复习日（相对首次复习）
+REVIEW_DAYS = (0, 1, 3, 7, 15, 30)
+
+
+class TestFSRSParamsAPI:
+    """个人 FSRS 参数测试"""
+
+    def test_default_params(self, client: TestClient):
+        """测试尚未优化时返回默认参数（与前端一致，各版本均为 FSRS-6 默认参数）"""
+        headers = self._new_user_headers(client)
+
+        response = client.get("/api/v1/fsrs/params", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["data"]
+        assert data["scheduler"] == "fsrs_v5"
+        assert data["is_default"] is True
+        assert len(data["weights"]) == 21
+
+        response = client.get("/api/v1/fsrs/params", params={"scheduler": "fsrs_v4"}, headers=headers)
+        assert response.json()["data"]["weights"] == data["weights"]
+
+    def test_invalid_scheduler(self, client: TestClient, auth_headers: dict):
+        """测试非 FSRS 调度器被拒绝"""
+        response = client.get("/api/v1/fsrs/params", params={"scheduler": "sm2"}, headers=auth_headers)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+        response = client.post("/api/v1/fsrs/params/optimize", json={"scheduler": "sm2"}, headers=auth_headers)
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    def test_optimize_not_enough_reviews(self, client: TestClient):
+        """测试有效复习记录不足时任务失败"""
+        headers = self._new_user_headers(client)
+        self._upload_reviews(client, headers, self._create_cards(client, headers, 2))
+
+        response = client.post("/api/v1/fsrs/params/optimize", json={}, headers=headers)
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        job = self._wait_for_job(client, headers, response.json()["data"]["id"])
+
+        assert job["status"] == "failed"
+        assert "有效复习记录不足" in job["error"]
+        assert client.get("/api/v1/fsrs/params", headers=headers).json()["data"]["is_default"] is True
+
+    def test_optimize(self, client: TestClient):
+        """测试由复习日志优化参数并保存"""
+        headers = self._new_user_headers(client)
+        card_ids = self._create_cards(client, headers, 40)
+        self._upload_reviews(client, headers, card_ids)
+
+        response = client.post("/api/v1/fsrs/params/optimize", json={"scheduler": "fsrs_v5"}, headers=headers)
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        job = self._wait_for_job(client, headers, response.json()["data"]["id"])
+
+        assert job["status"] == "succeeded", job["error"]
+        assert job["progress_total"] > 0
+        assert job["progress_done"] == job["progress_total"]
+        params = client.get("/api/v1/fsrs/params", headers=headers).json()["data"]
+        assert params["is_default"] is False
+        assert params["weights"] == job["result"]["weights"]
+        assert len(params["weights"]) == 21
+        assert params["sample_count"] == len(card_ids) * (len(REVIEW_DAYS) - 1)
+        assert params["loss_after"] <= params["loss_before"]
+        # 其他版本的参数不受影响
+        response = client.get("/api/v1/fsrs/params", params={"scheduler": "fsrs_v4"}, headers=headers)
+        assert response.json()["data"]["is_default"] is True
+
+    def _wait_for_job(self, client: TestClient, headers: dict, job_id: str, timeout: float = 30.0) -> dict:
+        """辅助方法：轮询任务直到结束"""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = client.get(f"/api/v1/jobs/{job_id}", headers=headers).json()["data"]
+            if job["status"] in ("succeeded", "failed", "cancelled"):
+                return job
+            assert time.monotonic() < deadline, f"任务未在 {timeout}s 内完成: {job}"
+            time.sleep(0.02)
+
+    @staticmethod
+    def _upload_reviews(client: TestClient, headers: dict, card_ids: list[str]) -> None:
+        """辅助方法：为每张卡片上传一组从新卡片开始的复习日志（约 20% 为 Again）"""
+        rng = random.Random(0)
+        start = int(time.time() * 1000) - 60 * DAY_MS
+        reviews = [
+            {
+                "id": str(uuid.uuid4()),
+                "card_id": card_id,
+                "review_time": start + day * DAY_MS,
+                "rating": 1 if rng.random() < 0.2 else rng.choice([2, 3, 3, 3, 4]),
+                "prev_state": "new" if day == 0 else "review",
+            }
+            for card_id in card_ids
+            for day in REVIEW_DAYS
+        ]
+        response = client.post("/api/v1/review-logs/batch", json={"reviews": reviews}, headers=headers)
+        assert response.json()["data"]["created_count"] == len(reviews)
+
+    @staticmethod
+    def _new_user_headers(client: TestClient) -> dict:
+        """辅助方法：注册新用户（复习日志按用户优化，避免与其他测试共享数据）"""
+        unique_id = uuid.uuid4().hex[:8]
+        client.post(
+            "/api/v1/auth/register",
+            json={
+                "username": f"fsrsuser_{unique_id}",
+                "email": f"fsrs_{unique_id}@example.com",
+                "nickname": "FSRS User",
+                "password": "password123",
+            },
+        )
+        response = client.post(
+            "/api/v1/auth/login",
+            json={"username": f"fsrsuser_{unique_id}", "password": "password123"},
+        )
+        return {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+
+    @staticmethod
+    def _create_cards(client: TestClient, headers: dict, count: int) -> list[str]:
+        """辅助方法：创建牌组、笔记类型和笔记，返回卡片 ID 列表"""
+        unique_id = uuid.uuid4().hex[:8]
+        response = client.post(
+            "/api/v1/note-models",
+            json={
+                "name": f"FSRSModel_{unique_id}",
+                "fields_schema": [
+                    {"name": "Front", "ord": 0},
+                    {"name": "Back", "ord": 1},
+                ],
+                "css": "",
+            },
+            headers=headers,
+        )
+        note_model_id = response.json()["data"]["id"]
+        response = client.post(
+            "/api/v1/decks",
+            json={"name": f"FSRSDeck_{unique_id}", "note_model_id": note_model_id},
+            headers=headers,
+        )
+        deck_id = response.json()["data"]["id"]
+        client.post(
+            "/api/v1/notes/batch",
+            json={
+                "deck_id": deck_id,
+                "note_model_id": note_model_id,
+                "notes": [{"fields": {"Front": f"Q{i}", "Back": f"A{i}"}} for i in range(count)],
+            },
+            headers=headers,
+        )
+        response = client.get("/api/v1/cards", params={"deck_id": deck_id, "page_size": count}, headers=headers)
+        return [item["id"] for item in response.json()["data"]["items"]]
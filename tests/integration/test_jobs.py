@@ -0,0 +1,320 @@
+"""
+后台任务 API 集成测试
+"""
+
+import asyncio
+import time
+import uuid
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.jobs import JobContext, job_queue
+from app.models.job import Job
+from app.services import job_handlers
+from app.services.job import JobService
+
+
+class TestJobAPI:
+    """后台任务测试"""
+
+    def test_notes_batch_in_background(self, client: TestClient, auth_headers: dict):
+        """测试批量创建笔记作为后台任务执行"""
+        deck_id, note_model_id = self._create_deck_and_model(client, auth_headers)
+
+        response = client.post(
+            "/api/v1/notes/batch",
+            params={"background": "true"},
+            json={
+                "deck_id": deck_id,
+                "note_model_id": note_model_id,
+                "notes": [{"fields": {"Front": f"Q{i}", "Back": f"A{i}"}} for i in range(3)],
+            },
+            headers=auth_headers,
+        )
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        job = response.json()["data"]
+        assert job["type"] == "create_notes_batch"
+        assert job["status"] in ("pending", "running", "succeeded")
+
+        job = self._wait_for_job(client, auth_headers, job["id"])
+        assert job["status"] == "succeeded"
+        assert job["result"]["created_count"] == 3
+        assert job["progress_done"] == job["progress_total"] == 3
+
+        notes = client.get("/api/v1/notes", params={"deck_id": deck_id}, headers=auth_headers).json()["data"]
+        assert notes["total"] == 3
+
+    def test_notes_batch_dedupes_across_chunks(
+        self, client: TestClient, auth_headers: dict, monkeypatch: pytest.MonkeyPatch
+    ):
+        """测试后台批量创建按块写入，跨块及与牌组已有笔记的重复均被跳过"""
+        monkeypatch.setattr(job_handlers, "NOTES_BATCH_JOB_CHUNK_SIZE", 2)
+        deck_id, note_model_id = self._create_deck_and_model(client, auth_headers)
+        client.post(
+            "/api/v1/notes/batch",
+            json={
+                "deck_id": deck_id,
+                "note_model_id": note_model_id,
+                "notes": [{"fields": {"Front": "Q3", "Back": "A3"}}],
+            },
+            headers=auth_headers,
+        )
+
+        response = client.post(
+            "/api/v1/notes/batch",
+            params={"background": "true"},
+            json={
+                "deck_id": deck_id,
+                "note_model_id": note_model_id,
+                "notes": [{"fields": {"Front": f"Q{i}", "Back": f"A{i}"}} for i in [0, 1, 0, 2, 3, 4]],
+            },
+            headers=auth_headers,
+        )
+
+        job = self._wait_for_job(client, auth_headers, response.json()["data"]["id"])
+        assert job["status"] == "succeeded"
+        assert job["result"]["created_count"] == 4
+        assert job["result"]["skipped_count"] == 2
+        assert job["progress_done"] == job["progress_total"] == 5
+
+        notes = client.get("/api/v1/notes", params={"deck_id": deck_id}, headers=auth_headers).json()["data"]
+        assert notes["total"] == 5
+
+    def test_publish_in_background(self, client: TestClient, auth_headers: dict):
+        """测试发布牌组作为后台任务执行"""
+        deck_id, note_model_id = self._create_deck_and_model(client, auth_headers)
+        client.post(
+            "/api/v1/notes",
+            json={"deck_id": deck_id, "note_model_id": note_model_id, "fields": {"Front": "Q", "Back": "A"}},
+            headers=auth_headers,
+        )
+        slug = f"job-test-{uuid.uuid4().hex[:8]}"
+
+        response = client.post(
+            f"/api/v1/decks/{deck_id}/publish",
+            params={"background": "true"},
+            json={"slug": slug, "title": "Job Test"},
+            headers=auth_headers,
+        )
+        assert response.status_code == status.HTTP_202_ACCEPTED
+
+        job = self._wait_for_job(client, auth_headers, response.json()["data"]["id"])
+        assert job["status"] == "succeeded"
+        assert job["result"]["slug"] == slug
+        assert client.get(f"/api/v1/shared-decks/{slug}").status_code == status.HTTP_200_OK
+
+    def test_failed_job_records_error(self, client: TestClient, auth_headers: dict):
+        """测试任务失败时记录错误信息"""
+        response = client.post(
+            "/api/v1/decks/non-existent-deck-id/publish",
+            params={"background": "true"},
+            json={"slug": f"job-fail-{uuid.uuid4().hex[:8]}", "title": "Job Fail"},
+            headers=auth_headers,
+        )
+
+        job = self._wait_for_job(client, auth_headers, response.json()["data"]["id"])
+        assert job["status"] == "failed"
+        assert job["error"] == "牌组不存在"
+
+    def test_cancel_running_job(self, client: TestClient, auth_headers: dict, monkeypatch: pytest.MonkeyPatch):
+        """测试取消执行中的任务"""
+
+        async def wait_for_cancel(ctx: JobContext) -> dict:
+            ctx.set_progress(1, 10)
+            while True:
+                ctx.check_cancelled()
+                await asyncio.sleep(0.01)
+
+        monkeypatch.setitem(job_queue._handlers, "test_wait", wait_for_cancel)
+        job_id = self._submit_job(client, auth_headers, "test_wait")
+
+        job = self._wait_for_job(client, auth_headers, job_id, until={"running"})
+        deadline = time.monotonic() + 10
+        while job["progress_done"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+            job = client.get(f"/api/v1/jobs/{job_id}", headers=auth_headers).json()["data"]
+        assert job["status"] == "running"
+        assert job["progress_done"] == 1
+        assert job["progress_total"] == 10
+
+        response = client.post(f"/api/v1/jobs/{job_id}/cancel", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"]["cancel_requested"] is True
+
+        job = self._wait_for_job(client, auth_headers, job_id)
+        assert job["status"] == "cancelled"
+
+        response = client.post(f"/api/v1/jobs/{job_id}/cancel", headers=auth_headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_cancel_pending_job(self, client: TestClient, auth_headers: dict):
+        """测试取消尚未开始的任务"""
+        client.portal.call(job_queue.stop)
+        try:
+            job_id = self._submit_job(client, auth_headers, "publish_new_version", {"shared_deck_id": "x"})
+
+            response = client.post(f"/api/v1/jobs/{job_id}/cancel", headers=auth_headers)
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json()["data"]["status"] == "cancelled"
+        finally:
+            client.portal.call(job_queue.start)
+
+    def test_cancel_between_load_and_claim(
+        self, client: TestClient, auth_headers: dict, monkeypatch: pytest.MonkeyPatch
+    ):
+        """测试 worker 读取任务后、认领前被取消时不执行任务，也不覆盖取消状态"""
+        executed: list[str] = []
+
+        async def record(ctx: JobContext) -> dict:
+            executed.append(ctx.job.id)
+            return {}
+
+        monkeypatch.setitem(job_queue._handlers, "test_record", record)
+        user_id = self._current_user_id(client, auth_headers)
+        client.portal.call(job_queue.stop)
+        try:
+            job_id = self._submit_job(client, auth_headers, "test_record")
+            session_factory = job_queue.session_factory
+
+            def racing_session():
+                session = session_factory()
+                load = session.get
+
+                async def get(entity, ident, **kwargs):
+                    loaded = await load(entity, ident, **kwargs)
+                    # 取消接口已提交、尚未通知 worker
+                    with monkeypatch.context() as m:
+                        m.setattr(job_queue, "request_cancel", lambda job_id: None)
+                        async with session_factory() as other:
+                            await JobService(other).cancel_job(job_id, user_id)
+                    return loaded
+
+                session.get = get
+                return session
+
+            monkeypatch.setattr(job_queue, "session_factory", racing_session)
+            client.portal.call(job_queue._run, job_id)
+            monkeypatch.setattr(job_queue, "session_factory", session_factory)
+        finally:
+            client.portal.call(job_queue.start)
+
+        job = client.get(f"/api/v1/jobs/{job_id}", headers=auth_headers).json()["data"]
+        assert job["status"] == "cancelled"
+        assert job["attempts"] == 0
+        assert executed == []
+
+    def test_recover_interrupted_jobs(self, client: TestClient, auth_headers: dict):
+        """测试重启时恢复中断的任务，超过最大执行次数的任务标记失败"""
+        deck_id, note_model_id = self._create_deck_and_model(client, auth_headers)
+        payload = {
+            "deck_id": deck_id,
+            "note_model_id": note_model_id,
+            "notes": [{"fields": {"Front": "Recovered", "Back": "x"}}],
+        }
+
+        client.portal.call(job_queue.stop)
+        interrupted_id = self._insert_running_job(client, auth_headers, payload, attempts=1)
+        exhausted_id = self._insert_running_job(client, auth_headers, payload, attempts=settings.JOB_MAX_ATTEMPTS)
+        assert client.portal.call(job_queue.start) == 1
+
+        job = self._wait_for_job(client, auth_headers, interrupted_id)
+        assert job["status"] == "succeeded"
+        assert job["attempts"] == 2
+        assert job["result"]["created_count"] == 1
+
+        job = client.get(f"/api/v1/jobs/{exhausted_id}", headers=auth_headers).json()["data"]
+        assert job["status"] == "failed"
+
+    def test_list_jobs(self, client: TestClient, auth_headers: dict):
+        """测试任务列表"""
+        response = client.get("/api/v1/jobs", params={"status": "succeeded"}, headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        items = response.json()["data"]["items"]
+        assert items
+        assert all(item["status"] == "succeeded" for item in items)
+
+    def test_get_job_not_found(self, client: TestClient, auth_headers: dict):
+        """测试获取不存在的任务"""
+        response = client.get("/api/v1/jobs/non-existent-job-id", headers=auth_headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def _wait_for_job(
+        self,
+        client: TestClient,
+        auth_headers: dict,
+        job_id: str,
+        until: set[str] | None = None,
+        timeout: float = 10.0,
+    ) -> dict:
+        """辅助方法：轮询任务直到进入指定状态（默认为任意结束状态）"""
+        until = until or {"succeeded", "failed", "cancelled"}
+        deadline = time.monotonic() + timeout
+        while True:
+            job = client.get(f"/api/v1/jobs/{job_id}", headers=auth_headers).json()["data"]
+            if job["status"] in until:
+                return job
+            assert time.monotonic() < deadline, f"任务未在 {timeout}s 内完成: {job}"
+            time.sleep(0.02)
+
+    def _current_user_id(self, client: TestClient, auth_headers: dict) -> str:
+        """辅助方法：获取当前用户 ID"""
+        return client.get("/api/v1/auth/me", headers=auth_headers).json()["data"]["id"]
+
+    def _submit_job(self, client: TestClient, auth_headers: dict, job_type: str, payload: dict | None = None) -> str:
+        """辅助方法：在应用事件循环中直接提交任务"""
+        user_id = self._current_user_id(client, auth_headers)
+
+        async def submit() -> str:
+            async with job_queue.session_factory() as session:
+                job = await JobService(session).submit_job(user_id, job_type, payload or {})
+                return job.id
+
+        return client.portal.call(submit)
+
+    def _insert_running_job(self, client: TestClient, auth_headers: dict, payload: dict, attempts: int) -> str:
+        """辅助方法：模拟服务中断时遗留的 running 任务"""
+        user_id = self._current_user_id(client, auth_headers)
+
+        async def insert() -> str:
+            async with job_queue.session_factory() as session:
+                job = Job(
+                    user_id=user_id, type="create_notes_batch", status="running", payload=payload, attempts=attempts
+                )
+                session.add(job)
+                await session.commit()
+                return job.id
+
+        return client.portal.call(insert)
+
+    def _create_deck_and_model(self, client: TestClient, auth_headers: dict) -> tuple[str, str]:
+        """辅助方法：创建牌组和笔记类型"""
+        unique_id = uuid.uuid4().hex[:8]
+
+        response = client.post(
+            "/api/v1/note-models",
+            json={
+                "name": f"JobTestModel_{unique_id}",
+                "fields_schema": [
+                    {"name": "Front", "ord": 0},
+                    {"name": "Back", "ord": 1},
+                ],
+                "css": "",
+            },
+            headers=auth_headers,
+        )
+        note_model_id = response.json()["data"]["id"]
+
+        response = client.post(
+            "/api/v1/decks",
+            json={"name": f"JobTestDeck_{unique_id}", "note_model_id": note_model_id},
+            headers=auth_headers,
+        )
+        deck_id = response.json()["data"]["id"]
+
+        return deck_id, note_model_id
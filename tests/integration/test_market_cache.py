@@ -0,0 +1,189 @@
+"""
+牌组市场响应缓存集成测试
+"""
+
+import uuid
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.response_cache import market_response_cache
+from app.services.download_counter import download_counter
+
+
+class TestMarketCacheAPI:
+    """牌组市场响应缓存测试"""
+
+    def test_detail_cache_headers(self, client: TestClient, auth_headers: dict):
+        """测试详情接口返回 ETag、Last-Modified 和 Cache-Control"""
+        slug = self._create_shared_deck(client, auth_headers)
+
+        response = client.get(f"/api/v1/shared-decks/{slug}")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"]["slug"] == slug
+        assert response.headers["etag"].startswith('"')
+        assert response.headers["last-modified"].endswith("GMT")
+        assert response.headers["cache-control"] == f"public, max-age={market_response_cache.max_age}"
+
+    def test_conditional_requests(self, client: TestClient, auth_headers: dict):
+        """测试 If-None-Match / If-Modified-Since 命中时返回 304，If-None-Match 优先"""
+        slug = self._create_shared_deck(client, auth_headers)
+        first = client.get(f"/api/v1/shared-decks/{slug}")
+        etag, last_modified = first.headers["etag"], first.headers["last-modified"]
+
+        response = client.get(f"/api/v1/shared-decks/{slug}", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["etag"] == etag
+        assert response.content == b""
+
+        response = client.get(f"/api/v1/shared-decks/{slug}", headers={"If-Modified-Since": last_modified})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        response = client.get(
+            f"/api/v1/shared-decks/{slug}",
+            headers={"If-None-Match": '"stale"', "If-Modified-Since": last_modified},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == first.content
+
+    def test_list_relies_on_etag_only(self, client: TestClient, auth_headers: dict):
+        """测试列表不带 Last-Modified，只带 If-Modified-Since 时不返回 304"""
+        self._create_shared_deck(client, auth_headers)
+        first = client.get("/api/v1/shared-decks")
+        assert "last-modified" not in first.headers
+
+        response = client.get("/api/v1/shared-decks", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+        assert response.status_code == status.HTTP_200_OK
+
+        response = client.get("/api/v1/shared-decks", headers={"If-None-Match": first.headers["etag"]})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_cache_hit_skips_database(self, client: TestClient, auth_headers: dict, db_engine):
+        """测试命中缓存时不执行 SQL"""
+        slug = self._create_shared_deck(client, auth_headers)
+
+        assert self._count_statements(client, db_engine, f"/api/v1/shared-decks/{slug}") > 0
+        assert self._count_statements(client, db_engine, f"/api/v1/shared-decks/{slug}") == 0
+
+    def test_list_key_normalizes_query_params(self, client: TestClient, auth_headers: dict, db_engine):
+        """测试参数顺序、默认值和未知参数不影响列表缓存键"""
+        self._create_shared_deck(client, auth_headers)
+
+        first = client.get("/api/v1/shared-decks?language=zh-CN&page_size=5")
+        statements = self._count_statements(
+            client, db_engine, "/api/v1/shared-decks?page_num=1&page_size=5&language=zh-CN&_=123"
+        )
+
+        assert statements == 0
+        assert client.get("/api/v1/shared-decks?page_size=5&language=zh-CN").headers["etag"] == first.headers["etag"]
+        other = client.get("/api/v1/shared-decks?language=zh-CN&page_size=6")
+        assert other.headers["etag"] != first.headers["etag"]
+
+    def test_writes_invalidate_cache(self, client: TestClient, auth_headers: dict):
+        """测试更新、精选等写操作使缓存失效"""
+        slug = self._create_shared_deck(client, auth_headers)
+        detail = client.get(f"/api/v1/shared-decks/{slug}").json()["data"]
+        shared_deck_id = detail["id"]
+        assert detail["is_featured"] is False
+
+        client.put(
+            f"/api/v1/admin/shared-decks/{shared_deck_id}/feature", params={"featured": "true"}, headers=auth_headers
+        )
+        assert client.get(f"/api/v1/shared-decks/{slug}").json()["data"]["is_featured"] is True
+
+        client.put(f"/api/v1/shared-decks/{shared_deck_id}", json={"title": "Renamed"}, headers=auth_headers)
+        assert client.get(f"/api/v1/shared-decks/{slug}").json()["data"]["title"] == "Renamed"
+
+        listed = client.get("/api/v1/shared-decks", params={"q": "Renamed"}).json()["data"]["items"]
+        client.put(
+            f"/api/v1/admin/shared-decks/{shared_deck_id}/active", params={"active": "false"}, headers=auth_headers
+        )
+        relisted = client.get("/api/v1/shared-decks", params={"q": "Renamed"}).json()["data"]["items"]
+        assert len(relisted) == len(listed) - 1
+
+    def test_download_counts_cache_hits(self, client: TestClient, auth_headers: dict):
+        """测试下载信息命中缓存时同样计入下载，304 不计入"""
+        slug = self._publish_deck(client, auth_headers)
+        before = self._download_count(client, slug)
+
+        first = client.get(f"/api/v1/shared-decks/{slug}/download")
+        second = client.get(f"/api/v1/shared-decks/{slug}/download")
+        not_modified = client.get(
+            f"/api/v1/shared-decks/{slug}/download", headers={"If-None-Match": first.headers["etag"]}
+        )
+
+        assert second.content == first.content
+        assert first.headers["cache-control"] == "private, no-store"
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+        assert self._download_count(client, slug) == before + 2
+
+    def _download_count(self, client: TestClient, slug: str) -> int:
+        """辅助方法：写入内存中的下载计数并清空市场响应缓存后读取下载次数"""
+        client.portal.call(download_counter.flush)
+        market_response_cache.invalidate()
+        return client.get(f"/api/v1/shared-decks/{slug}").json()["data"]["download_count"]
+
+    def _count_statements(self, client: TestClient, db_engine, url: str) -> int:
+        """辅助方法：统计一次请求执行的 SQL 语句数"""
+        statements: list[str] = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db_engine.sync_engine, "before_cursor_execute", _record)
+        try:
+            response = client.get(url)
+        finally:
+            event.remove(db_engine.sync_engine, "before_cursor_execute", _record)
+
+        assert response.status_code == status.HTTP_200_OK
+        return len(statements)
+
+    def _create_shared_deck(self, client: TestClient, auth_headers: dict) -> str:
+        """辅助方法：创建共享牌组，返回 slug"""
+        slug = f"market-cache-{uuid.uuid4().hex[:8]}"
+        response = client.post(
+            "/api/v1/shared-decks",
+            json={"slug": slug, "title": f"Market {slug}", "language": "zh-CN"},
+            headers=auth_headers,
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        return slug
+
+    def _publish_deck(self, client: TestClient, auth_headers: dict) -> str:
+        """辅助方法：创建带一条笔记的牌组并发布，返回 slug"""
+        unique_id = uuid.uuid4().hex[:8]
+        response = client.post(
+            "/api/v1/note-models",
+            json={
+                "name": f"MarketCacheModel_{unique_id}",
+                "fields_schema": [{"name": "Front", "ord": 0}, {"name": "Back", "ord": 1}],
+                "css": "",
+            },
+            headers=auth_headers,
+        )
+        note_model_id = response.json()["data"]["id"]
+        client.post(
+            f"/api/v1/note-models/{note_model_id}/templates",
+            json={"name": "Card 1", "question_template": "{{Front}}", "answer_template": "{{Back}}"},
+            headers=auth_headers,
+        )
+        deck_name = f"MarketCacheDeck_{unique_id}"
+        response = client.post(
+            "/api/v1/decks", json={"name": deck_name, "note_model_id": note_model_id}, headers=auth_headers
+        )
+        deck_id = response.json()["data"]["id"]
+        client.post(
+            "/api/v1/notes",
+            json={"deck_id": deck_id, "note_model_id": note_model_id, "fields": {"Front": "Q", "Back": "A"}},
+            headers=auth_headers,
+        )
+
+        slug = f"market-cache-{unique_id}"
+        response = client.post(
+            f"/api/v1/decks/{deck_id}/publish", json={"slug": slug, "title": deck_name}, headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        return slug
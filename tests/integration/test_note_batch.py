@@ -64,6 +64,61 @@ class TestNoteBatchAPI:
         assert data["data"]["created_count"] == 0
         assert data["data"]["skipped_count"] == 1
 
+    def test_batch_create_notes_dedup_within_batch(self, client: TestClient, auth_headers: dict):
+        """测试同一批次内的重复笔记只创建一次"""
+        deck_id, note_model_id = self._create_deck_and_model(client, auth_headers)
+
+        payload = {
+            "deck_id": deck_id,
+            "note_model_id": note_model_id,
+            "source_type": "import",
+            "notes": [
+                {"fields": {"Front": "Dog", "Back": "狗"}, "tags": []},
+                {"fields": {"Front": "Dog", "Back": "狗"}, "tags": ["dup"]},
+                {"fields": {"Front": "Bird", "Back": "鸟"}, "tags": []},
+            ],
+        }
+        response = client.post("/api/v1/notes/batch", json=payload, headers=auth_headers)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()["data"]
+        assert data["created_count"] == 2
+        assert data["skipped_count"] == 1
+        assert len(set(data["created_ids"])) == 2
+
+    def test_batch_create_notes_large_batch(self, client: TestClient, auth_headers: dict):
+        """测试超过单块大小的批量创建，笔记和卡片全部写入"""
+        deck_id, note_model_id = self._create_deck_and_model(client, auth_headers)
+        note_count = 2500
+
+        payload = {
+            "deck_id": deck_id,
+            "note_model_id": note_model_id,
+            "source_type": "import",
+            "notes": [{"fields": {"Front": f"Q{i}", "Back": f"A{i}"}, "tags": ["bulk"]} for i in range(note_count)],
+        }
+        response = client.post("/api/v1/notes/batch", json=payload, headers=auth_headers)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["data"]["created_count"] == note_count
+
+        notes = client.get("/api/v1/notes", params={"deck_id": deck_id, "page_size": 1}, headers=auth_headers).json()[
+            "data"
+        ]
+        assert notes["total"] == note_count
+
+        template_count = len(
+            client.get(f"/api/v1/note-models/{note_model_id}", headers=auth_headers).json()["data"]["templates"]
+        )
+        cards = client.get("/api/v1/cards", params={"deck_id": deck_id, "page_size": 1}, headers=auth_headers).json()[
+            "data"
+        ]
+        assert cards["total"] == note_count * template_count
+
+        note = client.get(f"/api/v1/notes/{notes['items'][0]['id']}", headers=auth_headers).json()["data"]
+        assert note["tags"] == ["bulk"]
+        assert note["created_at"] is not None
+
     def test_batch_create_notes_invalid_deck(self, client: TestClient, auth_headers: dict):
         """测试无效牌组"""
         _, note_model_id = self._create_deck_and_model(client, auth_headers)
@@ -94,6 +149,24 @@ class TestNoteBatchAPI:
         # 可能返回 400 或 404
         assert response.status_code in [status.HTTP_400_BAD_REQUEST, status.HTTP_404_NOT_FOUND]
 
+    def test_batch_create_notes_foreign_note_model(self, client: TestClient, auth_headers: dict):
+        """测试使用其他用户的笔记类型时被拒绝"""
+        _, note_model_id = self._create_deck_and_model(client, auth_headers)
+        other_headers = self._new_user_headers(client)
+        deck_id, _ = self._create_deck_and_model(client, other_headers)
+
+        payload = {
+            "deck_id": deck_id,
+            "note_model_id": note_model_id,
+            "source_type": "import",
+            "notes": [{"fields": {"Front": "Test", "Back": "测试"}, "tags": []}],
+        }
+
+        response = client.post("/api/v1/notes/batch", json=payload, headers=other_headers)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        notes = client.get("/api/v1/notes", params={"deck_id": deck_id}, headers=other_headers).json()["data"]
+        assert notes["total"] == 0
+
     def test_batch_create_notes_empty_list(self, client: TestClient, auth_headers: dict):
         """测试空笔记列表"""
         deck_id, note_model_id = self._create_deck_and_model(client, auth_headers)
@@ -121,6 +194,24 @@ class TestNoteBatchAPI:
         # 没有 token 或 token 无效时返回 401 或 403
         assert response.status_code in [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN]
 
+    def _new_user_headers(self, client: TestClient) -> dict:
+        """辅助方法：注册另一个用户并返回其认证头"""
+        unique_id = uuid.uuid4().hex[:8]
+        client.post(
+            "/api/v1/auth/register",
+            json={
+                "username": f"batch_{unique_id}",
+                "email": f"batch_{unique_id}@example.com",
+                "nickname": "Batch User",
+                "password": "password123",
+            },
+        )
+        response = client.post(
+            "/api/v1/auth/login",
+            json={"username": f"batch_{unique_id}", "password": "password123"},
+        )
+        return {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+
     def _create_deck_and_model(self, client: TestClient, auth_headers: dict) -> tuple[str, str]:
         """辅助方法：创建牌组和笔记类型"""
         unique_id = uuid.uuid4().hex[:8]
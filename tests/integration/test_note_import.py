@@ -0,0 +1,150 @@
+"""
+笔记流式导入 API 集成测试
+"""
+
+import json
+import uuid
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.services import note as note_service
+
+
+class TestNoteImportAPI:
+    """笔记流式导入测试"""
+
+    def test_import_ndjson(self, client: TestClient, auth_headers: dict):
+        """测试 NDJSON 导入：逐行校验、去重并返回出错行号"""
+        deck_id, note_model_id = self._create_deck_and_model(client, auth_headers)
+        lines = [
+            json.dumps({"fields": {"Front": "Hello", "Back": "你好"}, "tags": ["greeting"]}, ensure_ascii=False),
+            "",
+            "{not json",
+            json.dumps({"fields": {"Front": "Hello", "Back": "重复"}}, ensure_ascii=False),
+            json.dumps({"tags": ["missing-fields"]}),
+            json.dumps({"fields": {"Front": "World", "Back": "世界"}}, ensure_ascii=False),
+        ]
+
+        response = self._import(client, auth_headers, deck_id, note_model_id, "\n".join(lines), "application/x-ndjson")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()["data"]
+        assert data["total_rows"] == 5
+        assert data["created_count"] == 2
+        assert data["skipped_count"] == 1
+        assert data["error_count"] == 2
+        assert [e["line"] for e in data["errors"]] == [3, 5]
+
+        notes = client.get("/api/v1/notes", params={"deck_id": deck_id}, headers=auth_headers).json()["data"]
+        assert notes["total"] == 2
+
+    def test_import_csv(self, client: TestClient, auth_headers: dict):
+        """测试 CSV 导入：表头映射字段、tags 列、多行字段和列数错误"""
+        deck_id, note_model_id = self._create_deck_and_model(client, auth_headers)
+        body = '\ufeffFront,Back,tags\r\nApple,苹果,fruit food\r\n"Multi\nline","He said ""hi""",\r\nBroken,row\r\n'
+
+        response = self._import(client, auth_headers, deck_id, note_model_id, body, "text/csv")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        data = response.json()["data"]
+        assert data["created_count"] == 2
+        assert data["error_count"] == 1
+        assert data["errors"][0]["line"] == 5
+
+        notes = client.get("/api/v1/notes", params={"deck_id": deck_id}, headers=auth_headers).json()["data"]
+        by_front = {n["fields"]["Front"]: n for n in notes["items"]}
+        assert by_front["Apple"]["tags"] == ["fruit", "food"]
+        assert by_front["Multi\nline"]["fields"]["Back"] == 'He said "hi"'
+
+    def test_import_commits_in_chunks(self, client: TestClient, auth_headers: dict, monkeypatch: pytest.MonkeyPatch):
+        """测试按块提交"""
+        monkeypatch.setattr(note_service, "IMPORT_CHUNK_SIZE", 2)
+        deck_id, note_model_id = self._create_deck_and_model(client, auth_headers)
+        body = "\n".join(json.dumps({"fields": {"Front": f"Q{i}", "Back": f"A{i}"}}) for i in range(5))
+
+        response = self._import(client, auth_headers, deck_id, note_model_id, body, "application/x-ndjson")
+
+        data = response.json()["data"]
+        assert data["created_count"] == 5
+        assert data["committed_chunks"] == 3
+
+    def test_import_dedupes_across_chunks(
+        self, client: TestClient, auth_headers: dict, monkeypatch: pytest.MonkeyPatch
+    ):
+        """测试跨块的重复笔记由数据库查询跳过"""
+        monkeypatch.setattr(note_service, "IMPORT_CHUNK_SIZE", 2)
+        deck_id, note_model_id = self._create_deck_and_model(client, auth_headers)
+        body = "\n".join(json.dumps({"fields": {"Front": f"Q{i}", "Back": f"A{i}"}}) for i in [0, 1, 0, 2, 1])
+
+        response = self._import(client, auth_headers, deck_id, note_model_id, body, "application/x-ndjson")
+
+        data = response.json()["data"]
+        assert data["created_count"] == 3
+        assert data["skipped_count"] == 2
+        assert data["committed_chunks"] == 2
+
+        notes = client.get("/api/v1/notes", params={"deck_id": deck_id}, headers=auth_headers).json()["data"]
+        assert notes["total"] == 3
+
+    def test_import_csv_without_header(self, client: TestClient, auth_headers: dict):
+        """测试空 CSV 返回 400"""
+        deck_id, note_model_id = self._create_deck_and_model(client, auth_headers)
+
+        response = self._import(client, auth_headers, deck_id, note_model_id, "", "text/csv")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_import_invalid_deck(self, client: TestClient, auth_headers: dict):
+        """测试导入到不存在的牌组"""
+        _, note_model_id = self._create_deck_and_model(client, auth_headers)
+
+        response = self._import(
+            client,
+            auth_headers,
+            "non-existent-deck-id",
+            note_model_id,
+            '{"fields": {"Front": "x"}}',
+            "application/x-ndjson",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def _import(
+        self, client: TestClient, auth_headers: dict, deck_id: str, note_model_id: str, body: str, content_type: str
+    ):
+        """辅助方法：发送导入请求"""
+        return client.post(
+            "/api/v1/notes/import",
+            params={"deck_id": deck_id, "note_model_id": note_model_id},
+            content=body.encode(),
+            headers={**auth_headers, "Content-Type": content_type},
+        )
+
+    def _create_deck_and_model(self, client: TestClient, auth_headers: dict) -> tuple[str, str]:
+        """辅助方法：创建牌组和笔记类型"""
+        unique_id = uuid.uuid4().hex[:8]
+
+        response = client.post(
+            "/api/v1/note-models",
+            json={
+                "name": f"ImportTestModel_{unique_id}",
+                "fields_schema": [
+                    {"name": "Front", "ord": 0},
+                    {"name": "Back", "ord": 1},
+                ],
+                "css": "",
+            },
+            headers=auth_headers,
+        )
+        note_model_id = response.json()["data"]["id"]
+
+        response = client.post(
+            "/api/v1/decks",
+            json={"name": f"ImportTestDeck_{unique_id}"},
+            headers=auth_headers,
+        )
+        deck_id = response.json()["data"]["id"]
+
+        return deck_id, note_model_id
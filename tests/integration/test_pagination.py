@@ -0,0 +1,179 @@
+"""
+游标分页集成测试
+"""
+
+import uuid
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.utils.pagination import encode_cursor
+
+
+class TestCursorPaginationAPI:
+    """游标分页测试"""
+
+    def test_cursor_pages_match_offset_order(self, client: TestClient, auth_headers: dict):
+        """测试按游标逐页读取与一次性读取的顺序一致（排序键相同时按主键区分）"""
+        deck_id, note_model_id = self._create_deck_and_model(client, auth_headers)
+        card_ids = self._create_cards(client, auth_headers, deck_id, note_model_id, 4)
+        # 部分复习时间相同，验证排序键并列时不重复、不遗漏
+        for i, card_id in enumerate(card_ids * 2):
+            client.post(
+                "/api/v1/review-logs",
+                json={"card_id": card_id, "review_time": 1_700_000_000_000 + i // 3, "rating": 3},
+                headers=auth_headers,
+            )
+        expected = self._ids(client, auth_headers, "/api/v1/review-logs", {"page_size": 100})
+        walked = self._walk(client, auth_headers, "/api/v1/review-logs", {"page_size": 3})
+
+        assert len(expected) >= 8
+        assert walked == expected
+
+    def test_cursor_with_datetime_sort_key(self, client: TestClient, auth_headers: dict):
+        """测试以创建时间为排序键的游标分页"""
+        deck_id, note_model_id = self._create_deck_and_model(client, auth_headers)
+        self._create_cards(client, auth_headers, deck_id, note_model_id, 5)
+        params = {"deck_id": deck_id}
+
+        expected = self._ids(client, auth_headers, "/api/v1/notes", {"page_size": 100, **params})
+        walked = self._walk(client, auth_headers, "/api/v1/notes", {"page_size": 2}, params)
+
+        assert len(expected) == 5
+        assert walked == expected
+
+    def test_cursor_with_search_rank(self, client: TestClient, auth_headers: dict):
+        """测试共享牌组全文搜索结果按游标分页"""
+        word = f"pagetest{uuid.uuid4().hex[:6]}"
+        for i in range(5):
+            client.post(
+                "/api/v1/shared-decks",
+                json={
+                    "slug": f"page-test-{uuid.uuid4().hex[:8]}",
+                    "title": f"{word} deck {i}",
+                    "description": " ".join([word] * i),
+                },
+                headers=auth_headers,
+            )
+
+        expected = self._ids(client, auth_headers, "/api/v1/shared-decks", {"q": word, "page_size": 100})
+        walked = self._walk(client, auth_headers, "/api/v1/shared-decks", {"page_size": 2}, {"q": word})
+
+        assert len(expected) == 5
+        assert walked == expected
+
+    def test_total_is_optional(self, client: TestClient, auth_headers: dict):
+        """测试页码分页默认统计总数，游标分页默认不统计"""
+        deck_id, note_model_id = self._create_deck_and_model(client, auth_headers)
+        self._create_cards(client, auth_headers, deck_id, note_model_id, 3)
+
+        first = self._get(client, auth_headers, "/api/v1/notes", {"deck_id": deck_id, "page_size": 2})
+        assert first["total"] == 3
+        assert first["next_cursor"]
+
+        second = self._get(
+            client, auth_headers, "/api/v1/notes", {"deck_id": deck_id, "page_size": 2, "cursor": first["next_cursor"]}
+        )
+        assert second["total"] is None
+        assert second["next_cursor"] is None
+        assert len(second["items"]) == 1
+
+        counted = self._get(
+            client,
+            auth_headers,
+            "/api/v1/notes",
+            {"deck_id": deck_id, "page_size": 2, "cursor": first["next_cursor"], "with_total": "true"},
+        )
+        assert counted["total"] == 3
+
+        uncounted = self._get(
+            client, auth_headers, "/api/v1/notes", {"deck_id": deck_id, "page_size": 2, "with_total": "false"}
+        )
+        assert uncounted["total"] is None
+
+    def test_invalid_cursor(self, client: TestClient, auth_headers: dict):
+        """测试无效游标返回 400"""
+        for cursor in ("not-a-cursor", "WzFd"):
+            response = client.get("/api/v1/notes", params={"cursor": cursor}, headers=auth_headers)
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_cursor_type_mismatch(self, client: TestClient, auth_headers: dict):
+        """测试取值类型与排序列不符的游标返回 400"""
+        created_at = {"$dt": "2026-01-01T00:00:00"}
+        cases = [
+            ("/api/v1/notes", ["2026-01-01", "id"]),
+            ("/api/v1/notes", [created_at, 1]),
+            ("/api/v1/notes", [{"x": 1}, "id"]),
+            ("/api/v1/notes", [None, "id"]),
+            ("/api/v1/cards", ["soon", "id"]),
+            ("/api/v1/cards", [True, "id"]),
+            ("/api/v1/shared-decks", [1, False, 10, created_at, "id"]),
+            ("/api/v1/shared-decks", [False, False, [], created_at, "id"]),
+        ]
+        for url, values in cases:
+            response = client.get(url, params={"cursor": encode_cursor(values)}, headers=auth_headers)
+            assert response.status_code == status.HTTP_400_BAD_REQUEST, (url, values)
+
+    def _walk(
+        self, client: TestClient, auth_headers: dict, url: str, page: dict, params: dict | None = None
+    ) -> list[str]:
+        """辅助方法：从第一页开始按游标读取全部记录，返回 ID 列表"""
+        ids: list[str] = []
+        cursor = None
+        while True:
+            query = {**page, **(params or {}), **({"cursor": cursor} if cursor else {})}
+            data = self._get(client, auth_headers, url, query)
+            ids.extend(item["id"] for item in data["items"])
+            cursor = data["next_cursor"]
+            if not cursor:
+                return ids
+
+    def _ids(self, client: TestClient, auth_headers: dict, url: str, params: dict) -> list[str]:
+        """辅助方法：读取一页，返回 ID 列表"""
+        return [item["id"] for item in self._get(client, auth_headers, url, params)["items"]]
+
+    def _get(self, client: TestClient, auth_headers: dict, url: str, params: dict) -> dict:
+        """辅助方法：请求列表接口，返回分页数据"""
+        response = client.get(url, params=params, headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        return response.json()["data"]
+
+    def _create_deck_and_model(self, client: TestClient, auth_headers: dict) -> tuple[str, str]:
+        """辅助方法：创建牌组和笔记类型"""
+        unique_id = uuid.uuid4().hex[:8]
+        response = client.post(
+            "/api/v1/note-models",
+            json={
+                "name": f"PageTestModel_{unique_id}",
+                "fields_schema": [
+                    {"name": "Front", "ord": 0},
+                    {"name": "Back", "ord": 1},
+                ],
+                "css": "",
+            },
+            headers=auth_headers,
+        )
+        note_model_id = response.json()["data"]["id"]
+        response = client.post(
+            "/api/v1/decks",
+            json={"name": f"PageTestDeck_{unique_id}", "note_model_id": note_model_id},
+            headers=auth_headers,
+        )
+        return response.json()["data"]["id"], note_model_id
+
+    def _create_cards(
+        self, client: TestClient, auth_headers: dict, deck_id: str, note_model_id: str, count: int
+    ) -> list[str]:
+        """辅助方法：批量创建笔记，返回第一张卡片 ID 列表"""
+        response = client.post(
+            "/api/v1/notes/batch",
+            json={
+                "deck_id": deck_id,
+                "note_model_id": note_model_id,
+                "notes": [{"fields": {"Front": f"Page {uuid.uuid4().hex}", "Back": "A"}} for _ in range(count)],
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        cards = self._get(client, auth_headers, "/api/v1/cards", {"deck_id": deck_id, "page_size": 100})["items"]
+        return [card["id"] for card in cards][:count]
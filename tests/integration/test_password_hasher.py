@@ -0,0 +1,119 @@
+"""
+密码哈希执行器集成测试
+"""
+
+import uuid
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import TooManyRequestsException
+from app.core.password import password_hasher
+from app.models.user import User
+
+
+class TestPasswordHasherAPI:
+    """密码哈希执行器测试"""
+
+    async def test_login_rehashes_when_rounds_change(
+        self, client: TestClient, db: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ):
+        """测试调整成本因子后，登录时按新成本重新哈希"""
+        username = self._register(client)
+        old_hash = await self._hashed_password(db, username)
+        assert not password_hasher.needs_rehash(old_hash)
+
+        monkeypatch.setattr(password_hasher, "rounds", password_hasher.rounds + 1)
+        assert self._login(client, username, "password123").status_code == status.HTTP_200_OK
+
+        new_hash = await self._hashed_password(db, username)
+        assert new_hash != old_hash
+        assert new_hash.split("$")[2] == f"{password_hasher.rounds:02d}"
+        assert self._login(client, username, "password123").status_code == status.HTTP_200_OK
+        assert await self._hashed_password(db, username) == new_hash
+
+    async def test_failed_login_does_not_rehash(
+        self, client: TestClient, db: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ):
+        """测试密码错误时不重新哈希"""
+        username = self._register(client)
+        old_hash = await self._hashed_password(db, username)
+
+        monkeypatch.setattr(password_hasher, "rounds", password_hasher.rounds + 1)
+        assert self._login(client, username, "wrong-password").status_code == status.HTTP_401_UNAUTHORIZED
+        assert await self._hashed_password(db, username) == old_hash
+
+    async def test_login_skips_rehash_when_queue_full(
+        self, client: TestClient, db: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ):
+        """测试重新哈希被拒绝时登录仍然成功，保留旧哈希"""
+        username = self._register(client)
+        old_hash = await self._hashed_password(db, username)
+
+        async def rejected_hash(password: str) -> str:
+            raise TooManyRequestsException(msg="服务繁忙，请稍后重试")
+
+        monkeypatch.setattr(password_hasher, "rounds", password_hasher.rounds + 1)
+        monkeypatch.setattr(password_hasher, "hash", rejected_hash)
+        assert self._login(client, username, "password123").status_code == status.HTTP_200_OK
+        assert await self._hashed_password(db, username) == old_hash
+
+    def test_login_rejected_when_queue_full(self, client: TestClient, monkeypatch: pytest.MonkeyPatch):
+        """测试排队已满时登录返回 429"""
+        username = self._register(client)
+        monkeypatch.setattr(password_hasher, "max_pending", 1)
+        monkeypatch.setattr(password_hasher, "_pending", 1)
+
+        response = self._login(client, username, "password123")
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    def test_stats(self, client: TestClient, auth_headers: dict):
+        """测试管理员查看密码哈希指标"""
+        before = client.get("/api/v1/admin/password-hasher", headers=auth_headers).json()["data"]
+        self._register(client)
+
+        response = client.get("/api/v1/admin/password-hasher", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["data"]
+        assert data["completed"] == before["completed"] + 1
+        assert data["workers"] == password_hasher.workers
+        assert data["running"] == 0 and data["waiting"] == 0
+
+    def test_stats_requires_superuser(self, client: TestClient):
+        """测试普通用户无法查看密码哈希指标"""
+        username = self._register(client)
+        token = self._login(client, username, "password123").json()["data"]["access_token"]
+
+        response = client.get("/api/v1/admin/password-hasher", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    @staticmethod
+    async def _hashed_password(db: AsyncSession, username: str) -> str:
+        """辅助方法：读取用户的密码哈希"""
+        result = await db.execute(select(User.hashed_password).where(User.username == username))
+        return result.scalar_one()
+
+    @staticmethod
+    def _login(client: TestClient, username: str, password: str):
+        """辅助方法：登录"""
+        return client.post("/api/v1/auth/login", json={"username": username, "password": password})
+
+    @staticmethod
+    def _register(client: TestClient) -> str:
+        """辅助方法：注册新用户，返回用户名"""
+        unique_id = uuid.uuid4().hex[:8]
+        username = f"hasher_{unique_id}"
+        response = client.post(
+            "/api/v1/auth/register",
+            json={
+                "username": username,
+                "email": f"hasher_{unique_id}@example.com",
+                "nickname": "Hasher User",
+                "password": "password123",
+            },
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        return username
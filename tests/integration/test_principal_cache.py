@@ -0,0 +1,101 @@
+"""
+已认证用户身份缓存集成测试
+"""
+
+import uuid
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.core.principal import principal_cache
+
+
+class TestPrincipalCacheAPI:
+    """用户身份缓存测试"""
+
+    def test_repeated_requests_hit_cache(self, client: TestClient, auth_headers: dict):
+        """测试同一用户的后续请求命中缓存"""
+        user_id, headers = self._new_user(client)
+        before = self._cache_stats(client, auth_headers)
+
+        for _ in range(3):
+            response = client.get("/api/v1/decks", headers=headers)
+            assert response.status_code == status.HTTP_200_OK
+
+        after = self._cache_stats(client, auth_headers)
+        # 管理员查询指标本身也经过认证（已缓存，计入命中）
+        assert after["misses"] - before["misses"] == 1
+        assert after["hits"] - before["hits"] == 3
+        assert principal_cache.cache.peek(user_id) is not None
+
+    def test_deactivate_takes_effect_immediately(self, client: TestClient, auth_headers: dict):
+        """测试禁用、恢复用户后立即生效"""
+        user_id, headers = self._new_user(client)
+        assert client.get("/api/v1/decks", headers=headers).status_code == status.HTTP_200_OK
+
+        client.put(f"/api/v1/users/{user_id}", json={"is_active": False}, headers=auth_headers)
+        assert client.get("/api/v1/decks", headers=headers).status_code == status.HTTP_403_FORBIDDEN
+
+        client.put(f"/api/v1/users/{user_id}", json={"is_active": True}, headers=auth_headers)
+        assert client.get("/api/v1/decks", headers=headers).status_code == status.HTTP_200_OK
+
+    def test_superuser_change_takes_effect_immediately(self, client: TestClient, auth_headers: dict):
+        """测试授予管理员权限后立即生效"""
+        user_id, headers = self._new_user(client)
+        assert client.get("/api/v1/admin/caches", headers=headers).status_code == status.HTTP_403_FORBIDDEN
+
+        client.put(f"/api/v1/users/{user_id}", json={"is_superuser": True}, headers=auth_headers)
+        assert client.get("/api/v1/admin/caches", headers=headers).status_code == status.HTTP_200_OK
+
+    def test_delete_takes_effect_immediately(self, client: TestClient, auth_headers: dict):
+        """测试删除用户后其 token 立即失效"""
+        user_id, headers = self._new_user(client)
+        assert client.get("/api/v1/decks", headers=headers).status_code == status.HTTP_200_OK
+
+        client.delete(f"/api/v1/users/{user_id}", headers=auth_headers)
+        assert client.get("/api/v1/decks", headers=headers).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_profile_and_password_changes_invalidate(self, client: TestClient):
+        """测试修改昵称和密码时丢弃缓存"""
+        user_id, headers = self._new_user(client)
+        client.get("/api/v1/decks", headers=headers)
+        assert principal_cache.cache.peek(user_id) is not None
+
+        client.put("/api/v1/auth/me", json={"nickname": "Renamed"}, headers=headers)
+        assert principal_cache.cache.peek(user_id) is None
+        client.get("/api/v1/decks", headers=headers)
+        assert principal_cache.cache.peek(user_id).nickname == "Renamed"
+
+        response = client.post(
+            "/api/v1/auth/change-password",
+            json={"old_password": "password123", "new_password": "password456"},
+            headers=headers,
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert principal_cache.cache.peek(user_id) is None
+
+    @staticmethod
+    def _cache_stats(client: TestClient, auth_headers: dict) -> dict:
+        """辅助方法：获取用户身份缓存指标"""
+        response = client.get("/api/v1/admin/caches", headers=auth_headers)
+        return next(item for item in response.json()["data"] if item["name"] == "principal")
+
+    @staticmethod
+    def _new_user(client: TestClient) -> tuple[str, dict]:
+        """辅助方法：注册新用户并登录，返回用户 ID 和认证头"""
+        unique_id = uuid.uuid4().hex[:8]
+        client.post(
+            "/api/v1/auth/register",
+            json={
+                "username": f"principal_{unique_id}",
+                "email": f"principal_{unique_id}@example.com",
+                "nickname": "Principal User",
+                "password": "password123",
+            },
+        )
+        response = client.post(
+            "/api/v1/auth/login",
+            json={"username": f"principal_{unique_id}", "password": "password123"},
+        )
+        data = response.json()["data"]
+        return data["id"], {"Authorization": f"Bearer {data['access_token']}"}
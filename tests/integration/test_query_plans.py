@@ -0,0 +1,93 @@
+"""
+热点查询执行计划回归测试
+
+在独立的 SQLite 数据库上执行 Repository 的热点查询，记录实际发出的 SQL，
+再用 EXPLAIN QUERY PLAN 检查：不能出现全表扫描，分页/队列查询不能额外排序。
+"""
+
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+from typing import Any
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.models.base import Base
+from app.repositories.note import CardRepository, NoteRepository
+from app.repositories.review_log import ReviewLogRepository
+from app.repositories.shared_deck import SharedDeckRepository
+from app.utils.pagination import encode_cursor
+
+USER_ID = "00000000-0000-0000-0000-000000000001"
+DECK_ID = "00000000-0000-0000-0000-000000000002"
+
+HOT_QUERIES: dict[str, Callable[[AsyncSession], Awaitable[Any]]] = {
+    "due_cards": lambda db: CardRepository(db).get_due_cards(USER_ID),
+    "due_cards_by_deck": lambda db: CardRepository(db).get_due_cards(USER_ID, deck_id=DECK_ID, due_before=100),
+    "due_queue_entries": lambda db: CardRepository(db).get_due_queue_entries(USER_ID),
+    "due_histogram": lambda db: CardRepository(db).get_due_histogram(USER_ID, 1_700_000_000_000, 365),
+    "cards_page": lambda db: CardRepository(db).get_by_user_id(USER_ID, cursor=encode_cursor([100, "id"])),
+    "review_logs_page": lambda db: ReviewLogRepository(db).get_by_user_id(
+        USER_ID, cursor=encode_cursor([1_700_000_000_000, "id"])
+    ),
+    "notes_page": lambda db: NoteRepository(db).get_by_user_id(
+        USER_ID, cursor=encode_cursor([datetime(2026, 1, 1), "id"])
+    ),
+    "notes_by_deck": lambda db: NoteRepository(db).get_by_user_id(USER_ID, deck_id=DECK_ID),
+    "existing_guids": lambda db: NoteRepository(db).get_existing_guids(DECK_ID, ["a", "b"]),
+    "market": lambda db: SharedDeckRepository(db).search(),
+    "market_page": lambda db: SharedDeckRepository(db).search(
+        cursor=encode_cursor([False, False, 10, datetime(2026, 1, 1), "id"])
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+async def plan_engine():
+    """独立的空数据库（执行计划不依赖数据）"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+class TestQueryPlans:
+    """热点查询执行计划测试"""
+
+    @pytest.mark.parametrize("name", list(HOT_QUERIES))
+    async def test_hot_query_uses_index(self, plan_engine, name: str):
+        """测试热点查询走索引定位，且分页/队列查询不需要额外排序"""
+        plans = await self._explain(plan_engine, HOT_QUERIES[name])
+
+        assert plans
+        for sql, details in plans:
+            for detail in details:
+                # "SCAN t" 为全表扫描，"SCAN t USING INDEX" 为整个索引扫描，都不允许
+                assert not detail.startswith("SCAN "), f"{name}: {detail}\n{sql}"
+            if " LIMIT " in sql:
+                assert not any("TEMP B-TREE FOR ORDER BY" in detail for detail in details), f"{name}: {details}\n{sql}"
+
+    @staticmethod
+    async def _explain(engine, call: Callable[[AsyncSession], Awaitable[Any]]) -> list[tuple[str, list[str]]]:
+        """辅助方法：执行查询并返回每条 SELECT 语句的执行计划"""
+        statements: list[tuple[str, Any]] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append((statement, parameters))
+
+        event.listen(engine.sync_engine, "before_cursor_execute", record)
+        try:
+            async with AsyncSession(engine) as session:
+                await call(session)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+        plans = []
+        async with engine.connect() as conn:
+            for statement, parameters in statements:
+                result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+                plans.append((" ".join(statement.split()), [row[3] for row in result.all()]))
+        return plans
@@ -0,0 +1,114 @@
+"""
+批量上传复习日志 API 集成测试
+"""
+
+import time
+import uuid
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+
+class TestReviewLogBatchAPI:
+    """批量上传复习日志测试"""
+
+    def test_batch_upload_session(self, client: TestClient, auth_headers: dict):
+        """测试一次上传整个离线复习会话，并同步更新复习统计"""
+        card_ids = self._create_cards(client, auth_headers, 3)
+        before = client.get("/api/v1/review-logs/stats", headers=auth_headers).json()["data"]
+        reviews = self._reviews(card_ids, 2000)
+
+        response = client.post("/api/v1/review-logs/batch", json={"reviews": reviews}, headers=auth_headers)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["data"] == {"created_count": 2000, "skipped_count": 0, "error_count": 0}
+        stats = client.get("/api/v1/review-logs/stats", headers=auth_headers).json()["data"]
+        assert stats["total_reviews"] == before["total_reviews"] + 2000
+        response = client.get(f"/api/v1/review-logs/{reviews[0]['id']}", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"]["card_id"] == reviews[0]["card_id"]
+
+    def test_batch_upload_retry_is_idempotent(self, client: TestClient, auth_headers: dict):
+        """测试重试上传时已写入的日志被跳过，不会重复计数"""
+        card_ids = self._create_cards(client, auth_headers, 1)
+        reviews = self._reviews(card_ids, 10)
+        response = client.post("/api/v1/review-logs/batch", json={"reviews": reviews[:6]}, headers=auth_headers)
+        assert response.json()["data"]["created_count"] == 6
+        before = client.get("/api/v1/review-logs/stats", headers=auth_headers).json()["data"]
+
+        # 重试时带上全部日志，其中一条在同一批次内重复
+        response = client.post(
+            "/api/v1/review-logs/batch", json={"reviews": [*reviews, reviews[-1]]}, headers=auth_headers
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["data"] == {"created_count": 4, "skipped_count": 7, "error_count": 0}
+        stats = client.get("/api/v1/review-logs/stats", headers=auth_headers).json()["data"]
+        assert stats["total_reviews"] == before["total_reviews"] + 4
+
+    def test_batch_upload_unknown_card(self, client: TestClient, auth_headers: dict):
+        """测试卡片不存在的日志计为失败，不影响其他日志"""
+        card_ids = self._create_cards(client, auth_headers, 1)
+        reviews = self._reviews([*card_ids, str(uuid.uuid4())], 4)
+
+        response = client.post("/api/v1/review-logs/batch", json={"reviews": reviews}, headers=auth_headers)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["data"] == {"created_count": 2, "skipped_count": 0, "error_count": 2}
+        response = client.get(f"/api/v1/review-logs/{reviews[1]['id']}", headers=auth_headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_batch_upload_empty(self, client: TestClient, auth_headers: dict):
+        """测试空列表被拒绝"""
+        response = client.post("/api/v1/review-logs/batch", json={"reviews": []}, headers=auth_headers)
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    @staticmethod
+    def _reviews(card_ids: list[str], count: int) -> list[dict]:
+        """辅助方法：生成复习日志，轮流分配给各卡片"""
+        now = int(time.time() * 1000)
+        return [
+            {
+                "id": str(uuid.uuid4()),
+                "card_id": card_ids[i % len(card_ids)],
+                "review_time": now - (count - i) * 1000,
+                "rating": i % 4 + 1,
+                "duration_ms": 1000,
+            }
+            for i in range(count)
+        ]
+
+    def _create_cards(self, client: TestClient, auth_headers: dict, count: int) -> list[str]:
+        """辅助方法：创建牌组、笔记类型和笔记，返回卡片 ID 列表"""
+        unique_id = uuid.uuid4().hex[:8]
+        response = client.post(
+            "/api/v1/note-models",
+            json={
+                "name": f"BatchReviewModel_{unique_id}",
+                "fields_schema": [
+                    {"name": "Front", "ord": 0},
+                    {"name": "Back", "ord": 1},
+                ],
+                "css": "",
+            },
+            headers=auth_headers,
+        )
+        note_model_id = response.json()["data"]["id"]
+        response = client.post(
+            "/api/v1/decks",
+            json={"name": f"BatchReviewDeck_{unique_id}", "note_model_id": note_model_id},
+            headers=auth_headers,
+        )
+        deck_id = response.json()["data"]["id"]
+        client.post(
+            "/api/v1/notes/batch",
+            json={
+                "deck_id": deck_id,
+                "note_model_id": note_model_id,
+                "notes": [{"fields": {"Front": f"Q{i}", "Back": f"A{i}"}} for i in range(count)],
+            },
+            headers=auth_headers,
+        )
+        response = client.get("/api/v1/cards", params={"deck_id": deck_id}, headers=auth_headers)
+        return [item["id"] for item in response.json()["data"]["items"]]
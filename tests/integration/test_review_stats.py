@@ -0,0 +1,185 @@
+"""
+复习统计与每日汇总集成测试
+"""
+
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+from datetime import time as dt_time
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.core.jobs import job_queue
+from app.repositories.review_log import ReviewLogRepository
+
+DAY_MS = 24 * 3600 * 1000
+
+
+class TestReviewStatsAPI:
+    """复习统计测试"""
+
+    def test_stats_from_daily_rollup(self, client: TestClient, auth_headers: dict):
+        """测试复习统计由每日汇总计算，且与直接统计复习日志的结果一致"""
+        card_id = self._create_card(client, auth_headers)
+        before = client.get("/api/v1/review-logs/stats", headers=auth_headers).json()["data"]
+        now = int(time.time() * 1000)
+        reviews = [(now, 4), (now - 1000, 1), (now - 2 * DAY_MS, 3), (now - 10 * DAY_MS, 2)]
+        for review_time, rating in reviews:
+            self._review(client, auth_headers, card_id, review_time, rating)
+
+        response = client.get("/api/v1/review-logs/stats", headers=auth_headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        stats = response.json()["data"]
+        today = datetime.now(UTC).date()
+        week_start = today - timedelta(days=today.weekday())
+        assert stats["total_reviews"] == before["total_reviews"] + 4
+        assert stats["reviews_today"] == before["reviews_today"] + 2
+        assert stats["reviews_this_week"] == before["reviews_this_week"] + sum(
+            1 for review_time, _ in reviews if datetime.fromtimestamp(review_time / 1000, UTC).date() >= week_start
+        )
+        user_id = client.get("/api/v1/auth/me", headers=auth_headers).json()["data"]["id"]
+        assert client.portal.call(self._raw_stats, user_id) == stats
+
+    def test_daily_stats(self, client: TestClient, auth_headers: dict):
+        """测试每日汇总按日期累加"""
+        card_id = self._create_card(client, auth_headers)
+        now = int(time.time() * 1000)
+        today = datetime.fromtimestamp(now / 1000, UTC).date().isoformat()
+        before = self._daily(client, auth_headers, 60)
+        self._review(client, auth_headers, card_id, now, 3, duration_ms=1500)
+        self._review(client, auth_headers, card_id, now, 1, duration_ms=500)
+        self._review(client, auth_headers, card_id, now - 40 * DAY_MS, 4)
+
+        after = self._daily(client, auth_headers, 60)
+
+        empty = {"review_count": 0, "good_count": 0, "duration_ms": 0}
+        today_before = before.get(today, empty)
+        assert after[today] == {
+            "review_count": today_before["review_count"] + 2,
+            "good_count": today_before["good_count"] + 1,
+            "duration_ms": today_before["duration_ms"] + 2000,
+        }
+        old_day = datetime.fromtimestamp((now - 40 * DAY_MS) / 1000, UTC).date().isoformat()
+        assert after[old_day]["review_count"] == before.get(old_day, empty)["review_count"] + 1
+        assert old_day not in self._daily(client, auth_headers, 30)
+
+    def test_reviews_today_uses_utc_day(self, client: TestClient, auth_headers: dict, monkeypatch: pytest.MonkeyPatch):
+        """测试“今日”和每日汇总按复习时间的 UTC 日期划分，与服务器时区无关"""
+        card_id = self._create_card(client, auth_headers)
+        today = datetime.now(UTC).date()
+        today_start = int(datetime.combine(today, dt_time.min, tzinfo=UTC).timestamp() * 1000)
+        yesterday = (today - timedelta(days=1)).isoformat()
+        before = client.get("/api/v1/review-logs/stats", headers=auth_headers).json()["data"]
+        daily_before = self._daily(client, auth_headers, 2)
+
+        monkeypatch.setenv("TZ", "Asia/Shanghai")
+        time.tzset()
+        try:
+            # UTC 零点前后各一次：本地时区（UTC+8）下两者同属一天
+            self._review(client, auth_headers, card_id, today_start - 1, 3)
+            self._review(client, auth_headers, card_id, today_start, 3)
+            stats = client.get("/api/v1/review-logs/stats", headers=auth_headers).json()["data"]
+            daily = self._daily(client, auth_headers, 2)
+            user_id = client.get("/api/v1/auth/me", headers=auth_headers).json()["data"]["id"]
+            raw_stats = client.portal.call(self._raw_stats, user_id)
+        finally:
+            monkeypatch.undo()
+            time.tzset()
+
+        assert stats["total_reviews"] == before["total_reviews"] + 2
+        assert stats["reviews_today"] == before["reviews_today"] + 1
+        assert raw_stats == stats
+        for day in (yesterday, today.isoformat()):
+            count_before = daily_before[day]["review_count"] if day in daily_before else 0
+            assert daily[day]["review_count"] == count_before + 1
+
+    def test_stats_without_reviews(self, client: TestClient, auth_headers: dict):
+        """测试没有复习记录的用户统计为 0"""
+        unique_id = uuid.uuid4().hex[:8]
+        client.post(
+            "/api/v1/auth/register",
+            json={
+                "username": f"statsuser_{unique_id}",
+                "email": f"stats_{unique_id}@example.com",
+                "nickname": "Stats User",
+                "password": "password123",
+            },
+        )
+        response = client.post(
+            "/api/v1/auth/login",
+            json={"username": f"statsuser_{unique_id}", "password": "password123"},
+        )
+        headers = {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+
+        response = client.get("/api/v1/review-logs/stats", headers=headers)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"] == {
+            "total_reviews": 0,
+            "reviews_today": 0,
+            "reviews_this_week": 0,
+            "average_rating": 0.0,
+            "retention_rate": 0.0,
+        }
+
+    @staticmethod
+    async def _raw_stats(user_id: str) -> dict:
+        """辅助方法：直接从复习日志计算统计"""
+        async with job_queue.session_factory() as session:
+            return await ReviewLogRepository(session).get_stats(user_id)
+
+    def _daily(self, client: TestClient, auth_headers: dict, days: int) -> dict[str, dict]:
+        """辅助方法：获取最近若干天的每日汇总，按日期索引"""
+        response = client.get("/api/v1/review-logs/daily", params={"days": days}, headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        return {row.pop("day"): row for row in response.json()["data"]}
+
+    def _review(
+        self,
+        client: TestClient,
+        auth_headers: dict,
+        card_id: str,
+        review_time: int,
+        rating: int,
+        duration_ms: int | None = None,
+    ) -> None:
+        """辅助方法：创建复习日志"""
+        response = client.post(
+            "/api/v1/review-logs",
+            json={"card_id": card_id, "review_time": review_time, "rating": rating, "duration_ms": duration_ms},
+            headers=auth_headers,
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def _create_card(self, client: TestClient, auth_headers: dict) -> str:
+        """辅助方法：创建牌组、笔记类型和笔记，返回一张卡片 ID"""
+        unique_id = uuid.uuid4().hex[:8]
+        response = client.post(
+            "/api/v1/note-models",
+            json={
+                "name": f"StatsTestModel_{unique_id}",
+                "fields_schema": [
+                    {"name": "Front", "ord": 0},
+                    {"name": "Back", "ord": 1},
+                ],
+                "css": "",
+            },
+            headers=auth_headers,
+        )
+        note_model_id = response.json()["data"]["id"]
+        response = client.post(
+            "/api/v1/decks",
+            json={"name": f"StatsTestDeck_{unique_id}", "note_model_id": note_model_id},
+            headers=auth_headers,
+        )
+        deck_id = response.json()["data"]["id"]
+        client.post(
+            "/api/v1/notes",
+            json={"deck_id": deck_id, "note_model_id": note_model_id, "fields": {"Front": "Q", "Back": "A"}},
+            headers=auth_headers,
+        )
+        response = client.get("/api/v1/cards", params={"deck_id": deck_id}, headers=auth_headers)
+        return response.json()["data"]["items"][0]["id"]
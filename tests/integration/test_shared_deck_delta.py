@@ -0,0 +1,201 @@
+"""
+共享牌组增量下载 API 集成测试
+"""
+
+import uuid
+
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.utils import export_store
+
+
+class TestSharedDeckDeltaAPI:
+    """共享牌组增量下载测试"""
+
+    def test_delta_between_versions(self, client: TestClient, auth_headers: dict):
+        """测试相邻版本之间的增量和跨多个版本合并的增量"""
+        deck = self._publish_deck(client, auth_headers, note_count=3)
+        notes = self._get_notes(client, auth_headers, deck["deck_id"])
+        changed, removed = notes[0], notes[1]
+
+        # v2：修改一条（guid 由字段生成，只改标签时 guid 不变）、删除一条、新增一条
+        client.put(f"/api/v1/notes/{changed['id']}", json={"tags": ["changed"]}, headers=auth_headers)
+        client.delete(f"/api/v1/notes/{removed['id']}", headers=auth_headers)
+        added_id = self._create_note(client, auth_headers, deck, "Added")
+        self._publish_version(client, auth_headers, deck["shared_deck_id"])
+
+        response = client.get(f"/api/v1/shared-decks/{deck['slug']}/delta", params={"from": 1})
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["data"]
+        assert data["from_version"] == 1
+        assert data["to_version"] == 2
+        assert [n["guid"] for n in data["notes"]["changed"]] == [changed["guid"]]
+        assert data["notes"]["changed"][0]["tags"] == ["changed"]
+        assert data["notes"]["removed"] == [removed["guid"]]
+        assert [n["id"] for n in data["notes"]["added"]] == [added_id]
+        assert {c["note_id"] for c in data["cards"]["added"]} == {added_id}
+        assert len(data["cards"]["removed"]) == len(data["cards"]["added"])
+        assert data["cards"]["changed"] == []
+        assert len(data["note_models"]) == 1
+
+        # v3：删除 v2 新增的笔记，再新增一条
+        client.delete(f"/api/v1/notes/{added_id}", headers=auth_headers)
+        latest_id = self._create_note(client, auth_headers, deck, "Latest")
+        self._publish_version(client, auth_headers, deck["shared_deck_id"])
+
+        data = client.get(f"/api/v1/shared-decks/{deck['slug']}/delta", params={"from": 1}).json()["data"]
+        assert data["to_version"] == 3
+        assert [n["id"] for n in data["notes"]["added"]] == [latest_id]
+        assert [n["guid"] for n in data["notes"]["changed"]] == [changed["guid"]]
+        assert data["notes"]["removed"] == [removed["guid"]]
+
+        data = client.get(f"/api/v1/shared-decks/{deck['slug']}/delta", params={"from": 2}).json()["data"]
+        assert [n["id"] for n in data["notes"]["added"]] == [latest_id]
+        assert data["notes"]["changed"] == []
+        assert len(data["notes"]["removed"]) == 1
+
+    def test_delta_up_to_date(self, client: TestClient, auth_headers: dict):
+        """测试客户端已是最新版本时返回空增量"""
+        deck = self._publish_deck(client, auth_headers, note_count=1)
+
+        response = client.get(f"/api/v1/shared-decks/{deck['slug']}/delta", params={"from": 1})
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["data"]
+        assert data["from_version"] == data["to_version"] == 1
+        assert data["notes"] == {"added": [], "changed": [], "removed": []}
+
+    def test_delta_if_none_match(self, client: TestClient, auth_headers: dict):
+        """测试增量的 ETag 命中时返回 304"""
+        deck = self._publish_deck(client, auth_headers, note_count=1)
+        self._create_note(client, auth_headers, deck, "New")
+        self._publish_version(client, auth_headers, deck["shared_deck_id"])
+        url = f"/api/v1/shared-decks/{deck['slug']}/delta"
+
+        etag = client.get(url, params={"from": 1}).headers["ETag"]
+        response = client.get(url, params={"from": 1}, headers={"If-None-Match": etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_delta_falls_back_to_full_export(
+        self, client: TestClient, auth_headers: dict, monkeypatch: pytest.MonkeyPatch
+    ):
+        """测试需要合并的版本过多时重定向到完整导出"""
+        deck = self._publish_deck(client, auth_headers, note_count=1)
+        for i in range(2):
+            self._create_note(client, auth_headers, deck, f"New {i}")
+            self._publish_version(client, auth_headers, deck["shared_deck_id"])
+        monkeypatch.setattr(settings, "DELTA_MAX_CHAIN_LENGTH", 1)
+
+        response = client.get(f"/api/v1/shared-decks/{deck['slug']}/delta", params={"from": 1}, follow_redirects=False)
+        assert response.status_code == status.HTTP_303_SEE_OTHER
+        assert response.headers["Location"] == f"/api/v1/shared-decks/{deck['slug']}/export"
+
+        response = client.get(f"/api/v1/shared-decks/{deck['slug']}/delta", params={"from": 2})
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["data"]["notes"]["added"]) == 1
+
+    def test_publish_removes_stale_exports(
+        self, client: TestClient, auth_headers: dict, monkeypatch: pytest.MonkeyPatch
+    ):
+        """测试发布新版本后删除上一版本的导出文件和超出合并上限的增量"""
+        monkeypatch.setattr(settings, "DELTA_MAX_CHAIN_LENGTH", 1)
+        deck = self._publish_deck(client, auth_headers, note_count=1)
+        hashes = [self._content_hash(client, deck)]
+        for i in range(2):
+            self._create_note(client, auth_headers, deck, f"New {i}")
+            self._publish_version(client, auth_headers, deck["shared_deck_id"])
+            hashes.append(self._content_hash(client, deck))
+
+        assert not export_store.get_artifact_path(hashes[0]).exists()
+        assert not export_store.get_artifact_path(hashes[1]).exists()
+        assert export_store.get_artifact_path(hashes[2]).exists()
+        assert not export_store.get_delta_path(hashes[0], hashes[1]).exists()
+        assert export_store.get_delta_path(hashes[1], hashes[2]).exists()
+
+        response = client.get(f"/api/v1/shared-decks/{deck['slug']}/export", params={"version": 1})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        response = client.get(f"/api/v1/shared-decks/{deck['slug']}/delta", params={"from": 2})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"]["to_content_hash"] == hashes[2]
+
+    def test_delta_version_not_found(self, client: TestClient, auth_headers: dict):
+        """测试起始版本不存在"""
+        deck = self._publish_deck(client, auth_headers, note_count=1)
+
+        response = client.get(f"/api/v1/shared-decks/{deck['slug']}/delta", params={"from": 9})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def _publish_deck(self, client: TestClient, auth_headers: dict, note_count: int) -> dict:
+        """辅助方法：创建带内容的牌组并发布，返回相关 ID"""
+        unique_id = uuid.uuid4().hex[:8]
+
+        response = client.post(
+            "/api/v1/note-models",
+            json={
+                "name": f"DeltaTestModel_{unique_id}",
+                "fields_schema": [
+                    {"name": "Front", "ord": 0},
+                    {"name": "Back", "ord": 1},
+                ],
+                "css": "",
+            },
+            headers=auth_headers,
+        )
+        note_model_id = response.json()["data"]["id"]
+        client.post(
+            f"/api/v1/note-models/{note_model_id}/templates",
+            json={"name": "Card 1", "question_template": "{{Front}}", "answer_template": "{{Back}}"},
+            headers=auth_headers,
+        )
+
+        deck_name = f"DeltaTestDeck_{unique_id}"
+        response = client.post(
+            "/api/v1/decks",
+            json={"name": deck_name, "note_model_id": note_model_id},
+            headers=auth_headers,
+        )
+        deck = {"deck_id": response.json()["data"]["id"], "note_model_id": note_model_id}
+        for i in range(note_count):
+            self._create_note(client, auth_headers, deck, f"Q{i}")
+
+        deck["slug"] = f"delta-test-{unique_id}"
+        response = client.post(
+            f"/api/v1/decks/{deck['deck_id']}/publish",
+            json={"slug": deck["slug"], "title": deck_name},
+            headers=auth_headers,
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        deck["shared_deck_id"] = response.json()["data"]["id"]
+        return deck
+
+    def _create_note(self, client: TestClient, auth_headers: dict, deck: dict, front: str) -> str:
+        """辅助方法：创建笔记"""
+        response = client.post(
+            "/api/v1/notes",
+            json={
+                "deck_id": deck["deck_id"],
+                "note_model_id": deck["note_model_id"],
+                "fields": {"Front": front, "Back": "A"},
+            },
+            headers=auth_headers,
+        )
+        return response.json()["data"]["id"]
+
+    def _get_notes(self, client: TestClient, auth_headers: dict, deck_id: str) -> list[dict]:
+        """辅助方法：获取牌组内的笔记"""
+        response = client.get("/api/v1/notes", params={"deck_id": deck_id}, headers=auth_headers)
+        return response.json()["data"]["items"]
+
+    def _content_hash(self, client: TestClient, deck: dict) -> str:
+        """辅助方法：获取共享牌组当前版本的内容哈希"""
+        return client.get(f"/api/v1/shared-decks/{deck['slug']}").json()["data"]["content_hash"]
+
+    def _publish_version(self, client: TestClient, auth_headers: dict, shared_deck_id: str) -> None:
+        """辅助方法：发布新版本"""
+        response = client.post(f"/api/v1/shared-decks/{shared_deck_id}/publish-version", headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
@@ -0,0 +1,265 @@
+"""
+共享牌组导出 API 集成测试
+"""
+
+import json
+import uuid
+
+from fastapi import status
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.response_cache import market_response_cache
+from app.services.download_counter import download_counter
+
+
+class TestSharedDeckExportAPI:
+    """共享牌组导出测试"""
+
+    def test_export_buffered(self, client: TestClient, auth_headers: dict):
+        """测试默认（整体返回）导出"""
+        slug = self._publish_deck(client, auth_headers, note_count=3)
+
+        response = client.get(f"/api/v1/shared-decks/{slug}/export")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["data"]
+        assert len(data["note_models"]) == 1
+        template_count = len(data["note_models"][0]["templates"])
+        assert template_count >= 1
+        assert len(data["notes"]) == 3
+        assert len(data["cards"]) == 3 * template_count
+
+    def test_export_serves_prebuilt_artifact(self, client: TestClient, auth_headers: dict):
+        """测试导出直接返回发布时预生成的压缩文件"""
+        slug = self._publish_deck(client, auth_headers, note_count=2)
+        detail = client.get(f"/api/v1/shared-decks/{slug}").json()["data"]
+        snapshot = detail["snapshots"][0]
+        assert snapshot["file_size"] > 0
+
+        response = client.get(f"/api/v1/shared-decks/{slug}/export", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["etag"] == f'"{snapshot["content_hash"]}"'
+        body = response.json()
+        assert body["success"] is True
+        assert len(body["data"]["notes"]) == 2
+
+    def test_export_without_gzip_support(self, client: TestClient, auth_headers: dict):
+        """测试客户端不支持 gzip 时返回解压后的内容"""
+        slug = self._publish_deck(client, auth_headers, note_count=2)
+
+        response = client.get(f"/api/v1/shared-decks/{slug}/export", headers={"Accept-Encoding": "identity"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "content-encoding" not in response.headers
+        assert len(json.loads(response.content)["data"]["notes"]) == 2
+
+    def test_export_accept_encoding_qvalues(self, client: TestClient, auth_headers: dict):
+        """测试按 Accept-Encoding 的 q 值决定是否返回 gzip，q=0 表示不接受"""
+        slug = self._publish_deck(client, auth_headers, note_count=1)
+
+        for accept_encoding, gzipped in [
+            ("gzip;q=0", False),
+            ("identity, gzip; q=0.0", False),
+            ("*;q=0", False),
+            ("br, *;q=0.5", True),
+            ("deflate, gzip;q=0.3", True),
+            ("gzip;q=0, *", False),
+        ]:
+            response = client.get(f"/api/v1/shared-decks/{slug}/export", headers={"Accept-Encoding": accept_encoding})
+
+            assert response.status_code == status.HTTP_200_OK
+            assert ("content-encoding" in response.headers) is gzipped, accept_encoding
+            assert len(json.loads(response.content)["data"]["notes"]) == 1
+
+    def test_export_if_none_match(self, client: TestClient, auth_headers: dict):
+        """测试 If-None-Match 命中时返回 304 且不计入下载"""
+        slug = self._publish_deck(client, auth_headers, note_count=1)
+        etag = client.get(f"/api/v1/shared-decks/{slug}/export").headers["etag"]
+        before = self._download_count(client, slug)
+
+        response = client.get(f"/api/v1/shared-decks/{slug}/export", headers={"If-None-Match": etag})
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["etag"] == etag
+        assert self._download_count(client, slug) == before
+
+    def test_export_snapshot_is_immutable(self, client: TestClient, auth_headers: dict):
+        """测试快照文件不受源牌组后续修改影响，且可按版本导出"""
+        slug = self._publish_deck(client, auth_headers, note_count=1)
+        detail = client.get(f"/api/v1/shared-decks/{slug}").json()["data"]
+        notes = client.get(f"/api/v1/shared-decks/{slug}/export").json()["data"]["notes"]
+
+        # 发布后继续向源牌组添加笔记
+        deck = client.get("/api/v1/decks", params={"keyword": detail["title"]}, headers=auth_headers).json()
+        deck_id = deck["data"]["items"][0]["id"]
+        client.post(
+            "/api/v1/notes",
+            json={
+                "deck_id": deck_id,
+                "note_model_id": notes[0]["note_model_id"],
+                "fields": {"Front": "new", "Back": "x"},
+            },
+            headers=auth_headers,
+        )
+
+        response = client.get(f"/api/v1/shared-decks/{slug}/export", params={"version": 1})
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["data"]["notes"]) == 1
+
+        response = client.get(f"/api/v1/shared-decks/{slug}/export", params={"version": 2})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_export_stream_ndjson(self, client: TestClient, auth_headers: dict):
+        """测试流式导出与整体导出内容一致"""
+        slug = self._publish_deck(client, auth_headers, note_count=5)
+
+        buffered = client.get(f"/api/v1/shared-decks/{slug}/export").json()["data"]
+        response = client.get(f"/api/v1/shared-decks/{slug}/export", params={"stream": "true"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        records = [json.loads(line) for line in response.text.splitlines() if line]
+        assert records[0]["type"] == "deck"
+        assert records[0]["data"] == buffered["deck"]
+
+        by_type: dict[str, list] = {}
+        for record in records:
+            by_type.setdefault(record["type"], []).append(record["data"])
+
+        assert by_type["note_model"] == buffered["note_models"]
+        assert sorted(by_type["note"], key=lambda n: n["id"]) == sorted(buffered["notes"], key=lambda n: n["id"])
+        assert sorted(by_type["card"], key=lambda c: c["id"]) == sorted(buffered["cards"], key=lambda c: c["id"])
+
+    def test_export_stream_counts_download(self, client: TestClient, auth_headers: dict):
+        """测试流式导出同样计入下载次数"""
+        slug = self._publish_deck(client, auth_headers, note_count=1)
+
+        before = self._download_count(client, slug)
+        client.get(f"/api/v1/shared-decks/{slug}/export", params={"stream": "true"})
+
+        assert self._download_count(client, slug) == before + 1
+
+    def test_export_stream_rejects_version(self, client: TestClient, auth_headers: dict):
+        """测试流式导出不能指定版本，也不计入下载次数"""
+        slug = self._publish_deck(client, auth_headers, note_count=1)
+        before = self._download_count(client, slug)
+
+        response = client.get(f"/api/v1/shared-decks/{slug}/export", params={"stream": "true", "version": 1})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert self._download_count(client, slug) == before
+
+    def test_downloads_are_counted_after_flush(self, client: TestClient, auth_headers: dict):
+        """测试下载信息和导出都计入下载次数（累加在内存中，写入后可见）"""
+        slug = self._publish_deck(client, auth_headers, note_count=1)
+        before = self._download_count(client, slug)
+
+        client.get(f"/api/v1/shared-decks/{slug}/download")
+        client.get(f"/api/v1/shared-decks/{slug}/export")
+
+        assert self._download_count(client, slug) == before + 2
+
+    def test_export_stream_not_found(self, client: TestClient):
+        """测试流式导出不存在的共享牌组"""
+        response = client.get("/api/v1/shared-decks/non-existent-slug/export", params={"stream": "true"})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_export_query_count_independent_of_note_models(self, client: TestClient, auth_headers: dict, db_engine):
+        """测试导出的 SQL 语句数不随笔记类型数量增长"""
+        slug_single = self._publish_deck(client, auth_headers, note_count=2, model_count=1)
+        slug_multi = self._publish_deck(client, auth_headers, note_count=2, model_count=4)
+
+        single_count = self._count_export_statements(client, db_engine, slug_single)
+        multi_count = self._count_export_statements(client, db_engine, slug_multi)
+
+        assert multi_count == single_count
+
+    def _count_export_statements(self, client: TestClient, db_engine, slug: str) -> int:
+        """辅助方法：统计一次实时导出执行的 SQL 语句数"""
+        statements: list[str] = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db_engine.sync_engine, "before_cursor_execute", _record)
+        try:
+            response = client.get(f"/api/v1/shared-decks/{slug}/export", params={"stream": "true"})
+        finally:
+            event.remove(db_engine.sync_engine, "before_cursor_execute", _record)
+
+        assert response.status_code == status.HTTP_200_OK
+        note_models = [line for line in response.text.splitlines() if '"type":"note_model"' in line]
+        assert note_models
+        return len(statements)
+
+    def _download_count(self, client: TestClient, slug: str) -> int:
+        """辅助方法：写入内存中的下载计数并清空市场响应缓存后读取下载次数"""
+        client.portal.call(download_counter.flush)
+        market_response_cache.invalidate()
+        return client.get(f"/api/v1/shared-decks/{slug}").json()["data"]["download_count"]
+
+    def _publish_deck(self, client: TestClient, auth_headers: dict, note_count: int, model_count: int = 1) -> str:
+        """辅助方法：创建带内容的牌组并发布，返回 slug"""
+        unique_id = uuid.uuid4().hex[:8]
+
+        note_model_ids = []
+        for m in range(model_count):
+            response = client.post(
+                "/api/v1/note-models",
+                json={
+                    "name": f"ExportTestModel_{unique_id}_{m}",
+                    "fields_schema": [
+                        {"name": "Front", "ord": 0},
+                        {"name": "Back", "ord": 1},
+                    ],
+                    "css": "",
+                },
+                headers=auth_headers,
+            )
+            note_model_id = response.json()["data"]["id"]
+            note_model_ids.append(note_model_id)
+
+            client.post(
+                f"/api/v1/note-models/{note_model_id}/templates",
+                json={
+                    "name": "Card 1",
+                    "question_template": "{{Front}}",
+                    "answer_template": "{{Back}}",
+                },
+                headers=auth_headers,
+            )
+
+        deck_name = f"ExportTestDeck_{unique_id}"
+        response = client.post(
+            "/api/v1/decks",
+            json={"name": deck_name, "note_model_id": note_model_ids[0]},
+            headers=auth_headers,
+        )
+        deck_id = response.json()["data"]["id"]
+
+        for m, note_model_id in enumerate(note_model_ids):
+            client.post(
+                "/api/v1/notes/batch",
+                json={
+                    "deck_id": deck_id,
+                    "note_model_id": note_model_id,
+                    "notes": [
+                        {"fields": {"Front": f"Q{i}-{m}-{unique_id}", "Back": f"A{i}"}, "tags": ["export"]}
+                        for i in range(note_count)
+                    ],
+                },
+                headers=auth_headers,
+            )
+
+        slug = f"export-test-{unique_id}"
+        response = client.post(
+            f"/api/v1/decks/{deck_id}/publish",
+            json={"slug": slug, "title": deck_name},
+            headers=auth_headers,
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        return slug
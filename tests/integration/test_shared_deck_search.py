@@ -0,0 +1,97 @@
+"""
+共享牌组市场全文搜索集成测试
+"""
+
+import uuid
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+
+class TestSharedDeckSearchAPI:
+    """共享牌组全文搜索测试"""
+
+    def test_search_title_description_and_tags(self, client: TestClient, auth_headers: dict):
+        """测试搜索标题、描述和标签"""
+        marker = uuid.uuid4().hex[:8]
+        title_id = self._create(client, auth_headers, f"Spanish {marker}", tags=["language"])
+        description_id = self._create(client, auth_headers, "Other", description=f"Covers {marker} basics")
+        tag_id = self._create(client, auth_headers, "Tagged", tags=[marker])
+
+        assert set(self._search(client, marker)) == {title_id, description_id, tag_id}
+        assert self._search(client, f"spanish {marker}") == [title_id]
+
+    def test_search_ranks_title_matches_first(self, client: TestClient, auth_headers: dict):
+        """测试标题命中的结果排在描述命中之前"""
+        marker = uuid.uuid4().hex[:8]
+        description_id = self._create(client, auth_headers, "Plain", description=f"{marker} in description")
+        title_id = self._create(client, auth_headers, f"{marker} in title")
+
+        assert self._search(client, marker) == [title_id, description_id]
+
+    def test_search_cjk_substring(self, client: TestClient, auth_headers: dict):
+        """测试中日韩文字按子串匹配"""
+        marker = uuid.uuid4().hex[:8]
+        deck_id = self._create(client, auth_headers, f"日语词汇 {marker}")
+
+        assert self._search(client, f"词汇 {marker}") == [deck_id]
+        assert self._search(client, f"日语 {marker}") == [deck_id]
+        assert self._search(client, f"词语 {marker}") == []
+
+    def test_search_prefix_without_false_positives(self, client: TestClient, auth_headers: dict):
+        """测试按词前缀匹配，不会命中词中间的子串"""
+        marker = uuid.uuid4().hex[:8]
+        prefix_id = self._create(client, auth_headers, f"Articles {marker}")
+        self._create(client, auth_headers, f"Smart {marker}")
+
+        assert self._search(client, f"art {marker}") == [prefix_id]
+
+    def test_search_index_follows_update_and_delete(self, client: TestClient, auth_headers: dict):
+        """测试更新和删除后搜索索引同步"""
+        marker = uuid.uuid4().hex[:8]
+        renamed = uuid.uuid4().hex[:8]
+        deck_id = self._create(client, auth_headers, f"Before {marker}")
+
+        client.put(f"/api/v1/shared-decks/{deck_id}", json={"title": f"After {renamed}"}, headers=auth_headers)
+        assert self._search(client, marker) == []
+        assert self._search(client, renamed) == [deck_id]
+
+        client.delete(f"/api/v1/shared-decks/{deck_id}", headers=auth_headers)
+        assert self._search(client, renamed) == []
+
+    def test_search_without_searchable_terms(self, client: TestClient):
+        """测试关键词只有标点时返回空结果"""
+        response = client.get("/api/v1/shared-decks", params={"q": '"*-'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["data"]["total"] == 0
+
+    def _create(
+        self,
+        client: TestClient,
+        auth_headers: dict,
+        title: str,
+        description: str | None = None,
+        tags: list[str] | None = None,
+    ) -> str:
+        """辅助方法：创建共享牌组，返回 ID"""
+        response = client.post(
+            "/api/v1/shared-decks",
+            json={
+                "slug": f"search-test-{uuid.uuid4().hex[:8]}",
+                "title": title,
+                "description": description,
+                "tags": tags or [],
+            },
+            headers=auth_headers,
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        return response.json()["data"]["id"]
+
+    def _search(self, client: TestClient, q: str) -> list[str]:
+        """辅助方法：搜索共享牌组，返回结果 ID 列表"""
+        response = client.get("/api/v1/shared-decks", params={"q": q, "page_size": 50})
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()["data"]
+        assert data["total"] == len(data["items"])
+        return [item["id"] for item in data["items"]]
@@ -0,0 +1,141 @@
+"""
+标签索引集成测试
+"""
+
+import uuid
+
+from fastapi import status
+from fastapi.testclient import TestClient
+
+
+class TestTagAPI:
+    """标签过滤和标签计数测试"""
+
+    def test_note_tag_filter_is_exact(self, client: TestClient, auth_headers: dict):
+        """测试笔记标签过滤精确匹配，多个标签同时满足"""
+        deck_id, note_model_id = self._create_deck_and_model(client, auth_headers)
+        art = f"art-{uuid.uuid4().hex[:6]}"
+        history = f"history-{uuid.uuid4().hex[:6]}"
+        both_id = self._create_note(client, auth_headers, deck_id, note_model_id, "Q1", [art, history])
+        art_id = self._create_note(client, auth_headers, deck_id, note_model_id, "Q2", [art])
+        self._create_note(client, auth_headers, deck_id, note_model_id, "Q3", [f"s{art}"])
+
+        assert set(self._filter_notes(client, auth_headers, art)) == {both_id, art_id}
+        assert self._filter_notes(client, auth_headers, f"{art},{history}") == [both_id]
+        assert self._filter_notes(client, auth_headers, art[:-1]) == []
+
+    def test_note_tags_follow_writes(self, client: TestClient, auth_headers: dict):
+        """测试创建、批量创建、修改、删除笔记后标签计数同步"""
+        deck_id, note_model_id = self._create_deck_and_model(client, auth_headers)
+        tag = f"sync-{uuid.uuid4().hex[:6]}"
+        note_id = self._create_note(client, auth_headers, deck_id, note_model_id, "Single", [tag, f" {tag} "])
+        client.post(
+            "/api/v1/notes/batch",
+            json={
+                "deck_id": deck_id,
+                "note_model_id": note_model_id,
+                "notes": [{"fields": {"Front": f"Batch {i}", "Back": "x"}, "tags": [tag]} for i in range(3)],
+            },
+            headers=auth_headers,
+        )
+        assert self._note_tag_counts(client, auth_headers, deck_id) == {tag: 4}
+
+        client.put(f"/api/v1/notes/{note_id}", json={"tags": ["renamed"]}, headers=auth_headers)
+        assert self._note_tag_counts(client, auth_headers, deck_id) == {tag: 3, "renamed": 1}
+
+        client.delete(f"/api/v1/notes/{note_id}", headers=auth_headers)
+        assert self._note_tag_counts(client, auth_headers, deck_id) == {tag: 3}
+        assert self._note_tag_counts(client, auth_headers)[tag] == 3
+
+    def test_shared_deck_tags(self, client: TestClient, auth_headers: dict):
+        """测试共享牌组标签精确过滤和标签计数"""
+        art = f"art-{uuid.uuid4().hex[:6]}"
+        art_id = self._create_shared_deck(client, auth_headers, [art])
+        self._create_shared_deck(client, auth_headers, [f"s{art}"])
+        other_id = self._create_shared_deck(client, auth_headers, [art, "other"])
+
+        response = client.get("/api/v1/shared-decks", params={"tag": art})
+        assert {item["id"] for item in response.json()["data"]["items"]} == {art_id, other_id}
+
+        client.put(f"/api/v1/shared-decks/{other_id}", json={"tags": ["other"]}, headers=auth_headers)
+        client.delete(f"/api/v1/shared-decks/{art_id}", headers=auth_headers)
+
+        response = client.get("/api/v1/shared-decks/tags")
+        assert response.status_code == status.HTTP_200_OK
+        counts = {item["name"]: item["count"] for item in response.json()["data"]}
+        assert art not in counts
+        assert counts[f"s{art}"] == 1
+        assert counts["other"] >= 1
+
+    def test_shared_deck_slug_tags_is_reserved(self, client: TestClient, auth_headers: dict):
+        """测试 slug 不能为 tags（与标签计数路由冲突）"""
+        response = client.post(
+            "/api/v1/shared-decks",
+            json={"slug": "tags", "title": "Tags", "language": "zh-CN"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert client.get("/api/v1/shared-decks/tags").status_code == status.HTTP_200_OK
+
+    def _create_deck_and_model(self, client: TestClient, auth_headers: dict) -> tuple[str, str]:
+        """辅助方法：创建牌组和笔记类型"""
+        unique_id = uuid.uuid4().hex[:8]
+        response = client.post(
+            "/api/v1/note-models",
+            json={
+                "name": f"TagTestModel_{unique_id}",
+                "fields_schema": [
+                    {"name": "Front", "ord": 0},
+                    {"name": "Back", "ord": 1},
+                ],
+                "css": "",
+            },
+            headers=auth_headers,
+        )
+        note_model_id = response.json()["data"]["id"]
+        response = client.post(
+            "/api/v1/decks",
+            json={"name": f"TagTestDeck_{unique_id}", "note_model_id": note_model_id},
+            headers=auth_headers,
+        )
+        return response.json()["data"]["id"], note_model_id
+
+    def _create_note(
+        self, client: TestClient, auth_headers: dict, deck_id: str, note_model_id: str, front: str, tags: list[str]
+    ) -> str:
+        """辅助方法：创建带标签的笔记"""
+        response = client.post(
+            "/api/v1/notes",
+            json={
+                "deck_id": deck_id,
+                "note_model_id": note_model_id,
+                "fields": {"Front": f"{front}-{uuid.uuid4().hex[:6]}", "Back": "A"},
+                "tags": tags,
+            },
+            headers=auth_headers,
+        )
+        return response.json()["data"]["id"]
+
+    def _filter_notes(self, client: TestClient, auth_headers: dict, tags: str) -> list[str]:
+        """辅助方法：按标签过滤笔记，返回 ID 列表"""
+        response = client.get("/api/v1/notes", params={"tags": tags, "page_size": 50}, headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        return [item["id"] for item in response.json()["data"]["items"]]
+
+    def _note_tag_counts(self, client: TestClient, auth_headers: dict, deck_id: str | None = None) -> dict[str, int]:
+        """辅助方法：获取笔记标签计数"""
+        params = {"deck_id": deck_id} if deck_id else {}
+        response = client.get("/api/v1/notes/tags", params=params, headers=auth_headers)
+        assert response.status_code == status.HTTP_200_OK
+        return {item["name"]: item["count"] for item in response.json()["data"]}
+
+    def _create_shared_deck(self, client: TestClient, auth_headers: dict, tags: list[str]) -> str:
+        """辅助方法：创建带标签的共享牌组"""
+        response = client.post(
+            "/api/v1/shared-decks",
+            json={"slug": f"tag-test-{uuid.uuid4().hex[:8]}", "title": "Tag Test", "tags": tags},
+            headers=auth_headers,
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        return response.json()["data"]["id"]
@@ -0,0 +1,130 @@
+"""
+下载计数单元测试
+
+测试分片计数在并发累加和写入时不丢失增量
+"""
+
+import asyncio
+import threading
+import uuid
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.models import Base, SharedDeck
+from app.services.download_counter import DownloadCounter
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    """在临时文件数据库上创建会话工厂"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'downloads.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def _create_decks(session_factory, count: int) -> list[SharedDeck]:
+    """辅助方法：创建共享牌组"""
+    decks = [
+        SharedDeck(
+            author_id=str(uuid.uuid4()),
+            slug=f"downloads-{uuid.uuid4().hex[:8]}",
+            title="Downloads",
+        )
+        for _ in range(count)
+    ]
+    async with session_factory() as session:
+        session.add_all(decks)
+        await session.commit()
+    return decks
+
+
+async def _download_counts(session_factory) -> dict[str, int]:
+    """辅助方法：读取数据库中的下载次数"""
+    async with session_factory() as session:
+        rows = await session.execute(select(SharedDeck.id, SharedDeck.download_count))
+        return dict(rows.tuples().all())
+
+
+class TestDownloadCounter:
+    """下载计数测试类"""
+
+    @pytest.mark.unit
+    async def test_concurrent_adds_are_not_lost(self, session_factory):
+        """测试多线程、多协程并发累加且同时写入时，所有增量都写入数据库"""
+        decks = await _create_decks(session_factory, 3)
+        updated_at = {deck.id: deck.updated_at for deck in decks}
+        counter = DownloadCounter(shards=4)
+        counter.session_factory = session_factory
+
+        def add_in_thread() -> None:
+            for i in range(500):
+                counter.add(decks[i % len(decks)].id)
+
+        async def add_in_task(index: int) -> None:
+            for _ in range(20):
+                counter.add(decks[index % len(decks)].id)
+                await asyncio.sleep(0)
+
+        stop = asyncio.Event()
+
+        async def flush_loop() -> None:
+            while not stop.is_set():
+                await counter.flush()
+                await asyncio.sleep(0)
+
+        flusher = asyncio.create_task(flush_loop())
+        threads = [threading.Thread(target=add_in_thread) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        await asyncio.gather(*(add_in_task(i) for i in range(30)))
+        await asyncio.to_thread(lambda: [thread.join() for thread in threads])
+        stop.set()
+        await flusher
+        await counter.flush()
+
+        counts = await _download_counts(session_factory)
+        assert sum(counts.values()) == 8 * 500 + 30 * 20
+        assert counter.pending() == {}
+
+        # 下载计数不修改 updated_at
+        async with session_factory() as session:
+            for deck in decks:
+                assert (await session.get(SharedDeck, deck.id)).updated_at == updated_at[deck.id]
+
+    @pytest.mark.unit
+    async def test_failed_flush_keeps_counts(self, session_factory, tmp_path):
+        """测试写入失败时增量保留在缓冲中，下次写入成功"""
+        (deck,) = await _create_decks(session_factory, 1)
+        broken_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'empty.db'}")
+        counter = DownloadCounter(shards=2)
+        counter.session_factory = async_sessionmaker(broken_engine, class_=AsyncSession)
+        counter.add(deck.id, 3)
+
+        with pytest.raises(OperationalError):
+            await counter.flush()
+        assert counter.pending() == {deck.id: 3}
+
+        counter.add(deck.id)
+        counter.session_factory = session_factory
+        assert await counter.flush() == 4
+        assert (await _download_counts(session_factory))[deck.id] == 4
+        await broken_engine.dispose()
+
+    @pytest.mark.unit
+    async def test_stop_flushes_pending_counts(self, session_factory):
+        """测试停止时写入剩余的计数"""
+        (deck,) = await _create_decks(session_factory, 1)
+        counter = DownloadCounter(shards=2)
+        counter.session_factory = session_factory
+        counter.start()
+        counter.add(deck.id, 2)
+
+        await counter.stop()
+
+        assert (await _download_counts(session_factory))[deck.id] == 2
+        assert counter.pending() == {}
@@ -0,0 +1,192 @@
+"""
+进程内缓存和到期队列索引单元测试
+"""
+
+import random
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.core.cache import SessionInvalidator, TTLCache
+from app.services.due_queue import QUEUE_RANK, DueQueue
+
+
+class FakeClock:
+    """可手动推进的时钟"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def reference_take(
+    cards: dict[str, tuple[str, str, int]], limit: int, deck_id: str | None = None, due_before: int | None = None
+) -> list[str]:
+    """按定义计算到期卡片：过滤后按 (队列, 到期时间, 卡片 ID) 全量排序"""
+    rows = [
+        (queue, due, card_id)
+        for card_id, (card_deck, queue, due) in cards.items()
+        if queue in QUEUE_RANK
+        and (deck_id is None or card_deck == deck_id)
+        and (due_before is None or due <= due_before)
+    ]
+    return [card_id for _, _, card_id in sorted(rows)[:limit]]
+
+
+@pytest.mark.unit
+class TestTTLCache:
+    """TTL + LRU 缓存测试类"""
+
+    def test_hit_miss_and_expiry(self):
+        """测试命中、未命中和过期"""
+        clock = FakeClock()
+        cache: TTLCache[str, int] = TTLCache("test", max_size=10, ttl_seconds=5, clock=clock)
+
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        clock.now = 5
+        assert cache.get("a") is None
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.expirations, stats.size) == (1, 2, 1, 0)
+        assert stats.hit_rate == pytest.approx(1 / 3)
+
+    def test_lru_eviction(self):
+        """测试超出容量时淘汰最久未访问的条目"""
+        cache: TTLCache[str, int] = TTLCache("test", max_size=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.peek("b") is None
+        assert cache.peek("a") == 1
+        assert cache.peek("c") == 3
+        assert cache.stats().evictions == 1
+
+    def test_peek_and_invalidate(self):
+        """测试 peek 不计入指标，invalidate 只统计实际删除的条目"""
+        cache: TTLCache[str, int] = TTLCache("test", max_size=2, ttl_seconds=60)
+        cache.set("a", 1)
+
+        assert cache.peek("a") == 1
+        cache.invalidate("a")
+        cache.invalidate("a")
+
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.invalidations) == (0, 0, 1)
+
+    def test_disabled(self):
+        """测试容量为 0 时不缓存"""
+        cache: TTLCache[str, int] = TTLCache("test", max_size=0, ttl_seconds=60)
+        cache.set("a", 1)
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+@pytest.mark.unit
+class TestSessionInvalidator:
+    """跟随事务的缓存失效测试类"""
+
+    def test_invalidate_on_commit_and_discard_on_rollback(self):
+        """测试写入时立即失效、提交后再失效一次，回滚时交给 on_rollback"""
+        invalidated: list[str] = []
+        rolled_back: list[str] = []
+        invalidator = SessionInvalidator("test_invalidations", invalidated.append, on_rollback=rolled_back.append)
+        engine = create_engine("sqlite://")
+
+        with Session(engine) as session:
+            session.execute(text("SELECT 1"))
+            invalidator.defer(session, "a")
+            assert invalidated == ["a"]
+            assert invalidator.generation == 1
+            session.commit()
+            assert invalidated == ["a", "a"]
+            assert invalidator.generation == 2
+
+            session.execute(text("SELECT 1"))
+            invalidator.defer(session, "b")
+            session.rollback()
+            assert invalidated == ["a", "a", "b"]
+            assert rolled_back == ["b"]
+
+            session.execute(text("SELECT 1"))
+            session.commit()
+            assert invalidated == ["a", "a", "b"]
+        engine.dispose()
+
+
+@pytest.mark.unit
+class TestDueQueue:
+    """到期队列索引测试类"""
+
+    def test_take_order_and_filters(self):
+        """测试按队列、到期时间排序，并按牌组和到期时间过滤"""
+        queue = DueQueue.build(
+            [
+                ("r1", "d1", "review", 50),
+                ("n1", "d2", "new", 0),
+                ("l1", "d1", "learning", 200),
+                ("r2", "d2", "review", 10),
+                ("n2", "d1", "new", 0),
+            ]
+        )
+
+        assert queue.take(10) == ["l1", "n1", "n2", "r2", "r1"]
+        assert queue.take(3) == ["l1", "n1", "n2"]
+        assert queue.take(10, deck_id="d1") == ["l1", "n2", "r1"]
+        assert queue.take(10, due_before=10) == ["n1", "n2", "r2"]
+        assert queue.take(2, deck_id="d1", due_before=100) == ["n2", "r1"]
+        assert queue.take(10, deck_id="missing") == []
+
+    def test_apply_changes(self):
+        """测试应用卡片变更：更新、移入移出活跃队列、换牌组和删除"""
+        queue = DueQueue.build([("a", "d1", "review", 100), ("b", "d1", "new", 0)])
+
+        assert queue.apply({"id": "a", "due": 5})
+        assert queue.get("a") == ("d1", "review", 5)
+        assert queue.apply({"id": "b", "queue": "suspended"})
+        assert queue.get("b") is None
+        # 不在索引中的卡片只更新到期时间：仍不在活跃队列中
+        assert queue.apply({"id": "b", "due": 7})
+        # 进入活跃队列但缺少牌组时无法确定索引键
+        assert not queue.apply({"id": "b", "queue": "review", "due": 7})
+        assert queue.apply({"id": "c", "deck_id": "d2", "queue": "learning", "due": 1})
+        assert queue.apply({"id": "a", "deck_id": "d2"})
+        assert queue.take(10, deck_id="d2") == ["c", "a"]
+        assert queue.take(10, deck_id="d1") == []
+        assert queue.apply({"id": "c", "deleted": True})
+        assert queue.take(10) == ["a"]
+        assert len(queue) == 1
+
+    def test_matches_full_sort(self):
+        """测试随机变更后取出的结果与全量过滤排序一致"""
+        rng = random.Random(0)
+        queues = ["learning", "new", "review", "suspended"]
+        cards = {f"c{i}": (rng.choice(["d1", "d2"]), rng.choice(queues), rng.randint(0, 50)) for i in range(300)}
+        queue = DueQueue.build(
+            (card_id, deck_id, card_queue, due)
+            for card_id, (deck_id, card_queue, due) in cards.items()
+            if card_queue in QUEUE_RANK
+        )
+
+        for _ in range(500):
+            card_id = f"c{rng.randrange(320)}"
+            if card_id in cards and rng.random() < 0.1:
+                del cards[card_id]
+                assert queue.apply({"id": card_id, "deleted": True})
+                continue
+            cards[card_id] = (rng.choice(["d1", "d2"]), rng.choice(queues), rng.randint(0, 50))
+            deck_id, card_queue, due = cards[card_id]
+            assert queue.apply({"id": card_id, "deck_id": deck_id, "queue": card_queue, "due": due})
+
+        for deck_id in (None, "d1", "d2"):
+            for due_before in (None, 0, 25, 100):
+                for limit in (1, 20, 1000):
+                    expected = reference_take(cards, limit, deck_id, due_before)
+                    assert queue.take(limit, deck_id=deck_id, due_before=due_before) == expected
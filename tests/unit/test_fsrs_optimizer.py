@@ -0,0 +1,153 @@
+"""
+FSRS 参数优化单元测试
+
+用已知参数模拟复习历史，检查优化能降低损失并向模拟参数靠拢。
+"""
+
+import numpy as np
+import pytest
+
+from app.scheduler.base import DAY_MS
+from app.scheduler.batch import NUMPY_OPS
+from app.scheduler.fsrs import (
+    FSRS_DEFAULT_WEIGHTS,
+    S_MIN,
+    forgetting_curve,
+    init_difficulty,
+    next_state,
+)
+from app.scheduler.optimizer import WEIGHT_BOUNDS, ReviewHistoryBuilder, evaluate, fit
+
+# 模拟用的参数：初始稳定性明显高于默认值
+TRUE_WEIGHTS = (1.0, 2.5, 6.0, 25.0, *FSRS_DEFAULT_WEIGHTS[4:])
+
+
+def simulate(weights: tuple[float, ...], cards: int, reviews: int, seed: int = 0) -> list[tuple]:
+    """按给定参数模拟复习记录，返回按 (卡片, 时间) 排序的 (卡片 ID, 复习时间, 评分, 复习前状态)"""
+    rng = np.random.default_rng(seed)
+    w = np.asarray(weights)
+    g = rng.choice([1, 2, 3, 4], cards, p=[0.2, 0.1, 0.6, 0.1])
+    s = np.maximum(w[g - 1], S_MIN)
+    d = init_difficulty(w, g, NUMPY_OPS)
+    day = rng.integers(0, 100, cards)
+    days, ratings = [day.copy()], [g.copy()]
+    for _ in range(reviews - 1):
+        interval = np.maximum(1, np.round(s * rng.uniform(0.5, 1.5, cards)))
+        day = day + interval
+        recalled = rng.random(cards) < forgetting_curve(w, interval, s, NUMPY_OPS)
+        g = np.where(recalled, rng.choice([2, 3, 4], cards, p=[0.15, 0.75, 0.1]), 1)
+        d, s = next_state(w, d, s, interval, g, ops=NUMPY_OPS)
+        days.append(day.copy())
+        ratings.append(g.copy())
+    return [
+        (f"card-{card}", int(days[i][card]) * DAY_MS, int(ratings[i][card]), "new" if i == 0 else "review")
+        for card in range(cards)
+        for i in range(reviews)
+    ]
+
+
+def build(rows: list[tuple], chunk_size: int = 1000, **kwargs):
+    """分块构造复习历史"""
+    builder = ReviewHistoryBuilder(**kwargs)
+    for start in range(0, len(rows), chunk_size):
+        builder.add(rows[start : start + chunk_size])
+    return builder.build()
+
+
+@pytest.mark.unit
+class TestReviewHistoryBuilder:
+    """复习历史构造测试类"""
+
+    def test_groups_reviews_by_card_across_chunks(self):
+        """测试跨块的同一卡片被合并，天数差按 UTC 日期计算"""
+        rows = [
+            ("a", 0, 3, "new"),
+            ("a", DAY_MS + 5, 3, "learning"),
+            ("a", 4 * DAY_MS - 1, 1, "review"),
+            ("b", 10 * DAY_MS, 2, None),
+            ("b", 10 * DAY_MS + 60_000, 3, "learning"),
+        ]
+        history = build(rows, chunk_size=2)
+
+        assert history.card_count == 2
+        assert history.offsets.tolist() == [0, 3, 5]
+        assert history.elapsed.tolist() == [0, 1, 2, 0, 0]
+        assert history.rating.tolist() == [3, 3, 1, 2, 3]
+        # 首次复习和同日复习不计入样本
+        assert history.sample_count == 2
+
+    def test_skips_incomplete_histories(self):
+        """测试跳过不是从新卡片开始的卡片和只有一次复习的卡片"""
+        rows = [
+            ("imported", 0, 3, "review"),
+            ("imported", DAY_MS, 3, "review"),
+            ("single", 0, 3, "new"),
+            ("kept", 0, 3, "new"),
+            ("kept", 2 * DAY_MS, 4, "review"),
+        ]
+        history = build(rows)
+
+        assert history.card_count == 1
+        assert history.rating.tolist() == [3, 4]
+
+    def test_max_reviews_per_card(self):
+        """测试每张卡片只保留最早的若干次复习"""
+        rows = [("a", i * DAY_MS, 3, "new" if i == 0 else "review") for i in range(10)]
+        history = build(rows, max_reviews_per_card=4)
+
+        assert history.review_count == 4
+        assert history.sample_count == 3
+
+    def test_empty(self):
+        """测试没有复习记录"""
+        history = ReviewHistoryBuilder().build()
+
+        assert history.card_count == 0
+        assert history.sample_count == 0
+
+
+@pytest.mark.unit
+class TestFSRSOptimizer:
+    """FSRS 参数优化测试类"""
+
+    def test_fit_reduces_loss(self):
+        """测试优化降低损失，参数在取值范围内并向模拟参数靠拢"""
+        history = build(simulate(TRUE_WEIGHTS, cards=500, reviews=8))
+        steps: list[tuple[int, int]] = []
+
+        result = fit(history, FSRS_DEFAULT_WEIGHTS, on_step=lambda done, total: steps.append((done, total)))
+
+        assert result.sample_count == history.sample_count == 500 * 7
+        assert result.loss_after < result.loss_before
+        assert result.loss_after == pytest.approx(evaluate(history, result.weights))
+        assert steps and steps[-1][0] == steps[-1][1]
+        assert all(low <= w <= high for w, (low, high) in zip(result.weights, WEIGHT_BOUNDS, strict=True))
+        # 初始稳定性（Good）向模拟参数移动
+        assert abs(result.weights[2] - TRUE_WEIGHTS[2]) < abs(FSRS_DEFAULT_WEIGHTS[2] - TRUE_WEIGHTS[2])
+
+    def test_fit_without_short_term(self):
+        """测试关闭同日短期稳定性公式时优化全部 21 个参数"""
+        history = build(simulate(TRUE_WEIGHTS, cards=200, reviews=6))
+
+        result = fit(history, FSRS_DEFAULT_WEIGHTS, enable_short_term=False, epochs=2)
+
+        assert len(result.weights) == 21
+        assert result.loss_after <= result.loss_before
+
+    def test_fit_can_be_aborted(self):
+        """测试回调抛出异常时中止优化"""
+        history = build(simulate(TRUE_WEIGHTS, cards=100, reviews=4))
+
+        def abort(done: int, total: int) -> None:
+            raise RuntimeError("cancelled")
+
+        with pytest.raises(RuntimeError):
+            fit(history, on_step=abort)
+
+    def test_fit_invalid_input(self):
+        """测试无效的参数个数和没有样本的历史"""
+        history = build(simulate(TRUE_WEIGHTS, cards=10, reviews=3))
+        with pytest.raises(ValueError):
+            fit(history, FSRS_DEFAULT_WEIGHTS[:19])
+        with pytest.raises(ValueError):
+            fit(ReviewHistoryBuilder().build())
@@ -0,0 +1,368 @@
+"""
+调度算法单元测试
+
+SM-2 的期望值取自前端 web/src/scheduler/sm2.ts 在相同输入下的输出；
+FSRS 的期望值取自 fsrs_golden.json，由参考实现生成（scripts/gen_fsrs_golden.py 使用 py-fsrs，
+web/scripts/fsrs-golden.mjs 使用前端的 ts-fsrs），不由被测代码计算。
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.scheduler import (
+    DAY_MS,
+    FSRS_DEFAULT_WEIGHTS,
+    MINUTE_MS,
+    FSRSParameters,
+    schedule,
+    schedule_fsrs,
+)
+from app.scheduler.batch import CardBatch, schedule_batch
+from app.scheduler.fsrs import init_difficulty, init_stability, next_interval, next_state
+
+NOW = 1760000000000
+
+GOLDEN = json.loads((Path(__file__).parent / "fsrs_golden.json").read_text())
+# 参考实现对中间结果的舍入方式不同（ts-fsrs 保留 8 位小数），记忆状态按此精度比较
+TOLERANCE = 1e-6
+
+
+def _golden_transition(difficulty: float, stability: float, elapsed_days: int, rating: int) -> dict:
+    """取出给定输入的记忆状态转移期望值"""
+    for case in GOLDEN["transitions"]:
+        if (case["difficulty"], case["stability"], case["elapsed_days"], case["rating"]) == (
+            difficulty,
+            stability,
+            elapsed_days,
+            rating,
+        ):
+            return case["expected"]
+    raise KeyError((difficulty, stability, elapsed_days, rating))
+
+
+@dataclass
+class Card:
+    """测试用卡片"""
+
+    state: str = "new"
+    interval: int = 0
+    ease_factor: int = 2500
+    stability: float = 0.0
+    difficulty: float = 0.0
+    last_review: int | None = None
+
+
+# (state, interval, ease_factor, rating) -> (state, interval, ease_factor, due - now)
+SM2_GOLDEN = [
+    ("new", 0, 2500, 1, "relearning", 0, 2300, 10 * MINUTE_MS),
+    ("new", 0, 2500, 2, "learning", 0, 2500, 5 * MINUTE_MS),
+    ("new", 0, 2500, 3, "review", 1, 2500, DAY_MS),
+    ("new", 0, 2500, 4, "review", 4, 2650, 4 * DAY_MS),
+    ("new", 0, 0, 3, "review", 1, 2500, DAY_MS),
+    ("learning", 0, 2500, 1, "relearning", 0, 2300, 10 * MINUTE_MS),
+    ("learning", 0, 2500, 2, "review", 1, 2350, DAY_MS),
+    ("learning", 0, 2500, 4, "review", 1, 2650, DAY_MS),
+    ("relearning", 0, 1400, 1, "relearning", 0, 1300, 10 * MINUTE_MS),
+    ("relearning", 0, 1400, 2, "learning", 0, 1400, 5 * MINUTE_MS),
+    ("relearning", 0, 1400, 4, "review", 4, 1550, 4 * DAY_MS),
+    ("review", 1, 2500, 2, "review", 1, 2350, DAY_MS),
+    ("review", 1, 2500, 3, "review", 3, 2500, 3 * DAY_MS),
+    ("review", 3, 1300, 2, "review", 4, 1300, 4 * DAY_MS),
+    ("review", 3, 1300, 4, "review", 6, 1450, 6 * DAY_MS),
+    ("review", 5, 2360, 1, "relearning", 0, 2160, 10 * MINUTE_MS),
+    ("review", 5, 2360, 2, "review", 6, 2210, 6 * DAY_MS),
+    ("review", 5, 2360, 3, "review", 12, 2360, 12 * DAY_MS),
+    ("review", 5, 2360, 4, "review", 16, 2510, 16 * DAY_MS),
+    ("review", 10, 2500, 4, "review", 34, 2650, 34 * DAY_MS),
+    ("review", 13, 2850, 3, "review", 37, 2850, 37 * DAY_MS),
+    ("review", 13, 2850, 4, "review", 51, 3000, 51 * DAY_MS),
+    ("review", 200, 2500, 2, "review", 240, 2350, 240 * DAY_MS),
+    ("review", 200, 2500, 3, "review", 365, 2500, 365 * DAY_MS),
+]
+
+
+class TestSM2Scheduler:
+    """SM-2 调度测试类"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        ("state", "interval", "ease_factor", "rating", "exp_state", "exp_interval", "exp_ease", "exp_delay"),
+        SM2_GOLDEN,
+    )
+    def test_matches_frontend(self, state, interval, ease_factor, rating, exp_state, exp_interval, exp_ease, exp_delay):
+        """测试与前端 SM-2 实现结果一致"""
+        card = Card(state=state, interval=interval, ease_factor=ease_factor, stability=1.5, difficulty=4.0)
+        result = schedule(card, rating, "sm2", now=NOW)
+
+        assert result.state == exp_state
+        assert result.queue == ("learning" if exp_state in ("learning", "relearning") else "review")
+        assert result.interval == exp_interval
+        assert result.ease_factor == exp_ease
+        assert result.due - NOW == exp_delay
+        # SM-2 不修改 FSRS 记忆状态
+        assert (result.stability, result.difficulty) == (1.5, 4.0)
+
+
+class TestFSRSScheduler:
+    """FSRS 调度测试类"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("case", GOLDEN["init"], ids=lambda case: f"rating={case['rating']}")
+    def test_golden_initial_memory(self, case):
+        """测试新卡片按评分初始化稳定性和难度"""
+        w = FSRS_DEFAULT_WEIGHTS
+
+        assert init_stability(w, case["rating"]) == pytest.approx(case["stability"], abs=TOLERANCE)
+        assert init_difficulty(w, case["rating"]) == pytest.approx(case["difficulty"], abs=TOLERANCE)
+        assert next_interval(case["stability"], 0, FSRSParameters()) == case["interval"]
+
+    @pytest.mark.unit
+    def test_golden_transitions(self):
+        """测试单次复习的记忆状态转移和间隔"""
+        for case in GOLDEN["transitions"]:
+            expected = case["expected"]
+            difficulty, stability = next_state(
+                FSRS_DEFAULT_WEIGHTS, case["difficulty"], case["stability"], case["elapsed_days"], case["rating"]
+            )
+
+            assert difficulty == pytest.approx(expected["difficulty"], abs=TOLERANCE), case
+            assert stability == pytest.approx(expected["stability"], rel=TOLERANCE, abs=TOLERANCE), case
+            assert next_interval(stability, 0, FSRSParameters()) == expected["interval"], case
+
+    @pytest.mark.unit
+    def test_golden_intervals(self):
+        """测试不同目标保留率下稳定性到间隔的换算"""
+        for case in GOLDEN["intervals"]:
+            params = FSRSParameters(request_retention=case["request_retention"])
+            assert next_interval(case["stability"], 0, params) == case["interval"], case
+
+    @pytest.mark.unit
+    def test_golden_histories(self):
+        """测试按复习序列逐次重放后的记忆状态（误差不随复习次数累积）"""
+        w = FSRS_DEFAULT_WEIGHTS
+        for history in GOLDEN["histories"]:
+            difficulty = init_difficulty(w, history["first_rating"])
+            stability = init_stability(w, history["first_rating"])
+            for (elapsed, rating), (exp_difficulty, exp_stability) in zip(
+                history["reviews"], history["states"], strict=True
+            ):
+                difficulty, stability = next_state(w, difficulty, stability, elapsed, rating)
+                assert difficulty == pytest.approx(exp_difficulty, abs=TOLERANCE)
+                assert stability == pytest.approx(exp_stability, rel=TOLERANCE, abs=TOLERANCE)
+
+    @pytest.mark.unit
+    def test_default_weights_match_golden(self):
+        """测试默认参数与生成期望值时使用的参数一致"""
+        assert list(FSRS_DEFAULT_WEIGHTS) == GOLDEN["weights"]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("rating", [1, 2, 3, 4])
+    def test_versions_share_default_parameters(self, rating):
+        """测试 fsrs_v4 与 fsrs_v5 使用同一组默认参数（与前端一致）"""
+        card = Card(state="review", interval=10, stability=10.0, difficulty=5.0, last_review=NOW - 10 * DAY_MS)
+
+        assert schedule(card, rating, "fsrs_v4", now=NOW) == schedule(card, rating, "fsrs_v5", now=NOW)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(("rating", "exp_ease"), [(1, 897), (2, 1222), (3, 1970), (4, 2250)])
+    def test_new_card_initial_memory(self, rating, exp_ease):
+        """测试新卡片的记忆状态与期望值一致，易度因子由难度换算"""
+        case = GOLDEN["init"][rating - 1]
+        result = schedule(Card(), rating, "fsrs_v5", now=NOW)
+
+        assert result.stability == pytest.approx(case["stability"], abs=TOLERANCE)
+        assert result.difficulty == pytest.approx(case["difficulty"], abs=TOLERANCE)
+        assert result.ease_factor == exp_ease
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        ("rating", "exp_state", "exp_delay"),
+        [
+            (1, "learning", MINUTE_MS),
+            (2, "learning", 6 * MINUTE_MS),
+            (3, "learning", 10 * MINUTE_MS),
+            (4, "review", GOLDEN["init"][3]["interval"] * DAY_MS),
+        ],
+    )
+    def test_new_card_learning_steps(self, rating, exp_state, exp_delay):
+        """测试新卡片的学习步骤（默认 1m/10m，Easy 直接毕业）"""
+        result = schedule(Card(), rating, "fsrs_v5", now=NOW)
+
+        assert result.state == exp_state
+        assert result.due - NOW == exp_delay
+        assert result.interval == (GOLDEN["init"][3]["interval"] if rating == 4 else 0)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("rating", [1, 2, 3, 4])
+    def test_review_card(self, rating):
+        """测试按期复习的卡片（稳定性 10 天，间隔 10 天）"""
+        expected = _golden_transition(5.0, 10.0, 10, rating)
+        card = Card(state="review", interval=10, stability=10.0, difficulty=5.0, last_review=NOW - 10 * DAY_MS)
+        result = schedule(card, rating, "fsrs_v5", now=NOW)
+
+        assert result.stability == pytest.approx(expected["stability"], abs=TOLERANCE)
+        assert result.difficulty == pytest.approx(expected["difficulty"], abs=TOLERANCE)
+        if rating == 1:
+            assert (result.state, result.interval) == ("relearning", 0)
+            assert result.due - NOW == 10 * MINUTE_MS
+        else:
+            assert (result.state, result.interval) == ("review", expected["interval"])
+            assert result.due - NOW == expected["interval"] * DAY_MS
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(("rating", "exp_state", "exp_delay"), [(1, "relearning", 10), (2, "relearning", 15)])
+    def test_relearning_steps(self, rating, exp_state, exp_delay):
+        """测试重学步骤（默认 10m，Hard 为 1.5 倍）"""
+        card = Card(state="relearning", stability=2.0, difficulty=7.0, last_review=NOW - 3 * DAY_MS)
+        result = schedule(card, rating, "fsrs_v5", now=NOW)
+
+        assert result.state == exp_state
+        assert result.due - NOW == exp_delay * MINUTE_MS
+        assert result.stability == pytest.approx(_golden_transition(7.0, 2.0, 3, rating)["stability"], abs=TOLERANCE)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("rating", [1, 2, 3, 4])
+    def test_same_day_review_uses_short_term_stability(self, rating):
+        """测试同一天内再次复习时使用短期稳定性公式"""
+        card = Card(state="review", interval=3, stability=3.0, difficulty=6.0, last_review=NOW - 3600 * 1000)
+        expected = _golden_transition(6.0, 3.0, 0, rating)
+
+        assert schedule(card, rating, "fsrs_v5", now=NOW).stability == pytest.approx(
+            expected["stability"], abs=TOLERANCE
+        )
+
+    @pytest.mark.unit
+    def test_review_intervals_are_ordered(self):
+        """测试复习卡片 Hard <= Good < Easy"""
+        for stability in (0.5, 1.0, 3.0, 30.0, 300.0):
+            card = Card(state="review", interval=1, stability=stability, difficulty=9.0, last_review=NOW - 2 * DAY_MS)
+            hard, good, easy = (schedule(card, rating, "fsrs_v5", now=NOW).interval for rating in (2, 3, 4))
+            assert 1 <= hard <= good < easy
+
+    @pytest.mark.unit
+    def test_card_without_memory_state(self):
+        """测试没有记忆状态的复习卡片（例如从 SM-2 切换）按评分初始化"""
+        card = Card(state="review", interval=7, last_review=NOW - 7 * DAY_MS)
+        result = schedule(card, 3, "fsrs_v5", now=NOW)
+
+        assert result.stability == pytest.approx(GOLDEN["init"][2]["stability"])
+        assert result.interval == GOLDEN["init"][2]["interval"]
+
+    @pytest.mark.unit
+    def test_maximum_interval(self):
+        """测试最大间隔限制"""
+        params = FSRSParameters.for_scheduler("fsrs_v5", maximum_interval=30)
+        card = Card(state="review", interval=10, stability=10.0, difficulty=5.0, last_review=NOW - 10 * DAY_MS)
+
+        assert schedule_fsrs(card, 4, now=NOW, params=params).interval == 30
+
+    @pytest.mark.unit
+    def test_fuzz_stays_near_interval(self):
+        """测试开启间隔扰动后结果落在原间隔附近"""
+        import random
+
+        params = FSRSParameters.for_scheduler("fsrs_v5", enable_fuzz=True)
+        card = Card(state="review", interval=10, stability=10.0, difficulty=5.0, last_review=NOW - 10 * DAY_MS)
+        rng = random.Random(42)
+        intervals = {schedule_fsrs(card, 3, now=NOW, params=params, rng=rng).interval for _ in range(200)}
+        base = _golden_transition(5.0, 10.0, 10, 3)["interval"]
+
+        assert len(intervals) > 1
+        assert all(base - 4 <= interval <= base + 4 for interval in intervals)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"weights": (1.0,) * 10},
+            {"weights": FSRS_DEFAULT_WEIGHTS[:19]},
+            {"weights": (*FSRS_DEFAULT_WEIGHTS[:20], 0.0)},
+            {"request_retention": 1.0},
+            {"maximum_interval": 0},
+            {"learning_steps": (0,)},
+        ],
+    )
+    def test_invalid_parameters(self, kwargs):
+        """测试无效的 FSRS 参数"""
+        with pytest.raises(ValueError):
+            FSRSParameters(**kwargs)
+
+    @pytest.mark.unit
+    def test_invalid_rating(self):
+        """测试无效评分"""
+        with pytest.raises(ValueError):
+            schedule(Card(), 5, "fsrs_v5", now=NOW)
+
+
+class TestBatchScheduler:
+    """批量调度测试类"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("scheduler", ["sm2", "fsrs_v4", "fsrs_v5"])
+    def test_batch_matches_scalar(self, scheduler):
+        """测试批量调度与逐张调度结果一致"""
+        import random
+
+        rng = random.Random(7)
+        cards = []
+        for _ in range(2000):
+            has_memory = rng.random() < 0.85
+            cards.append(
+                Card(
+                    state=rng.choice(["new", "learning", "review", "relearning"]),
+                    interval=rng.randint(0, 400),
+                    ease_factor=rng.choice([0, 1300, 2500, 2850]),
+                    stability=rng.uniform(0.01, 300) if has_memory else 0.0,
+                    difficulty=rng.uniform(1, 10) if has_memory else 0.0,
+                    last_review=rng.choice([None, NOW - rng.randint(0, 200 * DAY_MS)]),
+                )
+            )
+        ratings = [rng.randint(1, 4) for _ in cards]
+
+        results = schedule_batch(CardBatch.from_cards(cards), ratings, scheduler, now=NOW).to_results()
+
+        for card, rating, result in zip(cards, ratings, results, strict=True):
+            expected = schedule(card, rating, scheduler, now=NOW)
+            assert (result.state, result.queue, result.due, result.interval, result.ease_factor) == (
+                expected.state,
+                expected.queue,
+                expected.due,
+                expected.interval,
+                expected.ease_factor,
+            )
+            assert result.stability == pytest.approx(expected.stability)
+            assert result.difficulty == pytest.approx(expected.difficulty)
+
+    @pytest.mark.unit
+    def test_batch_invalid_ratings(self):
+        """测试批量调度的评分校验"""
+
+        batch = CardBatch.from_cards([Card(), Card()])
+        with pytest.raises(ValueError):
+            schedule_batch(batch, [3], "fsrs_v5", now=NOW)
+        with pytest.raises(ValueError):
+            schedule_batch(batch, [3, 0], "fsrs_v5", now=NOW)
+
+    @pytest.mark.slow
+    @pytest.mark.unit
+    def test_batch_one_million_cards(self):
+        """测试一百万张卡片的批量调度"""
+
+        n = 1_000_000
+        gen = np.random.default_rng(0)
+        batch = CardBatch(
+            state=np.full(n, 2),
+            interval=np.full(n, 10),
+            ease_factor=np.full(n, 2500),
+            stability=gen.uniform(1, 100, n),
+            difficulty=gen.uniform(1, 10, n),
+            last_review=np.full(n, NOW - 10 * DAY_MS),
+        )
+        result = schedule_batch(batch, gen.integers(1, 5, n), "fsrs_v5", now=NOW)
+
+        assert len(result) == n
+        assert bool((result.due > NOW).all())
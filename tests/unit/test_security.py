@@ -4,14 +4,18 @@
 测试密码哈希、JWT 令牌等安全功能
 """
 
+import asyncio
 import uuid
 
 import pytest
 
+from app.core.exceptions import TooManyRequestsException
+from app.core.password import PasswordHasher
 from app.core.security import (
     create_tokens,
     get_password_hash,
     get_token_hash,
+    needs_rehash,
     verify_access_token,
     verify_password,
     verify_refresh_token,
@@ -73,6 +77,54 @@ class TestPasswordHashing:
         assert verify_password(password, hash1) is True
         assert verify_password(password, hash2) is True
 
+    @pytest.mark.unit
+    def test_needs_rehash(self):
+        """测试成本因子与配置不一致时需要重新哈希"""
+        hashed = get_password_hash("password", rounds=4)
+
+        assert needs_rehash(hashed, 4) is False
+        assert needs_rehash(hashed, 5) is True
+        assert needs_rehash("not-a-bcrypt-hash", 4) is True
+
+
+class TestPasswordHasher:
+    """密码哈希执行器测试类"""
+
+    @pytest.mark.unit
+    async def test_hash_and_verify(self):
+        """测试在线程池中哈希和校验，并记录指标"""
+        hasher = PasswordHasher(workers=2, max_pending=0, rounds=4)
+        try:
+            hashed = await hasher.hash("password")
+
+            assert await hasher.verify("password", hashed) is True
+            assert await hasher.verify("wrong", hashed) is False
+            assert hasher.needs_rehash(hashed) is False
+            stats = hasher.stats()
+            assert stats.completed == 3
+            assert stats.running == 0 and stats.waiting == 0
+        finally:
+            hasher.shutdown()
+
+    @pytest.mark.unit
+    async def test_concurrency_limit_and_queue_depth(self):
+        """测试并发超过线程数时排队，超过提交上限时拒绝"""
+        hasher = PasswordHasher(workers=1, max_pending=3, rounds=4)
+        try:
+            results = await asyncio.gather(
+                *(hasher.hash("password") for _ in range(4)),
+                return_exceptions=True,
+            )
+
+            rejected = [result for result in results if isinstance(result, TooManyRequestsException)]
+            assert len(rejected) == 1
+            stats = hasher.stats()
+            assert stats.completed == 3
+            assert stats.rejected == 1
+            assert stats.peak_waiting == 2
+        finally:
+            hasher.shutdown()
+
 
 class TestJWTTokens:
     """JWT 令牌测试类"""
@@ -0,0 +1,225 @@
+"""
+SQLite 生产模式单元测试
+
+测试 pragma、读写路由和写连接的批量提交
+"""
+
+import asyncio
+import uuid
+from collections.abc import AsyncIterator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select, text, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core import database
+from app.core.config import settings
+from app.core.database import create_sqlite_engines
+from app.core.deps import DBSession
+from app.core.sqlite import SQLiteSession, SQLiteWriter
+from app.models import Base, User
+from app.repositories.deck import DeckRepository
+
+
+@pytest.fixture
+async def sqlite_setup(tmp_path):
+    """在临时文件数据库上创建写连接、只读连接池和会话工厂"""
+    writer_engine, reader_engine = create_sqlite_engines(f"sqlite+aiosqlite:///{tmp_path / 'tuned.db'}")
+    async with writer_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    writer = SQLiteWriter(writer_engine, batch_size=8, timeout=5)
+    session_factory = async_sessionmaker(
+        reader_engine,
+        class_=SQLiteSession,
+        expire_on_commit=False,
+        autoflush=False,
+        writer=writer,
+        reader=reader_engine,
+    )
+    yield writer, reader_engine, session_factory
+    await writer.close()
+    await writer_engine.dispose()
+    await reader_engine.dispose()
+
+
+def _new_user() -> User:
+    """辅助方法：构造一个新用户"""
+    unique_id = uuid.uuid4().hex[:8]
+    return User(
+        username=f"sqlite_{unique_id}",
+        email=f"sqlite_{unique_id}@example.com",
+        nickname="SQLite",
+        hashed_password="x",
+    )
+
+
+async def _count_users(session_factory) -> int:
+    """辅助方法：用新会话统计用户数"""
+    async with session_factory() as session:
+        return (await session.execute(select(func.count()).select_from(User))).scalar_one()
+
+
+class TestSQLiteTuned:
+    """SQLite 生产模式测试类"""
+
+    @pytest.mark.unit
+    async def test_pragmas(self, sqlite_setup):
+        """测试连接建立时设置 pragma，只读连接禁止写入"""
+        writer, reader_engine, _ = sqlite_setup
+        async with reader_engine.connect() as conn:
+            assert (await conn.exec_driver_sql("PRAGMA journal_mode")).scalar() == "wal"
+            assert (await conn.exec_driver_sql("PRAGMA query_only")).scalar() == 1
+            assert (await conn.exec_driver_sql("PRAGMA busy_timeout")).scalar() == settings.SQLITE_BUSY_TIMEOUT
+        async with writer.engine.connect() as conn:
+            assert (await conn.exec_driver_sql("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert (await conn.exec_driver_sql("PRAGMA query_only")).scalar() == 0
+
+    @pytest.mark.unit
+    async def test_reads_use_reader_until_first_write(self, sqlite_setup):
+        """测试第一次写入前读取只读连接池，写入后读到自己未提交的写入"""
+        writer, reader_engine, session_factory = sqlite_setup
+        async with session_factory() as session:
+            await session.execute(select(User))
+            assert session.sync_session.writer_connection is None
+            assert session.get_bind() is reader_engine.sync_engine
+
+            session.add(_new_user())
+            await session.flush()
+            assert session.sync_session.writer_connection is not None
+            assert (await session.execute(select(func.count()).select_from(User))).scalar_one() == 1
+            assert await _count_users(session_factory) == 0
+
+            await session.commit()
+            assert session.sync_session.writer_connection is None
+            assert await _count_users(session_factory) == 1
+
+        assert writer.stats().leases == 1
+        assert writer.stats().commits == 1
+
+    @pytest.mark.unit
+    async def test_core_dml_uses_writer(self, sqlite_setup):
+        """测试直接执行 UPDATE 时获取写连接"""
+        _, _, session_factory = sqlite_setup
+        async with session_factory() as session:
+            session.add(_new_user())
+            await session.commit()
+
+            await session.execute(update(User).values(nickname="Renamed"))
+            assert session.sync_session.writer_connection is not None
+            await session.commit()
+
+        async with session_factory() as session:
+            assert (await session.execute(select(User.nickname))).scalar_one() == "Renamed"
+
+    @pytest.mark.unit
+    async def test_locking_reads_and_raw_writes_use_writer(self, sqlite_setup):
+        """测试 SELECT ... FOR UPDATE 和 text() 写入获取写连接，text() 查询仍读取只读连接池"""
+        _, reader_engine, session_factory = sqlite_setup
+        async with session_factory() as session:
+            await session.execute(text("SELECT count(*) FROM users"))
+            assert session.sync_session.writer_connection is None
+
+            assert await DeckRepository(session).get_by_id_for_update(str(uuid.uuid4())) is None
+            assert session.sync_session.writer_connection is not None
+            await session.commit()
+
+        async with session_factory() as session:
+            user = _new_user()
+            session.add(user)
+            await session.commit()
+
+            await session.execute(text("UPDATE users SET nickname = 'Raw' WHERE id = :id"), {"id": user.id})
+            assert session.sync_session.writer_connection is not None
+            await session.commit()
+            assert session.get_bind() is reader_engine.sync_engine
+
+        async with session_factory() as session:
+            assert (await session.execute(select(User.nickname))).scalar_one() == "Raw"
+
+    @pytest.mark.unit
+    async def test_concurrent_commits_are_batched(self, sqlite_setup):
+        """测试并发写入串行执行、合并提交，且没有锁冲突"""
+        writer, _, session_factory = sqlite_setup
+
+        async def create_user() -> None:
+            async with session_factory() as session:
+                session.add(_new_user())
+                await session.flush()
+                await asyncio.sleep(0)
+                await session.commit()
+
+        await asyncio.gather(*(create_user() for _ in range(20)))
+
+        assert await _count_users(session_factory) == 20
+        stats = writer.stats()
+        assert stats.committed_sessions == 20
+        assert stats.commits < 20
+        assert stats.avg_batch > 1
+        assert stats.waiting == 0
+
+    @pytest.mark.unit
+    async def test_rollback_only_discards_own_writes(self, sqlite_setup):
+        """测试同一批中某个会话回滚只撤销它自己的写入"""
+        writer, _, session_factory = sqlite_setup
+        first_flushed, second_flushed = asyncio.Event(), asyncio.Event()
+
+        async def commit_first() -> None:
+            async with session_factory() as session:
+                session.add(_new_user())
+                await session.flush()
+                first_flushed.set()
+                # 等第二个会话排队后提交，写连接交给第二个会话，本批尚未提交
+                while writer.stats().waiting == 0:
+                    await asyncio.sleep(0)
+                await session.commit()
+
+        async def rollback_second() -> None:
+            await first_flushed.wait()
+            async with session_factory() as session:
+                session.add(_new_user())
+                await session.flush()
+                second_flushed.set()
+                await session.rollback()
+
+        await asyncio.gather(commit_first(), rollback_second())
+
+        assert second_flushed.is_set()
+        assert await _count_users(session_factory) == 1
+
+    @pytest.mark.unit
+    async def test_idle_writer_returns_connection(self, sqlite_setup):
+        """测试写连接空闲时归还连接池"""
+        writer, _, session_factory = sqlite_setup
+        async with session_factory() as session:
+            session.add(_new_user())
+            await session.commit()
+
+        assert writer.engine.pool.checkedout() == 0
+        async with writer.engine.connect() as conn:
+            assert (await conn.execute(text("SELECT count(*) FROM users"))).scalar() == 1
+
+    @pytest.mark.unit
+    async def test_request_session_released_before_response(self, sqlite_setup, monkeypatch: pytest.MonkeyPatch):
+        """测试请求的读写会话在发送响应前提交并释放写连接"""
+        writer, _, session_factory = sqlite_setup
+        monkeypatch.setattr(database, "AsyncSessionLocal", session_factory)
+        app = FastAPI()
+
+        @app.post("/users")
+        async def create_user(db: DBSession) -> StreamingResponse:
+            db.add(_new_user())
+            await db.flush()
+
+            async def body() -> AsyncIterator[bytes]:
+                yield b"locked" if writer._lock.locked() else b"released"
+
+            return StreamingResponse(body())
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post("/users")
+
+        assert response.text == "released"
+        assert await _count_users(session_factory) == 1
@@ -0,0 +1,55 @@
+// 用前端实际运行的 ts-fsrs 重新计算 tests/unit/fsrs_golden.json 中的期望值。
+//
+// 输入（记忆状态、评分、间隔天数）沿用文件中已有的值（由 scripts/gen_fsrs_golden.py 生成），
+// 期望值全部由 ts-fsrs 计算后覆盖，source 记录 ts-fsrs 的版本。参数与 src/scheduler/fsrs.ts 一致
+// （generatorParameters 默认值，测试中关闭间隔扰动）。
+//
+// 用法（在 web 目录下，需先 pnpm install）:
+//     pnpm fsrs:golden
+
+import { readFileSync, writeFileSync } from 'node:fs'
+import { fileURLToPath } from 'node:url'
+import { fsrs, generatorParameters } from 'ts-fsrs'
+
+const output = fileURLToPath(new URL('../../tests/unit/fsrs_golden.json', import.meta.url))
+const { version } = JSON.parse(
+  readFileSync(new URL('../node_modules/ts-fsrs/package.json', import.meta.url), 'utf8'),
+)
+
+const scheduler = (request_retention = 0.9) =>
+  fsrs(generatorParameters({ enable_fuzz: false, enable_short_term: true, request_retention }))
+
+const golden = JSON.parse(readFileSync(output, 'utf8'))
+const f = scheduler()
+
+for (const item of golden.init) {
+  const { difficulty, stability } = f.next_state(null, 0, item.rating)
+  Object.assign(item, { difficulty, stability, interval: f.next_interval(stability, 0) })
+}
+
+for (const item of golden.transitions) {
+  const memory = { difficulty: item.difficulty, stability: item.stability }
+  const { difficulty, stability } = f.next_state(memory, item.elapsed_days, item.rating)
+  item.expected = { difficulty, stability, interval: f.next_interval(stability, 0) }
+}
+
+const byRetention = new Map()
+for (const item of golden.intervals) {
+  if (!byRetention.has(item.request_retention)) {
+    byRetention.set(item.request_retention, scheduler(item.request_retention))
+  }
+  item.interval = byRetention.get(item.request_retention).next_interval(item.stability, 0)
+}
+
+for (const history of golden.histories) {
+  let memory = f.next_state(null, 0, history.first_rating)
+  history.states = history.reviews.map(([elapsedDays, rating]) => {
+    memory = f.next_state(memory, elapsedDays, rating)
+    return [memory.difficulty, memory.stability]
+  })
+}
+
+golden.source = `ts-fsrs ${version}`
+golden.weights = [...f.parameters.w]
+writeFileSync(output, `${JSON.stringify(golden, null, 2)}\n`)
+console.log(`wrote ${output}`)
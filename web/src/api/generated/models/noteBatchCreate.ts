@@ -17,9 +17,9 @@ export interface NoteBatchCreate {
   /** 笔记类型ID */
   note_model_id: string
   /**
-   * 笔记列表（最多1000条）
+   * 笔记列表（最多50000条）
    * @minItems 1
-   * @maxItems 1000
+   * @maxItems 50000
    */
   notes: NoteBatchItem[]
   /** 来源类型 */